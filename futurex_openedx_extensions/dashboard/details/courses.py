@@ -1,7 +1,8 @@
 """Courses details collectors"""
 from __future__ import annotations
 
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List
 
 from common.djangoapps.student.models import CourseEnrollment
 from completion.models import BlockCompletion
@@ -27,9 +28,14 @@ from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 from eox_nelp.course_experience.models import FeedbackCourse
 from lms.djangoapps.certificates.models import GeneratedCertificate
+from lms.djangoapps.grades.context import grading_context_for_course
+from opaque_keys.edx.locator import CourseLocator
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.lib.courses import get_course_by_id
 from zeitlabs_payments.querysets import get_orders_queryset
 
+from futurex_openedx_extensions.helpers import constants as cs
+from futurex_openedx_extensions.helpers.caching import cache_dict
 from futurex_openedx_extensions.helpers.querysets import (
     check_staff_exist_queryset,
     get_accessible_users_and_courses,
@@ -357,3 +363,79 @@ def get_courses_orders_queryset(  # pylint: disable=too-many-arguments
         include_invoice=include_invoice,
         include_user_details=include_user_details,
     )
+
+
+def cache_name_course_grading_subsections(course_id: str, course_modified: datetime | None = None) -> str:
+    """
+    Get the cache name of the graded subsections of the course. The name includes the modification time of the course
+    overview, which is refreshed on every course publish. Therefore, publishing the course invalidates the cache.
+
+    :param course_id: The course ID
+    :type course_id: str
+    :param course_modified: The modification time of the course overview, if already loaded by the caller. Otherwise,
+        it is read from the database
+    :type course_modified: datetime | None
+    :return: The cache name
+    :rtype: str
+    """
+    modified = course_modified or CourseOverview.objects.filter(
+        id=course_id,
+    ).values_list('modified', flat=True).first()
+    version = int(modified.timestamp()) if modified else 0
+    return f'{cs.CACHE_NAME_COURSE_GRADING_SUBSECTIONS}_{course_id}_{version}'
+
+
+@cache_dict(
+    timeout='FX_CACHE_TIMEOUT_COURSE_GRADING_SUBSECTIONS',
+    key_generator_or_name=cache_name_course_grading_subsections,
+)
+def _get_cached_course_grading_subsections(
+    course_id: str, course_modified: datetime | None = None,  # pylint: disable=unused-argument
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Get the graded subsections of the course wrapped in a dictionary that is never empty, so the result is cached
+    even for a course without graded subsections.
+
+    :param course_id: The course ID
+    :type course_id: str
+    :param course_modified: The modification time of the course overview, used in the cache name only
+    :type course_modified: datetime | None
+    :return: The graded subsections of the course grouped by assignment type, under the `subsections` key
+    :rtype: Dict[str, Dict[str, List[Dict[str, Any]]]]
+    """
+    grading_context = grading_context_for_course(get_course_by_id(CourseLocator.from_string(course_id)))
+    return {
+        'subsections': {
+            assignment_type_name: [
+                {
+                    'display_name': subsection_info['subsection_block'].display_name,
+                    'location': str(subsection_info['subsection_block'].location),
+                } for subsection_info in subsection_infos
+            ] for assignment_type_name, subsection_infos in grading_context['all_graded_subsections_by_type'].items()
+        },
+    }
+
+
+def get_course_grading_subsections(
+    course_id: str, course_modified: datetime | None = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get the graded subsections of the course grouped by assignment type, in the grading order of the course.
+
+    returns:
+    {
+        'Homework': [
+            {'display_name': 'First Homework', 'location': 'block-v1:org+course+run+type@sequential+block@1'},
+            ...
+        ],
+        ...
+    }
+
+    :param course_id: The course ID
+    :type course_id: str
+    :param course_modified: The modification time of the course overview, if already loaded by the caller
+    :type course_modified: datetime | None
+    :return: The graded subsections of the course grouped by assignment type
+    :rtype: Dict[str, List[Dict[str, Any]]]
+    """
+    return _get_cached_course_grading_subsections(course_id, course_modified)['subsections']
@@ -162,13 +162,44 @@ common_parameters = {
         ParameterLocation.QUERY,
         required=False,
         type=openapi.TYPE_STRING,
-        enum=['csv'],
+        enum=['csv', 'csv.gz', 'jsonl.gz', 'parquet'],
         description=(
-            'Trigger a data export task for the results. Currently only `download=csv` is supported. The response'
-            ' will no longer be a list of objects, but a JSON object with `export_task_id` field. Then the'
+            'Trigger a data export task for the results in the given format: `csv`, `csv.gz` (gzipped CSV),'
+            ' `jsonl.gz` (gzipped JSON Lines), or `parquet` (only when `pyarrow` is installed on the server). The'
+            ' response will no longer be a list of objects, but a JSON object with `export_task_id` field. Then the'
             ' `export_task_id` can be used with the `/fx/export/v1/tasks/` endpoints.\n'
             '\n**Note:** this parameter will disable pagination options `page` and `page_size`. Therefore, the'
-            ' exported CSV will contain all the result\'s records.'
+            ' exported file will contain all the result\'s records.'
+        )
+    ),
+    'pagination': openapi.Parameter(
+        'pagination',
+        ParameterLocation.QUERY,
+        required=False,
+        type=openapi.TYPE_STRING,
+        enum=['page', 'keyset'],
+        description=(
+            'The pagination mode. Default is `page`, which uses the `page` parameter. `keyset` orders the results by'
+            ' ID and uses the `after` parameter instead of `page`, which keeps deep pages as fast as the first one.'
+            ' In `keyset` mode, `previous` is always `null`, and the `next` link carries the `after` value of the next'
+            ' page.'
+        )
+    ),
+    'after': query_parameter(
+        'after',
+        int,
+        'used only with `pagination=keyset`. The ID of the last record of the previous page. Not needed for the'
+        ' first page.',
+    ),
+    'count': openapi.Parameter(
+        'count',
+        ParameterLocation.QUERY,
+        required=False,
+        type=openapi.TYPE_INTEGER,
+        enum=[1, 0],
+        description=(
+            'used only with `pagination=keyset`. Use `0` to skip counting the results, then `count` will be `null` in'
+            ' the response. Default is `1`.'
         )
     ),
     'tenant_ids': query_parameter(
@@ -1002,6 +1033,9 @@ docs_src = {
             get_optional_parameter('futurex_openedx_extensions.dashboard.serializers::LearnerEnrollmentSerializer'),
             common_parameters['download'],
             common_parameters['omit_subsection_name'],
+            common_parameters['pagination'],
+            common_parameters['after'],
+            common_parameters['count'],
         ],
         'responses': responses(
             overrides={
@@ -1098,6 +1132,9 @@ docs_src = {
             ),
             common_parameters['include_staff'],
             common_parameters['download'],
+            common_parameters['pagination'],
+            common_parameters['after'],
+            common_parameters['count'],
         ],
         'responses': responses(
             overrides={
@@ -12,12 +12,12 @@ from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.roles import CourseInstructorRole, CourseStaffRole
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models.manager import BaseManager
 from django.utils.timezone import now
 from eox_nelp.course_experience.models import FeedbackCourse
 from eox_tenant.models import TenantConfig
 from lms.djangoapps.courseware.courses import get_course_blocks_completion_summary
 from lms.djangoapps.grades.api import CourseGradeFactory
-from lms.djangoapps.grades.context import grading_context_for_course
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import CourseLocator
@@ -27,7 +27,6 @@ from openedx.core.djangoapps.discussions.models import DiscussionsConfiguration
 from openedx.core.djangoapps.django_comment_common.models import assign_default_role
 from openedx.core.djangoapps.django_comment_common.utils import seed_permissions_roles
 from openedx.core.djangoapps.user_api.accounts.serializers import AccountLegacyProfileSerializer
-from openedx.core.lib.courses import get_course_by_id
 from organizations.api import add_organization_course, ensure_organization
 from rest_framework import serializers
 from rest_framework.fields import empty
@@ -43,7 +42,12 @@ from futurex_openedx_extensions.dashboard.custom_serializers import (
     OptionalFieldsSerializerMixin,
     SerializerOptionalMethodField,
 )
-from futurex_openedx_extensions.helpers.certificates import get_certificate_date, get_certificate_url
+from futurex_openedx_extensions.dashboard.details.courses import get_course_grading_subsections
+from futurex_openedx_extensions.helpers.certificates import (
+    get_certificate_date,
+    get_certificate_url,
+    get_certificates_by_users,
+)
 from futurex_openedx_extensions.helpers.constants import (
     ALLOWED_FILE_EXTENSIONS,
     COURSE_ACCESS_ROLES_GLOBAL,
@@ -62,6 +66,7 @@ from futurex_openedx_extensions.helpers.extractors import (
     extract_arabic_name_from_user,
     extract_full_name_from_user,
     import_from_path,
+    invalidate_library_keys_index,
     verify_course_ids,
 )
 from futurex_openedx_extensions.helpers.models import DataExportTask, TenantAsset
@@ -97,6 +102,7 @@ class DataExportTaskSerializer(ModelSerializerOptionalFields):
             'view_name',
             'related_id',
             'filename',
+            'export_format',
             'notes',
             'created_at',
             'started_at',
@@ -118,6 +124,15 @@ class DataExportTaskSerializer(ModelSerializerOptionalFields):
         """Return download url."""
         return get_exported_file_url(obj)
 
+    def to_representation(self, instance: DataExportTask) -> Any:
+        """Use the progress mirrored to the cache for tasks in progress, since the saved progress is throttled"""
+        representation = super().to_representation(instance)
+        if instance.status == DataExportTask.STATUS_PROCESSING and 'progress' in representation:
+            cached_progress = DataExportTask.get_cached_progress(instance.id)
+            if cached_progress is not None and cached_progress > representation['progress']:
+                representation['progress'] = cached_progress
+        return representation
+
 
 class LearnerBasicDetailsSerializer(ModelSerializerOptionalFields):
     """Serializer for learner's basic details."""
@@ -225,6 +240,18 @@ class LearnerBasicDetailsSerializer(ModelSerializerOptionalFields):
         return self._get_profile_field(obj, 'year_of_birth')
 
 
+class CourseScoreAndCertificateListSerializer(ListSerializerOptionalFields):  # pylint: disable=abstract-method
+    """List serializer that prefetches the data of CourseScoreAndCertificateSerializer for all items at once."""
+
+    def to_representation(self, instance: Any) -> Any:
+        """Return the representation of the items, after prefetching their certificates and exam scores."""
+        iterable = instance.all() if isinstance(instance, BaseManager) else instance
+        items = list(iterable)
+        self.child.prefetch_certificates(items)
+        self.child.prefetch_exam_scores(items)
+        return super().to_representation(items)
+
+
 class CourseScoreAndCertificateSerializer(ModelSerializerOptionalFields):
     """
     Course Score and Certificate Details Serializer
@@ -257,6 +284,8 @@ class CourseScoreAndCertificateSerializer(ModelSerializerOptionalFields):
         self._is_exam_name_in_header = self.context.get('omit_subsection_name', '0') != '1'
         self._grading_info: Dict[str, Any] = {}
         self._subsection_locations: Dict[str, Any] = {}
+        self._certificates: Dict[int, Dict[CourseLocator, Dict[str, Any]]] | None = None
+        self._exam_grades: Dict[Tuple[int, str], List[Dict[str, Any]]] | None = None
 
         if self.context.get('course_id'):
             self.collect_grading_info()
@@ -271,20 +300,21 @@ class CourseScoreAndCertificateSerializer(ModelSerializerOptionalFields):
         if not self.is_optional_field_requested('exam_scores'):
             return
 
-        grading_context = grading_context_for_course(get_course_by_id(course_id))
         index = 0
-        for assignment_type_name, subsection_infos in grading_context['all_graded_subsections_by_type'].items():
+        for assignment_type_name, subsection_infos in get_course_grading_subsections(
+            str(course_id), self.context.get('course_modified'),
+        ).items():
             for subsection_index, subsection_info in enumerate(subsection_infos, start=1):
                 header_enum = f' {subsection_index}' if len(subsection_infos) > 1 else ''
                 header_name = f'{assignment_type_name}{header_enum}'
                 if self.is_exam_name_in_header:
-                    header_name += f': {subsection_info["subsection_block"].display_name}'
+                    header_name += f': {subsection_info["display_name"]}'
 
                 self._grading_info[str(index)] = {
                     'header_name': header_name,
-                    'location': str(subsection_info['subsection_block'].location),
+                    'location': subsection_info['location'],
                 }
-                self._subsection_locations[str(subsection_info['subsection_block'].location)] = str(index)
+                self._subsection_locations[subsection_info['location']] = str(index)
                 index += 1
 
     @property
@@ -310,31 +340,74 @@ class CourseScoreAndCertificateSerializer(ModelSerializerOptionalFields):
         """Get the User. Its helper method required for CourseScoreAndCertificateSerializer"""
         raise NotImplementedError('Child class must implement _get_course_id method.')
 
+    def prefetch_certificates(self, instances: List[Any]) -> None:
+        """
+        Load the certificates of all the given instances at once, to be used by certificate_url and certificate_date.
+        """
+        if not self.is_optional_field_requested('certificate_url') and \
+                not self.is_optional_field_requested('certificate_date'):
+            return
+
+        self._certificates = get_certificates_by_users([
+            (self._get_user(instance), self._get_course_id(instance)) for instance in instances
+        ])
+
+    def _get_user_certificates(self, obj: Any) -> Dict[CourseLocator, Dict[str, Any]] | None:
+        """Return the prefetched certificates of the user of the given object, or None if not prefetched."""
+        if self._certificates is None:
+            return None
+        return self._certificates.get(self._get_user(obj).id, {})
+
     def get_certificate_url(self, obj: Any) -> Any:
         """Return the certificate URL."""
         return get_certificate_url(
-            self.context.get('request'), self._get_user(obj), self._get_course_id(obj)
+            self.context.get('request'), self._get_user(obj), self._get_course_id(obj),
+            certificates=self._get_user_certificates(obj),
         )
 
     def get_certificate_date(self, obj: Any) -> Any:
         """Return the certificate Date."""
         return dt_to_str(get_certificate_date(
-            self._get_user(obj), self._get_course_id(obj)
+            self._get_user(obj), self._get_course_id(obj), certificates=self._get_user_certificates(obj),
         ))
 
     def get_progress(self, obj: Any) -> Any:  # pylint: disable=no-self-use
         """Return the certificate URL."""
         return getattr(obj, 'progress', 0.0) or 0.0
 
-    def get_exam_scores(self, obj: Any) -> Dict[str, Tuple[float, float] | None]:
-        """Return exam scores."""
-        result: Dict[str, Tuple[float, float] | None] = {__index: None for __index in self.grading_info}
+    def prefetch_exam_scores(self, instances: List[Any]) -> None:
+        """
+        Load the subsection grades of all the given instances in one query, to be used by exam_scores.
+        """
+        if not self.is_optional_field_requested('exam_scores'):
+            return
+
+        self._exam_grades = {}
+        if not self.subsection_locations or not instances:
+            return
+
         grades = PersistentSubsectionGrade.objects.filter(
-            user_id=self._get_user(obj).id,
-            course_id=self._get_course_id(obj),
+            user_id__in={self._get_user(instance).id for instance in instances},
+            course_id__in={self._get_course_id(instance) for instance in instances},
             usage_key__in=self.subsection_locations.keys(),
             first_attempted__isnull=False,
-        ).values('usage_key', 'earned_all', 'possible_all')
+        ).values('user_id', 'course_id', 'usage_key', 'earned_all', 'possible_all')
+
+        for grade in grades:
+            self._exam_grades.setdefault((grade['user_id'], str(grade['course_id'])), []).append(grade)
+
+    def get_exam_scores(self, obj: Any) -> Dict[str, Tuple[float, float] | None]:
+        """Return exam scores."""
+        result: Dict[str, Tuple[float, float] | None] = {__index: None for __index in self.grading_info}
+        if self._exam_grades is not None:
+            grades = self._exam_grades.get((self._get_user(obj).id, str(self._get_course_id(obj))), [])
+        else:
+            grades = PersistentSubsectionGrade.objects.filter(
+                user_id=self._get_user(obj).id,
+                course_id=self._get_course_id(obj),
+                usage_key__in=self.subsection_locations.keys(),
+                first_attempted__isnull=False,
+            ).values('usage_key', 'earned_all', 'possible_all')
 
         for grade in grades:
             result[self.subsection_locations[str(grade['usage_key'])]] = (grade['earned_all'], grade['possible_all'])
@@ -387,6 +460,7 @@ class LearnerDetailsForCourseSerializer(
     class Meta:
         model = get_user_model()
         fields = LearnerBasicDetailsSerializer.Meta.fields + CourseScoreAndCertificateSerializer.Meta.fields
+        list_serializer_class = CourseScoreAndCertificateListSerializer
 
     def _get_course_id(self, obj: Any = None) -> CourseLocator:
         """Get the course ID. Its helper method required for CourseScoreAndCertificateSerializer"""
@@ -411,6 +485,7 @@ class LearnerEnrollmentSerializer(
             CourseScoreAndCertificateSerializer.Meta.fields +
             ['course_id', 'sso_external_id']
         )
+        list_serializer_class = CourseScoreAndCertificateListSerializer
 
     def _get_course_id(self, obj: Any = None) -> CourseLocator | None:
         """Get the course ID. Its helper method required for CourseScoreAndCertificateSerializer"""
@@ -1157,6 +1232,7 @@ class LibrarySerializer(serializers.Serializer):
                         'display_name': validated_data['display_name']
                     },
                 )
+            invalidate_library_keys_index([str(library.location.library_key)])
             # can't use auth.add_users here b/c it requires user to already have Instructor perms in this course
             CourseInstructorRole(library.location.library_key).add_users(user)
             add_users(user, CourseStaffRole(library.location.library_key), user)
@@ -3,6 +3,28 @@ from __future__ import annotations
 
 from typing import Any
 
+STATISTICS_SNAPSHOTS_TASK = 'futurex_openedx_extensions.dashboard.tasks.refresh_statistics_snapshots_task'
+
+
+def add_statistics_snapshots_beat_schedule(settings: Any) -> None:
+    """
+    Schedule the refresh of the statistics snapshots with celery beat. Entries already defined in CELERY_BEAT_SCHEDULE
+    with the same names are kept, so operators can override them.
+    """
+    schedule = {}
+    if settings.FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS:
+        schedule['fx-refresh-statistics-snapshots'] = {
+            'task': STATISTICS_SNAPSHOTS_TASK,
+            'schedule': settings.FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS,
+        }
+    if settings.FX_STATISTICS_SNAPSHOT_FULL_REFRESH_SECONDS:
+        schedule['fx-full-refresh-statistics-snapshots'] = {
+            'task': STATISTICS_SNAPSHOTS_TASK,
+            'schedule': settings.FX_STATISTICS_SNAPSHOT_FULL_REFRESH_SECONDS,
+            'kwargs': {'full_refresh': True},
+        }
+    settings.CELERY_BEAT_SCHEDULE = {**schedule, **getattr(settings, 'CELERY_BEAT_SCHEDULE', {})}
+
 
 def plugin_settings(settings: Any) -> None:
     """plugin settings"""
@@ -13,6 +35,41 @@ def plugin_settings(settings: Any) -> None:
         60 * 60 * 2,  # 2 hours
     )
 
+    # Serve the live statistics from the precomputed statistics snapshots when available
+    settings.FX_STATISTICS_SNAPSHOT_ENABLED = getattr(
+        settings,
+        'FX_STATISTICS_SNAPSHOT_ENABLED',
+        False,
+    )
+
+    # Compute the days since the last snapshot refresh live when serving from the snapshots. This runs the live
+    # learners, enrollments and certificates queries of these days on every miss of the live statistics cache, so it
+    # is disabled by default; the snapshots are already refreshed every FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS
+    settings.FX_STATISTICS_SNAPSHOT_LIVE_DELTA = getattr(
+        settings,
+        'FX_STATISTICS_SNAPSHOT_LIVE_DELTA',
+        False,
+    )
+
+    # Interval of the incremental refresh of the statistics snapshots, scheduled with celery beat when the snapshots
+    # are enabled. Zero to not schedule it
+    settings.FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS = getattr(
+        settings,
+        'FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS',
+        60 * 15,  # 15 minutes
+    )
+
+    # Interval of the full refresh of the statistics snapshots, scheduled with celery beat when the snapshots are
+    # enabled. Zero to not schedule it
+    settings.FX_STATISTICS_SNAPSHOT_FULL_REFRESH_SECONDS = getattr(
+        settings,
+        'FX_STATISTICS_SNAPSHOT_FULL_REFRESH_SECONDS',
+        60 * 60 * 24,  # 1 day
+    )
+
+    if settings.FX_STATISTICS_SNAPSHOT_ENABLED:
+        add_statistics_snapshots_beat_schedule(settings)
+
     # Cache timeout for course ratings per tenant
     settings.FX_CACHE_TIMEOUT_COURSES_RATINGS = getattr(
         settings,
@@ -20,6 +77,13 @@ def plugin_settings(settings: Any) -> None:
         60 * 60,  # 1 hour
     )
 
+    # Cache timeout for the graded subsections of a course. The cache is refreshed anyway when the course is published
+    settings.FX_CACHE_TIMEOUT_COURSE_GRADING_SUBSECTIONS = getattr(
+        settings,
+        'FX_CACHE_TIMEOUT_COURSE_GRADING_SUBSECTIONS',
+        60 * 60 * 24,  # 1 day
+    )
+
     settings.FX_DISABLE_CONFIG_VALIDATIONS = getattr(
         settings,
         'FX_DISABLE_CONFIG_VALIDATIONS',
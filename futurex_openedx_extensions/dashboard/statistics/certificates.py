@@ -16,6 +16,42 @@ from futurex_openedx_extensions.helpers.querysets import check_staff_exist_query
 log = logging.getLogger(__name__)
 
 
+def parse_course_effort(effort: str, course_id: str) -> float:
+    """Parse course effort in HH:MM format and return total hours as a float."""
+    try:
+        if not effort:
+            raise FXCodedException(
+                FXExceptionCodes.COURSE_EFFORT_NOT_FOUND,
+                f'Course effort not found for course {course_id}'
+            )
+
+        parts = effort.split(':')
+        hours = int(parts[0])
+        minutes = int(parts[1]) if len(parts) > 1 else 0
+
+        if hours < 0 or minutes < 0:
+            raise ValueError('Hours and minutes must be non-negative values.')
+        if minutes >= 60:
+            raise ValueError('Minutes cannot be 60 or more.')
+
+        total_hours = hours + minutes / 60
+
+        if total_hours < 0.5:
+            raise ValueError('course effort value is too small')
+
+        return round(total_hours, 1)
+
+    except FXCodedException:
+        return settings.FX_DEFAULT_COURSE_EFFORT
+
+    except (ValueError, IndexError) as exc:
+        log.exception(
+            'Invalid course-effort for course %s. Assuming default value (%s hours). Error: %s',
+            course_id, settings.FX_DEFAULT_COURSE_EFFORT, str(exc)
+        )
+        return settings.FX_DEFAULT_COURSE_EFFORT
+
+
 def get_certificates_count(
     fx_permission_info: dict,
     visible_courses_filter: bool | None = True,
@@ -68,15 +104,15 @@ def get_certificates_count(
     return dict(result)
 
 
-def get_learning_hours_count(
+def get_learning_hours_count_per_org(
     fx_permission_info: dict,
     visible_courses_filter: bool | None = True,
     active_courses_filter: bool | None = None,
     include_staff: bool | None = None,
-) -> int:
+) -> Dict[str, float]:
     """
-    Get the count of learning hours in the given tenants. The count is grouped by course_effort. Certificates
-    for admins, staff, and superusers are also included.
+    Get the count of learning hours in the given tenants grouped by organization. Learning hours are calculated from
+    the course_effort of the courses of the issued certificates.
 
     :param fx_permission_info: Dictionary containing permission information
     :type fx_permission_info: dict
@@ -86,45 +122,10 @@ def get_learning_hours_count(
     :type active_courses_filter: bool | None
     :param include_staff: Include staff members in the count
     :type include_staff: bool | None
-    :return: Count of certificates per organization
-    :rtype: Dict[str, int]
+    :return: Count of learning hours per organization
+    :rtype: Dict[str, float]
     """
 
-    def parse_course_effort(effort: str, course_id: str) -> float:
-        """Parses course effort in HH:MM format and returns total hours as a float."""
-        try:
-            if not effort:
-                raise FXCodedException(
-                    FXExceptionCodes.COURSE_EFFORT_NOT_FOUND,
-                    f'Course effort not found for course {course_id}'
-                )
-
-            parts = effort.split(':')
-            hours = int(parts[0])
-            minutes = int(parts[1]) if len(parts) > 1 else 0
-
-            if hours < 0 or minutes < 0:
-                raise ValueError('Hours and minutes must be non-negative values.')
-            if minutes >= 60:
-                raise ValueError('Minutes cannot be 60 or more.')
-
-            total_hours = hours + minutes / 60
-
-            if total_hours < 0.5:
-                raise ValueError('course effort value is too small')
-
-            return round(total_hours, 1)
-
-        except FXCodedException:
-            return settings.FX_DEFAULT_COURSE_EFFORT
-
-        except (ValueError, IndexError) as exc:
-            log.exception(
-                'Invalid course-effort for course %s. Assuming default value (%s hours). Error: %s',
-                course_id, settings.FX_DEFAULT_COURSE_EFFORT, str(exc)
-            )
-            return settings.FX_DEFAULT_COURSE_EFFORT
-
     queryset = GeneratedCertificate.objects.filter(
         status='downloadable',
         course_id__in=get_base_queryset_courses(
@@ -153,15 +154,52 @@ def get_learning_hours_count(
                     id=OuterRef('course_id')
                 ).values('effort')
             )
+        ).annotate(
+            org_lower_case=Subquery(
+                CourseOverview.objects.filter(
+                    id=OuterRef('course_id')
+                ).values(org_lower_case=Lower('org'))
+            )
         ).annotate(
             certificates_count=Count('id')
-        ).values('course_effort', 'certificates_count', 'course_id')
+        ).values('course_effort', 'certificates_count', 'course_id', 'org_lower_case')
     )
 
-    return sum(
-        parse_course_effort(
+    learning_hours: Dict[str, float] = {}
+    for entry in result:
+        org = entry['org_lower_case']
+        learning_hours[org] = learning_hours.get(org, 0) + parse_course_effort(
             entry.get('course_effort', settings.FX_DEFAULT_COURSE_EFFORT),
             entry.get('course_id')
         ) * entry.get('certificates_count', 0)
-        for entry in result
-    )
+
+    return learning_hours
+
+
+def get_learning_hours_count(
+    fx_permission_info: dict,
+    visible_courses_filter: bool | None = True,
+    active_courses_filter: bool | None = None,
+    include_staff: bool | None = None,
+) -> float:
+    """
+    Get the count of learning hours in the given tenants. Certificates for admins, staff, and superusers are also
+    included.
+
+    :param fx_permission_info: Dictionary containing permission information
+    :type fx_permission_info: dict
+    :param visible_courses_filter: Value to filter courses on catalog visibility. None means no filter.
+    :type visible_courses_filter: bool | None
+    :param active_courses_filter: Value to filter courses on active status. None means no filter.
+    :type active_courses_filter: bool | None
+    :param include_staff: Include staff members in the count
+    :type include_staff: bool | None
+    :return: Count of learning hours
+    :rtype: float
+    """
+    return sum(get_learning_hours_count_per_org(
+        fx_permission_info,
+        visible_courses_filter=visible_courses_filter,
+        active_courses_filter=active_courses_filter,
+        include_staff=include_staff,
+    ).values())
@@ -1,7 +1,17 @@
 """functions for getting statistics about learners"""
 from __future__ import annotations
 
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment, UserSignupSource
+from django.db.models import Q
+
+from futurex_openedx_extensions.helpers.converters import get_allowed_roles
+from futurex_openedx_extensions.helpers.extractors import get_partial_access_course_ids
+from futurex_openedx_extensions.helpers.permissions import get_tenant_limited_fx_permission_info
 from futurex_openedx_extensions.helpers.querysets import get_learners_search_queryset, get_permitted_learners_queryset
+from futurex_openedx_extensions.helpers.tenants import get_tenants_sites
 
 
 def get_learners_count(
@@ -27,3 +37,117 @@ def get_learners_count(
     )
 
     return queryset.count()
+
+
+def _get_staff_orgs_per_user(orgs: List[str]) -> Dict[int, Set[str] | None]:
+    """
+    Get the orgs where each user has a staff role, among the given orgs. None means that the user has a global staff
+    role, so the user is staff in all orgs. This is the same rule of check_staff_exist_queryset without a course
+
+    :param orgs: The orgs to check
+    :type orgs: List[str]
+    :return: The lowercase staff orgs of every staff user, by user ID
+    :rtype: Dict[int, Set[str] | None]
+    """
+    allowed_roles = get_allowed_roles(None)
+    org_roles = allowed_roles['tenant_only'] + allowed_roles['course_only'] + allowed_roles['tenant_or_course']
+
+    result: Dict[int, Set[str] | None] = {}
+    for user_id, role, org in CourseAccessRole.objects.filter(
+        Q(role__in=allowed_roles['global']) | (Q(role__in=org_roles) & Q(org__in=orgs)),
+    ).values_list('user_id', 'role', 'org').distinct():
+        if role in allowed_roles['global']:
+            result[user_id] = None
+        elif (user_orgs := result.setdefault(user_id, set())) is not None:
+            user_orgs.add(org.lower())
+    return result
+
+
+def _is_staff_in_orgs(staff_orgs_per_user: Dict[int, Set[str] | None], user_id: int, orgs: Set[str]) -> bool:
+    """Check if the user is staff in any of the given orgs, according to the result of _get_staff_orgs_per_user"""
+    if user_id not in staff_orgs_per_user:
+        return False
+    staff_orgs = staff_orgs_per_user[user_id]
+    return staff_orgs is None or bool(staff_orgs & orgs)
+
+
+def _get_users_per_tenant(fx_permission_info: dict, tenants_permission_info: Dict[int, dict]) -> Dict[int, Set[int]]:
+    """
+    Get the IDs of the permitted learners of every tenant, before excluding staff users. Full access tenants get the
+    learners who signed up on their sites, and the other tenants get the learners enrolled in their partial access
+    courses. Each access type is read with one query for all tenants
+
+    :param fx_permission_info: Dictionary containing permission information
+    :type fx_permission_info: dict
+    :param tenants_permission_info: The permission information limited to every tenant, by tenant ID
+    :type tenants_permission_info: Dict[int, dict]
+    :return: The learner IDs of every tenant
+    :rtype: Dict[int, Set[int]]
+    """
+    full_access_tenant_by_site = {}
+    partial_access_tenants_by_org = defaultdict(list)
+    for tenant_id, tenant_permission_info in tenants_permission_info.items():
+        if tenant_permission_info['view_allowed_tenant_ids_full_access']:
+            for site in get_tenants_sites([tenant_id]):
+                full_access_tenant_by_site[site] = tenant_id
+        else:
+            for org in tenant_permission_info['view_allowed_course_access_orgs']:
+                partial_access_tenants_by_org[org].append(tenant_id)
+
+    learners = get_learners_search_queryset()
+    users_per_tenant: Dict[int, Set[int]] = {tenant_id: set() for tenant_id in tenants_permission_info}
+    if full_access_tenant_by_site:
+        for user_id, site in UserSignupSource.objects.filter(
+            user__in=learners, site__in=list(full_access_tenant_by_site),
+        ).values_list('user_id', 'site').distinct():
+            users_per_tenant[full_access_tenant_by_site[site]].add(user_id)
+
+    if partial_access_tenants_by_org:
+        for user_id, course_id in CourseEnrollment.objects.filter(
+            user__in=learners, course_id__in=get_partial_access_course_ids(fx_permission_info),
+        ).values_list('user_id', 'course_id').distinct():
+            for tenant_id in partial_access_tenants_by_org.get(str(course_id.org).lower(), []):
+                users_per_tenant[tenant_id].add(user_id)
+
+    return users_per_tenant
+
+
+def get_learners_count_per_tenant(
+    fx_permission_info: dict,
+    include_staff: bool = False,
+) -> Dict[int, int]:
+    """
+    Get the count of learners of each tenant in fx_permission_info. The result of each tenant is the same as calling
+    get_learners_count with the permission information limited to that tenant (get_tenant_limited_fx_permission_info).
+
+    The learners are read with one query per access type for all tenants, rather than one query per tenant: signup
+    sites of the full access tenants, enrollments in the partial access courses, and staff roles in the orgs. Then the
+    rows are folded into tenants through the site and org maps.
+
+    :param fx_permission_info: Dictionary containing permission information
+    :type fx_permission_info: dict
+    :param include_staff: flag to include staff users
+    :type include_staff: bool
+    :return: Dictionary of tenant ID and the count of learners
+    :rtype: Dict[int, int]
+    """
+    tenant_ids = fx_permission_info['view_allowed_tenant_ids_any_access']
+    if not tenant_ids:
+        return {}
+
+    tenants_permission_info = {
+        tenant_id: get_tenant_limited_fx_permission_info(fx_permission_info, tenant_id) for tenant_id in tenant_ids
+    }
+    users_per_tenant = _get_users_per_tenant(fx_permission_info, tenants_permission_info)
+
+    staff_orgs_per_user: Dict[int, Set[str] | None] = {}
+    if not include_staff:
+        staff_orgs_per_user = _get_staff_orgs_per_user(sorted(fx_permission_info['view_allowed_any_access_orgs']))
+
+    result = {}
+    for tenant_id, tenant_users in users_per_tenant.items():
+        tenant_orgs = set(tenants_permission_info[tenant_id]['view_allowed_any_access_orgs'])
+        result[tenant_id] = sum(
+            1 for user_id in tenant_users if not _is_staff_in_orgs(staff_orgs_per_user, user_id, tenant_orgs)
+        )
+    return result
@@ -7,6 +7,7 @@ from futurex_openedx_extensions.dashboard.statistics.certificates import (
 )
 from futurex_openedx_extensions.dashboard.statistics.courses import get_courses_count, get_enrollments_count
 from futurex_openedx_extensions.dashboard.statistics.learners import get_learners_count
+from futurex_openedx_extensions.dashboard.statistics.snapshots import get_snapshot_statistics
 from futurex_openedx_extensions.helpers import constants as cs
 from futurex_openedx_extensions.helpers.caching import cache_dict
 from futurex_openedx_extensions.helpers.permissions import build_fx_permission_info
@@ -15,10 +16,13 @@ from futurex_openedx_extensions.helpers.permissions import build_fx_permission_i
 @cache_dict(
     settings.FX_CACHE_TIMEOUT_LIVE_STATISTICS_PER_TENANT,
     lambda tenant_id: f'{cs.CACHE_NAME_LIVE_STATISTICS_PER_TENANT}_{tenant_id}',
+    stale_timeout='FX_CACHE_STALE_TIMEOUT',
+    early_expiration_beta=cs.CACHE_EARLY_EXPIRATION_BETA,
 )
 def get_live_statistics(tenant_id: int) -> dict:
     """
-    Get the live statistics for the given tenant.
+    Get the live statistics for the given tenant. When FX_STATISTICS_SNAPSHOT_ENABLED is set and the statistics
+    snapshot of the tenant is available, all counters except courses_count are read from the snapshot.
 
     :param tenant_id: The ID of the tenant.
     :type tenant_id: int
@@ -26,7 +30,7 @@ def get_live_statistics(tenant_id: int) -> dict:
     :rtype: dict
     """
     fx_permission_info = build_fx_permission_info(tenant_id)
-    result = {
+    result: dict = {
         'learners_count': 0,
         'courses_count': 0,
         'enrollments_count': 0,
@@ -34,8 +38,16 @@ def get_live_statistics(tenant_id: int) -> dict:
         'learning_hours_count': 0,
     }
     if fx_permission_info['view_allowed_tenant_ids_any_access']:
-        result['learners_count'] = get_learners_count(fx_permission_info)
         result['courses_count'] = sum(org_count['courses_count'] for org_count in get_courses_count(fx_permission_info))
+
+        snapshot = None
+        if settings.FX_STATISTICS_SNAPSHOT_ENABLED:
+            snapshot = get_snapshot_statistics(tenant_id, live_delta=settings.FX_STATISTICS_SNAPSHOT_LIVE_DELTA)
+        if snapshot is not None:
+            result.update(snapshot)
+            return result
+
+        result['learners_count'] = get_learners_count(fx_permission_info)
         result['enrollments_count'] = sum(
             org_count['enrollments_count'] for org_count in get_enrollments_count(fx_permission_info)
         )
@@ -0,0 +1,228 @@
+"""functions for building and reading the precomputed statistics snapshots"""
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Lower, TruncDate
+from django.utils import timezone
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+from futurex_openedx_extensions.dashboard.statistics.certificates import parse_course_effort
+from futurex_openedx_extensions.dashboard.statistics.courses import _get_enrollments_count
+from futurex_openedx_extensions.helpers import constants as cs
+from futurex_openedx_extensions.helpers.models import StatisticsSnapshot, StatisticsSnapshotWatermark
+from futurex_openedx_extensions.helpers.permissions import build_fx_permission_info
+from futurex_openedx_extensions.helpers.querysets import (
+    check_staff_exist_queryset,
+    get_base_queryset_courses,
+    get_learners_search_queryset,
+    get_permitted_learners_queryset,
+)
+from futurex_openedx_extensions.helpers.tenants import get_course_org_filter_list
+
+SNAPSHOT_COUNTERS = ['learners_count', 'enrollments_count', 'certificates_count', 'learning_hours_count']
+SNAPSHOT_REFRESH_LOCK_SECONDS = 60 * 60  # 1 hour
+
+
+def _start_of_day(the_date: date) -> datetime:
+    """Get the aware datetime of the start of the given day"""
+    return timezone.make_aware(datetime.combine(the_date, time.min))
+
+
+def _get_days_filter(field_name: str, date_from: date | None, extra_days: List[date]) -> Q:
+    """Get the filter of the records created on or after date_from, or created on one of the extra days"""
+    if date_from is None:
+        return Q()
+
+    result = Q(**{f'{field_name}__gte': _start_of_day(date_from)})
+    if extra_days:
+        result |= Q(**{f'{field_name}__date__in': extra_days})
+
+    return result
+
+
+def compute_statistics_buckets(
+    tenant_id: int,
+    date_from: date | None = None,
+    extra_days: List[date] | None = None,
+) -> Dict[Tuple[str, date], Dict[str, Any]]:
+    """
+    Compute the statistics of the given tenant grouped by org and by the creation day of the counted records. Staff
+    users are excluded, and only visible courses are considered; the same as get_live_statistics.
+
+    :param tenant_id: The ID of the tenant
+    :type tenant_id: int
+    :param date_from: Only compute the days starting from this date. None means all days
+    :type date_from: date | None
+    :param extra_days: Days before date_from to compute too
+    :type extra_days: List[date] | None
+    :return: Dictionary of the counters of every (org, day). Learners are stored under an empty org
+    :rtype: Dict[Tuple[str, date], Dict[str, Any]]
+    """
+    fx_permission_info = build_fx_permission_info(tenant_id)
+    extra_days = extra_days or []
+    buckets: Dict[Tuple[str, date], Dict[str, Any]] = {}
+
+    def _add(org: str, day: date, counter: str, value: Any) -> None:
+        """Add the value to the counter of the bucket"""
+        bucket = buckets.setdefault((org, day), {key: 0 for key in SNAPSHOT_COUNTERS})
+        bucket[counter] += value
+
+    learners = get_permitted_learners_queryset(
+        queryset=get_learners_search_queryset(),
+        fx_permission_info=fx_permission_info,
+    ).filter(
+        _get_days_filter('date_joined', date_from, extra_days),
+    ).annotate(day=TruncDate('date_joined')).values('day').annotate(learners_count=Count('id'))
+    for item in learners:
+        _add('', item['day'], 'learners_count', item['learners_count'])
+
+    enrollments = _get_enrollments_count(fx_permission_info).filter(
+        _get_days_filter('created', date_from, extra_days),
+    ).annotate(day=TruncDate('created')).values('day', org_lower_case=Lower('course__org')).annotate(
+        enrollments_count=Count('id'),
+    )
+    for item in enrollments:
+        _add(item['org_lower_case'], item['day'], 'enrollments_count', item['enrollments_count'])
+
+    certificates = GeneratedCertificate.objects.filter(
+        status='downloadable',
+        course_id__in=get_base_queryset_courses(fx_permission_info),
+        user__is_active=True,
+    ).filter(
+        _get_days_filter('created_date', date_from, extra_days),
+    ).annotate(
+        course_org=Subquery(
+            CourseOverview.objects.filter(id=OuterRef('course_id')).values(org_lower_case=Lower('org'))
+        ),
+        course_effort=Subquery(
+            CourseOverview.objects.filter(id=OuterRef('course_id')).values('effort')
+        ),
+    ).filter(
+        ~check_staff_exist_queryset(ref_user_id='user_id', ref_org='course_org', ref_course_id='course_id'),
+    ).annotate(day=TruncDate('created_date')).values('course_org', 'course_effort', 'course_id', 'day').annotate(
+        certificates_count=Count('id'),
+    )
+    for item in certificates:
+        _add(item['course_org'], item['day'], 'certificates_count', item['certificates_count'])
+        _add(
+            item['course_org'],
+            item['day'],
+            'learning_hours_count',
+            parse_course_effort(item['course_effort'], item['course_id']) * item['certificates_count'],
+        )
+
+    return buckets
+
+
+def _get_modified_certificates_days(tenant_id: int, watermark: datetime, date_from: date) -> List[date]:
+    """Get the creation days, before date_from, of the certificates modified after the watermark"""
+    return sorted(set(
+        GeneratedCertificate.objects.filter(
+            course_id__in=get_base_queryset_courses(build_fx_permission_info(tenant_id), visible_filter=None),
+            modified_date__gte=watermark,
+            created_date__lt=_start_of_day(date_from),
+        ).annotate(day=TruncDate('created_date')).values_list('day', flat=True)
+    ))
+
+
+def refresh_statistics_snapshot(tenant_id: int, full_refresh: bool = False) -> bool:
+    """
+    Refresh the statistics snapshot of the given tenant. Only the days of the records created or modified since the
+    last refresh are recomputed, unless full_refresh is True, or the tenant was never refreshed before.
+
+    Records are bucketed by their creation day, and learners by the day they joined. Changes that do not touch the
+    timestamps of the counted records are only reflected by a full refresh: like unenrolling, deactivating a user,
+    granting a staff role, or a learner who joined before the last refresh and became a learner of the tenant after it.
+
+    Only one refresh of the tenant runs at a time. A refresh requested while another one is running is skipped.
+
+    :param tenant_id: The ID of the tenant
+    :type tenant_id: int
+    :param full_refresh: Recompute all days
+    :type full_refresh: bool
+    :return: True if the snapshot was refreshed, False if another refresh of the tenant is running
+    :rtype: bool
+    """
+    lock_key = f'{cs.CACHE_NAME_STATISTICS_SNAPSHOT_REFRESH}_{tenant_id}{cs.CACHE_DICT_LOCK_SUFFIX}'
+    if not cache.add(lock_key, True, SNAPSHOT_REFRESH_LOCK_SECONDS):
+        return False
+
+    try:
+        _refresh_statistics_snapshot(tenant_id, full_refresh)
+    finally:
+        cache.delete(lock_key)
+    return True
+
+
+def _refresh_statistics_snapshot(tenant_id: int, full_refresh: bool) -> None:
+    """Refresh the statistics snapshot of the given tenant. See refresh_statistics_snapshot"""
+    refresh_time = timezone.now()
+    watermark = StatisticsSnapshotWatermark.objects.filter(
+        tenant_id=tenant_id,
+    ).values_list('watermark', flat=True).first()
+
+    date_from = None
+    extra_days: List[date] = []
+    if watermark and not full_refresh:
+        date_from = timezone.localdate(watermark)
+        extra_days = _get_modified_certificates_days(tenant_id, watermark, date_from)
+
+    buckets = compute_statistics_buckets(tenant_id, date_from=date_from, extra_days=extra_days)
+
+    with transaction.atomic():
+        stale_records = StatisticsSnapshot.objects.filter(tenant_id=tenant_id)
+        if date_from:
+            stale_records = stale_records.filter(Q(snapshot_date__gte=date_from) | Q(snapshot_date__in=extra_days))
+        stale_records.delete()
+
+        StatisticsSnapshot.objects.bulk_create([
+            StatisticsSnapshot(tenant_id=tenant_id, org=org, snapshot_date=day, **counters)
+            for (org, day), counters in buckets.items()
+        ])
+        StatisticsSnapshotWatermark.objects.update_or_create(
+            tenant_id=tenant_id, defaults={'watermark': refresh_time},
+        )
+
+
+def get_snapshot_statistics(tenant_id: int, live_delta: bool = True) -> Dict[str, Any] | None:
+    """
+    Get the statistics of the given tenant from the snapshot. Only the orgs currently in the course org filter of the
+    tenant are considered.
+
+    :param tenant_id: The ID of the tenant
+    :type tenant_id: int
+    :param live_delta: Compute the days since the last refresh live instead of reading them from the snapshot. This
+        runs the live queries of the learners, enrollments and certificates of these days on every call
+    :type live_delta: bool
+    :return: Dictionary of the counters, or None if the snapshot of the tenant was never refreshed
+    :rtype: Dict[str, Any] | None
+    """
+    watermark = StatisticsSnapshotWatermark.objects.filter(
+        tenant_id=tenant_id,
+    ).values_list('watermark', flat=True).first()
+    if not watermark:
+        return None
+
+    orgs = get_course_org_filter_list([tenant_id], ignore_invalid_tenant_ids=True)['course_org_filter_list']
+    queryset = StatisticsSnapshot.objects.filter(tenant_id=tenant_id, org__in=orgs + [''])
+    watermark_date = timezone.localdate(watermark)
+    if live_delta:
+        queryset = queryset.filter(snapshot_date__lt=watermark_date)
+
+    totals = queryset.aggregate(**{counter: Sum(counter) for counter in SNAPSHOT_COUNTERS})
+    result = {counter: totals[counter] or 0 for counter in SNAPSHOT_COUNTERS}
+
+    if live_delta:
+        live_buckets = compute_statistics_buckets(tenant_id, date_from=watermark_date)
+        for counter in SNAPSHOT_COUNTERS:
+            result[counter] += sum(
+                counters[counter] for (org, _), counters in live_buckets.items() if org in orgs or org == ''
+            )
+
+    return result
@@ -0,0 +1,33 @@
+"""FX Dashboard celery tasks"""
+from __future__ import annotations
+
+import logging
+from typing import List
+
+from celery import shared_task
+from celery_utils.logged_task import LoggedTask
+
+from futurex_openedx_extensions.dashboard.statistics.snapshots import refresh_statistics_snapshot
+from futurex_openedx_extensions.helpers.tenants import get_all_tenant_ids
+
+log = logging.getLogger(__name__)
+
+
+@shared_task(base=LoggedTask)
+def refresh_statistics_snapshots_task(tenant_ids: List[int] | None = None, full_refresh: bool = False) -> None:
+    """
+    Celery task to refresh the statistics snapshots of the given tenants, or all tenants if none is given. When
+    FX_STATISTICS_SNAPSHOT_ENABLED is set, it is scheduled with celery beat: an incremental run every
+    FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS, and a full refresh every FX_STATISTICS_SNAPSHOT_FULL_REFRESH_SECONDS to
+    reconcile changes that do not touch the timestamps of the counted records.
+
+    A failure in one tenant is logged and does not stop refreshing the other tenants.
+    """
+    for tenant_id in tenant_ids or get_all_tenant_ids():
+        try:
+            if not refresh_statistics_snapshot(tenant_id, full_refresh=full_refresh):
+                log.info('Statistics Snapshot refresh of tenant %s skipped: another refresh is running', tenant_id)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            log.error(
+                'Statistics Snapshot Error for tenant %s: (%s) %s', tenant_id, exc.__class__.__name__, str(exc),
+            )
@@ -19,7 +19,7 @@ from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.paginator import EmptyPage
 from django.db import transaction
 from django.db.models.query import QuerySet
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.decorators import method_decorator
 from django_filters.rest_framework import DjangoFilterBackend
@@ -51,7 +51,7 @@ from futurex_openedx_extensions.dashboard.details.learners import (
 from futurex_openedx_extensions.dashboard.docs_utils import docs
 from futurex_openedx_extensions.dashboard.statistics.certificates import (
     get_certificates_count,
-    get_learning_hours_count,
+    get_learning_hours_count_per_org,
 )
 from futurex_openedx_extensions.dashboard.statistics.courses import (
     get_courses_count,
@@ -60,7 +60,7 @@ from futurex_openedx_extensions.dashboard.statistics.courses import (
     get_enrollments_count,
     get_enrollments_count_aggregated,
 )
-from futurex_openedx_extensions.dashboard.statistics.learners import get_learners_count
+from futurex_openedx_extensions.dashboard.statistics.learners import get_learners_count, get_learners_count_per_tenant
 from futurex_openedx_extensions.helpers import clickhouse_operations as ch
 from futurex_openedx_extensions.helpers.constants import (
     ALLOWED_FILE_EXTENSIONS,
@@ -124,8 +124,6 @@ logger = logging.getLogger(__name__)
 class TotalCountsView(FXViewRoleInfoMixin, APIView):
     """
     View to get the total count statistics
-
-    TODO: there is a better way to get info per tenant without iterating over all tenants
     """
     STAT_CERTIFICATES = 'certificates'
     STAT_COURSES = 'courses'
@@ -162,57 +160,41 @@ class TotalCountsView(FXViewRoleInfoMixin, APIView):
         self.include_staff = False
         self.tenant_ids: list[int] = []
 
-    def _get_certificates_count_data(self, one_tenant_permission_info: dict) -> int:
-        """Get the count of certificates for the given tenant"""
-        collector_result = get_certificates_count(one_tenant_permission_info, include_staff=self.include_staff)
-        return sum(certificate_count for certificate_count in collector_result.values())
-
-    @staticmethod
-    def _get_courses_count_data(one_tenant_permission_info: dict, visible_filter: bool | None) -> int:
-        """Get the count of courses for the given tenant"""
-        collector_result = get_courses_count(one_tenant_permission_info, visible_filter=visible_filter)
-        return sum(org_count['courses_count'] for org_count in collector_result)
-
-    def _get_enrollments_count_data(self, one_tenant_permission_info: dict, visible_filter: bool | None) -> int:
-        """Get the count of enrollments for the given tenant"""
-        collector_result = get_enrollments_count(
-            one_tenant_permission_info, visible_filter=visible_filter, include_staff=self.include_staff,
-        )
-        return sum(org_count['enrollments_count'] for org_count in collector_result)
-
-    def _get_learners_count_data(self, one_tenant_permission_info: dict) -> int:
-        """Get the count of learners for the given tenant"""
-        return get_learners_count(one_tenant_permission_info, include_staff=self.include_staff)
-
-    def _get_learning_hours_count_data(self, one_tenant_permission_info: dict) -> int:
-        """Get the count of learning_hours for the given tenant"""
-        return get_learning_hours_count(one_tenant_permission_info, include_staff=self.include_staff)
-
-    def _get_stat_count(self, stat: str, tenant_id: int) -> Any:
-        """Get the count of the given stat for the given tenant"""
-        if stat == self.STAT_UNIQUE_LEARNERS:
-            return get_learners_count(self.fx_permission_info, self.include_staff)
-
-        one_tenant_permission_info = get_tenant_limited_fx_permission_info(self.fx_permission_info, tenant_id)
+    def _get_orgs_count_data(self, stat: str) -> Dict[str, Any]:
+        """Get the count of the given stat for all accessible orgs at once, grouped by org"""
         if stat == self.STAT_CERTIFICATES:
-            result = self._get_certificates_count_data(one_tenant_permission_info)
-
-        elif stat == self.STAT_COURSES:
-            result = self._get_courses_count_data(one_tenant_permission_info, visible_filter=True)
-
-        elif stat == self.STAT_ENROLLMENTS:
-            result = self._get_enrollments_count_data(one_tenant_permission_info, visible_filter=True)
+            return get_certificates_count(self.fx_permission_info, include_staff=self.include_staff)
 
-        elif stat == self.STAT_HIDDEN_COURSES:
-            result = self._get_courses_count_data(one_tenant_permission_info, visible_filter=False)
+        if stat in (self.STAT_COURSES, self.STAT_HIDDEN_COURSES):
+            collector_result = get_courses_count(
+                self.fx_permission_info, visible_filter=stat == self.STAT_COURSES,
+            )
+            return {org_count['org_lower_case']: org_count['courses_count'] for org_count in collector_result}
 
-        elif stat == self.STAT_LEARNING_HOURS:
-            result = self._get_learning_hours_count_data(one_tenant_permission_info)
+        if stat == self.STAT_ENROLLMENTS:
+            collector_result = get_enrollments_count(
+                self.fx_permission_info, visible_filter=True, include_staff=self.include_staff,
+            )
+            return {org_count['org_lower_case']: org_count['enrollments_count'] for org_count in collector_result}
 
-        else:
-            result = self._get_learners_count_data(one_tenant_permission_info)
+        return get_learning_hours_count_per_org(self.fx_permission_info, include_staff=self.include_staff)
 
-        return result
+    def _get_stat_count_per_tenant(self, stat: str) -> Dict[int, int]:
+        """
+        Get the count of the given stat for all selected tenants. The number of queries does not depend on the
+        number of tenants: org-based stats are calculated once for all orgs then folded into their tenants.
+        """
+        if stat == self.STAT_LEARNERS:
+            return get_learners_count_per_tenant(self.fx_permission_info, include_staff=self.include_staff)
+
+        orgs_count = self._get_orgs_count_data(stat)
+        return {
+            tenant_id: int(sum(
+                orgs_count.get(org, 0) for org in get_tenant_limited_fx_permission_info(
+                    self.fx_permission_info, tenant_id,
+                )['view_allowed_any_access_orgs']
+            )) for tenant_id in self.tenant_ids
+        }
 
     def _load_query_params(self, request: Any) -> None:
         """Load the query parameters"""
@@ -226,7 +208,7 @@ class TotalCountsView(FXViewRoleInfoMixin, APIView):
     def _construct_result(self) -> dict:
         """Construct the result dictionary"""
         if self.STAT_UNIQUE_LEARNERS in self.stats:
-            total_unique_learners = self._get_stat_count(self.STAT_UNIQUE_LEARNERS, 0)
+            total_unique_learners = get_learners_count(self.fx_permission_info, self.include_staff)
             self.stats.remove(self.STAT_UNIQUE_LEARNERS)
         else:
             total_unique_learners = None
@@ -235,11 +217,11 @@ class TotalCountsView(FXViewRoleInfoMixin, APIView):
             f'total_{self.STAT_RESULT_KEYS[stat]}': 0 for stat in self.stats
         })
 
-        for tenant_id in self.tenant_ids:
-            for stat in self.stats:
-                count = int(self._get_stat_count(stat, tenant_id))
-                result[tenant_id][self.STAT_RESULT_KEYS[stat]] = count
-                result[f'total_{self.STAT_RESULT_KEYS[stat]}'] += count
+        for stat in self.stats:
+            counts = self._get_stat_count_per_tenant(stat)
+            for tenant_id in self.tenant_ids:
+                result[tenant_id][self.STAT_RESULT_KEYS[stat]] = counts[tenant_id]
+                result[f'total_{self.STAT_RESULT_KEYS[stat]}'] += counts[tenant_id]
 
         if total_unique_learners is not None:
             result['total_unique_learners'] = total_unique_learners
@@ -256,7 +238,7 @@ class TotalCountsView(FXViewRoleInfoMixin, APIView):
 
 
 @docs('AggregatedCountsView.get')
-class AggregatedCountsView(TotalCountsView):  # pylint: disable=too-many-instance-attributes
+class AggregatedCountsView(TotalCountsView):
     """
     View to get the aggregated count statistics
     """
@@ -316,16 +298,7 @@ class AggregatedCountsView(TotalCountsView):  # pylint: disable=too-many-instanc
                 'Invalid dates. You must provide a valid date_from and date_to formated as YYYY-MM-DD'
             ) from exc
 
-    def _get_certificates_count_data(self, one_tenant_permission_info: dict) -> int:
-        """Get the count of certificates for the given tenant"""
-        raise NotImplementedError('Certificates count is not supported for aggregated counts yet')
-
-    @staticmethod
-    def _get_courses_count_data(one_tenant_permission_info: dict, visible_filter: bool | None) -> int:
-        """Get the count of courses for the given tenant"""
-        raise NotImplementedError('Courses count is not supported for aggregated counts yet')
-
-    def _get_enrollments_count_data(  # type: ignore
+    def _get_enrollments_count_data(
         self, one_tenant_permission_info: dict, visible_filter: bool | None,
     ) -> tuple[list, datetime | None, datetime | None]:
         """Get the count of enrollments for the given tenant"""
@@ -343,14 +316,6 @@ class AggregatedCountsView(TotalCountsView):  # pylint: disable=too-many-instanc
             {'label': item['period'], 'value': item['enrollments_count']} for item in collector_result
         ], calculated_from, calculated_to
 
-    def _get_learners_count_data(self, one_tenant_permission_info: dict) -> int:
-        """Get the count of learners for the given tenant"""
-        raise NotImplementedError('Learners count is not supported for aggregated counts yet')
-
-    def _get_learning_hours_count_data(self, one_tenant_permission_info: dict) -> int:
-        """Get the count of learning_hours for the given tenant"""
-        raise NotImplementedError('Learning hours count is not supported for aggregated counts yet')
-
     @staticmethod
     def get_period_label(aggregate_period: str, the_date: date | datetime) -> str:
         """Get the period label"""
@@ -463,7 +428,9 @@ class AggregatedCountsView(TotalCountsView):  # pylint: disable=too-many-instanc
             }
             for stat in self.stats:
                 key = self.STAT_RESULT_KEYS[stat]
-                data = self._get_stat_count(stat, tenant_id)
+                data = self._get_enrollments_count_data(
+                    get_tenant_limited_fx_permission_info(self.fx_permission_info, tenant_id), visible_filter=True,
+                )
                 self.date_from = data[1]
                 self.date_to = data[2]
 
@@ -511,6 +478,7 @@ class LearnersView(ExportCSVMixin, FXViewRoleInfoMixin, ListAPIView):
     serializer_class = serializers.LearnerDetailsSerializer
     pagination_class = DefaultPagination
     fx_view_name = 'learners_list'
+    fx_keyset_pagination = True
     fx_default_read_only_roles = ['staff', 'instructor', 'data_researcher', 'org_course_creator_group']
     fx_view_description = 'api/fx/learners/v1/learners/: Get the list of learners'
 
@@ -930,6 +898,7 @@ class LearnersEnrollmentView(ExportCSVMixin, FXViewRoleInfoMixin, ListAPIView):
     permission_classes = [FXHasTenantCourseAccess]
     pagination_class = DefaultPagination
     fx_view_name = 'learners_enrollment_details'
+    fx_keyset_pagination = True
     fx_default_read_only_roles = ['staff', 'instructor', 'data_researcher', 'org_course_creator_group']
     fx_view_description = 'api/fx/learners/v1/enrollments: Get the list of enrollments'
     is_single_course_requested = False
@@ -1015,8 +984,10 @@ class LearnersEnrollmentView(ExportCSVMixin, FXViewRoleInfoMixin, ListAPIView):
     def get_serializer_context(self) -> Dict[str, Any]:
         """Get the serializer context"""
         context = super().get_serializer_context()
-        if self.is_single_course_requested and self.get_queryset().exists():
-            context['course_id'] = str(self.get_queryset().first().course_id)
+        enrollment = self.get_queryset().select_related('course').first() if self.is_single_course_requested else None
+        if enrollment:
+            context['course_id'] = str(enrollment.course_id)
+            context['course_modified'] = enrollment.course.modified
             context['omit_subsection_name'] = self.request.query_params.get('omit_subsection_name', '0')
         return context
 
@@ -1387,7 +1358,73 @@ class ClickhouseQueryView(FXViewRoleInfoMixin, APIView):
 
         return page, int(page_size_str)
 
-    def get(self, request: Any, scope: str, slug: str) -> JsonResponse | Response:
+    @staticmethod
+    def pop_out_no_cache_param(params: Dict[str, str]) -> bool:
+        """
+        Pop out the no_cache parameter, and return True if it requests bypassing the cached results. Only system
+        staff users are allowed to bypass the cache
+
+        :param params: The parameters
+        :type params: Dict[str, str]
+        :return: True if bypassing the cached results is requested
+        :rtype: bool
+        """
+        return params.pop('no_cache', '').lower() in ('1', 'true')
+
+    @staticmethod
+    def get_stream_format(request: Any) -> str | None:
+        """
+        Get the streaming format requested by the Accept header. Unpaginated queries are streamed as JSON lines
+        (application/x-ndjson) or Arrow IPC (application/vnd.apache.arrow.stream) when requested, rather than
+        returned as one JSON list
+
+        :param request: The request object
+        :type request: Request
+        :return: The content type of the requested stream, or None if streaming is not requested
+        :rtype: str | None
+        """
+        accept = request.META.get('HTTP_ACCEPT', '')
+        return next((stream_format for stream_format in ch.STREAM_FORMATS if stream_format in accept), None)
+
+    def perform_content_negotiation(self, request: Any, force: bool = False) -> Any:
+        """Do not reject the streaming formats, they are returned without the renderers"""
+        return super().perform_content_negotiation(request, force=force or bool(self.get_stream_format(request)))
+
+    @staticmethod
+    def get_query_results(
+        clickhouse_query: ClickhouseQuery, params: Dict[str, Any], page: int | None, page_size: int, bypass_cache: bool,
+    ) -> Dict[str, Any]:
+        """
+        Get the cached results of the query, or execute the query and cache its results
+
+        :param clickhouse_query: The Clickhouse query
+        :type clickhouse_query: ClickhouseQuery
+        :param params: The parameters of the query
+        :type params: Dict[str, Any]
+        :param page: The page number, or None if not paginated
+        :type page: int | None
+        :param page_size: The page size
+        :type page_size: int
+        :param bypass_cache: True to execute the query even if its results are cached
+        :type bypass_cache: bool
+        :return: The records count, the next page number, and the results of the query
+        :rtype: Dict[str, Any]
+        """
+        results = None if bypass_cache else clickhouse_query.get_cached_results(params, page, page_size)
+        if results is None:
+            with ch.get_pooled_client() as clickhouse_client:
+                records_count, next_page, result = ch.execute_query(
+                    clickhouse_client,
+                    query=clickhouse_query.query,
+                    parameters=params,
+                    page=page,
+                    page_size=page_size,
+                )
+            results = {'count': records_count, 'next_page': next_page, 'results': ch.result_to_json(result)}
+            clickhouse_query.cache_results(params, page, page_size, results)
+        return results
+
+    def get(self, request: Any, scope: str, slug: str) -> JsonResponse | StreamingHttpResponse | Response:
         """
         GET /api/fx/query/v1/<scope>/<slug>/
 
@@ -1415,6 +1452,8 @@ class ClickhouseQueryView(FXViewRoleInfoMixin, APIView):
         self.get_page_url_with_page(request.build_absolute_uri(), 9)
 
         page, page_size = self.pop_out_page_params(params, clickhouse_query.paginated)
+        bypass_cache = self.pop_out_no_cache_param(params) and request.fx_permission_info['is_system_staff_user']
+        stream_format = None if clickhouse_query.paginated else self.get_stream_format(request)
 
         orgs = request.fx_permission_info['view_allowed_any_access_orgs'].copy()
         params[CLICKHOUSE_FX_BUILTIN_ORG_IN_TENANTS] = orgs
@@ -1422,17 +1461,15 @@ class ClickhouseQueryView(FXViewRoleInfoMixin, APIView):
             params[CLICKHOUSE_FX_BUILTIN_CA_USERS_OF_TENANTS] = get_usernames_with_access_roles(orgs)
 
         error_response = None
+        results: Dict[str, Any] = {}
         try:
             clickhouse_query.fix_param_types(params)
 
-            with ch.get_client() as clickhouse_client:
-                records_count, next_page, result = ch.execute_query(
-                    clickhouse_client,
-                    query=clickhouse_query.query,
-                    parameters=params,
-                    page=page,
-                    page_size=page_size,
-                )
+            if stream_format:
+                streamed_content = ch.stream_query(clickhouse_query.query, params, stream_format)
+                return StreamingHttpResponse(streamed_content, content_type=stream_format)
+
+            results = self.get_query_results(clickhouse_query, params, page, page_size, bypass_cache)
 
         except EmptyPage as exc:
             error_response = Response(
@@ -1456,16 +1493,16 @@ class ClickhouseQueryView(FXViewRoleInfoMixin, APIView):
 
         if clickhouse_query.paginated:
             return JsonResponse({
-                'count': records_count,
-                'next': self.get_page_url_with_page(request.build_absolute_uri(), next_page),
+                'count': results['count'],
+                'next': self.get_page_url_with_page(request.build_absolute_uri(), results['next_page']),
                 'previous': self.get_page_url_with_page(
                     request.build_absolute_uri(),
                     None if page == 1 else page - 1 if page else None,
                 ),
-                'results': ch.result_to_json(result),
+                'results': results['results'],
             })
 
-        return JsonResponse(ch.result_to_json(result), safe=False)
+        return JsonResponse(results['results'], safe=False)
 
 
 @docs('ConfigEditableInfoView.get')
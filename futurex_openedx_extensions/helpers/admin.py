@@ -21,6 +21,7 @@ from openedx.core.lib.api.authentication import BearerAuthentication
 from rest_framework.response import Response
 from simple_history.admin import SimpleHistoryAdmin
 
+from futurex_openedx_extensions.helpers.caching import invalidate_local_caches
 from futurex_openedx_extensions.helpers.constants import CACHE_NAMES
 from futurex_openedx_extensions.helpers.models import (
     ClickhouseQuery,
@@ -311,6 +312,7 @@ class CacheInvalidatorAdmin(admin.ModelAdmin):
             raise Http404(f'Cache name {cache_name} not found')
 
         cache.set(cache_name, None)
+        invalidate_local_caches()
         full_path = request.get_full_path()
         full_path = full_path[:len(full_path) - 1]
         one_step_back_path = full_path.rsplit('/', 1)[0]
@@ -320,7 +322,7 @@ class CacheInvalidatorAdmin(admin.ModelAdmin):
 class DataExportTaskAdmin(admin.ModelAdmin):
     """Admin class of DataExportTask model"""
     raw_id_fields = ('user', 'tenant')
-    list_display = ('id', 'view_name', 'status', 'progress', 'user', 'notes',)
+    list_display = ('id', 'view_name', 'export_format', 'status', 'progress', 'user', 'notes',)
     search_fields = ('filename', 'user__email', 'user__username', 'notes')
 
 
@@ -1,10 +1,18 @@
 """Helper functions for caching"""
 from __future__ import annotations
 
+import copy
 import functools
 import logging
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import timedelta
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Generator, List, Set, Tuple
 
 from django.conf import settings
 from django.core.cache import cache
@@ -14,34 +22,383 @@ from futurex_openedx_extensions.helpers import constants as cs
 
 log = logging.getLogger(__name__)
 
+_local_cache: OrderedDict = OrderedDict()
+_local_cache_lock = threading.Lock()
+_local_cache_generation: Dict[str, Any] = {'value': None, 'checked_at': None}
+_local_cache_names: Set[str] = set()
+_request_memo_store: ContextVar[Dict[Tuple, Any] | None] = ContextVar('fx_request_memo_store', default=None)
 
-def cache_dict(timeout: int | str, key_generator_or_name: str | Callable) -> Callable:
+
+def _get_timeout_seconds(timeout: int | str, allow_zero: bool = False) -> int:
+    """
+    Get the timeout in seconds, reading it from the settings when timeout is a string
+
+    :param timeout: The timeout in seconds, or the name of the setting that holds it
+    :type timeout: int | str
+    :param allow_zero: Accept zero as a valid timeout
+    :type allow_zero: bool
+    :return: The timeout in seconds
+    :rtype: int
+    """
+    if isinstance(timeout, str):
+        timeout_seconds = getattr(settings, timeout, None)
+        if timeout_seconds is None:
+            raise ValueError(f'timeout setting ({timeout}) not found')
+    else:
+        timeout_seconds = timeout
+
+    if not isinstance(timeout_seconds, int) or timeout_seconds < 0 or (timeout_seconds == 0 and not allow_zero):
+        raise ValueError(
+            'unexpected timeout value. Should be an integer greater than 0'
+        )
+    return timeout_seconds
+
+
+def _is_cache_expired(cached: Dict[str, Any], early_expiration_beta: float) -> bool:
+    """
+    Check if the cached entry is expired
+
+    With a positive early_expiration_beta, the entry is randomly considered expired shortly before its expiry time;
+    the closer to the expiry and the slower the computation, the higher the probability. So one caller usually
+    refreshes it before all callers find it expired at once.
+
+    :param cached: The cached entry
+    :type cached: Dict[str, Any]
+    :param early_expiration_beta: The factor of the early expiration. Zero to disable it
+    :type early_expiration_beta: float
+    :return: True if the entry is expired
+    :rtype: bool
+    """
+    expiry_datetime = cached.get('expiry_datetime')
+    if expiry_datetime is None:
+        return False
+
+    early_seconds = 0.0
+    if early_expiration_beta > 0:
+        early_seconds = cached.get('compute_seconds', 0.0) * early_expiration_beta * -math.log(1.0 - random.random())
+
+    return timezone.now() + timedelta(seconds=early_seconds) >= expiry_datetime
+
+
+def _get_local_cache_generation() -> int:
+    """
+    Get the generation of the local cache. It is read from the shared cache at most once per
+    CACHE_LOCAL_GENERATION_CHECK_SECONDS, so a local cache hit usually costs no network call
+
+    :return: The current generation
+    :rtype: int
+    """
+    now = time.monotonic()
+    checked_at = _local_cache_generation['checked_at']
+    if checked_at is None or now - checked_at >= cs.CACHE_LOCAL_GENERATION_CHECK_SECONDS:
+        _local_cache_generation['value'] = cache.get(cs.CACHE_NAME_LOCAL_CACHE_GENERATION, 0)
+        _local_cache_generation['checked_at'] = now
+    return _local_cache_generation['value']
+
+
+def get_cache_generation() -> int:
+    """
+    Get the current generation of the caches, which is increased when all the caches are invalidated by
+    `invalidate_cache()`. Values derived from the invalidated caches can store it, and be rebuilt when it changes
+
+    :return: The current generation
+    :rtype: int
+    """
+    return _get_local_cache_generation()
+
+
+def _local_cache_version_key(cache_key: str) -> str:
+    """
+    Get the key of the version of a cache name in the shared cache
+
+    :param cache_key: The cache name
+    :type cache_key: str
+    :return: The key of the version
+    :rtype: str
+    """
+    return f'{cs.CACHE_NAME_LOCAL_CACHE_VERSION}_{cache_key}'
+
+
+def _get_local_cache_version(cache_key: str) -> int:
+    """
+    Get the version of a cache name from the shared cache. Only the cache names with a local cache have a version,
+    which is increased by `invalidate_cache(cache_name)`
+
+    :param cache_key: The cache key
+    :type cache_key: str
+    :return: The current version, zero for the keys without a version
+    :rtype: int
+    """
+    if cache_key not in _local_cache_names:
+        return 0
+    return cache.get(_local_cache_version_key(cache_key), 0)
+
+
+def _increase_shared_counter(counter_key: str) -> None:
+    """
+    Increase a counter stored in the shared cache without a timeout, such as the local cache generation
+
+    :param counter_key: The key of the counter
+    :type counter_key: str
+    """
+    cache.add(counter_key, 0, None)
+    try:
+        cache.incr(counter_key)
+    except ValueError:
+        log.warning('cache_dict: failed to increase the local cache generation (%s)', counter_key)
+
+
+def _local_cache_get(cache_key: str) -> Dict[str, Any] | None:
+    """
+    Get a copy of the value from the local cache of this process. The version of a cache name is read from the shared
+    cache at most once per CACHE_LOCAL_GENERATION_CHECK_SECONDS, so a value invalidated by another process is dropped
+    soon
+
+    :param cache_key: The cache key
+    :type cache_key: str
+    :return: A copy of the cached value, or None if it's missing, expired, or from an older generation or version
+    :rtype: Dict[str, Any] | None
+    """
+    generation = _get_local_cache_generation()
+    with _local_cache_lock:
+        entry = _local_cache.get(cache_key)
+    if entry is None:
+        return None
+
+    now = time.monotonic()
+    expiry, entry_generation, version, version_checked_at, data = entry
+    valid = expiry > now and entry_generation == generation
+    if valid and now - version_checked_at >= cs.CACHE_LOCAL_GENERATION_CHECK_SECONDS:
+        valid = _get_local_cache_version(cache_key) == version
+        version_checked_at = now
+
+    with _local_cache_lock:
+        if _local_cache.get(cache_key) is entry:
+            if valid:
+                _local_cache[cache_key] = (expiry, entry_generation, version, version_checked_at, data)
+                _local_cache.move_to_end(cache_key)
+            else:
+                del _local_cache[cache_key]
+
+    return copy.deepcopy(data) if valid else None
+
+
+def _local_cache_set(cache_key: str, data: Dict[str, Any], local_seconds: int) -> None:
+    """
+    Set a copy of the value in the local cache of this process, evicting the least recently used entries when full
+
+    :param cache_key: The cache key
+    :type cache_key: str
+    :param data: The value to cache
+    :type data: Dict[str, Any]
+    :param local_seconds: Seconds to keep the value
+    :type local_seconds: int
+    """
+    generation = _get_local_cache_generation()
+    version = _get_local_cache_version(cache_key)
+    data = copy.deepcopy(data)
+    now = time.monotonic()
+    with _local_cache_lock:
+        _local_cache[cache_key] = (now + local_seconds, generation, version, now, data)
+        _local_cache.move_to_end(cache_key)
+        while len(_local_cache) > cs.CACHE_LOCAL_MAX_ENTRIES:
+            _local_cache.popitem(last=False)
+
+
+def _local_cache_delete(cache_key: str) -> None:
+    """
+    Delete the value from the local cache of this process, and increase the version of the cache name so the other
+    processes drop their local value within CACHE_LOCAL_GENERATION_CHECK_SECONDS
+
+    :param cache_key: The cache key
+    :type cache_key: str
+    """
+    if cache_key in _local_cache_names:
+        _increase_shared_counter(_local_cache_version_key(cache_key))
+
+    with _local_cache_lock:
+        _local_cache.pop(cache_key, None)
+
+
+def invalidate_local_caches() -> None:
+    """
+    Invalidate the local caches of cache_dict in all processes by increasing the generation stored in the shared
+    cache. Other processes drop their local entries within CACHE_LOCAL_GENERATION_CHECK_SECONDS
+    """
+    _increase_shared_counter(cs.CACHE_NAME_LOCAL_CACHE_GENERATION)
+
+    with _local_cache_lock:
+        _local_cache.clear()
+    _local_cache_generation['checked_at'] = None
+
+
+def _read_cache_dict(
+    cache_key: str | None, stale_seconds: int, early_expiration_beta: float, local_seconds: int = 0,
+) -> Tuple[Dict[str, Any] | None, str | None]:
+    """
+    Read the cached result of cache_dict. An expired result is returned as None when the caller must refresh it.
+    Only a fresh result is kept in the local cache, so a stale one is never served from it without a refresh
+
+    :param cache_key: The cache key
+    :type cache_key: str | None
+    :param stale_seconds: Seconds to serve the stale result while one caller refreshes it
+    :type stale_seconds: int
+    :param early_expiration_beta: The factor of the early expiration. Zero to disable it
+    :type early_expiration_beta: float
+    :param local_seconds: Seconds to keep the result in the local cache of this process. Zero to disable it
+    :type local_seconds: int
+    :return: The cached result or None, and the key of the refresh lock acquired for the caller if any
+    :rtype: Tuple[Dict[str, Any] | None, str | None]
+    """
+    if cache_key and local_seconds:
+        result = _local_cache_get(cache_key)
+        if result is not None:
+            return result, None
+
+    cached = cache.get(cache_key) if cache_key else None
+    result = cached.get('data') if cached is not None else None
+    if cached is None or result is None:
+        return result, None
+
+    if not (stale_seconds or early_expiration_beta > 0) or not _is_cache_expired(cached, early_expiration_beta):
+        if cache_key and local_seconds:
+            _local_cache_set(cache_key, result, local_seconds)
+        return result, None
+
+    if not stale_seconds:
+        return None, None
+
+    lock_key = f'{cache_key}{cs.CACHE_DICT_LOCK_SUFFIX}'
+    if not cache.add(lock_key, True, stale_seconds):
+        return result, None
+
+    return None, lock_key
+
+
+def _write_cache_dict(
+    cache_key: str, result: Dict[str, Any], timeouts: Tuple[int, int, int], compute_seconds: float | None,
+) -> None:
+    """
+    Write the result of cache_dict to the shared cache, and to the local cache when enabled
+
+    :param cache_key: The cache key
+    :type cache_key: str
+    :param result: The result to cache
+    :type result: Dict[str, Any]
+    :param timeouts: The timeout, stale timeout, and local timeout in seconds
+    :type timeouts: Tuple[int, int, int]
+    :param compute_seconds: The computation time of the result, stored for the early expiration. None to skip it
+    :type compute_seconds: float | None
+    """
+    timeout_seconds, stale_seconds, local_seconds = timeouts
+    cache.set(
+        cache_key, _get_cache_dict_content(result, timeout_seconds, compute_seconds),
+        float(timeout_seconds + stale_seconds),
+    )
+
+    if local_seconds:
+        _local_cache_set(cache_key, result, local_seconds)
+
+
+def _get_cache_dict_content(
+    result: Dict[str, Any], timeout_seconds: int, compute_seconds: float | None = None,
+) -> Dict[str, Any]:
+    """
+    Get the content stored in the shared cache for a result of cache_dict
+
+    :param result: The result to cache
+    :type result: Dict[str, Any]
+    :param timeout_seconds: The timeout in seconds
+    :type timeout_seconds: int
+    :param compute_seconds: The computation time of the result, stored for the early expiration. None to skip it
+    :type compute_seconds: float | None
+    :return: The cache content
+    :rtype: Dict[str, Any]
+    """
+    now_datetime = timezone.now()
+    cache_content = {
+        'created_datetime': now_datetime,
+        'expiry_datetime': now_datetime + timedelta(seconds=timeout_seconds),
+        'data': result,
+    }
+    if compute_seconds is not None:
+        cache_content['compute_seconds'] = compute_seconds
+    return cache_content
+
+
+def cache_dict_set_many(
+    results: Dict[str, Dict[str, Any]], timeout: int | str, stale_timeout: int | str | None = None,
+) -> None:
+    """
+    Write many results to the shared cache at once, in the same format of cache_dict. This is useful to prewarm the
+    cache of a function decorated with cache_dict, using the same timeouts of the decorator
+
+    :param results: The results to cache, by cache key
+    :type results: Dict[str, Dict[str, Any]]
+    :param timeout: The timeout in seconds, or the name of the setting that holds it
+    :type timeout: int | str
+    :param stale_timeout: The stale timeout in seconds, or the name of the setting that holds it
+    :type stale_timeout: int | str | None
+    """
+    if not results:
+        return
+
+    timeout_seconds = _get_timeout_seconds(timeout)
+    stale_seconds = _get_timeout_seconds(stale_timeout, allow_zero=True) if stale_timeout is not None else 0
+    cache.set_many(
+        {cache_key: _get_cache_dict_content(result, timeout_seconds) for cache_key, result in results.items()},
+        float(timeout_seconds + stale_seconds),
+    )
+
+
+def cache_dict(
+    timeout: int | str,
+    key_generator_or_name: str | Callable,
+    stale_timeout: int | str | None = None,
+    early_expiration_beta: float = 0.0,
+    local_timeout: int | str | None = None,
+) -> Callable:
     """
     Cache the dictionary result returned by the function
 
     The caller can pass `___skip_cache` as a keyword argument to skip the cache. This will invoke a fresh call
     to the function and return the result without caching it nor invalidating the currently cached value.
+
+    When `stale_timeout` is set (seconds or a setting name, zero disables it), the cached value is kept for that many
+    seconds after it expires. During that period, only one caller refreshes the value while holding a cache lock,
+    and all other callers get the stale value instead of recomputing it at the same time.
+
+    When `early_expiration_beta` is positive, the value is refreshed probabilistically before it expires. Values
+    around 1.0 are recommended; higher values refresh earlier.
+
+    When `local_timeout` is set (seconds or a setting name, zero disables it), the value is also kept in a bounded
+    in-process LRU cache for that many seconds, so repeated calls in the same process skip the shared cache. Like the
+    shared cache, every caller gets its own copy of the value, so modifying it does not affect the next callers. Use
+    it only for functions with a few distinct keys. All local entries are dropped by `invalidate_local_caches`, which
+    is called by `invalidate_cache()`. When `key_generator_or_name` is a cache name, `invalidate_cache(cache_name)`
+    drops its local entry in all processes too; other processes drop theirs within
+    CACHE_LOCAL_GENERATION_CHECK_SECONDS. Generated keys are only dropped locally, or by `invalidate_local_caches`.
     """
+    if local_timeout is not None and isinstance(key_generator_or_name, str):
+        _local_cache_names.add(key_generator_or_name)
+
     def decorator(func: Callable) -> Callable:
         """Decorator definition"""
         @functools.wraps(func)
         def wrapped(*args: Any, **kwargs: Any) -> Dict[str, Any]:
             """Wrapped function"""
             cache_key = None
-            timeout_seconds = None
+            timeout_seconds = 0
+            stale_seconds = 0
+            local_seconds = 0
             skip_cache = kwargs.pop('__skip_cache', False)
             try:
-                if isinstance(timeout, str):
-                    timeout_seconds = getattr(settings, timeout, None)
-                    if timeout_seconds is None:
-                        raise ValueError(f'timeout setting ({timeout}) not found')
-                else:
-                    timeout_seconds = timeout
-
-                if not isinstance(timeout_seconds, int) or timeout_seconds <= 0:
-                    raise ValueError(
-                        'unexpected timeout value. Should be an integer greater than 0'
-                    )
+                timeout_seconds = _get_timeout_seconds(timeout)
+                if stale_timeout is not None:
+                    stale_seconds = _get_timeout_seconds(stale_timeout, allow_zero=True)
+                if local_timeout is not None:
+                    local_seconds = _get_timeout_seconds(local_timeout, allow_zero=True)
+
                 if not callable(key_generator_or_name) and not isinstance(key_generator_or_name, str):
                     raise TypeError('key_generator_or_name must be a callable or a string')
 
@@ -55,23 +412,23 @@ def cache_dict(timeout: int | str, key_generator_or_name: str | Callable) -> Cal
             if skip_cache:
                 return func(*args, **kwargs)
 
-            result = cache.get(cache_key) if cache_key else None
-            if result is not None:
-                result = result.get('data')
+            result, lock_key = _read_cache_dict(cache_key, stale_seconds, early_expiration_beta, local_seconds)
 
             if result is None:
-                result = func(*args, **kwargs)
-                now_datetime = timezone.now()
+                try:
+                    start_time = time.monotonic()
+                    result = func(*args, **kwargs)
+                    compute_seconds = time.monotonic() - start_time
+                finally:
+                    if lock_key:
+                        cache.delete(lock_key)
+
                 if cache_key and result and isinstance(result, dict):
-                    timeout_seconds = float(timeout_seconds)  # type: ignore
-                    cache.set(
+                    _write_cache_dict(
                         cache_key,
-                        {
-                            'created_datetime': now_datetime,
-                            'expiry_datetime': now_datetime + timedelta(seconds=timeout_seconds),
-                            'data': result,
-                        },
-                        timeout_seconds,
+                        result,
+                        (timeout_seconds, stale_seconds, local_seconds),
+                        compute_seconds if early_expiration_beta > 0 else None,
                     )
                 elif cache_key and result:
                     log.error(
@@ -84,23 +441,80 @@ def cache_dict(timeout: int | str, key_generator_or_name: str | Callable) -> Cal
     return decorator
 
 
+@contextmanager
+def request_memo_context() -> Generator[Dict[Tuple, Any], None, None]:
+    """
+    Open a memo store for the functions decorated with request_memo. The store is dropped when the context exits.
+    FXRequestMemoMiddleware opens one for every request
+
+    :return: The memo store
+    :rtype: Generator[Dict[Tuple, Any], None, None]
+    """
+    store: Dict[Tuple, Any] = {}
+    token = _request_memo_store.set(store)
+    try:
+        yield store
+    finally:
+        _request_memo_store.reset(token)
+
+
+def request_memo(key_generator: Callable) -> Callable:
+    """
+    Memoize the result of the function within the current request_memo_context, so each distinct call runs once per
+    request. Outside a request_memo_context, the function is called as is.
+
+    `key_generator` is called with the same arguments of the function, and must return a hashable value that
+    identifies the result. Every caller gets its own copy of the memoized result, so modifying it does not affect
+    the next callers.
+    """
+    def decorator(func: Callable) -> Callable:
+        """Decorator definition"""
+        @functools.wraps(func)
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            """Wrapped function"""
+            store = _request_memo_store.get()
+            if store is None:
+                return func(*args, **kwargs)
+
+            memo_key = (func.__module__, func.__qualname__, key_generator(*args, **kwargs))
+            if memo_key not in store:
+                store[memo_key] = func(*args, **kwargs)
+            return copy.deepcopy(store[memo_key])
+
+        return wrapped
+    return decorator
+
+
+def invalidate_request_memo() -> None:
+    """
+    Drop the memoized results of the current request_memo_context, if any
+    """
+    store = _request_memo_store.get()
+    if store is not None:
+        store.clear()
+
+
 def invalidate_cache(cache_name: str = None) -> None:
     """
     Invalidate a specific cache or all predefined caches.
 
-    - To invalidate a specific cache, provide the cache name.
-    - To reset all predefined caches, pass None as `cache_name`.
+    - To invalidate a specific cache, provide the cache name. Its local value is dropped in all processes, without
+      touching the other caches, the cache generation, or the request memo.
+    - To reset all predefined caches, pass None as `cache_name`. The local caches of all processes and the request
+      memo are dropped too, and the cache generation is increased.
 
     :param cache_name: The name of the cache to invalidate.
     :raises FXCodedException: If the provided `cache_name` is invalid (and not `"__all__"`).
     """
     if not cache_name:
-        cache.delete(cs.CACHE_NAME_ALL_COURSE_ORG_FILTER_LIST)
-        cache.delete(cs.CACHE_NAME_ALL_TENANTS_INFO)
+        cache.delete(cs.CACHE_NAME_TENANTS_REGISTRY)
         cache.delete(cs.CACHE_NAME_ALL_VIEW_ROLES)
-        cache.delete(cs.CACHE_NAME_ORG_TO_TENANT_MAP)
+        cache.delete(cs.CACHE_NAME_LIBRARY_KEYS_INDEX)
+        invalidate_local_caches()
+        invalidate_request_memo()
     else:
         cache.delete(cache_name)
+        _local_cache_delete(cache_name)
 
 
 def invalidate_tenant_readable_lms_configs(tenant_ids: List[int]) -> None:
@@ -1,17 +1,58 @@
 """Helper functions for certificates."""
 from __future__ import annotations
 
-from typing import Any
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
 
 from django.contrib.auth import get_user_model
-from lms.djangoapps.certificates.api import get_certificates_for_user_by_course_keys
+from lms.djangoapps.certificates.api import format_certificate_for_user, get_certificates_for_user_by_course_keys
+from lms.djangoapps.certificates.models import GeneratedCertificate
 from opaque_keys.edx.locator import CourseLocator
 
 from futurex_openedx_extensions.helpers.converters import relative_url_to_absolute_url
 from futurex_openedx_extensions.helpers.tenants import set_request_domain_by_org
 
 
-def get_certificate_date(user: get_user_model, course_id: CourseLocator) -> Any:
+def get_certificates_by_users(
+    user_course_pairs: List[Tuple[get_user_model, CourseLocator]],
+) -> Dict[int, Dict[CourseLocator, Dict[str, Any]]]:
+    """
+    Return the certificates of many users at once, grouped by user ID. The certificates of every user are in the same
+    format returned by get_certificates_for_user_by_course_keys. The eligible generated certificates of all the users
+    are read in one query, and formatted by the same platform function used by get_certificates_for_user_by_course_keys.
+
+    :param user_course_pairs: List of (user, course ID) pairs. Pairs with a missing user or course are ignored.
+    :type user_course_pairs: List[Tuple[get_user_model, CourseLocator]]
+    :return: The certificates of every user that has at least one certificate, keyed by user ID.
+    :rtype: Dict[int, Dict[CourseLocator, Dict[str, Any]]]
+    """
+    users = {}
+    requested_course_ids = defaultdict(set)
+    for user, course_id in user_course_pairs:
+        if user is None or course_id is None:
+            continue
+        users[user.id] = user
+        requested_course_ids[user.id].add(str(course_id))
+
+    if not users:
+        return {}
+
+    all_course_ids = set().union(*requested_course_ids.values())
+    result: Dict[int, Dict[CourseLocator, Dict[str, Any]]] = defaultdict(dict)
+    for certificate in GeneratedCertificate.eligible_certificates.filter(
+        user_id__in=list(users), course_id__in=list(all_course_ids),
+    ).select_related('user'):
+        if str(certificate.course_id) in requested_course_ids[certificate.user_id]:
+            result[certificate.user_id][certificate.course_id] = format_certificate_for_user(
+                users[certificate.user_id].username, certificate,
+            )
+
+    return dict(result)
+
+
+def get_certificate_date(
+    user: get_user_model, course_id: CourseLocator, certificates: Dict[CourseLocator, Dict[str, Any]] | None = None,
+) -> Any:
     """
     Return the certificate date for the given user and course.
 
@@ -19,9 +60,12 @@ def get_certificate_date(user: get_user_model, course_id: CourseLocator) -> Any:
     :type user: get_user_model
     :param course_id: The course ID.
     :type course_id: CourseLocator
+    :param certificates: The prefetched certificates of the user. None to fetch them
+    :type certificates: Dict[CourseLocator, Dict[str, Any]] | None
     :return: The certificate URL.
     """
-    certificates = get_certificates_for_user_by_course_keys(user, [course_id])
+    if certificates is None:
+        certificates = get_certificates_for_user_by_course_keys(user, [course_id])
     passing_certificate_url = certificates.get(course_id, {}).get('download_url')
     if passing_certificate_url:
         return certificates.get(course_id, {}).get('created')
@@ -29,7 +73,12 @@ def get_certificate_date(user: get_user_model, course_id: CourseLocator) -> Any:
     return None
 
 
-def get_certificate_url(request: Any, user: get_user_model, course_id: CourseLocator) -> Any:
+def get_certificate_url(
+    request: Any,
+    user: get_user_model,
+    course_id: CourseLocator,
+    certificates: Dict[CourseLocator, Dict[str, Any]] | None = None,
+) -> Any:
     """
     Return the certificate URL for the given user and course.
 
@@ -39,9 +88,12 @@ def get_certificate_url(request: Any, user: get_user_model, course_id: CourseLoc
     :type user: get_user_model
     :param course_id: The course ID.
     :type course_id: CourseLocator
+    :param certificates: The prefetched certificates of the user. None to fetch them
+    :type certificates: Dict[CourseLocator, Dict[str, Any]] | None
     :return: The certificate URL.
     """
-    certificates = get_certificates_for_user_by_course_keys(user, [course_id])
+    if certificates is None:
+        certificates = get_certificates_for_user_by_course_keys(user, [course_id])
     passing_certificate_url = certificates.get(course_id, {}).get('download_url')
     if passing_certificate_url:
         if passing_certificate_url.startswith('/'):
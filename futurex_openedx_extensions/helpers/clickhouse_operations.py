@@ -1,15 +1,31 @@
 """Clickhouse helper functions."""
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import os
-from typing import Any, Dict
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, List
 
 import yaml  # type: ignore
 from clickhouse_connect import get_client as clickhouse_get_client
 from clickhouse_connect.driver.httpclient import Client
 from clickhouse_connect.driver.query import QueryResult
 from django.conf import settings
+from django.core.cache import cache
 from django.core.paginator import EmptyPage
+from django.core.serializers.json import DjangoJSONEncoder
+
+from futurex_openedx_extensions.helpers import constants as cs
+
+log = logging.getLogger(__name__)
+
+STREAM_FORMAT_ARROW = 'application/vnd.apache.arrow.stream'
+STREAM_FORMAT_NDJSON = 'application/x-ndjson'
+STREAM_FORMATS = [STREAM_FORMAT_ARROW, STREAM_FORMAT_NDJSON]
 
 
 class ClickhouseBaseError(Exception):
@@ -34,7 +50,7 @@ class ClickhouseDefaultQueriesError(ClickhouseBaseError):
 
 def get_client() -> Client:
     """
-    Get Clickhouse client.
+    Get a new Clickhouse client. Use get_pooled_client to reuse the clients across requests.
 
     :return: Clickhouse client.
     :rtype: Client
@@ -57,6 +73,122 @@ def get_client() -> Client:
     return client
 
 
+class _PooledClient:  # pylint: disable=too-few-public-methods
+    """A Clickhouse client held by the clients pool, with its connection and last usage times."""
+    def __init__(self, client: Client) -> None:
+        """Initialize the pooled client"""
+        self.client = client
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+    def close(self) -> None:
+        """Close the client, ignoring errors of already broken connections"""
+        try:
+            self.client.close()
+        except Exception as exc:  # pylint: disable=broad-except
+            log.warning('Clickhouse: failed to close a pooled client: %s', exc)
+
+
+class ClickhouseClientPool:
+    """
+    Per-process pool of idle Clickhouse clients, reused across requests to save the connection overhead of creating
+    a new client (new HTTP session, handshake, and settings query) for every query. Each client is used by one caller
+    at a time.
+
+    Pooled clients are replaced after FX_CLICKHOUSE_POOL_KEEP_ALIVE_SECONDS, and the ones idle for more than
+    FX_CLICKHOUSE_POOL_HEALTH_CHECK_SECONDS are pinged before reuse, and reconnected when the ping fails. The pool is
+    emptied without closing the clients after a fork, since their connections belong to the parent process.
+    """
+    def __init__(self) -> None:
+        """Initialize the pool"""
+        self._lock = threading.Lock()
+        self._idle_clients: List[_PooledClient] = []
+        self._pid = os.getpid()
+
+    def _pop_idle_client(self) -> _PooledClient | None:
+        """Pop the most recently used idle client, if any"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._idle_clients = []
+                self._pid = os.getpid()
+            return self._idle_clients.pop() if self._idle_clients else None
+
+    @staticmethod
+    def _is_healthy(pooled_client: _PooledClient) -> bool:
+        """Check if the connection of the pooled client is still usable"""
+        try:
+            return bool(pooled_client.client.ping())
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    def acquire(self) -> _PooledClient:
+        """
+        Get a usable client from the pool, or a new client if none is available.
+
+        :return: The pooled client.
+        :rtype: _PooledClient
+        """
+        while True:
+            pooled_client = self._pop_idle_client()
+            if pooled_client is None:
+                return _PooledClient(get_client())
+
+            now = time.monotonic()
+            if now - pooled_client.created_at >= settings.FX_CLICKHOUSE_POOL_KEEP_ALIVE_SECONDS:
+                pooled_client.close()
+            elif now - pooled_client.last_used_at >= settings.FX_CLICKHOUSE_POOL_HEALTH_CHECK_SECONDS and \
+                    not self._is_healthy(pooled_client):
+                log.warning('Clickhouse: reconnecting a pooled client that failed the health check.')
+                pooled_client.close()
+            else:
+                return pooled_client
+
+    def release(self, pooled_client: _PooledClient, check_health: bool = False) -> None:
+        """
+        Return the client to the pool, or close it if the pool is full.
+
+        :param pooled_client: The pooled client.
+        :type pooled_client: _PooledClient
+        :param check_health: Check the health of the client before its next use, i.e. after a failed query
+        :type check_health: bool
+        """
+        pooled_client.last_used_at = float('-inf') if check_health else time.monotonic()
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle_clients) < settings.FX_CLICKHOUSE_POOL_SIZE:
+                self._idle_clients.append(pooled_client)
+                return
+        pooled_client.close()
+
+    def clear(self) -> None:
+        """Close all the idle clients of the pool"""
+        with self._lock:
+            idle_clients, self._idle_clients = self._idle_clients, []
+        for pooled_client in idle_clients:
+            pooled_client.close()
+
+
+_clients_pool = ClickhouseClientPool()
+
+
+@contextmanager
+def get_pooled_client() -> Generator[Client, None, None]:
+    """
+    Get a Clickhouse client from the per-process clients pool, and return it to the pool when done.
+
+    :return: Clickhouse client.
+    :rtype: Generator[Client, None, None]
+    """
+    pooled_client = _clients_pool.acquire()
+    failed = False
+    try:
+        yield pooled_client.client
+    except Exception:
+        failed = True
+        raise
+    finally:
+        _clients_pool.release(pooled_client, check_health=failed)
+
+
 def get_default_queries() -> dict:
     """
     Get the default Clickhouse queries.
@@ -122,16 +254,104 @@ def count_result(clickhouse_client: Client, query: str, parameters: Dict[str, An
     return result[0][0]
 
 
+class PageQueryResult:  # pylint: disable=too-few-public-methods
+    """Rows of a page of a Clickhouse query, without the records count column of the single round-trip pagination."""
+    def __init__(self, column_names: tuple, result_rows: list) -> None:
+        """Initialize the page result"""
+        self.column_names = column_names
+        self.result_rows = result_rows
+
+
+def _get_count_cache_key(query: str, parameters: Dict[str, Any] | None) -> str:
+    """
+    Get the cache key of the records count of the Clickhouse query with the given parameters.
+
+    :param query: The Clickhouse query.
+    :type query: str
+    :param parameters: The parameters to format the query with.
+    :type parameters: Dict[str, Any] | None
+    :return: The cache key.
+    :rtype: str
+    """
+    query_hash = hashlib.sha256(
+        json.dumps([query, parameters], sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    return f'{cs.CACHE_NAME_CLICKHOUSE_QUERY_COUNT}_{query_hash}'
+
+
+def _get_cached_count(query: str, parameters: Dict[str, Any] | None) -> int | None:
+    """Get the cached records count of the Clickhouse query, if the count caching is enabled"""
+    if not settings.FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT:
+        return None
+    return cache.get(_get_count_cache_key(query, parameters))
+
+
+def _cache_count(query: str, parameters: Dict[str, Any] | None, count: int) -> None:
+    """Cache the records count of the Clickhouse query, if the count caching is enabled"""
+    if settings.FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT:
+        cache.set(_get_count_cache_key(query, parameters), count, settings.FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT)
+
+
+def _run_query(clickhouse_client: Client, query: str, parameters: Dict[str, Any] | None) -> QueryResult:
+    """Run the Clickhouse query, raising ClickhouseQueryParamsError on failure"""
+    try:
+        return clickhouse_client.query(query, parameters=parameters)
+    except Exception as exc:
+        raise ClickhouseQueryParamsError(f'Error executing Clickhouse query: {exc}') from exc
+
+
+def _execute_page_query_with_count(
+    clickhouse_client: Client,
+    query: str,
+    parameters: Dict[str, Any] | None,
+    page: int,
+    page_size: int,
+) -> tuple[int, PageQueryResult | None]:
+    """
+    Execute the query of one page, and get the records count of the whole query in the same round-trip, using the
+    count() OVER () window function. A separate count query is needed only when the page is empty, to tell an empty
+    result from a page that does not exist. The rows are read from the query as a subquery, so the order of the
+    query's ORDER BY is not guaranteed across the pages.
+
+    :return: The records count, and the page result.
+    :rtype: tuple[int, PageQueryResult | None]
+    """
+    offset = (page - 1) * page_size
+    result = _run_query(
+        clickhouse_client,
+        f'SELECT *, count() OVER () AS {cs.CLICKHOUSE_RECORDS_COUNT_COLUMN} FROM ({query}) '
+        f'LIMIT {page_size} OFFSET {offset}',
+        parameters,
+    )
+
+    rows = result.result_rows
+    if rows:
+        return rows[0][-1], PageQueryResult(
+            column_names=tuple(result.column_names[:-1]),
+            result_rows=[row[:-1] for row in rows],
+        )
+
+    if page == 1:
+        return 0, None
+    return count_result(clickhouse_client, query, parameters=parameters), None
+
+
 def execute_query(
     clickhouse_client: Client,
     query: str,
     parameters: Dict[str, Any] | None = None,
     page: int | None = None,
     page_size: int = 20,
-) -> tuple[int | None, int | None, QueryResult | None]:
+) -> tuple[int | None, int | None, QueryResult | PageQueryResult | None]:
     """
     Execute the Clickhouse query.
 
+    Paginated queries get their records count with a separate count query, or with the page itself in one round-trip
+    when FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION is set; the page is then read through a window function, which does not
+    keep the order of the query. The counts are cached for FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT seconds, so the next
+    pages of the same query need only the page query. A page beyond a cached count is checked with a fresh count,
+    since the records could be added after the count was cached.
+
     :param clickhouse_client: The Clickhouse client.
     :type clickhouse_client: Client
     :param query: The Clickhouse query to execute.
@@ -143,42 +363,126 @@ def execute_query(
     :param page_size: The page size.
     :type page_size: int
     :return: The results of the query.
-    :rtype: tuple[int | None, int | None, QueryResult | None]
+    :rtype: tuple[int | None, int | None, QueryResult | PageQueryResult | None]
     """
-    max_count = None
-    next_page = None
-
     if page is not None:
         if page < 1:
             raise EmptyPage('Page should be greater than or equal to 1')
         if page_size is None or page_size < 1 or page_size > 1000:
             raise EmptyPage('Page size should be an integer between 1 and 1000')
 
-    if page:
-        offset = (page - 1) * page_size
+    if not page:
+        return None, None, _run_query(clickhouse_client, query, parameters)
+
+    offset = (page - 1) * page_size
+    max_count = _get_cached_count(query, parameters)
+    if max_count is not None and offset >= max_count:
+        max_count = None
+    result: QueryResult | PageQueryResult | None = None
+
+    if max_count is None and settings.FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION:
+        max_count, result = _execute_page_query_with_count(clickhouse_client, query, parameters, page, page_size)
+        _cache_count(query, parameters, max_count)
+    elif max_count is None:
         max_count = count_result(clickhouse_client, query, parameters=parameters)
-        if max_count == 0:
-            return 0, None, None
+        _cache_count(query, parameters, max_count)
 
-        if offset >= max_count:
-            raise EmptyPage('Page does not exist!')
-        next_page = page + 1 if offset + page_size < max_count else None
-        query = f'{query} LIMIT {page_size} OFFSET {offset}'
+    if max_count == 0:
+        return 0, None, None
 
-    try:
-        result = clickhouse_client.query(query, parameters=parameters)
-    except Exception as exc:
-        raise ClickhouseQueryParamsError(f'Error executing Clickhouse query: {exc}') from exc
+    if offset >= max_count:
+        raise EmptyPage('Page does not exist!')
+    next_page = page + 1 if offset + page_size < max_count else None
+
+    if result is None:
+        result = _run_query(clickhouse_client, f'{query} LIMIT {page_size} OFFSET {offset}', parameters)
 
     return max_count, next_page, result
 
 
-def result_to_json(result: QueryResult | None) -> list[dict]:
+def _stream_ndjson(
+    clickhouse_client: Client, query: str, parameters: Dict[str, Any] | None,
+) -> Generator[bytes, None, None]:
+    """
+    Stream the results of the Clickhouse query as JSON lines, one block of rows at a time. An empty chunk is yielded
+    first, once the query is started.
+    """
+    with clickhouse_client.query_row_block_stream(query, parameters=parameters) as stream:
+        column_names = stream.source.column_names
+        yield b''
+        for block in stream:
+            yield ''.join(
+                json.dumps(dict(zip(column_names, row)), cls=DjangoJSONEncoder) + '\n' for row in block
+            ).encode('utf-8')
+
+
+def _stream_arrow(
+    clickhouse_client: Client, query: str, parameters: Dict[str, Any] | None,
+) -> Generator[bytes, None, None]:
+    """
+    Stream the results of the Clickhouse query in the Arrow IPC streaming format, as returned by Clickhouse. An empty
+    chunk is yielded first, once the query is started.
+    """
+    stream = clickhouse_client.raw_stream(query, parameters=parameters, fmt='ArrowStream')
+    try:
+        yield b''
+        while True:
+            chunk = stream.read(cs.CLICKHOUSE_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        stream.close()
+
+
+def _stream_query_with_pooled_client(
+    query: str, parameters: Dict[str, Any] | None, stream_format: str,
+) -> Generator[bytes, None, None]:
+    """Stream the results of the Clickhouse query, holding a pooled client until the stream is consumed or closed"""
+    with get_pooled_client() as clickhouse_client:
+        stream_generator = (_stream_arrow if stream_format == STREAM_FORMAT_ARROW else _stream_ndjson)(
+            clickhouse_client, query, parameters,
+        )
+        try:
+            first_chunk = next(stream_generator, b'')
+        except Exception as exc:
+            raise ClickhouseQueryParamsError(f'Error executing Clickhouse query: {exc}') from exc
+        yield first_chunk
+        yield from stream_generator
+
+
+def stream_query(
+    query: str,
+    parameters: Dict[str, Any] | None,
+    stream_format: str,
+) -> Generator[bytes, None, None]:
+    """
+    Stream the results of the Clickhouse query without holding them in memory. The query is started before returning,
+    so its errors are raised to the caller rather than while streaming.
+
+    :param query: The Clickhouse query to execute.
+    :type query: str
+    :param parameters: The parameters to format the query with.
+    :type parameters: Dict[str, Any] | None
+    :param stream_format: The content type of the stream, one of STREAM_FORMATS.
+    :type stream_format: str
+    :return: The generator of the streamed content.
+    :rtype: Generator[bytes, None, None]
+    """
+    if stream_format not in STREAM_FORMATS:
+        raise ClickhouseQueryParamsError(f'Unsupported stream format: {stream_format}')
+
+    generator = _stream_query_with_pooled_client(query, parameters, stream_format)
+    next(generator)
+    return generator
+
+
+def result_to_json(result: QueryResult | PageQueryResult | None) -> list[dict]:
     """
     Convert the Clickhouse result to JSON.
 
     :param result: The Clickhouse result.
-    :type result: QueryResult | None
+    :type result: QueryResult | PageQueryResult | None
     :return: The result as JSON.
     :rtype: list[dict]
     """
@@ -2,37 +2,48 @@
 from openedx.core.lib.api.authentication import BearerAuthentication
 from rest_framework.authentication import SessionAuthentication
 
-CACHE_NAME_ALL_COURSE_ORG_FILTER_LIST = 'fx_course_org_filter_list'
-CACHE_NAME_ALL_TENANTS_INFO = 'fx_tenants_info_v3'
+TENANTS_REGISTRY_VERSION = 1
+CACHE_NAME_TENANTS_REGISTRY = f'fx_tenants_registry_v{TENANTS_REGISTRY_VERSION}'
 CACHE_NAME_ALL_VIEW_ROLES = 'fx_view_roles'
-CACHE_NAME_ORG_TO_TENANT_MAP = 'fx_org_to_tenant_mapping'
+CACHE_NAME_LIBRARY_KEYS_INDEX = 'fx_library_keys_index'
+CACHE_NAME_LIBRARY_NOT_FOUND = 'fx_library_not_found'
 CACHE_NAME_USER_COURSE_ACCESS_ROLES = 'fx_user_course_access_roles'
+CACHE_NAME_USER_PERMISSION_INDEX = 'fx_user_permission_index'
 CACHE_NAME_LIVE_STATISTICS_PER_TENANT = 'fx_live_statistics_per_tenant'
 CACHE_NAME_CONFIG_ACCESS_CONTROL = 'fx_config_access_control'
 CACHE_NAME_TENANT_READABLE_LMS_CONFIG = 'fx_config_tenant_lms_config'
 CACHE_NAME_COURSES_RATINGS = 'fx_courses_ratings'
+CACHE_NAME_COURSE_GRADING_SUBSECTIONS = 'fx_course_grading_subsections'
+CACHE_NAME_EXPORT_TASK_PROGRESS = 'fx_export_task_progress'
+CACHE_NAME_CLICKHOUSE_QUERY_COUNT = 'fx_clickhouse_query_count'
+CACHE_NAME_CLICKHOUSE_QUERY_RESULTS = 'fx_clickhouse_query_results'
+CACHE_NAME_EXPORT_DATA_WATERMARK = 'fx_export_data_watermark'
+CACHE_NAME_STATISTICS_SNAPSHOT_REFRESH = 'fx_statistics_snapshot_refresh'
+CACHE_DICT_LOCK_SUFFIX = '_refresh_lock'
+CACHE_EARLY_EXPIRATION_BETA = 1.0
+CACHE_NAME_LOCAL_CACHE_GENERATION = 'fx_local_cache_generation'
+CACHE_NAME_LOCAL_CACHE_VERSION = 'fx_local_cache_version'
+CACHE_LOCAL_GENERATION_CHECK_SECONDS = 1
+CACHE_LOCAL_MAX_ENTRIES = 256
 
 CACHE_NAMES = {
-    CACHE_NAME_ALL_COURSE_ORG_FILTER_LIST: {
-        'short_description': 'Course Organization Filter',
-        'long_description': 'List of all course org filter for all tenants',
-    },
-    CACHE_NAME_ALL_TENANTS_INFO: {
-        'short_description': 'Tenants Info',
-        'long_description': 'Basic information about all tenants',
+    CACHE_NAME_TENANTS_REGISTRY: {
+        'short_description': 'Tenants Registry',
+        'long_description': 'Basic information, course org filters, and organization mappings of all tenants',
     },
     CACHE_NAME_ALL_VIEW_ROLES: {
         'short_description': 'View Accessible Roles',
         'long_description': 'Information about accessible roles for all supported views',
     },
-    CACHE_NAME_ORG_TO_TENANT_MAP: {
-        'short_description': 'Organization to Tenant Mapping',
-        'long_description': 'Mapping of organization to tenant',
-    }
+    CACHE_NAME_LIBRARY_KEYS_INDEX: {
+        'short_description': 'Library Keys Index',
+        'long_description': 'IDs and organizations of all libraries',
+    },
 }
 
 CLICKHOUSE_FX_BUILTIN_ORG_IN_TENANTS = '__orgs_of_tenants__'
 CLICKHOUSE_FX_BUILTIN_CA_USERS_OF_TENANTS = '__ca_users_of_tenants__'
+CLICKHOUSE_RECORDS_COUNT_COLUMN = '__fx_records_count__'
 
 CLICKHOUSE_QUERY_SLUG_PATTERN = r'[a-z0-9_\-.]+'
 
@@ -141,4 +152,11 @@ KEY_TYPE_MAP = {
 ALLOWED_FILE_EXTENSIONS = ['.png', '.jpeg', '.jpg', '.ico', '.svg', '.css']
 
 CSV_EXPORT_UPLOAD_DIR = 'exported_files'
+CSV_EXPORT_S3_MIN_PART_SIZE = 5 * 1024 * 1024  # S3 rejects multipart parts smaller than 5 MB, except the last one
+CSV_EXPORT_S3_MAX_PARTS = 10000
 CONFIG_FILES_UPLOAD_DIR = 'config_files'
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
+
+CLICKHOUSE_STREAM_CHUNK_SIZE = 64 * 1024
+
+COURSE_ACCESS_ROLES_CACHE_BATCH_SIZE = 500
@@ -1,28 +1,44 @@
 """
 This module contains utils for tasks.
 """
-import csv
+import copy
+import io
 import logging
 import os
 import tempfile
+import time
 from datetime import datetime
-from typing import Any, Generator, Optional, Tuple
+from itertools import islice
+from typing import Any, Generator, List, Optional, Tuple
 from urllib.parse import urlencode, urlparse
 
 import boto3
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
+from django.core.files import File
 from django.core.files.storage import default_storage
+from django.db.models import QuerySet
 from django.urls import resolve
+from rest_framework.exceptions import APIException
+from rest_framework.generics import GenericAPIView
 from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
 from storages.backends.s3boto3 import S3Boto3Storage
 
-from futurex_openedx_extensions.helpers.constants import CSV_EXPORT_UPLOAD_DIR
+from futurex_openedx_extensions.helpers.constants import (
+    CSV_EXPORT_S3_MAX_PARTS,
+    CSV_EXPORT_S3_MIN_PART_SIZE,
+    CSV_EXPORT_UPLOAD_DIR,
+)
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
+from futurex_openedx_extensions.helpers.export_formats import (
+    combine_parquet_files,
+    get_export_format,
+    get_export_writer,
+)
 from futurex_openedx_extensions.helpers.models import DataExportTask
-from futurex_openedx_extensions.helpers.upload import get_storage_dir, upload_file
+from futurex_openedx_extensions.helpers.upload import get_content_type, get_storage_dir, get_storage_key, upload_file
 
 log = logging.getLogger(__name__)
 User = get_user_model()
@@ -65,6 +81,47 @@ def _get_mocked_request(url_with_query_str: str, fx_info: dict, site: Site) -> R
     return mocked_request
 
 
+def _get_export_view(view_instance: Any, url_with_query_str: str, fx_info: dict, view_data: dict) -> Any:
+    """
+    Initialize the view of the export to stream its queryset directly. Authentication and permission checks of the
+    view are performed once here, instead of once for every page of the export.
+
+    :param view_instance: The view function resolved from the path of the export
+    :type view_instance: Any
+    :param url_with_query_str: The URL of the view with the query params
+    :type url_with_query_str: str
+    :param fx_info: contains role and permission info
+    :type fx_info: dict
+    :param view_data: required data for mocking
+    :type view_data: dict
+    :return: The initialized view, or None if the view does not support streaming the export
+    :rtype: Any
+    """
+    view_class = getattr(view_instance, 'view_class', None)
+    if not isinstance(view_class, type) or not issubclass(view_class, GenericAPIView):
+        return None
+
+    view = view_class(**getattr(view_instance, 'view_initkwargs', {}))
+    if not hasattr(view, 'is_export_streaming_supported') or not view.is_export_streaming_supported():
+        return None
+
+    kwargs = view_data.get('kwargs', {})
+    mocked_request = _get_mocked_request(url_with_query_str, fx_info, view_data['site'])
+    view.setup(mocked_request, **kwargs)
+    request = view.initialize_request(mocked_request, **kwargs)
+    view.request = request
+    view.headers = view.default_response_headers
+    try:
+        view.initial(request, **kwargs)
+    except APIException as exc:
+        raise FXCodedException(
+            code=FXExceptionCodes.EXPORT_CSV_VIEW_RESPONSE_FAILURE,
+            message=f'CSV Export: View initialization failed with status code: {exc.status_code}',
+        ) from exc
+
+    return view
+
+
 def _get_response_data(response: Any) -> Tuple:
     """Get response data"""
     if response.status_code != 200:
@@ -121,9 +178,59 @@ def _paginated_response_generator(
         url = response.data.get('next')
 
 
-def _upload_file_to_storage(local_file_path: str, filename: str, tenant_id: int, partial_tag: int = 0) -> str:
+def _is_ordered_by_pk(queryset: QuerySet) -> bool:
+    """Check if the queryset is ordered by primary key only"""
+    return list(queryset.query.order_by) in (
+        ['pk'], [queryset.model._meta.pk.name],
+    )
+
+
+def _streamed_response_generator(view_data: dict) -> Generator:
+    """
+    Generator to yield batches of records streamed directly from the queryset of the view. The queryset is
+    read once with a database iterator; every batch has the size of one page, so the continuation of a long export
+    uses the same start_page/end_page bookkeeping of the paginated export. When the queryset is ordered by primary
+    key, the continuation starts after the last exported key instead of using an offset. Chunks of a parallel export
+    are limited to the keys after "after" and up to "until".
+    """
+    view = view_data['export_view']
+    page_size = view_data['page_size']
+    page = view_data['start_page']
+    processed_records = (page - 1) * page_size
+    queryset = view.get_export_queryset()
+    ordered_by_pk = _is_ordered_by_pk(queryset)
+    if ordered_by_pk and view_data.get('until') is not None:
+        queryset = queryset.filter(pk__lte=view_data['until'])
+    total_records = view_data.get('total_records') or view.get_export_count(queryset)
+    if ordered_by_pk and view_data.get('after') is not None:
+        records = queryset.filter(pk__gt=view_data['after']).iterator(chunk_size=page_size)
+    else:
+        records = queryset[processed_records:].iterator(chunk_size=page_size)
+    start_time = datetime.now()
+    while not view_data['end_page']:
+        items = list(islice(records, page_size))
+        if not items and page > view_data['start_page']:
+            break
+
+        data = view.serialize_export_items(items)
+        processed_records += len(data)
+
+        progress = round(processed_records / total_records, 2) if total_records else 0
+        yield data, progress, processed_records
+        if len(items) < page_size:
+            break
+        if _is_long_running_process(start_time):
+            view_data['end_page'] = page
+            view_data['after'] = items[-1].pk if ordered_by_pk else None
+        page += 1
+
+
+def _upload_file_to_storage(
+    local_file_path: str, filename: str, tenant_id: int, partial_tag: int = 0, chunk: int = 0,
+) -> str:
     """
-    Upload a file to the default storage (e.g., S3).
+    Upload a file to the default storage (e.g., S3). The file is streamed, and compressed on the fly when the filename
+    ends with .gz.
 
     :param local_file_path: Path to the local file to upload
     :type local_file_path: str
@@ -133,19 +240,127 @@ def _upload_file_to_storage(local_file_path: str, filename: str, tenant_id: int,
     :type tenant_id: int
     :param partial_tag: The partial file number.
     :type partial_tag: int
+    :param chunk: The chunk number of a parallel export, 0 if the export is not parallel.
+    :type chunk: int
     :return: The path of the uploaded file
     :rtype: str
     """
-    if partial_tag:
+    compress = filename.endswith('.gz')
+    if partial_tag and chunk:
+        filename = f'{filename}_parts/{filename}_{chunk:03d}_{partial_tag:06d}'
+    elif partial_tag:
         filename = f'{filename}_parts/{filename}_{partial_tag:06d}'
     storage_path = os.path.join(get_storage_dir(tenant_id, CSV_EXPORT_UPLOAD_DIR), filename)
-    upload_file(storage_path, local_file_path, is_private=True)
+    upload_file(storage_path, local_file_path, is_private=True, compress=compress)
     return storage_path
 
 
+class _PartialFilesReader(io.RawIOBase):
+    """Read the given partial files from the storage one after the other, as one stream"""
+    def __init__(self, part_paths: List[str]) -> None:
+        """Initialize the reader"""
+        super().__init__()
+        self._part_paths = iter(part_paths)
+        self._current_file: Optional[File] = None
+
+    def readable(self) -> bool:
+        """The reader is readable"""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read the next bytes of the current partial file into the buffer, moving to the next file when needed"""
+        while True:
+            if self._current_file is None:
+                part_path = next(self._part_paths, None)
+                if part_path is None:
+                    return 0
+                self._current_file = default_storage.open(part_path, 'rb')
+
+            data = self._current_file.read(len(buffer))
+            if data:
+                buffer[:len(data)] = data
+                return len(data)
+
+            self._current_file.close()
+            self._current_file = None
+
+    def close(self) -> None:
+        """Close the current partial file"""
+        if self._current_file is not None:
+            self._current_file.close()
+            self._current_file = None
+        super().close()
+
+
+def _combine_partial_files_s3(storage_path: str, part_paths: List[str]) -> bool:
+    """
+    Combine the partial files into one file with an S3 multipart upload that copies the parts inside the bucket. No
+    data goes through the worker.
+
+    :param storage_path: The path of the combined file
+    :type storage_path: str
+    :param part_paths: The paths of the partial files, in order
+    :type part_paths: List[str]
+    :return: True if the file was combined, False if the multipart copy is not possible for the storage or the parts
+    :rtype: bool
+    """
+    if not isinstance(default_storage, S3Boto3Storage) or not 0 < len(part_paths) <= CSV_EXPORT_S3_MAX_PARTS:
+        return False
+
+    if any(default_storage.size(part_path) < CSV_EXPORT_S3_MIN_PART_SIZE for part_path in part_paths[:-1]):
+        return False
+
+    bucket_name = default_storage.bucket.name
+    client = default_storage.bucket.meta.client
+    key = get_storage_key(storage_path)
+    upload_id = client.create_multipart_upload(
+        Bucket=bucket_name, Key=key, ACL='private', ContentType=get_content_type(storage_path),
+    )['UploadId']
+    try:
+        parts = []
+        for part_number, part_path in enumerate(part_paths, start=1):
+            result = client.upload_part_copy(
+                Bucket=bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                CopySource={'Bucket': bucket_name, 'Key': get_storage_key(part_path)},
+            )
+            parts.append({'ETag': result['CopyPartResult']['ETag'], 'PartNumber': part_number})
+
+        client.complete_multipart_upload(
+            Bucket=bucket_name, Key=key, UploadId=upload_id, MultipartUpload={'Parts': parts},
+        )
+    except Exception:
+        client.abort_multipart_upload(Bucket=bucket_name, Key=key, UploadId=upload_id)
+        raise
+
+    return True
+
+
+def _combine_partial_parquet_files(storage_path: str, part_paths: List[str]) -> None:
+    """
+    Combine partial Parquet files into one file. Parquet files cannot be concatenated, so the row groups of the parts
+    are rewritten into a local temporary file, which is then uploaded.
+
+    :param storage_path: The path of the combined file
+    :type storage_path: str
+    :param part_paths: The paths of the partial files, in order
+    :type part_paths: List[str]
+    """
+    with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+        combine_parquet_files(part_paths, tmp_file)
+    try:
+        upload_file(storage_path, tmp_file.name, is_private=True)
+    finally:
+        os.remove(tmp_file.name)
+
+
 def _combine_partial_files(task_id: int, filename: str, tenant_id: int) -> None:
     """
-    Combine partial files into a single file.
+    Combine partial files into a single file. The parts are copied inside the bucket when the storage is S3 and the
+    parts are large enough, otherwise they are streamed from the storage into the combined file. Both ways use
+    constant memory and no local disk. Parquet parts are rewritten into one file instead.
 
     :param task_id: The task ID.
     :type task_id: int
@@ -157,34 +372,197 @@ def _combine_partial_files(task_id: int, filename: str, tenant_id: int) -> None:
     storage_dir = get_storage_dir(tenant_id, CSV_EXPORT_UPLOAD_DIR)
     parts_dir = os.path.join(storage_dir, f'{filename}_parts')
     partial_files = default_storage.listdir(parts_dir)[1]
+    part_paths = [os.path.join(parts_dir, partial_file) for partial_file in sorted(partial_files)]
+    storage_path = os.path.join(storage_dir, filename)
 
     log.info('CSV Export: combining partial files for task %s...', task_id)
-    try:
-        with tempfile.NamedTemporaryFile(mode='w', newline='', encoding='utf-8', delete=False) as tmp_file:
-            for partial_file in sorted(partial_files):
-                with default_storage.open(os.path.join(parts_dir, partial_file)) as file:
-                    tmp_file.write(file.read().decode('utf-8'))
-        log.info('CSV Export: uploading combined file for task %s...', task_id)
-        _upload_file_to_storage(
-            tmp_file.name, filename, DataExportTask.get_task(task_id=task_id).tenant.id,
+    if get_export_format(filename) == DataExportTask.FORMAT_PARQUET:
+        _combine_partial_parquet_files(storage_path, part_paths)
+        log.info('CSV Export: partial Parquet files combined for task %s...', task_id)
+    elif _combine_partial_files_s3(storage_path, part_paths):
+        log.info('CSV Export: partial files combined by multipart copy for task %s...', task_id)
+    else:
+        with _PartialFilesReader(part_paths) as reader:
+            default_storage.save(storage_path, File(io.BufferedReader(reader), name=filename))
+        if isinstance(default_storage, S3Boto3Storage):
+            default_storage.bucket.Object(storage_path).Acl().put(ACL='private')
+        log.info('CSV Export: partial files combined by streaming for task %s...', task_id)
+
+    _delete_partial_files(task_id, parts_dir, part_paths)
+
+
+def _delete_partial_files(task_id: int, parts_dir: str, part_paths: List[str]) -> None:
+    """
+    Delete the partial files and their directory from the storage.
+
+    :param task_id: The task ID.
+    :type task_id: int
+    :param parts_dir: The directory of the partial files.
+    :type parts_dir: str
+    :param part_paths: The paths of the partial files.
+    :type part_paths: List[str]
+    """
+    log.info('CSV Export: deleting partial files for task %s...', task_id)
+    for part_path in part_paths:
+        default_storage.delete(part_path)
+    log.info('CSV Export: deleting partial files directory for task %s...', task_id)
+    default_storage.delete(parts_dir)
+    log.info('CSV Export: partial files directory deleted successfully for task %s...', task_id)
+
+
+class _ExportProgressTracker:
+    """
+    Coalesce the progress updates of an export task. The progress is saved when it advances by
+    FX_TASK_PROGRESS_UPDATE_STEP, or when FX_TASK_PROGRESS_UPDATE_SECONDS pass since the last save, and on flush.
+
+    Chunks of a parallel export report their progress as deltas that are added to the progress of the task. Other
+    exports report the progress of the task itself, which is also mirrored to the cache on every update when
+    FX_TASK_PROGRESS_CACHE_TIMEOUT is set.
+    """
+    def __init__(self, task_id: int, additive: bool = False) -> None:
+        """Initialize the tracker"""
+        self.task_id = task_id
+        self.additive = additive
+        self.progress = 0.0
+        self.saved_progress = 0.0
+        self.saved_at = time.monotonic()
+
+    def update(self, progress: float) -> None:
+        """
+        Report the progress of the export.
+
+        :param progress: The progress of the task, or the progress to add to it for a chunk of a parallel export
+        :type progress: float
+        """
+        if self.additive:
+            self.progress += progress
+        else:
+            self.progress = progress
+            DataExportTask.cache_progress(self.task_id, progress)
+
+        if (
+            self.progress - self.saved_progress >= settings.FX_TASK_PROGRESS_UPDATE_STEP or
+            time.monotonic() - self.saved_at >= settings.FX_TASK_PROGRESS_UPDATE_SECONDS
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Save the progress that is not saved yet"""
+        if self.progress != self.saved_progress:
+            if self.additive:
+                DataExportTask.add_progress(self.task_id, min(self.progress - self.saved_progress, 1.0))
+            else:
+                DataExportTask.set_progress(self.task_id, self.progress)
+            self.saved_progress = self.progress
+        self.saved_at = time.monotonic()
+
+
+def _write_export_batches(
+    task_id: int, view_data: dict, filename: str, output_file: Any, response_generator: Generator,
+) -> None:
+    """
+    Write the batches of the response generator to the output file, and track the progress of the task.
+
+    :param task_id: task id will be used to update progress
+    :type task_id: int
+    :param view_data: required data for mocking
+    :type view_data: dict
+    :param filename: filename for generated CSV
+    :type filename: str
+    :param output_file: binary file to write the batches into
+    :type output_file: Any
+    :param response_generator: generator of (data, progress, processed_records)
+    :type response_generator: Generator
+    """
+    page_size = view_data['page_size']
+    chunk = view_data.get('chunk', 0)
+    batch_count = view_data.get('processed_batches', 0)
+    writer = None
+    progress_tracker = _ExportProgressTracker(task_id, additive=bool(chunk))
+    for data, progress, processed_records in response_generator:
+        batch_count += 1
+        log.info(
+            'CSV Export: processing batch %s (%s records) of task %s... %s%%',
+            batch_count,
+            processed_records,
+            task_id,
+            round(progress * 100, 2),
         )
-        log.info('CSV Export: file uploaded successfully for task %s...', task_id)
-        log.info('CSV Export: deleting partial files for task %s...', task_id)
-        for partial_file in partial_files:
-            default_storage.delete(os.path.join(parts_dir, partial_file))
-        log.info('CSV Export: deleting partial files directory for task %s...', task_id)
-        default_storage.delete(parts_dir)
-        log.info('CSV Export: partial files directory deleted successfully for task %s...', task_id)
+        if data:
+            log.info('CSV Export: writing batch %s of task %s...', batch_count, task_id)
+            if not writer:
+                writer = get_export_writer(filename, output_file)
+            # Write header only for page 1 (of the first chunk)
+            writer.write_batch(data, header=processed_records <= page_size and chunk <= 1)
+
+            if chunk:
+                # chunks run concurrently, each one adds its own share to the task progress
+                progress_tracker.update(len(data) / view_data['total_records'])
+            else:
+                # Allow the possibility of %1 records added to/dropped from the view during the export
+                # The %1 margin is just an estimate, there is no proved calculation for it
+                if view_data['end_page'] is None and 1.01 >= progress >= 0.99:
+                    progress = 1.0
+
+                # update task progress
+                progress_tracker.update(progress)
+        else:
+            log.warning('CSV Export: batch %s of task %s is empty!', batch_count, task_id)
 
-    finally:
-        try:
-            os.remove(tmp_file.name)
-            log.info('CSV Export: temporary combined file removed for task %s...', task_id)
-        except Exception as exc:
-            log.info('CSV Export: failed to remove temporary combined file for task %s: %s', task_id, str(exc))
+    if writer:
+        writer.close()
+    progress_tracker.flush()
+
+    view_data['processed_batches'] = batch_count
+
+
+def _upload_export_file(task_id: int, view_data: dict, filename: str, local_file_path: str) -> bool:
+    """
+    Upload the generated file to the storage as a single file, a partial file, or a chunk of a parallel export.
+
+    :param task_id: task id of the export
+    :type task_id: int
+    :param view_data: required data for mocking
+    :type view_data: dict
+    :param filename: filename for generated CSV
+    :type filename: str
+    :param local_file_path: path of the generated file
+    :type local_file_path: str
+    :return: True if export fully completed, False if partially completed
+    :rtype: bool
+    """
+    chunk = view_data.get('chunk', 0)
+    single_file = not chunk and view_data['start_page'] == 1 and view_data['end_page'] is None
+    if single_file:
+        log.info('CSV Export: uploading file for task %s (no partial files).', task_id)
+        partial_tag = 0
+    else:
+        log.info('CSV Export: uploading partial file for task %s.', task_id)
+        partial_tag = view_data['start_page']
+    _upload_file_to_storage(
+        local_file_path,
+        filename,
+        DataExportTask.get_task(task_id=task_id).tenant.id,
+        partial_tag=partial_tag,
+        chunk=chunk,
+    )
+
+    if single_file:
+        log.info('CSV Export: file uploaded successfully for task %s (no partial files).', task_id)
+    elif view_data['end_page']:
+        log.info('CSV Export: partial file uploaded successfully for task %s.', task_id)
+        view_data['start_page'] = view_data['end_page'] + 1
+        view_data['end_page'] = None
+        return False
+    elif chunk:
+        log.info('CSV Export: chunk %s uploaded successfully for task %s.', chunk, task_id)
+    else:
+        _combine_partial_files(task_id, filename, DataExportTask.get_task(task_id=task_id).tenant.id)
 
+    return True
 
-def _generate_csv_with_tracked_progress(  # pylint: disable=too-many-branches
+
+def _generate_csv_with_tracked_progress(
     task_id: int, fx_permission_info: dict, view_data: dict, filename: str, view_instance: Any
 ) -> bool:
     """
@@ -203,65 +581,15 @@ def _generate_csv_with_tracked_progress(  # pylint: disable=too-many-branches
     :return: True if export fully completed, False if partially completed
     :rtype: bool
     """
-    fully_completed = True
-    page_size = view_data['page_size']
-    batch_count = view_data.get('processed_batches', 0)
-    writer = None
     try:
-        with tempfile.NamedTemporaryFile(mode='w', newline='', encoding='utf-8', delete=False) as tmp_file:
-            for data, progress, processed_records in _paginated_response_generator(
-                fx_permission_info, view_data, view_instance
-            ):
-                batch_count += 1
-                log.info(
-                    'CSV Export: processing batch %s (%s records) of task %s... %s%%',
-                    batch_count,
-                    processed_records,
-                    task_id,
-                    round(progress * 100, 2),
-                )
-                if data:
-                    log.info('CSV Export: writing batch %s of task %s...', batch_count, task_id)
-                    if not writer:
-                        writer = csv.DictWriter(
-                            tmp_file, fieldnames=data[0].keys(), quotechar='"', quoting=csv.QUOTE_NONNUMERIC,
-                        )
-                    if processed_records <= page_size:
-                        # Write header only for page 1
-                        writer.writeheader()
-                    writer.writerows(data)
-
-                    # Allow the possibility of %1 records added to/dropped from the view during the export
-                    # The %1 margin is just an estimate, there is no proved calculation for it
-                    if view_data['end_page'] is None and 1.01 >= progress >= 0.99:
-                        progress = 1.0
-
-                    # update task progress
-                    DataExportTask.set_progress(task_id, progress)
-                else:
-                    log.warning('CSV Export: batch %s of task %s is empty!', batch_count, task_id)
-
-        view_data['processed_batches'] = batch_count
-
-        if view_data['start_page'] == 1 and view_data['end_page'] is None:
-            log.info('CSV Export: uploading file for task %s (no partial files).', task_id)
-            partial_tag = 0
-        else:
-            log.info('CSV Export: uploading partial file for task %s.', task_id)
-            partial_tag = view_data['start_page']
-        _upload_file_to_storage(
-            tmp_file.name, filename, DataExportTask.get_task(task_id=task_id).tenant.id, partial_tag=partial_tag,
-        )
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as tmp_file:
+            if view_data.get('export_view'):
+                response_generator = _streamed_response_generator(view_data)
+            else:
+                response_generator = _paginated_response_generator(fx_permission_info, view_data, view_instance)
+            _write_export_batches(task_id, view_data, filename, tmp_file, response_generator)
 
-        if view_data['start_page'] == 1 and view_data['end_page'] is None:
-            log.info('CSV Export: file uploaded successfully for task %s (no partial files).', task_id)
-        elif view_data['end_page']:
-            log.info('CSV Export: partial file uploaded successfully for task %s.', task_id)
-            view_data['start_page'] = view_data['end_page'] + 1
-            view_data['end_page'] = None
-            fully_completed = False
-        else:
-            _combine_partial_files(task_id, filename, DataExportTask.get_task(task_id=task_id).tenant.id)
+        fully_completed = _upload_export_file(task_id, view_data, filename, tmp_file.name)
 
     finally:
         try:
@@ -277,7 +605,8 @@ def export_data_to_csv(
     task_id: int, url: str, view_data: dict, fx_permission_info: dict, filename: str
 ) -> bool:
     """
-    Mock view with given view params and write JSON response to CSV
+    Mock view with given view params and write JSON response to CSV. Views supporting it are streamed directly
+    from their queryset, other views are called page by page
 
     :param task_id: task id will be used to update progress
     :type task_id: int
@@ -302,6 +631,30 @@ def export_data_to_csv(
     log.info('CSV Export: processing task %s...', task_id)
     DataExportTask.set_status(task_id=task_id, status=DataExportTask.STATUS_PROCESSING)
 
+    view_instance = _prepare_export(url, view_data, fx_permission_info)
+
+    # Ensure the filename ends with the extension of a supported format, CSV by default
+    if get_export_format(filename) is None:
+        filename += '.csv'
+
+    return _generate_csv_with_tracked_progress(
+        task_id, fx_permission_info, view_data, filename, view_instance
+    )
+
+
+def _prepare_export(url: str, view_data: dict, fx_permission_info: dict) -> Any:
+    """
+    Restore the user of the export, resolve the view, and fill view_data with the data required for the export.
+
+    :param url: view url will be used to mock view and get response
+    :type url: str
+    :param view_data: required data for mocking
+    :type view_data: dict
+    :param fx_permission_info: contains role and permission info
+    :type fx_permission_info: dict
+    :return: The view instance
+    :rtype: Any
+    """
     user_id = fx_permission_info.get('user_id')
     user = _get_user(user_id)
     # restore user in fx_permission_info
@@ -319,20 +672,95 @@ def export_data_to_csv(
     query_params['page_size'] = page_size
     url_with_query_str = f'{url}?{urlencode(query_params)}'
 
-    # Ensure the filename ends with .csv
-    if not filename.endswith('.csv'):
-        filename += '.csv'
-
     view_data.update({
         'url': url_with_query_str,
         'page_size': page_size,
         'view_instance': view_instance,
         'site': Site.objects.get(domain=view_data['site_domain'])
     })
+    view_data['export_view'] = _get_export_view(view_instance, url_with_query_str, fx_permission_info, view_data)
 
-    return _generate_csv_with_tracked_progress(
-        task_id, fx_permission_info, view_data, filename, view_instance
+    return view_instance
+
+
+def get_export_chunks(url: str, view_data: dict, fx_permission_info: dict) -> List[dict]:
+    """
+    Split an export into ranges of primary keys to be exported in parallel. Only streamed exports of querysets ordered
+    by primary key can be split, and every chunk has at least one page of records.
+
+    :param url: view url will be used to mock view and get response
+    :type url: str
+    :param view_data: required data for mocking
+    :type view_data: dict
+    :param fx_permission_info: contains role and permission info
+    :type fx_permission_info: dict
+    :return: The view data of every chunk, or an empty list if the export should not be split
+    :rtype: List[dict]
+    """
+    if settings.FX_TASK_EXPORT_PARALLEL_CHUNKS < 2 or urlparse(url).query:
+        return []
+
+    chunk_view_data = copy.deepcopy(view_data)
+    _prepare_export(url, view_data, fx_permission_info)
+    view = view_data['export_view']
+    if view is None:
+        return []
+
+    queryset = view.get_export_queryset()
+    if not _is_ordered_by_pk(queryset):
+        return []
+
+    total_records = view.get_export_count(queryset)
+    chunks_count = min(settings.FX_TASK_EXPORT_PARALLEL_CHUNKS, total_records // view_data['page_size'])
+    if chunks_count < 2:
+        return []
+
+    pk_values = queryset.values_list('pk', flat=True)
+    boundaries = [pk_values[total_records * index // chunks_count - 1] for index in range(1, chunks_count)]
+    return [
+        {
+            **chunk_view_data,
+            'chunk': chunk,
+            'after': after,
+            'until': until,
+            'total_records': total_records,
+        } for chunk, (after, until) in enumerate(zip([None] + boundaries, boundaries + [None]), start=1)
+    ]
+
+
+def merge_export_chunks(task_id: int, filename: str) -> None:
+    """
+    Merge the partial files of all chunks of a parallel export into the exported file, in order.
+
+    :param task_id: The task ID.
+    :type task_id: int
+    :param filename: filename for generated CSV
+    :type filename: str
+    """
+    if get_export_format(filename) is None:
+        filename += '.csv'
+    _combine_partial_files(task_id, filename, DataExportTask.get_task(task_id=task_id).tenant.id)
+
+
+def delete_export_chunks(task_id: int, filename: str) -> None:
+    """
+    Delete the partial files of all chunks of a parallel export, such as when the export has failed.
+
+    :param task_id: The task ID.
+    :type task_id: int
+    :param filename: filename for generated CSV
+    :type filename: str
+    """
+    if get_export_format(filename) is None:
+        filename += '.csv'
+    parts_dir = os.path.join(
+        get_storage_dir(DataExportTask.get_task(task_id=task_id).tenant.id, CSV_EXPORT_UPLOAD_DIR), f'{filename}_parts',
     )
+    try:
+        partial_files = default_storage.listdir(parts_dir)[1]
+    except FileNotFoundError:
+        return
+    _delete_partial_files(task_id, parts_dir, [os.path.join(parts_dir, partial_file) for partial_file in partial_files])
 
 
 def generate_file_url(storage_path: str) -> str:
@@ -370,6 +798,13 @@ def get_exported_file_url(fx_task: DataExportTask) -> Optional[str]:
     return None
 
 
+def is_exported_file_available(fx_task: DataExportTask) -> bool:
+    """Check if the task is completed and its exported file is still in the storage"""
+    return fx_task.status == fx_task.STATUS_COMPLETED and default_storage.exists(
+        os.path.join(get_storage_dir(fx_task.tenant_id, CSV_EXPORT_UPLOAD_DIR), fx_task.filename)
+    )
+
+
 def log_export_task(fx_task_id: int, async_task: Any, continue_job: bool = False) -> None:
     """Log export task details"""
     msg = 'continuation' if continue_job else 'initial'
@@ -0,0 +1,310 @@
+"""Writers of the supported file formats of the data exports"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import shutil
+import tempfile
+from typing import IO, Any, Dict, List
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+
+from futurex_openedx_extensions.helpers.models import DataExportTask
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+log = logging.getLogger(__name__)
+
+
+def is_export_format_available(export_format: str) -> bool:
+    """
+    Check if the export format is supported, and its requirements are installed. Parquet requires pyarrow.
+
+    :param export_format: The export format
+    :type export_format: str
+    :return: True if the export format can be used
+    :rtype: bool
+    """
+    if export_format not in [choice[0] for choice in DataExportTask.FORMAT_CHOICES]:
+        return False
+    return export_format != DataExportTask.FORMAT_PARQUET or pyarrow is not None
+
+
+def get_export_format(filename: str) -> str | None:
+    """
+    Get the export format of the given exported filename, by its extension.
+
+    :param filename: The exported filename
+    :type filename: str
+    :return: The export format, or None if the extension is not of a supported format
+    :rtype: str | None
+    """
+    for export_format, _ in DataExportTask.FORMAT_CHOICES:
+        if filename.endswith(f'.{export_format}'):
+            return export_format
+    return None
+
+
+class ExportWriter:
+    """
+    Base class of the writers of the exported records into a local binary file, one batch at a time. Compression of
+    the .gz formats is not done by the writers, the file is compressed while it is uploaded.
+    """
+    def __init__(self, file: IO[bytes]) -> None:
+        """Initialize the writer"""
+        self.file = file
+
+    def write_batch(self, records: List[Dict[str, Any]], header: bool) -> None:
+        """
+        Write a batch of records.
+
+        :param records: The records to write
+        :type records: List[Dict[str, Any]]
+        :param header: True if the batch is the first one of the whole export
+        :type header: bool
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush the written data. The file itself is left open for the caller to close"""
+
+
+class CSVExportWriter(ExportWriter):
+    """Writer of the CSV formats. The header is written once, before the first batch of the export"""
+    def __init__(self, file: IO[bytes]) -> None:
+        """Initialize the writer"""
+        super().__init__(file)
+        self._text_file = io.TextIOWrapper(file, encoding='utf-8', newline='')
+        self._writer: csv.DictWriter | None = None
+
+    def write_batch(self, records: List[Dict[str, Any]], header: bool) -> None:
+        """Write a batch of records as CSV rows"""
+        if not self._writer:
+            self._writer = csv.DictWriter(
+                self._text_file, fieldnames=records[0].keys(), quotechar='"', quoting=csv.QUOTE_NONNUMERIC,
+            )
+        if header:
+            self._writer.writeheader()
+        self._writer.writerows(records)
+
+    def close(self) -> None:
+        """Flush the written rows, and release the file without closing it"""
+        self._text_file.flush()
+        self._text_file.detach()
+
+
+class JSONLinesExportWriter(ExportWriter):
+    """Writer of the JSON Lines formats, one JSON object per line"""
+    def write_batch(self, records: List[Dict[str, Any]], header: bool) -> None:
+        """Write a batch of records as JSON lines"""
+        self.file.write(''.join(
+            json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for record in records
+        ).encode('utf-8'))
+
+
+class ParquetExportWriter(ExportWriter):
+    """
+    Writer of the Parquet format, one row group per batch. The column types are inferred from the batches: booleans,
+    integers and floats keep their types, columns of both integers and floats are stored as floats, and all other
+    values are stored as strings. The schema of a Parquet file cannot change after its first row group, so when a
+    batch does not fit the schema of the written row groups, they are rewritten with the column promoted to a type that
+    fits both. The row groups are written into a temporary file, which is copied into the file when closed.
+    """
+    def __init__(self, file: IO[bytes]) -> None:
+        """Initialize the writer"""
+        super().__init__(file)
+        self._writer: Any = None
+        self._spool: Any = None
+
+    @staticmethod
+    def get_schema(records: List[Dict[str, Any]]) -> Any:
+        """
+        Infer the schema of the exported records. Columns of null values only have the null type.
+
+        :param records: The records of the batch
+        :type records: List[Dict[str, Any]]
+        :return: The schema
+        :rtype: pyarrow.Schema
+        """
+        fields = []
+        for key in records[0]:
+            value_types = {type(record[key]) for record in records if record[key] is not None}
+            if not value_types:
+                field_type = pyarrow.null()
+            elif value_types == {bool}:
+                field_type = pyarrow.bool_()
+            elif value_types == {int}:
+                field_type = pyarrow.int64()
+            elif value_types <= {int, float}:
+                field_type = pyarrow.float64()
+            else:
+                field_type = pyarrow.string()
+            fields.append(pyarrow.field(key, field_type))
+        return pyarrow.schema(fields)
+
+    @staticmethod
+    def combine_types(first_type: Any, second_type: Any) -> Any:
+        """
+        Get the type that fits the values of both types: the null type fits in any type, integers are promoted to
+        floats, and all other different types fall back to strings.
+
+        :param first_type: The first type
+        :type first_type: pyarrow.DataType
+        :param second_type: The second type
+        :type second_type: pyarrow.DataType
+        :return: The combined type
+        :rtype: pyarrow.DataType
+        """
+        if first_type == second_type or pyarrow.types.is_null(second_type):
+            return first_type
+        if pyarrow.types.is_null(first_type):
+            return second_type
+        if {first_type, second_type} == {pyarrow.int64(), pyarrow.float64()}:
+            return pyarrow.float64()
+        return pyarrow.string()
+
+    @staticmethod
+    def combine_schemas(schemas: List[Any]) -> Any:
+        """
+        Combine the schemas of several batches or Parquet files of the same export, with combine_types.
+
+        :param schemas: The schemas to combine
+        :type schemas: List[pyarrow.Schema]
+        :return: The combined schema
+        :rtype: pyarrow.Schema
+        """
+        field_types: Dict[str, Any] = {}
+        for schema in schemas:
+            for field in schema:
+                field_types[field.name] = ParquetExportWriter.combine_types(
+                    field_types.get(field.name, pyarrow.null()), field.type,
+                )
+        return pyarrow.schema([pyarrow.field(name, field_type) for name, field_type in field_types.items()])
+
+    @staticmethod
+    def get_table(records: List[Dict[str, Any]], schema: Any) -> Any:
+        """
+        Convert the records to a table of the given schema, which must fit their values. Values of the string columns
+        are converted to strings, and integers of the float columns to floats.
+
+        :param records: The records
+        :type records: List[Dict[str, Any]]
+        :param schema: The schema of the table
+        :type schema: pyarrow.Schema
+        :return: The table
+        :rtype: pyarrow.Table
+        """
+        for field in schema:
+            key = field.name
+            if pyarrow.types.is_string(field.type):
+                for record in records:
+                    value = record.get(key)
+                    if value is not None and not isinstance(value, str):
+                        record[key] = json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False) \
+                            if isinstance(value, (dict, list)) else str(value)
+            elif pyarrow.types.is_floating(field.type):
+                for record in records:
+                    if record.get(key) is not None:
+                        record[key] = float(record[key])
+        return pyarrow.Table.from_pylist(records, schema=schema)
+
+    def _rewrite(self, schema: Any) -> None:
+        """
+        Rewrite the written row groups with the given schema, and continue writing with it.
+
+        :param schema: The new schema
+        :type schema: pyarrow.Schema
+        """
+        log.info('Parquet Export: column types changed, rewriting the written row groups with: %s', schema.types)
+        self._writer.close()
+        old_spool = self._spool
+        old_spool.seek(0)
+
+        self._spool = tempfile.TemporaryFile()
+        self._writer = pyarrow.parquet.ParquetWriter(self._spool, schema)
+        parquet_file = pyarrow.parquet.ParquetFile(old_spool)
+        for index in range(parquet_file.num_row_groups):
+            self._writer.write_table(self.get_table(parquet_file.read_row_group(index).to_pylist(), schema))
+        old_spool.close()
+
+    def write_batch(self, records: List[Dict[str, Any]], header: bool) -> None:
+        """Write a batch of records as a row group"""
+        records = [dict(record) for record in records]
+        if not self._writer:
+            self._spool = tempfile.TemporaryFile()
+            self._writer = pyarrow.parquet.ParquetWriter(self._spool, self.get_schema(records))
+        else:
+            schema = self.combine_schemas([self._writer.schema, self.get_schema(records)])
+            if not schema.equals(self._writer.schema):
+                self._rewrite(schema)
+        self._writer.write_table(self.get_table(records, self._writer.schema))
+
+    def close(self) -> None:
+        """Write the footer of the Parquet file, and copy the temporary file into the file"""
+        if self._writer:
+            self._writer.close()
+            self._spool.seek(0)
+            shutil.copyfileobj(self._spool, self.file)
+            self._spool.close()
+
+
+EXPORT_WRITERS = {
+    DataExportTask.FORMAT_CSV: CSVExportWriter,
+    DataExportTask.FORMAT_CSV_GZ: CSVExportWriter,
+    DataExportTask.FORMAT_JSONL_GZ: JSONLinesExportWriter,
+    DataExportTask.FORMAT_PARQUET: ParquetExportWriter,
+}
+
+
+def get_export_writer(filename: str, file: IO[bytes]) -> ExportWriter:
+    """
+    Get the writer of the export format of the given filename. Unknown formats are written as CSV.
+
+    :param filename: The exported filename
+    :type filename: str
+    :param file: The local binary file to write into
+    :type file: IO[bytes]
+    :return: The writer
+    :rtype: ExportWriter
+    """
+    return EXPORT_WRITERS.get(get_export_format(filename) or DataExportTask.FORMAT_CSV, CSVExportWriter)(file)
+
+
+def combine_parquet_files(part_paths: List[str], file: IO[bytes]) -> None:
+    """
+    Combine the partial Parquet files of an export into one Parquet file, one row group at a time. Parquet files
+    cannot be concatenated like the other formats. The partial files of a parallel export infer their schemas
+    separately, so the row groups are converted to the combined schema of all the partial files.
+
+    :param part_paths: The paths of the partial files in the storage, in order
+    :type part_paths: List[str]
+    :param file: The local binary file to write the combined file into
+    :type file: IO[bytes]
+    """
+    part_paths = [part_path for part_path in part_paths if default_storage.size(part_path)]
+    if not part_paths:
+        return
+
+    schemas = []
+    for part_path in part_paths:
+        with default_storage.open(part_path, 'rb') as part_file:
+            schemas.append(pyarrow.parquet.ParquetFile(part_file).schema_arrow)
+    schema = ParquetExportWriter.combine_schemas(schemas)
+
+    writer = pyarrow.parquet.ParquetWriter(file, schema)
+    for part_path in part_paths:
+        with default_storage.open(part_path, 'rb') as part_file:
+            parquet_file = pyarrow.parquet.ParquetFile(part_file)
+            for index in range(parquet_file.num_row_groups):
+                table = parquet_file.read_row_group(index)
+                if not table.schema.equals(schema):
+                    table = ParquetExportWriter.get_table(table.to_pylist(), schema)
+                writer.write_table(table)
+    writer.close()
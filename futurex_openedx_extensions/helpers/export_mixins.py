@@ -2,35 +2,136 @@
 This module contains a mixin for exporting data to CSV format and related helpers.
 """
 import copy
+import hashlib
+import json
 import logging
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Type
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Max, Model, QuerySet
+from django.utils import timezone
 from eox_tenant.models import TenantConfig
 from rest_framework import status as http_status
+from rest_framework.generics import GenericAPIView
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from futurex_openedx_extensions.helpers import constants as cs
+from futurex_openedx_extensions.helpers.caching import cache_dict
 from futurex_openedx_extensions.helpers.constants import CSV_TASK_LIMIT_PER_USER as TASK_LIMIT
-from futurex_openedx_extensions.helpers.export_csv import log_export_task
+from futurex_openedx_extensions.helpers.export_csv import is_exported_file_available, log_export_task
+from futurex_openedx_extensions.helpers.export_formats import is_export_format_available
 from futurex_openedx_extensions.helpers.models import DataExportTask
+from futurex_openedx_extensions.helpers.querysets import update_removable_annotations
 from futurex_openedx_extensions.helpers.tasks import export_data_to_csv_task
 
 User = get_user_model()
 
 log = logging.getLogger(__name__)
 
+# Fields of the last modification time of the exported records, used in the data watermark of the export
+EXPORT_MODIFIED_FIELDS = ('modified', 'modified_at')
+
+
+def _normalize_fingerprint_value(value: Any) -> Any:
+    """Normalize a value of the export fingerprint. Lists are sorted, since their order does not change the export"""
+    if isinstance(value, dict):
+        return {str(key): _normalize_fingerprint_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sorted(
+            (_normalize_fingerprint_value(item) for item in value),
+            key=lambda item: json.dumps(item, sort_keys=True, default=str),
+        )
+    return value
+
+
+def _cache_name_model_data_watermark(model: Type[Model]) -> str:
+    """Return the cache name of the data watermark of the model"""
+    return f'{cs.CACHE_NAME_EXPORT_DATA_WATERMARK}_{model._meta.label_lower}'
+
+
+@cache_dict(
+    timeout='FX_CACHE_TIMEOUT_EXPORT_DATA_WATERMARK',
+    key_generator_or_name=_cache_name_model_data_watermark,
+)
+def get_model_data_watermark(model: Type[Model]) -> Dict[str, Any]:
+    """
+    Get the data watermark of the model: the last primary key of its table, and the last modification time of its
+    records when the model has a modified field. The whole table is used rather than the exported records, so the
+    values are read from the indexes without counting or filtering the records
+
+    :param model: The model
+    :type model: Type[Model]
+    :return: The data watermark
+    :rtype: Dict[str, Any]
+    """
+    aggregates = {'fx_last_pk': Max('pk')}
+    model_fields = {field.name for field in model._meta.get_fields()}
+    modified_field = next((name for name in EXPORT_MODIFIED_FIELDS if name in model_fields), None)
+    if modified_field:
+        aggregates['fx_last_modified'] = Max(modified_field)
+
+    return model._default_manager.aggregate(**aggregates)  # pylint: disable=protected-access
+
 
 class ExportCSVMixin:
     """
-    Mixin for exporting data to CSV format.
+    Mixin for exporting data to CSV format, or any other format of DataExportTask.FORMAT_CHOICES (download=<format>).
+
+    Views based on GenericAPIView expose their queryset and serializer to the export task, which streams the records
+    directly into the CSV file. Other views, or views setting fx_export_streaming to False, are exported by calling
+    the view page by page.
     """
+    fx_export_streaming = True
+
+    def is_export_streaming_supported(self) -> bool:
+        """Check if the export task can stream the queryset of the view directly"""
+        return bool(self.fx_export_streaming) and isinstance(self, GenericAPIView)
+
+    def get_export_queryset(self) -> QuerySet:
+        """
+        Get the filtered queryset to export. Unordered querysets are ordered by primary key to keep the order stable
+        when the export is continued in another task.
+
+        :return: The queryset to export
+        :rtype: QuerySet
+        """
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        if not queryset.ordered:
+            ordered_queryset = queryset.order_by('pk')
+            update_removable_annotations(ordered_queryset, removable=getattr(queryset, 'removable_annotations', None))
+            queryset = ordered_queryset
+        return queryset
+
+    def get_export_count(self, queryset: QuerySet) -> int:
+        """Get the number of records to export, counted the same way as the paginator of the view"""
+        paginator_class = getattr(self.paginator, 'django_paginator_class', None)  # type: ignore[attr-defined]
+        if paginator_class is None:
+            return queryset.count()
+        return paginator_class(queryset, 1).count
+
+    def serialize_export_items(self, items: List[Any]) -> List[Any]:
+        """Serialize a chunk of exported records"""
+        return self.get_serializer(items, many=True).data  # type: ignore[attr-defined]
+
+    @property
+    def export_format(self) -> str:
+        """
+        Get the export format requested by the download parameter. CSV exports are compressed on the fly (csv.gz)
+        when FX_TASK_EXPORT_GZIP is set
+        """
+        export_format = self.request.query_params.get('download', '').lower()  # type: ignore[attr-defined]
+        if export_format == DataExportTask.FORMAT_CSV and settings.FX_TASK_EXPORT_GZIP:
+            return DataExportTask.FORMAT_CSV_GZ
+        return export_format
+
     @property
     def export_filename(self) -> str:
         """Get the generated file name with the current timestamp including microseconds"""
         current_time = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        return f'{self.fx_view_name}_{current_time}.csv'  # type: ignore[attr-defined]
+        return f'{self.fx_view_name}_{current_time}.{self.export_format}'  # type: ignore[attr-defined]
 
     def get_view_request_url(self) -> str:
         """Create url from current request with given query params"""
@@ -61,7 +162,69 @@ class ExportCSVMixin:
         """
         return None
 
-    def generate_csv_url_response(self) -> dict:
+    def get_export_data_watermark(self) -> str:
+        """
+        Watermark of the exported data, included in the export fingerprint, so identical export requests are not
+        answered by an export of older data. Views exported by streaming their queryset use the data watermark of the
+        exported model, which changes when a record is added or modified. Other views return an empty watermark, so
+        their exports are reused for FX_TASK_EXPORT_REUSE_SECONDS only; related view can override it to return a value
+        that changes when the data changes.
+
+        :return: The watermark
+        :rtype: str
+        """
+        if not self.is_export_streaming_supported():
+            return ''
+
+        return json.dumps(get_model_data_watermark(self.get_export_queryset().model), sort_keys=True, default=str)
+
+    def get_export_fingerprint(self) -> str:
+        """
+        Get the fingerprint of the export request: a hash of the view name, the normalized query params, the export
+        format, the permission scope, and the data watermark. Identical export requests have the same fingerprint.
+
+        :return: The fingerprint
+        :rtype: str
+        """
+        query_params = self.get_filtered_query_params()
+        fingerprint_data = _normalize_fingerprint_value({
+            'view_name': self.fx_view_name,  # type: ignore[attr-defined]
+            'query_params': dict(query_params.lists()) if hasattr(query_params, 'lists') else query_params,
+            'kwargs': self.kwargs,  # type: ignore[attr-defined]
+            'export_format': self.export_format,
+            'fx_permission_info': self.get_serialized_fx_permission_info(),
+            'watermark': self.get_export_data_watermark(),
+        })
+        return hashlib.sha256(
+            json.dumps(fingerprint_data, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+
+    def get_reusable_export_task(self, fingerprint: str) -> DataExportTask | None:
+        """
+        Get a recent export task of the user with the same fingerprint, that is still in progress, or completed with
+        its file still available. Failed tasks are never reused.
+
+        :param fingerprint: The fingerprint of the export request
+        :type fingerprint: str
+        :return: The task to reuse, or None
+        :rtype: DataExportTask | None
+        """
+        if not settings.FX_TASK_EXPORT_REUSE_SECONDS:
+            return None
+
+        fx_task = DataExportTask.objects.filter(
+            user=self.request.user,  # type: ignore[attr-defined]
+            fingerprint=fingerprint,
+            created_at__gte=timezone.now() - timedelta(seconds=settings.FX_TASK_EXPORT_REUSE_SECONDS),
+        ).exclude(status=DataExportTask.STATUS_FAILED).order_by('-id').first()
+
+        if fx_task is None or (
+            fx_task.status == DataExportTask.STATUS_COMPLETED and not is_exported_file_available(fx_task)
+        ):
+            return None
+        return fx_task
+
+    def generate_csv_url_response(self, fingerprint: str = '') -> dict:
         """Return response with csv file url"""
         filtered_query_params = self.get_filtered_query_params()
         view_url = self.get_view_request_url()
@@ -83,7 +246,9 @@ class ExportCSVMixin:
             view_name=self.__class__.fx_view_name,  # type: ignore[attr-defined]
             user=self.request.user,  # type: ignore[attr-defined]
             tenant=TenantConfig.objects.get(id=tenant_id),
-            related_id=self.get_related_id()  # type: ignore[func-returns-value]
+            related_id=self.get_related_id(),  # type: ignore[func-returns-value]
+            export_format=self.export_format,
+            fingerprint=fingerprint,
         )
         async_task = export_data_to_csv_task.delay(
             fx_task.id, view_url, view_data, fx_permission_info, exported_filename,
@@ -104,29 +269,60 @@ class ExportCSVMixin:
         )
         return user_exported_tasks.count()
 
-    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        """Override the list method to generate CSV and return JSON response with CSV URL"""
-        if self.request.query_params.get('download', '').lower() == 'csv':  # type: ignore[attr-defined]
-            permitted_tenant_ids = self.request.fx_permission_info[  # type: ignore[attr-defined]
-                'view_allowed_tenant_ids_any_access'
-            ]
+    def get_export_request_error(self, export_format: str) -> Response | None:
+        """
+        Validate the export request of the user.
 
-            if not self.request.fx_permission_info['download_allowed']:  # type: ignore[attr-defined]
-                return Response(
-                    {'detail': 'You are not permitted to use the "download" parameter'},
-                    status=http_status.HTTP_403_FORBIDDEN
-                )
+        :param export_format: The requested export format
+        :type export_format: str
+        :return: The error response, or None if the export request is valid
+        :rtype: Response | None
+        """
+        permitted_tenant_ids = self.request.fx_permission_info[  # type: ignore[attr-defined]
+            'view_allowed_tenant_ids_any_access'
+        ]
 
-            if len(permitted_tenant_ids) > 1:
-                return Response(
-                    {'detail': 'Download CSV functionality is not implemented for multiple tenants!'},
-                    status=http_status.HTTP_400_BAD_REQUEST,
-                )
-            if len(permitted_tenant_ids) == 0:
-                return Response(
-                    {'detail': 'Missing tenant access'},
-                    status=http_status.HTTP_403_FORBIDDEN
-                )
+        if not self.request.fx_permission_info['download_allowed']:  # type: ignore[attr-defined]
+            return Response(
+                {'detail': 'You are not permitted to use the "download" parameter'},
+                status=http_status.HTTP_403_FORBIDDEN
+            )
+
+        if len(permitted_tenant_ids) > 1:
+            return Response(
+                {'detail': 'Download CSV functionality is not implemented for multiple tenants!'},
+                status=http_status.HTTP_400_BAD_REQUEST,
+            )
+        if len(permitted_tenant_ids) == 0:
+            return Response(
+                {'detail': 'Missing tenant access'},
+                status=http_status.HTTP_403_FORBIDDEN
+            )
+
+        if not is_export_format_available(export_format):
+            return Response(
+                {'detail': f'Export format ({export_format}) is not available on this server!'},
+                status=http_status.HTTP_400_BAD_REQUEST,
+            )
+
+        return None
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Override the list method to generate the export file and return JSON response with the export task ID"""
+        download = self.request.query_params.get('download', '').lower()  # type: ignore[attr-defined]
+        if download in [choice[0] for choice in DataExportTask.FORMAT_CHOICES]:
+            error_response = self.get_export_request_error(download)
+            if error_response:
+                return error_response
+
+            fingerprint = self.get_export_fingerprint()
+            reusable_task = self.get_reusable_export_task(fingerprint)
+            if reusable_task:
+                log.info('CSV Export: reusing task %s for an identical export request.', reusable_task.id)
+                return Response({
+                    'success': f'Task already exists with id: {reusable_task.id}',
+                    'export_task_id': reusable_task.id,
+                }, status=http_status.HTTP_200_OK)
 
             if self.get_existing_incompleted_task_count() >= TASK_LIMIT:
                 return Response(
@@ -134,6 +330,6 @@ class ExportCSVMixin:
                     status=http_status.HTTP_429_TOO_MANY_REQUESTS
                 )
 
-            response = self.generate_csv_url_response()
+            response = self.generate_csv_url_response(fingerprint=fingerprint)
             return Response(response, status=http_status.HTTP_200_OK)
         return super().list(request, args, kwargs)  # type: ignore
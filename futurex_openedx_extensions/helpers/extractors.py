@@ -5,16 +5,19 @@ import importlib
 import re
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 from urllib.parse import urlparse
 
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from opaque_keys.edx.locator import LibraryLocator
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from xmodule.modulestore.django import modulestore
 
 from futurex_openedx_extensions.helpers import constants as cs
+from futurex_openedx_extensions.helpers.caching import cache_dict, invalidate_cache, request_memo
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
 
 
@@ -142,6 +145,89 @@ def verify_course_ids(course_ids: List[str]) -> None:
             )
 
 
+@cache_dict(
+    timeout='FX_CACHE_TIMEOUT_LIBRARY_KEYS',
+    key_generator_or_name=cs.CACHE_NAME_LIBRARY_KEYS_INDEX,
+    local_timeout='FX_CACHE_LOCAL_TIMEOUT',
+)
+def get_library_keys_index() -> Dict[str, Dict[str, str]]:
+    """
+    Get the index of the organizations of all library keys, by library ID. It saves reading all the library keys from
+    the modulestore and scanning them for every lookup.
+
+    {
+        'by_id': {<library_id>: <org>, ...},
+    }
+
+    :return: The library keys index
+    :rtype: Dict[str, Dict[str, str]]
+    """
+    return {
+        'by_id': {str(lib_key): lib_key.org for lib_key in modulestore().get_library_keys()},
+    }
+
+
+def cache_name_library_not_found(library_id: str) -> str:
+    """
+    Get the cache name of the marker of a library ID that was not found in the modulestore
+
+    :param library_id: The library ID
+    :type library_id: str
+    :return: The cache name
+    :rtype: str
+    """
+    return f'{cs.CACHE_NAME_LIBRARY_NOT_FOUND}_{library_id}'
+
+
+def invalidate_library_keys_index(library_ids: Iterable[str] = ()) -> None:
+    """
+    Invalidate the library keys index, and forget that the given library IDs were not found in the modulestore. Only
+    the index is invalidated; the other caches and the local cache generation are kept.
+
+    :param library_ids: The IDs of the libraries to forget that were not found, such as newly created libraries
+    :type library_ids: Iterable[str]
+    """
+    invalidate_cache(cs.CACHE_NAME_LIBRARY_KEYS_INDEX)
+    cache.delete_many([cache_name_library_not_found(library_id) for library_id in library_ids])
+
+
+def get_orgs_of_libraries(library_ids: Iterable[str]) -> Dict[str, str]:
+    """
+    Get the organizations of the libraries with the given IDs from the library keys index. IDs missing from the index
+    are looked up in the modulestore, since the library could be created in Studio after the index was cached. The
+    index is refreshed when any of them is found. IDs that are not of existing libraries are ignored, and remembered
+    for FX_CACHE_TIMEOUT_LIBRARY_NOT_FOUND seconds so they are not looked up again on every call.
+
+    :param library_ids: The IDs to get the organizations of. Course IDs are allowed and ignored
+    :type library_ids: Iterable[str]
+    :return: The organization of every library, by library ID
+    :rtype: Dict[str, str]
+    """
+    library_ids = set(library_ids)
+    libraries = get_library_keys_index()['by_id']
+
+    missing_library_ids = {
+        cache_name_library_not_found(library_id): library_id for library_id in sorted(library_ids)
+        if library_id not in libraries and re.search(cs.LIBRARY_ID_REGX_EXACT, library_id)
+    }
+    for cache_name in cache.get_many(list(missing_library_ids)):
+        missing_library_ids.pop(cache_name)
+
+    if missing_library_ids:
+        store = modulestore()
+        not_found = {
+            cache_name: True for cache_name, library_id in missing_library_ids.items()
+            if not store.get_library(LibraryLocator.from_string(library_id))
+        }
+        if not_found:
+            cache.set_many(not_found, settings.FX_CACHE_TIMEOUT_LIBRARY_NOT_FOUND)
+        if len(not_found) < len(missing_library_ids):
+            invalidate_library_keys_index()
+            libraries = get_library_keys_index()['by_id']
+
+    return {library_id: libraries[library_id] for library_id in library_ids if library_id in libraries}
+
+
 def get_orgs_of_courses(course_ids: List[str]) -> Dict[str, Any]:
     """
     Get the organization of the courses with the given course IDs.
@@ -161,9 +247,7 @@ def get_orgs_of_courses(course_ids: List[str]) -> Dict[str, Any]:
     }
 
     result['courses'].update({
-        str(lib_key): lib_key.org.lower()
-        for lib_key in modulestore().get_library_keys()
-        if str(lib_key) in course_ids
+        library_id: org.lower() for library_id, org in get_orgs_of_libraries(course_ids).items()
     })
 
     invalid_course_ids = [course_id for course_id in course_ids if course_id not in result['courses']]
@@ -173,6 +257,19 @@ def get_orgs_of_courses(course_ids: List[str]) -> Dict[str, Any]:
     return result
 
 
+def _partial_access_course_ids_memo_key(fx_permission_info: dict, include_libraries: bool = False) -> Tuple:
+    """Return the request memo key of get_partial_access_course_ids"""
+    user = fx_permission_info['user']
+    return (
+        user.id if user else None,
+        fx_permission_info['is_system_staff_user'],
+        tuple(sorted(fx_permission_info['view_allowed_roles'])),
+        tuple(sorted(fx_permission_info['view_allowed_course_access_orgs'])),
+        include_libraries,
+    )
+
+
+@request_memo(key_generator=_partial_access_course_ids_memo_key)
 def get_partial_access_course_ids(fx_permission_info: dict, include_libraries: bool = False) -> List[str]:
     """
     Get the course IDs that the user has partial access to according to the permission information.
@@ -203,9 +300,7 @@ def get_partial_access_course_ids(fx_permission_info: dict, include_libraries: b
 
     only_limited_access_libraries = []
     if include_libraries:
-        only_limited_access_libraries = [
-            str(lib_key) for lib_key in modulestore().get_library_keys() if str(lib_key) in course_ids_to_check
-        ]
+        only_limited_access_libraries = sorted(get_orgs_of_libraries(course_ids_to_check))
 
     return [str(course_id) for course_id in only_limited_access] + only_limited_access_libraries
 
@@ -0,0 +1,61 @@
+"""
+Django management command to recompute the course access roles cache of the users in bulk.
+
+Use it to prewarm the cache after a deploy, a cache invalidation, or a bulk import of course access roles.
+
+Usage:
+    python manage.py lms cache_course_access_roles
+    python manage.py lms cache_course_access_roles --user-ids 3 7 9
+    python manage.py lms cache_course_access_roles --async
+
+"""
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from futurex_openedx_extensions.helpers import constants as cs
+from futurex_openedx_extensions.helpers.roles import cache_course_access_roles_of_users
+from futurex_openedx_extensions.helpers.tasks import cache_course_access_roles_task
+
+
+class Command(BaseCommand):
+    """Django management command to recompute the course access roles cache."""
+
+    help = 'Recompute the course access roles cache of all the users who have roles, or of the given users'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            '--user-ids',
+            nargs='+',
+            type=int,
+            help='IDs of the users to recompute. All the users who have course access roles if not provided',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=cs.COURSE_ACCESS_ROLES_CACHE_BATCH_SIZE,
+            help='Number of users to recompute in one batch',
+        )
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='run_async',
+            help='Run the recompute in a celery task instead of this process',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Execute the command to recompute the course access roles cache."""
+        user_ids = options['user_ids']
+
+        if options['run_async']:
+            async_task = cache_course_access_roles_task.delay(user_ids)
+            self.stdout.write(self.style.SUCCESS(
+                f'Course access roles cache recompute is scheduled in task ({async_task.id})'
+            ))
+            return
+
+        users_count = cache_course_access_roles_of_users(user_ids, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully recomputed the course access roles cache of {users_count} users'
+        ))
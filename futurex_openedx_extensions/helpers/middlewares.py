@@ -0,0 +1,19 @@
+"""Middlewares"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from futurex_openedx_extensions.helpers.caching import request_memo_context
+
+
+class FXRequestMemoMiddleware:  # pylint: disable=too-few-public-methods
+    """Open a memo store for every request, so helpers decorated with request_memo run once per request"""
+
+    def __init__(self, get_response: Callable) -> None:
+        """Initialize the middleware"""
+        self.get_response = get_response
+
+    def __call__(self, request: Any) -> Any:
+        """Process the request within a memo context"""
+        with request_memo_context():
+            return self.get_response(request)
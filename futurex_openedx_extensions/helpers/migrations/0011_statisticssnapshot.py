@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_tenant', '0008_synchronize_tenants'),
+        ('fx_helpers', '0010_historicalconfigmirror_configmirror'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticsSnapshotWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('watermark', models.DateTimeField(help_text='Records created or modified after this time are not in the snapshot')),
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='eox_tenant.tenantconfig')),
+            ],
+            options={
+                'verbose_name': 'Statistics Snapshot Watermark',
+                'verbose_name_plural': 'Statistics Snapshot Watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='StatisticsSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('org', models.CharField(blank=True, default='', help_text='Empty for tenant-wide statistics', max_length=255)),
+                ('snapshot_date', models.DateField()),
+                ('learners_count', models.IntegerField(default=0)),
+                ('enrollments_count', models.IntegerField(default=0)),
+                ('certificates_count', models.IntegerField(default=0)),
+                ('learning_hours_count', models.FloatField(default=0.0)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='eox_tenant.tenantconfig')),
+            ],
+            options={
+                'verbose_name': 'Statistics Snapshot',
+                'verbose_name_plural': 'Statistics Snapshots',
+                'unique_together': {('tenant', 'org', 'snapshot_date')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fx_helpers', '0011_statisticssnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataexporttask',
+            name='chunks_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of the chunks of a parallel export. Zero if the export is not parallel'),
+        ),
+        migrations.AddField(
+            model_name='dataexporttask',
+            name='completed_chunks',
+            field=models.PositiveIntegerField(default=0, help_text='Number of the completed chunks of a parallel export'),
+        ),
+    ]
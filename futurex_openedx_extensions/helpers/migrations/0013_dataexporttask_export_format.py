@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fx_helpers', '0012_dataexporttask_chunks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataexporttask',
+            name='export_format',
+            field=models.CharField(choices=[('csv', 'csv'), ('csv.gz', 'csv.gz'), ('jsonl.gz', 'jsonl.gz'), ('parquet', 'parquet')], default='csv', max_length=16),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fx_helpers', '0013_dataexporttask_export_format'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataexporttask',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Hash of the exported view, filters, format, and permission scope. Used to reuse identical exports', max_length=64),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fx_helpers', '0014_dataexporttask_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clickhousequery',
+            name='cache_timeout',
+            field=models.PositiveIntegerField(default=0, help_text='Seconds to cache the results of the query. Zero disables the caching'),
+        ),
+        migrations.AddField(
+            model_name='historicalclickhousequery',
+            name='cache_timeout',
+            field=models.PositiveIntegerField(default=0, help_text='Seconds to cache the results of the query. Zero disables the caching'),
+        ),
+    ]
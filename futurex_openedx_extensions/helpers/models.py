@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
 import random
 import re
 from typing import Any, Dict, List, Tuple
 
 from common.djangoapps.student.models import CourseAccessRole
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import BooleanField, Case, Exists, OuterRef, Q, QuerySet, Value, When
+from django.db.models import BooleanField, Case, Exists, F, OuterRef, Q, QuerySet, Value, When
+from django.db.models.functions import Least
 from django.db.utils import IntegrityError
 from django.utils import timezone
 from eox_tenant.models import TenantConfig
@@ -221,6 +225,9 @@ class ClickhouseQuery(models.Model):
     params_config = models.JSONField(default=dict, blank=True)
     paginated = models.BooleanField(default=True)
     enabled = models.BooleanField(default=True)
+    cache_timeout = models.PositiveIntegerField(
+        default=0, help_text='Seconds to cache the results of the query. Zero disables the caching',
+    )
     modified_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -329,7 +336,7 @@ class ClickhouseQuery(models.Model):
 
         params = self.get_sample_params()
         try:
-            with ch.get_client() as clickhouse_client:
+            with ch.get_pooled_client() as clickhouse_client:
                 self.fix_param_types(params=params)
                 ch.validate_clickhouse_query(clickhouse_client, self.query, parameters=params)
         except ch.ClickhouseBaseError as exc:
@@ -380,6 +387,62 @@ class ClickhouseQuery(models.Model):
             else:
                 params[param_name] = None
 
+    def get_results_cache_key(self, params: Dict[str, Any], page: int | None, page_size: int) -> str:
+        """
+        Get the cache key of the results of the query with the given parameters. The key includes the last
+        modification time of the query, so editing the query does not return the results of its older version.
+
+        :param params: The typed parameters of the query, including the builtin ones.
+        :type params: Dict[str, Any]
+        :param page: The page number, or None if not paginated.
+        :type page: int | None
+        :param page_size: The page size.
+        :type page_size: int
+        :return: The cache key.
+        :rtype: str
+        """
+        normalized_params = {
+            name: sorted(value) if isinstance(value, list) else value for name, value in params.items()
+        }
+        params_hash = hashlib.sha256(json.dumps(
+            [normalized_params, page, page_size, self.modified_at], sort_keys=True, default=str,
+        ).encode('utf-8')).hexdigest()
+        return f'{cs.CACHE_NAME_CLICKHOUSE_QUERY_RESULTS}_{self.scope}_{self.version}_{self.slug}_{params_hash}'
+
+    def get_cached_results(self, params: Dict[str, Any], page: int | None, page_size: int) -> Dict[str, Any] | None:
+        """
+        Get the cached results of the query with the given parameters.
+
+        :param params: The typed parameters of the query, including the builtin ones.
+        :type params: Dict[str, Any]
+        :param page: The page number, or None if not paginated.
+        :type page: int | None
+        :param page_size: The page size.
+        :type page_size: int
+        :return: The cached results, or None if not cached or the caching is disabled for the query.
+        :rtype: Dict[str, Any] | None
+        """
+        if not self.cache_timeout:
+            return None
+        return cache.get(self.get_results_cache_key(params, page, page_size))
+
+    def cache_results(self, params: Dict[str, Any], page: int | None, page_size: int, results: Dict[str, Any]) -> None:
+        """
+        Cache the results of the query with the given parameters for cache_timeout seconds. Does nothing when
+        cache_timeout is zero.
+
+        :param params: The typed parameters of the query, including the builtin ones.
+        :type params: Dict[str, Any]
+        :param page: The page number, or None if not paginated.
+        :type page: int | None
+        :param page_size: The page size.
+        :type page_size: int
+        :param results: The results to cache.
+        :type results: Dict[str, Any]
+        """
+        if self.cache_timeout:
+            cache.set(self.get_results_cache_key(params, page, page_size), results, self.cache_timeout)
+
     @classmethod
     def get_query_record(cls, scope: str, version: str, slug: str) -> ClickhouseQuery | None:
         """
@@ -428,6 +491,7 @@ class ClickhouseQuery(models.Model):
                 description=item.get('description'),
                 query=item['query'],
                 params_config=item.get('params_config') or {},
+                cache_timeout=item.get('cache_timeout') or 0,
             )
 
     @classmethod
@@ -452,6 +516,18 @@ class DataExportTask(models.Model):
         (STATUS_FAILED, STATUS_FAILED),
     ]
 
+    FORMAT_CSV = 'csv'
+    FORMAT_CSV_GZ = 'csv.gz'
+    FORMAT_JSONL_GZ = 'jsonl.gz'
+    FORMAT_PARQUET = 'parquet'
+
+    FORMAT_CHOICES = [
+        (FORMAT_CSV, FORMAT_CSV),
+        (FORMAT_CSV_GZ, FORMAT_CSV_GZ),
+        (FORMAT_JSONL_GZ, FORMAT_JSONL_GZ),
+        (FORMAT_PARQUET, FORMAT_PARQUET),
+    ]
+
     filename = models.CharField(max_length=255)
     view_name = models.CharField(max_length=255)
     related_id = models.CharField(max_length=255, null=True, blank=True)
@@ -464,6 +540,17 @@ class DataExportTask(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     error_message = models.CharField(max_length=255, null=True, blank=True)
+    export_format = models.CharField(max_length=16, choices=FORMAT_CHOICES, default=FORMAT_CSV)
+    fingerprint = models.CharField(
+        max_length=64, default='', blank=True, db_index=True,
+        help_text='Hash of the exported view, filters, format, and permission scope. Used to reuse identical exports',
+    )
+    chunks_count = models.PositiveIntegerField(
+        default=0, help_text='Number of the chunks of a parallel export. Zero if the export is not parallel',
+    )
+    completed_chunks = models.PositiveIntegerField(
+        default=0, help_text='Number of the completed chunks of a parallel export',
+    )
 
     class Meta:
         """Metaclass for the model"""
@@ -508,14 +595,20 @@ class DataExportTask(models.Model):
             )
 
         fx_task.status = status
+        update_fields = ['status']
         if status == cls.STATUS_FAILED and error_message:
             fx_task.error_message = error_message[:255]
+            update_fields.append('error_message')
         if status == cls.STATUS_PROCESSING:
             fx_task.started_at = timezone.now()
+            update_fields.append('started_at')
         if status == cls.STATUS_COMPLETED:
             fx_task.completed_at = timezone.now()
             fx_task.progress = 1.0
-        fx_task.save()
+            update_fields += ['completed_at', 'progress']
+        fx_task.save(update_fields=update_fields)
+        if status in [cls.STATUS_COMPLETED, cls.STATUS_FAILED]:
+            cache.delete(cls.get_progress_cache_key(task_id))
 
     @classmethod
     def get_status(cls, task_id: int) -> str:
@@ -555,27 +648,149 @@ class DataExportTask(models.Model):
     @classmethod
     def set_progress(cls, task_id: int, progress: float) -> None:
         """
-        Set the progress of the task.
+        Set the progress of the task, in one update of the progress column only.
 
         :param task_id: The ID of the task.
         :type task_id: int
         :param progress: The progress to set.
         :type progress: float
         """
-        fx_task = cls.get_task(task_id)
-        if fx_task.status != cls.STATUS_PROCESSING:
+        if not isinstance(progress, float) or progress < 0.0 or progress > 1.0:
+            raise FXCodedException(
+                code=FXExceptionCodes.EXPORT_CSV_TASK_INVALID_PROGRESS_VALUE,
+                message=f'Invalid progress value! ({progress}).'
+            )
+
+        if not cls.objects.filter(id=task_id, status=cls.STATUS_PROCESSING).update(progress=progress):
             raise FXCodedException(
                 code=FXExceptionCodes.EXPORT_CSV_TASK_CANNOT_CHANGE_PROGRESS,
-                message=f'Cannot set progress for a task with status ({fx_task.status}).'
+                message=f'Cannot set progress for a task with status ({cls.get_task(task_id).status}).'
             )
 
-        if not isinstance(progress, float) or progress < 0.0 or progress > 1.0:
+    @classmethod
+    def add_progress(cls, task_id: int, progress_delta: float) -> None:
+        """
+        Add to the progress of the task in one atomic update, so concurrent workers of the same task do not
+        overwrite each other's progress. The progress never exceeds 1.0.
+
+        :param task_id: The ID of the task.
+        :type task_id: int
+        :param progress_delta: The progress to add.
+        :type progress_delta: float
+        """
+        if not isinstance(progress_delta, float) or progress_delta < 0.0 or progress_delta > 1.0:
             raise FXCodedException(
                 code=FXExceptionCodes.EXPORT_CSV_TASK_INVALID_PROGRESS_VALUE,
-                message=f'Invalid progress value! ({progress}).'
+                message=f'Invalid progress value! ({progress_delta}).'
             )
-        fx_task.progress = progress
-        fx_task.save()
+
+        if not cls.objects.filter(id=task_id, status=cls.STATUS_PROCESSING).update(
+            progress=Least(F('progress') + progress_delta, Value(1.0)),
+        ):
+            raise FXCodedException(
+                code=FXExceptionCodes.EXPORT_CSV_TASK_CANNOT_CHANGE_PROGRESS,
+                message=f'Cannot add progress for a task with status ({cls.get_task(task_id).status}).'
+            )
+
+    @classmethod
+    def set_chunks_count(cls, task_id: int, chunks_count: int) -> None:
+        """
+        Set the number of the chunks of a parallel export, and reset the number of its completed chunks.
+
+        :param task_id: The ID of the task.
+        :type task_id: int
+        :param chunks_count: The number of the chunks.
+        :type chunks_count: int
+        """
+        cls.objects.filter(id=task_id).update(chunks_count=chunks_count, completed_chunks=0)
+
+    @classmethod
+    def complete_chunk(cls, task_id: int) -> bool:
+        """
+        Count one more completed chunk of a parallel export. The count is increased and read in one transaction, so
+        only the worker of the last completed chunk gets True, even when chunks complete concurrently.
+
+        :param task_id: The ID of the task.
+        :type task_id: int
+        :return: True if all the chunks are completed, False otherwise or if the task is not processing anymore.
+        :rtype: bool
+        """
+        with transaction.atomic():
+            if not cls.objects.filter(id=task_id, status=cls.STATUS_PROCESSING).update(
+                completed_chunks=F('completed_chunks') + 1,
+            ):
+                return False
+            fx_task = cls.objects.only('chunks_count', 'completed_chunks').get(id=task_id)
+            return fx_task.completed_chunks == fx_task.chunks_count
+
+    @staticmethod
+    def get_progress_cache_key(task_id: int) -> str:
+        """
+        Get the cache key of the mirrored progress of the task.
+
+        :param task_id: The ID of the task.
+        :type task_id: int
+        :return: The cache key.
+        :rtype: str
+        """
+        return f'{cs.CACHE_NAME_EXPORT_TASK_PROGRESS}_{task_id}'
+
+    @classmethod
+    def cache_progress(cls, task_id: int, progress: float) -> None:
+        """
+        Mirror the latest progress of the task to the cache, so it can be polled before it is saved. Does nothing
+        when FX_TASK_PROGRESS_CACHE_TIMEOUT is zero.
+
+        :param task_id: The ID of the task.
+        :type task_id: int
+        :param progress: The progress to mirror.
+        :type progress: float
+        """
+        if settings.FX_TASK_PROGRESS_CACHE_TIMEOUT:
+            cache.set(cls.get_progress_cache_key(task_id), progress, settings.FX_TASK_PROGRESS_CACHE_TIMEOUT)
+
+    @classmethod
+    def get_cached_progress(cls, task_id: int) -> float | None:
+        """
+        Get the progress of the task mirrored to the cache.
+
+        :param task_id: The ID of the task.
+        :type task_id: int
+        :return: The mirrored progress, or None if it is not in the cache.
+        :rtype: float | None
+        """
+        if not settings.FX_TASK_PROGRESS_CACHE_TIMEOUT:
+            return None
+        return cache.get(cls.get_progress_cache_key(task_id))
+
+
+class StatisticsSnapshot(models.Model):
+    """
+    Precomputed statistics per tenant, per org, and per day. The day is the creation day of the counted records.
+    Learners are not related to orgs, they are stored in the tenant-wide records that have an empty org
+    """
+    tenant = models.ForeignKey(TenantConfig, on_delete=models.CASCADE)
+    org = models.CharField(max_length=255, blank=True, default='', help_text='Empty for tenant-wide statistics')
+    snapshot_date = models.DateField()
+    learners_count = models.IntegerField(default=0)
+    enrollments_count = models.IntegerField(default=0)
+    certificates_count = models.IntegerField(default=0)
+    learning_hours_count = models.FloatField(default=0.0)
+
+    class Meta:
+        verbose_name = 'Statistics Snapshot'
+        verbose_name_plural = 'Statistics Snapshots'
+        unique_together = ('tenant', 'org', 'snapshot_date')
+
+
+class StatisticsSnapshotWatermark(models.Model):
+    """The time of the last refresh of the statistics snapshot of a tenant"""
+    tenant = models.OneToOneField(TenantConfig, on_delete=models.CASCADE)
+    watermark = models.DateTimeField(help_text='Records created or modified after this time are not in the snapshot')
+
+    class Meta:
+        verbose_name = 'Statistics Snapshot Watermark'
+        verbose_name_plural = 'Statistics Snapshot Watermarks'
 
 
 class ConfigAccessControl(models.Model):
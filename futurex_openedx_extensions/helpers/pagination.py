@@ -1,8 +1,16 @@
 """Pagination helpers and classes for the API views."""
+from __future__ import annotations
+
+from typing import Any, List
+
 from django.core.paginator import Paginator
 from django.db.models.query import QuerySet
 from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from futurex_openedx_extensions.helpers.querysets import verify_queryset_removable_annotations
 
@@ -25,9 +33,113 @@ class DefaultPaginator(Paginator):
 
 
 class DefaultPagination(PageNumberPagination):
-    """Default pagination settings for the API views."""
+    """
+    Default pagination settings for the API views.
+
+    Views setting fx_keyset_pagination to True also accept the keyset pagination mode (pagination=keyset). In keyset
+    mode, the records are ordered by ID, and every page starts after the ID of the last record of the previous page
+    (after=<id>). This makes deep pages as cheap as the first one, since no OFFSET is used. The total count can be
+    skipped in this mode with count=0.
+    """
     page_size: int = 20
     page_size_query_param: str = 'page_size'
     max_page_size: int = 100
 
     django_paginator_class = DefaultPaginator
+
+    pagination_mode_query_param: str = 'pagination'
+    keyset_query_param: str = 'after'
+    count_query_param: str = 'count'
+    keyset_field: str = 'id'
+
+    PAGINATION_MODE_PAGE = 'page'
+    PAGINATION_MODE_KEYSET = 'keyset'
+
+    keyset_mode: bool = False
+    keyset_base_url: str = ''
+    keyset_count: int | None = None
+    keyset_last_value: Any = None
+
+    def is_keyset_pagination(self, request: Request, view: Any = None) -> bool:
+        """
+        Check if the keyset pagination mode is requested, and allowed for the view.
+
+        :param request: The request object
+        :type request: Request
+        :param view: The view object
+        :type view: Any
+        :return: True if the keyset pagination mode is used
+        :rtype: bool
+        """
+        return bool(getattr(view, 'fx_keyset_pagination', False)) and request.query_params.get(
+            self.pagination_mode_query_param, self.PAGINATION_MODE_PAGE,
+        ) == self.PAGINATION_MODE_KEYSET
+
+    def get_keyset_after(self, request: Request) -> int | None:
+        """
+        Get the ID of the last record of the previous page from the request.
+
+        :param request: The request object
+        :type request: Request
+        :return: The ID of the last record of the previous page, or None for the first page
+        :rtype: int | None
+        """
+        after = request.query_params.get(self.keyset_query_param)
+        if after in (None, ''):
+            return None
+        try:
+            return int(after)
+        except ValueError as exc:
+            raise NotFound(f'Invalid {self.keyset_query_param} value: {after}') from exc
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> List | None:
+        """Paginate the queryset by page number, or by keyset if the keyset pagination mode is requested"""
+        self.keyset_mode = self.is_keyset_pagination(request, view)
+        if not self.keyset_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.keyset_base_url = remove_query_param(request.build_absolute_uri(), self.page_query_param)
+        after = self.get_keyset_after(request)
+
+        self.keyset_count = None
+        if request.query_params.get(self.count_query_param, '1') != '0':
+            self.keyset_count = self.django_paginator_class(queryset, page_size).count
+
+        queryset = queryset.order_by(self.keyset_field)
+        if after is not None:
+            queryset = queryset.filter(**{f'{self.keyset_field}__gt': after})
+
+        page = list(queryset[:page_size + 1])
+        self.keyset_last_value = getattr(page[page_size - 1], self.keyset_field) if len(page) > page_size else None
+        return page[:page_size]
+
+    def get_next_link(self) -> str | None:
+        """Get the link of the next page"""
+        if not self.keyset_mode:
+            return super().get_next_link()
+
+        if self.keyset_last_value is None:
+            return None
+        return replace_query_param(self.keyset_base_url, self.keyset_query_param, self.keyset_last_value)
+
+    def get_previous_link(self) -> str | None:
+        """Get the link of the previous page. Keyset pagination only moves forward"""
+        if not self.keyset_mode:
+            return super().get_previous_link()
+        return None
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """Get the paginated response"""
+        if not self.keyset_mode:
+            return super().get_paginated_response(data)
+
+        return Response({
+            'count': self.keyset_count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -13,8 +13,9 @@ from futurex_openedx_extensions.helpers.roles import (
     check_tenant_access,
     get_accessible_tenant_ids,
     get_user_course_access_roles,
+    get_user_permission_index,
 )
-from futurex_openedx_extensions.helpers.tenants import get_course_org_filter_list, get_org_to_tenant_map
+from futurex_openedx_extensions.helpers.tenants import get_course_org_filter_list
 from futurex_openedx_extensions.helpers.users import is_system_staff_user
 
 
@@ -78,26 +79,21 @@ class FXBaseAuthenticatedPermission(IsAuthenticated):
 
     @staticmethod
     def _set_view_allowed_info(
-        request: Any, tenant_ids: List[int], user_roles: dict, view_allowed_roles: List[str],
+        request: Any, tenant_ids: List[int], view_allowed_roles: List[str],
     ) -> None:
-        """Helper method to set view allowed info."""
-        permitted_orgs: set = set(get_course_org_filter_list(tenant_ids)['course_org_filter_list'])
+        """Helper method to set view allowed info from the cached permission index of the user."""
+        permission_index = get_user_permission_index(request.user.id, view_allowed_roles)
         full_access_orgs: set = set()
         course_access_orgs: set = set()
-        for role in view_allowed_roles:
-            if role in user_roles:
-                full_access_orgs.update(
-                    permitted_orgs & set(user_roles[role]['orgs_full_access'])
-                )
-                course_access_orgs.update(
-                    permitted_orgs & set(user_roles[role]['orgs_of_courses'])
-                )
+        full_access_tenant_ids: set = set()
+        for tenant_id in tenant_ids:
+            tenant_index = permission_index.get(tenant_id)
+            if tenant_index:
+                full_access_orgs.update(tenant_index['full_access_orgs'])
+                course_access_orgs.update(tenant_index['course_access_orgs'])
+                full_access_tenant_ids.update(tenant_index['full_access_tenant_ids'])
         course_access_orgs -= full_access_orgs
 
-        full_access_tenant_ids = set()
-        for org in full_access_orgs:
-            full_access_tenant_ids.update(get_org_to_tenant_map()[org])
-
         request.fx_permission_info.update({
             'view_allowed_full_access_orgs': list(full_access_orgs),
             'view_allowed_course_access_orgs': list(course_access_orgs),
@@ -193,7 +189,7 @@ class FXBaseAuthenticatedPermission(IsAuthenticated):
                 request.fx_permission_info['view_allowed_full_access_orgs']
             return True
 
-        self._set_view_allowed_info(request, tenant_ids, user_roles, view_allowed_roles)
+        self._set_view_allowed_info(request, tenant_ids, view_allowed_roles)
 
         return self.verify_access_roles(request, view)
 
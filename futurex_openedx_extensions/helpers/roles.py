@@ -5,11 +5,13 @@ from __future__ import annotations
 import json
 import logging
 import re
+import uuid
 from copy import deepcopy
 from enum import Enum
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
 from common.djangoapps.student.models import CourseAccessRole, UserSignupSource
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db import DatabaseError, transaction
@@ -20,10 +22,15 @@ from openedx.core.djangoapps.content.course_overviews.models import CourseOvervi
 from rest_framework import status as http_status
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
-from xmodule.modulestore.django import modulestore
 
 from futurex_openedx_extensions.helpers import constants as cs
-from futurex_openedx_extensions.helpers.caching import cache_dict
+from futurex_openedx_extensions.helpers.caching import (
+    cache_dict,
+    cache_dict_set_many,
+    get_cache_generation,
+    invalidate_request_memo,
+    request_memo,
+)
 from futurex_openedx_extensions.helpers.converters import (
     error_details_to_dictionary,
     get_allowed_roles,
@@ -35,13 +42,16 @@ from futurex_openedx_extensions.helpers.extractors import (
     DictHashcode,
     DictHashcodeSet,
     get_orgs_of_courses,
+    get_orgs_of_libraries,
     verify_course_ids,
 )
 from futurex_openedx_extensions.helpers.models import ViewAllowedRoles, ViewUserMapping
 from futurex_openedx_extensions.helpers.querysets import check_staff_exist_queryset, get_search_query
 from futurex_openedx_extensions.helpers.tenants import (
+    get_all_course_org_filter_list,
     get_all_tenant_ids,
     get_course_org_filter_list,
+    get_org_to_tenant_map,
     get_tenants_by_org,
     get_tenants_sites,
 )
@@ -171,7 +181,12 @@ def cache_name_user_course_access_roles(user_id: int) -> str:
     return f'{cs.CACHE_NAME_USER_COURSE_ACCESS_ROLES}_{user_id}'
 
 
-@cache_dict(timeout='FX_CACHE_TIMEOUT_COURSE_ACCESS_ROLES', key_generator_or_name=cache_name_user_course_access_roles)
+@cache_dict(
+    timeout='FX_CACHE_TIMEOUT_COURSE_ACCESS_ROLES',
+    key_generator_or_name=cache_name_user_course_access_roles,
+    stale_timeout='FX_CACHE_STALE_TIMEOUT',
+    early_expiration_beta=cs.CACHE_EARLY_EXPIRATION_BETA,
+)
 def get_user_course_access_roles(user_id: int) -> dict:
     """
     Get all course access roles for one user.
@@ -203,8 +218,22 @@ def get_user_course_access_roles(user_id: int) -> dict:
     :return: All course access roles for the user
     :rtype: dict
     """
-    access_roles = CourseAccessRole.objects.filter(
-        user_id=user_id,
+    access_roles = list(_get_course_access_roles_values([user_id]))
+    return _build_user_course_access_roles(access_roles, _get_orgs_of_access_roles_libraries(access_roles))
+
+
+def _get_course_access_roles_values(user_ids: List[int]) -> QuerySet:
+    """
+    Get the course access roles of the given users, with the lower case orgs of the roles and their courses. The
+    roles are ordered by user, as expected by _build_user_course_access_roles for every user.
+
+    :param user_ids: The user IDs
+    :type user_ids: List[int]
+    :return: The course access roles values
+    :rtype: QuerySet
+    """
+    return CourseAccessRole.objects.filter(
+        user_id__in=user_ids,
     ).annotate(
         course_org=Subquery(
             CourseOverview.objects.filter(id=OuterRef('course_id')).values('org')
@@ -215,11 +244,37 @@ def get_user_course_access_roles(user_id: int) -> dict:
         course_org_lower_case=Lower('course_org'),
     ).values(
         'id', 'user_id', 'role', 'org_lower_case', 'course_id', 'course_org_lower_case',
-    ).order_by('role', 'org_lower_case', 'course_id')  # ordering is crucial for the result
+    ).order_by('user_id', 'role', 'org_lower_case', 'course_id')  # ordering is crucial for the result
+
+
+def _get_orgs_of_access_roles_libraries(access_roles: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Get the organizations of the libraries of the given course access roles values.
+
+    :param access_roles: The course access roles values
+    :type access_roles: List[Dict[str, Any]]
+    :return: The organization of every library, by library ID
+    :rtype: Dict[str, str]
+    """
+    return get_orgs_of_libraries(
+        str(access_role['course_id']) for access_role in access_roles
+        if access_role['course_id'] and not access_role['course_org_lower_case']
+    )
+
+
+def _build_user_course_access_roles(access_roles: Iterable[Dict[str, Any]], libraries: Dict[str, str]) -> dict:
+    """
+    Build the result of get_user_course_access_roles from the course access roles of one user.
 
+    :param access_roles: The course access roles values of the user, ordered by role, org, and course ID
+    :type access_roles: Iterable[Dict[str, Any]]
+    :param libraries: The orgs of the libraries, by library ID
+    :type libraries: Dict[str, str]
+    :return: All course access roles for the user
+    :rtype: dict
+    """
     result: Dict[str, Any] = {}
     useless_entry = False
-    library_keys = modulestore().get_library_keys()
     for access_role in access_roles:
         access_role['org'] = access_role['org_lower_case']
         access_role['course_org'] = access_role['course_org_lower_case']
@@ -231,9 +286,9 @@ def get_user_course_access_roles(user_id: int) -> dict:
 
         if not access_role['course_org'] and access_role['course_id']:
             # set course_org for libraries
-            if filtered_ids := [key for key in library_keys if str(key) == access_role['course_id']]:
-                access_role['course_org'] = filtered_ids[0].org
-                access_role['course_org_lower_case'] = filtered_ids[0].org.lower()
+            if library_org := libraries.get(access_role['course_id']):
+                access_role['course_org'] = library_org
+                access_role['course_org_lower_case'] = library_org.lower()
 
         try:
             validate_course_access_role(access_role)
@@ -282,6 +337,113 @@ def get_user_course_access_roles(user_id: int) -> dict:
     }
 
 
+def cache_name_user_permission_index(user_id: int) -> str:
+    """
+    Get the cache name for the version of the permission indexes of the user.
+
+    :param user_id: The user ID
+    :type user_id: int
+    :return: The cache name
+    :rtype: str
+    """
+    return f'{cs.CACHE_NAME_USER_PERMISSION_INDEX}_{user_id}'
+
+
+def _build_user_permission_index(user_id: int, view_allowed_roles: List[str]) -> Dict[int, Dict[str, List]]:
+    """
+    Build the permission index of the user for the given view roles. See get_user_permission_index.
+
+    :param user_id: The user ID
+    :type user_id: int
+    :param view_allowed_roles: The roles allowed for the view
+    :type view_allowed_roles: List[str]
+    :return: The permission index, per tenant ID
+    :rtype: Dict[int, Dict[str, List]]
+    """
+    user_roles = get_user_course_access_roles(user_id)['roles']
+    full_access_orgs: set = set()
+    course_access_orgs: set = set()
+    for role in view_allowed_roles:
+        if role in user_roles:
+            full_access_orgs.update(user_roles[role]['orgs_full_access'])
+            course_access_orgs.update(user_roles[role]['orgs_of_courses'])
+
+    org_to_tenant_map = get_org_to_tenant_map()
+    index = {}
+    for tenant_id, tenant_orgs in get_all_course_org_filter_list().items():
+        tenant_full_access_orgs = sorted(full_access_orgs.intersection(tenant_orgs))
+        tenant_course_access_orgs = sorted(course_access_orgs.intersection(tenant_orgs))
+        if not tenant_full_access_orgs and not tenant_course_access_orgs:
+            continue
+
+        index[tenant_id] = {
+            'full_access_orgs': tenant_full_access_orgs,
+            'course_access_orgs': tenant_course_access_orgs,
+            'full_access_tenant_ids': sorted({
+                full_access_tenant_id
+                for org in tenant_full_access_orgs for full_access_tenant_id in org_to_tenant_map.get(org, [])
+            }),
+        }
+    return index
+
+
+def _user_permission_index_memo_key(user_id: int, view_allowed_roles: List[str]) -> Tuple:
+    """Return the request memo key of get_user_permission_index"""
+    return user_id, tuple(sorted(view_allowed_roles))
+
+
+@request_memo(key_generator=_user_permission_index_memo_key)
+def get_user_permission_index(user_id: int, view_allowed_roles: List[str]) -> Dict[int, Dict[str, List]]:
+    """
+    Get the permission index of the user for the given view roles: the orgs of every tenant that the user can access
+    with these roles, fully or through some courses, and the tenants that the fully accessible orgs belong to.
+
+    {
+        <tenant_id>: {
+            'full_access_orgs': [org1, org2, ...],
+            'course_access_orgs': [org3, ...],
+            'full_access_tenant_ids': [1, 2, ...],
+        },
+        ...
+    }
+
+    Every index is cached under its own key, made of the user, the view roles, the cache generation, and the version
+    of the permission indexes of the user. The version is cached under the key deleted with the course access roles
+    cache of the user, so deleting it orphans all the indexes of the user. No cached entry is ever read, modified, and
+    written back; the version and the indexes are written with cache.add so concurrent requests keep the first value.
+
+    :param user_id: The user ID
+    :type user_id: int
+    :param view_allowed_roles: The roles allowed for the view
+    :type view_allowed_roles: List[str]
+    :return: The permission index, per tenant ID
+    :rtype: Dict[int, Dict[str, List]]
+    """
+    version_cache_name = cache_name_user_permission_index(user_id)
+    timeout = settings.FX_CACHE_TIMEOUT_COURSE_ACCESS_ROLES
+    version = cache.get(version_cache_name)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(version_cache_name, version, timeout):
+            version = cache.get(version_cache_name) or version
+
+    roles_key = ','.join(sorted(view_allowed_roles))
+    cache_name = f'{version_cache_name}_{version}_{roles_key}_{get_cache_generation()}'
+    cached_index = cache.get(cache_name)
+    if cached_index is not None:
+        return cached_index
+
+    index = _build_user_permission_index(user_id, view_allowed_roles)
+    cache.add(cache_name, index, timeout)
+    return index
+
+
+def _accessible_tenant_ids_memo_key(user: get_user_model, roles_filter: List[str] | None = None) -> Tuple:
+    """Return the request memo key of get_accessible_tenant_ids"""
+    return user.id if user else None, tuple(roles_filter) if isinstance(roles_filter, list) else roles_filter
+
+
+@request_memo(key_generator=_accessible_tenant_ids_memo_key)
 def get_accessible_tenant_ids(user: get_user_model, roles_filter: List[str] | None = None) -> List[int]:
     """
     Get the tenants that the user has access to.
@@ -504,7 +666,11 @@ class FXViewRoleInfoMixin(metaclass=FXViewRoleInfoMetaClass):
             self.request, 'fx_permission_info') else {}  # type: ignore[attr-defined]
 
     @staticmethod
-    @cache_dict(timeout='FX_CACHE_TIMEOUT_VIEW_ROLES', key_generator_or_name=cs.CACHE_NAME_ALL_VIEW_ROLES)
+    @cache_dict(
+        timeout='FX_CACHE_TIMEOUT_VIEW_ROLES',
+        key_generator_or_name=cs.CACHE_NAME_ALL_VIEW_ROLES,
+        local_timeout='FX_CACHE_LOCAL_TIMEOUT',
+    )
     def get_allowed_roles_all_views() -> Dict[str, List[str]]:
         """
         Get the allowed roles for all views.
@@ -706,8 +872,8 @@ def get_course_access_roles_queryset(  # pylint: disable=too-many-arguments, too
         tenants_of_courses = []
         for org in CourseOverview.objects.filter(id__in=course_ids_filter).values_list('org', flat=True).distinct():
             tenants_of_courses.extend(get_tenants_by_org(org))
-        for lib_key in list(filter(lambda x: str(x) in course_ids_filter, modulestore().get_library_keys())):
-            tenants_of_courses.extend(get_tenants_by_org(lib_key.org))
+        for library_org in get_orgs_of_libraries(course_ids_filter).values():
+            tenants_of_courses.extend(get_tenants_by_org(library_org))
         tenants_of_courses = list(set(tenants_of_courses))
         orgs_of_courses = set(get_course_org_filter_list(tenants_of_courses)['course_org_filter_list'])
 
@@ -769,10 +935,54 @@ def cache_refresh_course_access_roles(user_id: int) -> None:
     :param user_id: The user ID
     :type user_id: int
     """
+    invalidate_request_memo()
+    cache.delete(cache_name_user_permission_index(user_id))
     if cache.delete(cache_name_user_course_access_roles(user_id)):
         get_user_course_access_roles(user_id)
 
 
+def cache_course_access_roles_of_users(
+    user_ids: List[int] | None = None, batch_size: int = cs.COURSE_ACCESS_ROLES_CACHE_BATCH_SIZE,
+) -> int:
+    """
+    Recompute the course access roles cache of the given users in bulk, to prewarm it after a deploy, a cache
+    invalidation, or a bulk import of roles. Every batch of users is read with one query, and written to the cache
+    at once. The permission indexes of the users are deleted to be rebuilt from the new roles.
+
+    :param user_ids: The user IDs. None for all the users who have course access roles
+    :type user_ids: List[int] | None
+    :param batch_size: The number of users to recompute in one batch
+    :type batch_size: int
+    :return: The number of users whose cache is recomputed
+    :rtype: int
+    """
+    if user_ids is None:
+        user_ids = list(CourseAccessRole.objects.values_list('user_id', flat=True).distinct().order_by('user_id'))
+    else:
+        user_ids = sorted(set(user_ids))
+
+    for index in range(0, len(user_ids), batch_size):
+        batch_user_ids = user_ids[index:index + batch_size]
+        access_roles_values = list(_get_course_access_roles_values(batch_user_ids))
+        libraries = _get_orgs_of_access_roles_libraries(access_roles_values)
+        access_roles_of_users: Dict[int, List[Dict[str, Any]]] = {user_id: [] for user_id in batch_user_ids}
+        for access_role in access_roles_values:
+            access_roles_of_users[access_role['user_id']].append(access_role)
+
+        cache_dict_set_many(
+            {
+                cache_name_user_course_access_roles(user_id): _build_user_course_access_roles(access_roles, libraries)
+                for user_id, access_roles in access_roles_of_users.items()
+            },
+            timeout='FX_CACHE_TIMEOUT_COURSE_ACCESS_ROLES',
+            stale_timeout='FX_CACHE_STALE_TIMEOUT',
+        )
+        cache.delete_many([cache_name_user_permission_index(user_id) for user_id in batch_user_ids])
+
+    invalidate_request_memo()
+    return len(user_ids)
+
+
 def _verify_can_delete_course_access_roles_partial(
     caller: get_user_model, tenant_ids: list[int], user_roles: Dict[str, Any], username: str,
 ) -> None:
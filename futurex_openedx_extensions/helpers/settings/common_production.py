@@ -20,6 +20,20 @@ def plugin_settings(settings: Any) -> None:
         60 * 60 * 2,  # 2 hours
     )
 
+    # Seconds to serve the stale cached value while one worker refreshes it. Zero to disable
+    settings.FX_CACHE_STALE_TIMEOUT = getattr(
+        settings,
+        'FX_CACHE_STALE_TIMEOUT',
+        60 * 5,  # 5 minutes
+    )
+
+    # Seconds to keep the frequently used cached values in the memory of each process. Zero to disable
+    settings.FX_CACHE_LOCAL_TIMEOUT = getattr(
+        settings,
+        'FX_CACHE_LOCAL_TIMEOUT',
+        10,
+    )
+
     settings.FX_CACHE_TIMEOUT_VIEW_ROLES = getattr(
         settings,
         'FX_CACHE_TIMEOUT_VIEW_ROLES',
@@ -32,6 +46,26 @@ def plugin_settings(settings: Any) -> None:
         60 * 60 * 24,  # 1 day
     )
 
+    settings.FX_CACHE_TIMEOUT_LIBRARY_KEYS = getattr(
+        settings,
+        'FX_CACHE_TIMEOUT_LIBRARY_KEYS',
+        60 * 30,  # 30 minutes
+    )
+
+    # Seconds to remember that a library ID was not found in the modulestore, so it is not looked up again
+    settings.FX_CACHE_TIMEOUT_LIBRARY_NOT_FOUND = getattr(
+        settings,
+        'FX_CACHE_TIMEOUT_LIBRARY_NOT_FOUND',
+        60 * 5,  # 5 minutes
+    )
+
+    # Seconds to keep the data watermark of the exported models, used in the fingerprint of the export requests
+    settings.FX_CACHE_TIMEOUT_EXPORT_DATA_WATERMARK = getattr(
+        settings,
+        'FX_CACHE_TIMEOUT_EXPORT_DATA_WATERMARK',
+        60,
+    )
+
     # Exported CSV files directive name
     settings.FX_DASHBOARD_STORAGE_DIR = getattr(
         settings,
@@ -53,6 +87,99 @@ def plugin_settings(settings: Any) -> None:
         5,
     )
 
+    # Number of chunks exported in parallel by the workers for large exports. 1 disables parallel exports
+    settings.FX_TASK_EXPORT_PARALLEL_CHUNKS = getattr(
+        settings,
+        'FX_TASK_EXPORT_PARALLEL_CHUNKS',
+        1,
+    )
+
+    # Seconds between two saves of the progress of an export task. Zero to save every progress update
+    settings.FX_TASK_PROGRESS_UPDATE_SECONDS = getattr(
+        settings,
+        'FX_TASK_PROGRESS_UPDATE_SECONDS',
+        5,
+    )
+
+    # Progress advance that saves the progress of an export task before FX_TASK_PROGRESS_UPDATE_SECONDS pass
+    settings.FX_TASK_PROGRESS_UPDATE_STEP = getattr(
+        settings,
+        'FX_TASK_PROGRESS_UPDATE_STEP',
+        0.05,
+    )
+
+    # Seconds to keep the latest progress of an export task mirrored in the cache. Zero to disable the mirror
+    settings.FX_TASK_PROGRESS_CACHE_TIMEOUT = getattr(
+        settings,
+        'FX_TASK_PROGRESS_CACHE_TIMEOUT',
+        0,
+    )
+
+    # Seconds to reuse an export task for identical export requests of the same user. Zero to disable
+    settings.FX_TASK_EXPORT_REUSE_SECONDS = getattr(
+        settings,
+        'FX_TASK_EXPORT_REUSE_SECONDS',
+        60 * 5,  # 5 minutes
+    )
+
+    # Gzip the exported files on the fly (.csv.gz)
+    settings.FX_TASK_EXPORT_GZIP = getattr(
+        settings,
+        'FX_TASK_EXPORT_GZIP',
+        False,
+    )
+
+    # Part size (in MB) of the multipart uploads of local files to S3
+    settings.FX_UPLOAD_PART_SIZE_MB = getattr(
+        settings,
+        'FX_UPLOAD_PART_SIZE_MB',
+        8,
+    )
+
+    # Number of parts uploaded concurrently by the multipart uploads of local files to S3
+    settings.FX_UPLOAD_MAX_CONCURRENCY = getattr(
+        settings,
+        'FX_UPLOAD_MAX_CONCURRENCY',
+        4,
+    )
+
+    # Number of idle Clickhouse clients kept per process for reuse across requests. Zero disables the pooling
+    settings.FX_CLICKHOUSE_POOL_SIZE = getattr(
+        settings,
+        'FX_CLICKHOUSE_POOL_SIZE',
+        4,
+    )
+
+    # Seconds a pooled Clickhouse client is kept alive before it is closed and replaced by a new connection
+    settings.FX_CLICKHOUSE_POOL_KEEP_ALIVE_SECONDS = getattr(
+        settings,
+        'FX_CLICKHOUSE_POOL_KEEP_ALIVE_SECONDS',
+        60 * 5,  # 5 minutes
+    )
+
+    # Seconds of idleness after which a pooled Clickhouse client is pinged before it is reused
+    settings.FX_CLICKHOUSE_POOL_HEALTH_CHECK_SECONDS = getattr(
+        settings,
+        'FX_CLICKHOUSE_POOL_HEALTH_CHECK_SECONDS',
+        30,
+    )
+
+    # Get the records count of paginated Clickhouse queries with the page itself, in one round-trip. The page is read
+    # from the query wrapped with a window function, which does not guarantee the order of the query's ORDER BY across
+    # the pages. Enable it only when the order of the paginated Clickhouse queries does not matter
+    settings.FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION = getattr(
+        settings,
+        'FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION',
+        False,
+    )
+
+    # Seconds to cache the records count of paginated Clickhouse queries for their next pages. Zero disables it
+    settings.FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT = getattr(
+        settings,
+        'FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT',
+        60,
+    )
+
     # Max Period Chunks
     settings.FX_MAX_PERIOD_CHUNKS_MAP = getattr(
         settings,
@@ -104,3 +231,9 @@ def plugin_settings(settings: Any) -> None:
         'FX_COURSE_CATEGORY_MAX_COUNT',
         20,
     )
+
+    # Memoize the permission and tenant helpers once per request
+    fx_request_memo_middleware = 'futurex_openedx_extensions.helpers.middlewares.FXRequestMemoMiddleware'
+    middleware = list(getattr(settings, 'MIDDLEWARE', []))
+    if fx_request_memo_middleware not in middleware:
+        settings.MIDDLEWARE = middleware + [fx_request_memo_middleware]
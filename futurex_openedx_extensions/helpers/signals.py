@@ -14,6 +14,7 @@ from futurex_openedx_extensions.helpers.models import ConfigAccessControl, Tenan
 from futurex_openedx_extensions.helpers.roles import (
     add_missing_signup_source_record,
     cache_name_user_course_access_roles,
+    cache_name_user_permission_index,
 )
 from futurex_openedx_extensions.helpers.tenants import get_all_tenant_ids, get_all_tenants_info
 
@@ -25,8 +26,10 @@ def refresh_course_access_role_cache_on_save(
     """Receiver to refresh the course access role cache when a course access role is saved"""
     if instance.org:
         add_missing_signup_source_record(instance.user_id, instance.org)
-    cache_name = cache_name_user_course_access_roles(instance.user_id)
-    cache.delete(cache_name)
+    cache.delete_many([
+        cache_name_user_course_access_roles(instance.user_id),
+        cache_name_user_permission_index(instance.user_id),
+    ])
 
 
 @receiver(post_delete, sender=CourseAccessRole)
@@ -34,8 +37,10 @@ def refresh_course_access_role_cache_on_delete(
     sender: Any, instance: CourseAccessRole, **kwargs: Any,  # pylint: disable=unused-argument
 ) -> None:
     """Receiver to refresh the course access role cache when a course access role is deleted"""
-    cache_name = cache_name_user_course_access_roles(instance.user_id)
-    cache.delete(cache_name)
+    cache.delete_many([
+        cache_name_user_course_access_roles(instance.user_id),
+        cache_name_user_permission_index(instance.user_id),
+    ])
 
 
 @receiver(post_save, sender=ViewAllowedRoles)
@@ -43,7 +48,7 @@ def refresh_view_allowed_roles_cache_on_save(
     sender: Any, instance: ViewAllowedRoles, **kwargs: Any,  # pylint: disable=unused-argument
 ) -> None:
     """Receiver to refresh the view allowed roles cache when a view allowed role is saved"""
-    cache.delete(cs.CACHE_NAME_ALL_VIEW_ROLES)
+    invalidate_cache(cs.CACHE_NAME_ALL_VIEW_ROLES)
 
 
 @receiver(post_delete, sender=ViewAllowedRoles)
@@ -51,7 +56,7 @@ def refresh_view_allowed_roles_cache_on_delete(
     sender: Any, instance: ViewAllowedRoles, **kwargs: Any,  # pylint: disable=unused-argument
 ) -> None:
     """Receiver to refresh the view allowed roles cache when a view allowed role is deleted"""
-    cache.delete(cs.CACHE_NAME_ALL_VIEW_ROLES)
+    invalidate_cache(cs.CACHE_NAME_ALL_VIEW_ROLES)
 
 
 @receiver(post_save, sender=ConfigAccessControl)
@@ -1,17 +1,107 @@
 """FX Helpers celery tasks"""
+from __future__ import annotations
+
 import copy
 import logging
+from contextlib import contextmanager
+from typing import Generator, List
 
 from celery import shared_task
 from celery_utils.logged_task import LoggedTask
 
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
-from futurex_openedx_extensions.helpers.export_csv import export_data_to_csv, log_export_task
+from futurex_openedx_extensions.helpers.export_csv import (
+    delete_export_chunks,
+    export_data_to_csv,
+    get_export_chunks,
+    log_export_task,
+    merge_export_chunks,
+)
 from futurex_openedx_extensions.helpers.models import DataExportTask
+from futurex_openedx_extensions.helpers.roles import cache_course_access_roles_of_users
 
 log = logging.getLogger(__name__)
 
 
+def _fail_export_task(fx_task_id: int, error_message: str, filename: str | None) -> None:
+    """
+    Mark the export task as failed, and delete the partial files of its chunks when the filename is given. Errors
+    are only logged, so they do not hide the error that failed the export task.
+    """
+    try:
+        DataExportTask.set_status(task_id=fx_task_id, status=DataExportTask.STATUS_FAILED, error_message=error_message)
+    except FXCodedException as exc:
+        log.error('CSV Export: cannot mark task %s as failed: (%s) %s', fx_task_id, exc.code, str(exc))
+
+    if filename:
+        try:
+            delete_export_chunks(fx_task_id, filename)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            log.error(
+                'CSV Export: failed to delete the partial files of task %s: (%s) %s',
+                fx_task_id, exc.__class__.__name__, str(exc),
+            )
+
+
+@contextmanager
+def _export_task_errors(fx_task_id: int, filename: str | None = None) -> Generator:
+    """
+    Log the errors of an export task, and mark the export task as failed. The partial files of the chunks of a
+    parallel export are deleted too when the filename is given.
+    """
+    try:
+        yield
+
+    except FXCodedException as exc:
+        if exc.code == FXExceptionCodes.EXPORT_CSV_TASK_NOT_FOUND.value:
+            log.error('CSV Export Error: (%s) %s', exc.code, str(exc))
+        else:
+            log.error('CSV Export Error for task %s: (%s) %s', fx_task_id, exc.code, str(exc))
+            _fail_export_task(fx_task_id, str(exc), filename)
+        raise
+
+    except Exception as exc:
+        log.error('CSV Export Unhandled Error for task %s: (%s) %s', fx_task_id, exc.__class__.__name__, str(exc))
+        _fail_export_task(fx_task_id, str(exc), filename)
+        raise
+
+
+def _delete_chunks_of_failed_task(fx_task_id: int, filename: str) -> bool:
+    """
+    Delete the partial files of the chunks of a parallel export if the export task has failed, such as by the error
+    of another chunk.
+
+    :return: True if the export task has failed, False otherwise
+    :rtype: bool
+    """
+    if DataExportTask.get_task(fx_task_id).status != DataExportTask.STATUS_FAILED:
+        return False
+
+    log.info('CSV Export: task %s has failed, deleting the partial files of its chunks.', fx_task_id)
+    delete_export_chunks(fx_task_id, filename)
+    return True
+
+
+def _get_continuation_view_data(view_data: dict) -> dict:
+    """
+    Get the view data required to continue an export in a new task. Only serializable values are kept.
+
+    :param view_data: The view data of the export, as updated by the export
+    :type view_data: dict
+    :return: The view data of the continuation
+    :rtype: dict
+    """
+    next_view_data = {
+        key: view_data[key] for key in [
+            'query_params', 'kwargs', 'path', 'start_page', 'end_page', 'site_domain'
+        ]
+    }
+    for key in ['after', 'chunk', 'until', 'total_records']:
+        if view_data.get(key) is not None:
+            next_view_data[key] = view_data[key]
+    return next_view_data
+
+
 @shared_task(base=LoggedTask)
 def export_data_to_csv_task(
     fx_task_id: int, url: str, view_data: dict, fx_permission_info: dict, filename: str
@@ -19,9 +109,14 @@ def export_data_to_csv_task(
     """
     Celery task to mock view with given view params and write JSON response to CSV.
     """
-    try:
+    with _export_task_errors(fx_task_id):
         _ = DataExportTask.get_task(fx_task_id)
 
+        if view_data['start_page'] == 1 and _start_parallel_export(
+            fx_task_id, url, view_data, fx_permission_info, filename,
+        ):
+            return
+
         if export_data_to_csv(fx_task_id, url, view_data, copy.deepcopy(fx_permission_info), filename):
             DataExportTask.set_status(task_id=fx_task_id, status=DataExportTask.STATUS_COMPLETED)
         else:
@@ -30,23 +125,87 @@ def export_data_to_csv_task(
                 view_data['start_page'],
                 fx_task_id,
             )
-            next_view_data = {
-                key: view_data[key] for key in [
-                    'query_params', 'kwargs', 'path', 'start_page', 'end_page', 'site_domain'
-                ]
-            }
-            async_task = export_data_to_csv_task.delay(fx_task_id, url, next_view_data, fx_permission_info, filename)
+            async_task = export_data_to_csv_task.delay(
+                fx_task_id, url, _get_continuation_view_data(view_data), fx_permission_info, filename,
+            )
+            log_export_task(fx_task_id, async_task, continue_job=True)
+
+
+def _start_parallel_export(
+    fx_task_id: int, url: str, view_data: dict, fx_permission_info: dict, filename: str
+) -> bool:
+    """
+    Split the export into chunks, and export them concurrently, one celery task per chunk. The worker of the last
+    completed chunk starts the merge of the exported chunks.
+
+    :return: True if the parallel export was started, False if the export cannot be split
+    :rtype: bool
+    """
+    chunks = get_export_chunks(url, copy.deepcopy(view_data), copy.deepcopy(fx_permission_info))
+    if not chunks:
+        return False
+
+    log.info('CSV Export: splitting task %s into %s parallel chunks.', fx_task_id, len(chunks))
+    DataExportTask.set_status(task_id=fx_task_id, status=DataExportTask.STATUS_PROCESSING)
+    DataExportTask.set_chunks_count(fx_task_id, len(chunks))
+    for chunk_view_data in chunks:
+        async_task = export_data_to_csv_chunk_task.delay(
+            fx_task_id, url, chunk_view_data, fx_permission_info, filename,
+        )
+        log_export_task(fx_task_id, async_task)
+    return True
+
+
+@shared_task(base=LoggedTask)
+def export_data_to_csv_chunk_task(
+    fx_task_id: int, url: str, view_data: dict, fx_permission_info: dict, filename: str
+) -> None:
+    """
+    Celery task to export one chunk of a parallel export. A long chunk is continued in a new task, like the
+    sequential export. The merge is started when the last chunk is completed. Once the export task has failed, the
+    remaining chunks are skipped, and the partial files are deleted.
+    """
+    with _export_task_errors(fx_task_id, filename):
+        if _delete_chunks_of_failed_task(fx_task_id, filename):
+            return
+
+        if not export_data_to_csv(fx_task_id, url, view_data, copy.deepcopy(fx_permission_info), filename):
+            log.info(
+                'CSV Export: continuing chunk %s of task %s from page %s.',
+                view_data['chunk'],
+                fx_task_id,
+                view_data['start_page'],
+            )
+            async_task = export_data_to_csv_chunk_task.delay(
+                fx_task_id, url, _get_continuation_view_data(view_data), fx_permission_info, filename,
+            )
             log_export_task(fx_task_id, async_task, continue_job=True)
+            return
 
-    except FXCodedException as exc:
-        if exc.code == FXExceptionCodes.EXPORT_CSV_TASK_NOT_FOUND.value:
-            log.error('CSV Export Error: (%s) %s', exc.code, str(exc))
+        if DataExportTask.complete_chunk(fx_task_id):
+            log.info('CSV Export: all chunks of task %s are completed.', fx_task_id)
+            async_task = merge_export_chunks_task.delay(fx_task_id, filename)
+            log_export_task(fx_task_id, async_task, continue_job=True)
         else:
-            log.error('CSV Export Error for task %s: (%s) %s', fx_task_id, exc.code, str(exc))
-            DataExportTask.set_status(task_id=fx_task_id, status=DataExportTask.STATUS_FAILED, error_message=str(exc))
-        raise
+            _delete_chunks_of_failed_task(fx_task_id, filename)
 
-    except Exception as exc:
-        log.error('CSV Export Unhandled Error for task %s: (%s) %s', fx_task_id, exc.__class__.__name__, str(exc))
-        DataExportTask.set_status(task_id=fx_task_id, status=DataExportTask.STATUS_FAILED, error_message=str(exc))
-        raise
+
+@shared_task(base=LoggedTask)
+def merge_export_chunks_task(fx_task_id: int, filename: str) -> None:
+    """
+    Celery task to merge the exported chunks of a parallel export, and complete the export task.
+    """
+    with _export_task_errors(fx_task_id, filename):
+        log.info('CSV Export: merging the chunks of task %s.', fx_task_id)
+        merge_export_chunks(fx_task_id, filename)
+        DataExportTask.set_status(task_id=fx_task_id, status=DataExportTask.STATUS_COMPLETED)
+
+
+@shared_task(base=LoggedTask)
+def cache_course_access_roles_task(user_ids: List[int] | None = None) -> int:
+    """
+    Celery task to recompute the course access roles cache of the given users, or of all the users who have roles.
+    """
+    users_count = cache_course_access_roles_of_users(user_ids)
+    log.info('Course access roles cache: recomputed for %s users.', users_count)
+    return users_count
@@ -4,7 +4,7 @@ from __future__ import annotations
 import copy
 import json
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from urllib.parse import urlparse
 
 from common.djangoapps.third_party_auth.models import SAMLProviderConfig
@@ -16,7 +16,7 @@ from django.db.models import Count, OuterRef, QuerySet, Subquery
 from eox_tenant.models import Route, TenantConfig
 
 from futurex_openedx_extensions.helpers import constants as cs
-from futurex_openedx_extensions.helpers.caching import cache_dict, invalidate_cache
+from futurex_openedx_extensions.helpers.caching import cache_dict, invalidate_cache, request_memo
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
 from futurex_openedx_extensions.helpers.extractors import (
     dot_separated_path_extract_all,
@@ -29,6 +29,59 @@ from futurex_openedx_extensions.helpers.models import ConfigAccessControl, Confi
 logger = logging.getLogger(__name__)
 
 
+def _get_tenant_exclusion_reasons(tenant: TenantConfig) -> List[int]:
+    """
+    Get the reasons of excluding the tenant for bad configuration. The tenant must be read by
+    _get_tenants_with_routes_queryset
+
+    :param tenant: The tenant
+    :type tenant: TenantConfig
+    :return: List of exclusion reasons, empty if the tenant is not excluded
+    :rtype: List[int]
+    """
+    reasons = []
+    if tenant.routes_count == 0:
+        reasons.append(FXExceptionCodes.TENANT_HAS_NO_SITE.value)
+    if tenant.routes_count > 1:
+        reasons.append(FXExceptionCodes.TENANT_HAS_MORE_THAN_ONE_SITE.value)
+
+    lms_base = tenant.lms_configs.get('LMS_BASE')
+    if not lms_base:
+        reasons.append(FXExceptionCodes.TENANT_HAS_NO_LMS_BASE.value)
+
+    if lms_base and not reasons:
+        lms_base = lms_base.split(':')[-2] if ':' in lms_base else lms_base
+        if lms_base != tenant.route_domain:
+            reasons.append(FXExceptionCodes.TENANT_LMS_BASE_SITE_MISMATCH.value)
+
+    if not tenant.lms_configs.get('IS_FX_DASHBOARD_ENABLED', True):
+        reasons.append(FXExceptionCodes.TENANT_DASHBOARD_NOT_ENABLED.value)
+
+    course_org_filter = tenant.lms_configs.get('course_org_filter')
+    if not course_org_filter or (
+        isinstance(course_org_filter, list) and not all(isinstance(org, str) for org in course_org_filter)
+    ) or (
+        isinstance(course_org_filter, str) and not course_org_filter.strip()
+    ):
+        reasons.append(FXExceptionCodes.TENANT_COURSE_ORG_FILTER_NOT_VALID.value)
+
+    return reasons
+
+
+def _get_tenants_with_routes_queryset() -> QuerySet:
+    """
+    Get the queryset of all tenants with the route information needed by _get_tenant_exclusion_reasons
+
+    :return: QuerySet of all tenants
+    :rtype: QuerySet
+    """
+    return TenantConfig.objects.only('id', 'external_key', 'lms_configs').annotate(
+        routes_count=Count('route'),
+    ).annotate(
+        route_domain=Subquery(Route.objects.filter(config_id=OuterRef('pk')).values('domain')[:1]),
+    ).order_by('id')
+
+
 def get_excluded_tenant_ids() -> Dict[int, List[int]]:
     """
     Get dictionary of tenant IDs excluded for bad configuration, along with the reasons of exclusion
@@ -36,42 +89,12 @@ def get_excluded_tenant_ids() -> Dict[int, List[int]]:
     :return: List of tenant IDs to exclude
     :rtype: Dict[int, List[int]]
     """
-    def check_bad_config(tenant: TenantConfig) -> List[int]:
-        """Check if the tenant has a bad config"""
-        reasons = []
-        if tenant.routes_count == 0:
-            reasons.append(FXExceptionCodes.TENANT_HAS_NO_SITE.value)
-        if tenant.routes_count > 1:
-            reasons.append(FXExceptionCodes.TENANT_HAS_MORE_THAN_ONE_SITE.value)
-
-        lms_base = tenant.lms_configs.get('LMS_BASE')
-        if not lms_base:
-            reasons.append(FXExceptionCodes.TENANT_HAS_NO_LMS_BASE.value)
-
-        if lms_base and not reasons:
-            lms_base = lms_base.split(':')[-2] if ':' in lms_base else lms_base
-            if lms_base != tenant.route_domain:
-                reasons.append(FXExceptionCodes.TENANT_LMS_BASE_SITE_MISMATCH.value)
-
-        if not tenant.lms_configs.get('IS_FX_DASHBOARD_ENABLED', True):
-            reasons.append(FXExceptionCodes.TENANT_DASHBOARD_NOT_ENABLED.value)
-
-        course_org_filter = tenant.lms_configs.get('course_org_filter')
-        if not course_org_filter or (
-            isinstance(course_org_filter, list) and not all(isinstance(org, str) for org in course_org_filter)
-        ) or (
-            isinstance(course_org_filter, str) and not course_org_filter.strip()
-        ):
-            reasons.append(FXExceptionCodes.TENANT_COURSE_ORG_FILTER_NOT_VALID.value)
-
-        return reasons
-
-    tenants = TenantConfig.objects.annotate(
-        routes_count=Count('route'),
-    ).annotate(
-        route_domain=Subquery(Route.objects.filter(config_id=OuterRef('pk')).values('domain')[:1]),
-    )
-    return {tenant.id: check_bad_config(tenant) for tenant in tenants if check_bad_config(tenant)}
+    result = {}
+    for tenant in _get_tenants_with_routes_queryset():
+        reasons = _get_tenant_exclusion_reasons(tenant)
+        if reasons:
+            result[tenant.id] = reasons
+    return result
 
 
 def get_all_tenants() -> QuerySet:
@@ -105,18 +128,68 @@ def fix_lms_base(domain_name: str) -> str:
     return f'{domain_name_parts.scheme}://{domain_name_parts.hostname}{port}'
 
 
-@cache_dict(timeout='FX_CACHE_TIMEOUT_TENANTS_INFO', key_generator_or_name=cs.CACHE_NAME_ALL_TENANTS_INFO)
-def get_all_tenants_info() -> Dict[str, str | dict | List[int]]:
+def _get_course_org_filter(lms_configs: Dict[str, Any]) -> List[str]:
     """
-    Get all tenants in the system that are exposed in the route table, and with a valid config
+    Get the sorted, lower case, and unique orgs of the course org filter of a tenant
 
-    Note: a tenant is a TenantConfig object
+    :param lms_configs: The LMS configs of the tenant
+    :type lms_configs: Dict[str, Any]
+    :return: The orgs of the course org filter
+    :rtype: List[str]
+    """
+    course_org_filter = lms_configs.get('course_org_filter', [])
+    if isinstance(course_org_filter, str):
+        course_org_filter = [course_org_filter]
+    return sorted(list({org.strip().lower() for org in course_org_filter}))
 
-    :return: Dictionary of tenant IDs and Sites
-    :rtype: Dict[str, Any]
+
+def _get_org_to_tenant_map(course_org_filter_list: Dict[int, List[str]]) -> Dict[str, List[int]]:
+    """
+    Build the map of orgs to tenant IDs from the course org filters of the tenants
+
+    :param course_org_filter_list: Dictionary of tenant IDs and their course org filters
+    :type course_org_filter_list: Dict[int, List[str]]
+    :return: Dictionary of orgs and their tenant IDs
+    :rtype: Dict[str, List[int]]
+    """
+    result: Dict[str, set] = {}
+    for t_id, course_org_filter in course_org_filter_list.items():
+        for org in course_org_filter:
+            result.setdefault(org, set()).add(t_id)
+
+    return {org: sorted(tenant_ids) for org, tenant_ids in result.items()}
+
+
+def _get_tenants_sharing_orgs(
+    course_org_filter_list: Dict[int, List[str]], org_to_tenant_map: Dict[str, List[int]],
+) -> Dict[int, List[int]]:
+    """
+    Build the map of every tenant to the other tenants that share at least one org with it
+
+    :param course_org_filter_list: Dictionary of tenant IDs and their course org filters
+    :type course_org_filter_list: Dict[int, List[str]]
+    :param org_to_tenant_map: Dictionary of orgs and their tenant IDs
+    :type org_to_tenant_map: Dict[str, List[int]]
+    :return: Dictionary of tenant IDs and the IDs of the tenants sharing orgs with them
+    :rtype: Dict[int, List[int]]
+    """
+    result: Dict[int, set] = {tenant_id: set() for tenant_id in course_org_filter_list}
+    for tenant_ids in org_to_tenant_map.values():
+        if len(tenant_ids) < 2:
+            continue
+        for tenant_id in tenant_ids:
+            result[tenant_id].update(other_id for other_id in tenant_ids if other_id != tenant_id)
+
+    return {tenant_id: sorted(other_ids) for tenant_id, other_ids in result.items()}
+
+
+def _get_sso_sites_info() -> Dict[str, List[Dict[str, str]]]:
+    """
+    Get the enabled SSO providers of FX_SSO_INFO, by site domain
+
+    :return: Dictionary of site domains and their SSO providers
+    :rtype: Dict[str, List[Dict[str, str]]]
     """
-    tenant_ids = list(get_all_tenants().values_list('id', flat=True))
-    info = TenantConfig.objects.filter(id__in=tenant_ids).values('id', 'lms_configs')
     sso_sites: Dict[str, List[Dict[str, str]]] = {}
     for sso_site in SAMLProviderConfig.objects.current_set().filter(
         entity_id__in=settings.FX_SSO_INFO, enabled=True,
@@ -128,6 +201,40 @@ def get_all_tenants_info() -> Dict[str, str | dict | List[int]]:
             'slug': sso_site['slug'],
             'entity_id': sso_site['entity_id'],
         })
+    return sso_sites
+
+
+@cache_dict(
+    timeout='FX_CACHE_TIMEOUT_TENANTS_INFO',
+    key_generator_or_name=cs.CACHE_NAME_TENANTS_REGISTRY,
+    stale_timeout='FX_CACHE_STALE_TIMEOUT',
+    local_timeout='FX_CACHE_LOCAL_TIMEOUT',
+)
+def get_tenants_registry() -> Dict[str, Any]:
+    """
+    Get the registry of all tenants. It is built in one pass from one TenantConfig query, and cached under one key,
+    so all the tenant information is consistent and is invalidated at once. Use the helper functions to read it:
+
+    {
+        'version': TENANTS_REGISTRY_VERSION,
+        'tenants_info': <see get_all_tenants_info>,
+        'course_org_filter_list': <see get_all_course_org_filter_list>,
+        'org_to_tenant_map': <see get_org_to_tenant_map>,
+        'tenants_sharing_orgs': <see get_tenants_sharing_orgs>,
+    }
+
+    :return: The tenants registry
+    :rtype: Dict[str, Any]
+    """
+    template_site = settings.FX_TEMPLATE_TENANT_SITE
+    info = []
+    template_tenant_id = None
+    for tenant in _get_tenants_with_routes_queryset():
+        if template_site and tenant.external_key == template_site:
+            template_tenant_id = tenant.id
+        if not _get_tenant_exclusion_reasons(tenant):
+            info.append({'id': tenant.id, 'lms_configs': tenant.lms_configs})
+    tenant_ids = [tenant['id'] for tenant in info]
 
     tenant_by_site = {}
     for tenant in info:
@@ -136,50 +243,67 @@ def get_all_tenants_info() -> Dict[str, str | dict | List[int]]:
         tenant_by_site[lms_base_no_port] = tenant['id']
         tenant_by_site[lms_base] = tenant['id']
 
-    template_tenant = None
     template_assets: Dict[str, str] | None = None
-    try:
-        template_tenant = TenantConfig.objects.get(external_key=settings.FX_TEMPLATE_TENANT_SITE)
-    except TenantConfig.DoesNotExist:
-        logger.error('CONFIGURATION ERROR: Template tenant not found! (%s)', settings.FX_TEMPLATE_TENANT_SITE)
-
-    if template_tenant:
+    if template_tenant_id:
         template_assets = {
-            asset.slug: asset.file.url for asset in TenantAsset.objects.filter(tenant=template_tenant)
+            asset.slug: asset.file.url for asset in TenantAsset.objects.filter(tenant_id=template_tenant_id)
         }
+    else:
+        logger.error('CONFIGURATION ERROR: Template tenant not found! (%s)', template_site)
+
+    course_org_filter_list = {tenant['id']: _get_course_org_filter(tenant['lms_configs']) for tenant in info}
+    org_to_tenant_map = _get_org_to_tenant_map(course_org_filter_list)
 
     return {
-        'tenant_ids': tenant_ids,
-        'sites': {
-            tenant['id']: tenant['lms_configs']['LMS_BASE'] for tenant in info
-        },
-        'info': {
-            tenant['id']: {
-                'lms_root_url': get_first_not_empty_item([
-                    (tenant['lms_configs'].get('LMS_ROOT_URL') or '').strip(),
-                    fix_lms_base((tenant['lms_configs']['LMS_BASE']).strip()),
-                ], default=''),
-                'studio_root_url': settings.CMS_ROOT_URL,
-                'platform_name': get_first_not_empty_item([
-                    (tenant['lms_configs'].get('PLATFORM_NAME') or '').strip(),
-                    (tenant['lms_configs'].get('platform_name') or '').strip(),
-                ], default=''),
-                'logo_image_url': (tenant['lms_configs'].get('logo_image_url') or '').strip(),
-            } for tenant in info
-        },
-        'default_org_per_tenant': {
-            tenant['id']: tenant['lms_configs'].get('DEFAULT_COURSE_ORG', None) for tenant in info
-        },
-        'tenant_by_site': tenant_by_site,
-        'sso_sites': sso_sites,
-        'template_tenant': {
-            'tenant_id': template_tenant.id if template_tenant else None,
-            'tenant_site': settings.FX_TEMPLATE_TENANT_SITE if template_tenant else None,
-            'assets': template_assets,
+        'version': cs.TENANTS_REGISTRY_VERSION,
+        'tenants_info': {
+            'tenant_ids': tenant_ids,
+            'sites': {
+                tenant['id']: tenant['lms_configs']['LMS_BASE'] for tenant in info
+            },
+            'info': {
+                tenant['id']: {
+                    'lms_root_url': get_first_not_empty_item([
+                        (tenant['lms_configs'].get('LMS_ROOT_URL') or '').strip(),
+                        fix_lms_base((tenant['lms_configs']['LMS_BASE']).strip()),
+                    ], default=''),
+                    'studio_root_url': settings.CMS_ROOT_URL,
+                    'platform_name': get_first_not_empty_item([
+                        (tenant['lms_configs'].get('PLATFORM_NAME') or '').strip(),
+                        (tenant['lms_configs'].get('platform_name') or '').strip(),
+                    ], default=''),
+                    'logo_image_url': (tenant['lms_configs'].get('logo_image_url') or '').strip(),
+                } for tenant in info
+            },
+            'default_org_per_tenant': {
+                tenant['id']: tenant['lms_configs'].get('DEFAULT_COURSE_ORG', None) for tenant in info
+            },
+            'tenant_by_site': tenant_by_site,
+            'sso_sites': _get_sso_sites_info(),
+            'template_tenant': {
+                'tenant_id': template_tenant_id,
+                'tenant_site': template_site if template_tenant_id else None,
+                'assets': template_assets,
+            },
         },
+        'course_org_filter_list': course_org_filter_list,
+        'org_to_tenant_map': org_to_tenant_map,
+        'tenants_sharing_orgs': _get_tenants_sharing_orgs(course_org_filter_list, org_to_tenant_map),
     }
 
 
+def get_all_tenants_info() -> Dict[str, Any]:
+    """
+    Get all tenants in the system that are exposed in the route table, and with a valid config
+
+    Note: a tenant is a TenantConfig object
+
+    :return: Dictionary of tenant IDs and Sites
+    :rtype: Dict[str, Any]
+    """
+    return get_tenants_registry()['tenants_info']
+
+
 def get_all_tenant_ids() -> List[int]:
     """
     Get list of IDs of all tenants in the system
@@ -215,7 +339,6 @@ def get_tenant_site(tenant_id: int) -> str:
     return get_all_tenants_info()['sites'].get(tenant_id)
 
 
-@cache_dict(timeout='FX_CACHE_TIMEOUT_TENANTS_INFO', key_generator_or_name=cs.CACHE_NAME_ALL_COURSE_ORG_FILTER_LIST)
 def get_all_course_org_filter_list() -> Dict[int, List[str]]:
     """
     Get all course org filters for all tenants.
@@ -223,18 +346,35 @@ def get_all_course_org_filter_list() -> Dict[int, List[str]]:
     :return: Dictionary of tenant IDs and their course org filters
     :rtype: Dict[int, List[str]]
     """
-    tenant_configs = get_all_tenants().values_list('id', 'lms_configs')
+    return get_tenants_registry()['course_org_filter_list']
 
-    result = {}
-    for t_id, config in tenant_configs:
-        course_org_filter = config.get('course_org_filter', [])
-        if isinstance(course_org_filter, str):
-            course_org_filter = [course_org_filter]
-        result[t_id] = sorted(list({org.strip().lower() for org in course_org_filter}))
 
-    return result
+def _are_tenants_without_shared_orgs(tenant_ids: List[int]) -> bool:
+    """
+    Check if none of the given tenants shares an org with another one of them, so their orgs can be listed without
+    looking for duplicates.
 
+    :param tenant_ids: List of tenant IDs
+    :type tenant_ids: List[int]
+    :return: True if the tenants have no orgs in common, and no tenant ID is repeated
+    :rtype: bool
+    """
+    requested_tenant_ids = set(tenant_ids)
+    if len(requested_tenant_ids) != len(tenant_ids):
+        return False
 
+    tenants_sharing_orgs = get_tenants_sharing_orgs()
+    return not any(
+        requested_tenant_ids.intersection(tenants_sharing_orgs.get(tenant_id, [])) for tenant_id in tenant_ids
+    )
+
+
+def _course_org_filter_list_memo_key(tenant_ids: List[int], ignore_invalid_tenant_ids: bool = False) -> Tuple:
+    """Return the request memo key of get_course_org_filter_list"""
+    return tuple(tenant_ids or []), ignore_invalid_tenant_ids
+
+
+@request_memo(key_generator=_course_org_filter_list_memo_key)
 def get_course_org_filter_list(tenant_ids: List[int], ignore_invalid_tenant_ids: bool = False) -> Dict[str, Any]:
     """
     Get the filters to use for course orgs.
@@ -267,9 +407,18 @@ def get_course_org_filter_list(tenant_ids: List[int], ignore_invalid_tenant_ids:
 
     tenant_ids = tenant_ids or []
     orgs_list = []
-    duplicate_trace = {}
-    duplicates = {}
+    duplicate_trace: Dict[str, List[int]] = {}
+    duplicates: Dict[int, List[int]] = {}
     invalid = []
+
+    if _are_tenants_without_shared_orgs(tenant_ids):
+        for tenant_id in tenant_ids:
+            course_org_filter = tenant_configs.get(tenant_id, [])
+            if not course_org_filter:
+                invalid.append(tenant_id)
+            orgs_list.extend(course_org_filter)
+        tenant_ids = []
+
     for tenant_id in tenant_ids:
         course_org_filter = tenant_configs.get(tenant_id, [])
         if not course_org_filter:
@@ -277,7 +426,7 @@ def get_course_org_filter_list(tenant_ids: List[int], ignore_invalid_tenant_ids:
             continue
 
         for org in course_org_filter:
-            if org not in orgs_list:
+            if org not in duplicate_trace:
                 orgs_list.append(org)
                 duplicate_trace[org] = [tenant_id]
             else:
@@ -299,7 +448,6 @@ def get_course_org_filter_list(tenant_ids: List[int], ignore_invalid_tenant_ids:
     }
 
 
-@cache_dict(timeout='FX_CACHE_TIMEOUT_TENANTS_INFO', key_generator_or_name=cs.CACHE_NAME_ORG_TO_TENANT_MAP)
 def get_org_to_tenant_map() -> Dict[str, List[int]]:
     """
     Get the map of orgs to tenant IDs
@@ -313,19 +461,24 @@ def get_org_to_tenant_map() -> Dict[str, List[int]]:
     :return: Dictionary of orgs and their tenant IDs
     :rtype: Dict[str, List[int]]
     """
-    tenant_configs = get_all_course_org_filter_list()
-    result: Dict[str, Any] = {}
-    for t_id, course_org_filter in tenant_configs.items():
-        for org in course_org_filter:
-            if org not in result:
-                result[org] = {t_id}
-            else:
-                result[org].add(t_id)
+    return get_tenants_registry()['org_to_tenant_map']
 
-    for org, tenant_ids in result.items():
-        result[org] = list(tenant_ids)
 
-    return result
+def get_tenants_sharing_orgs() -> Dict[int, List[int]]:
+    """
+    Get the other tenants that share at least one org with every tenant
+
+    {
+        1: [4],
+        2: [],
+        4: [1],
+        ....
+    }
+
+    :return: Dictionary of tenant IDs and the IDs of the tenants sharing orgs with them
+    :rtype: Dict[int, List[int]]
+    """
+    return get_tenants_registry()['tenants_sharing_orgs']
 
 
 def get_tenants_by_org(org: str) -> List[int]:
@@ -1,15 +1,21 @@
 """Upload helpers"""
+import io
+import mimetypes
 import os
+import shutil
+import tempfile
 import uuid
-from typing import Any
+import zlib
+from typing import Any, BinaryIO
 
+from boto3.s3.transfer import TransferConfig
 from django.conf import settings
 from django.core.files import File
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from storages.backends.s3boto3 import S3Boto3Storage
 
-from futurex_openedx_extensions.helpers.constants import CONFIG_FILES_UPLOAD_DIR
+from futurex_openedx_extensions.helpers.constants import CONFIG_FILES_UPLOAD_DIR, UPLOAD_READ_CHUNK_SIZE
 
 
 def get_storage_dir(tenant_id: int, dir_name: str) -> str:
@@ -17,29 +23,131 @@ def get_storage_dir(tenant_id: int, dir_name: str) -> str:
     return os.path.join(settings.FX_DASHBOARD_STORAGE_DIR, f'{str(tenant_id)}/{dir_name}')
 
 
-def upload_file(storage_path: str, file: str | File, is_private: bool = False) -> str:
+class GzipReader(io.RawIOBase):
+    """Readable stream of the gzip compression of another binary stream. The data is compressed on the fly"""
+    def __init__(self, source: BinaryIO, chunk_size: int = UPLOAD_READ_CHUNK_SIZE) -> None:
+        """Initialize the reader"""
+        super().__init__()
+        self._source = source
+        self._chunk_size = chunk_size
+        self._compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)  # 16 + MAX_WBITS for the gzip container
+        self._pending = b''
+        self._eof = False
+
+    def readable(self) -> bool:
+        """The reader is readable"""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read the next compressed bytes into the buffer, compressing more of the source when needed"""
+        while not self._pending and not self._eof:
+            data = self._source.read(self._chunk_size)
+            if data:
+                self._pending = self._compressor.compress(data)
+            else:
+                self._pending = self._compressor.flush()
+                self._eof = True
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def get_content_type(storage_path: str) -> str:
+    """
+    Return the content type of the file to be saved in the given path. Compressed files are served as they are.
+
+    :param storage_path: The path of the file in the storage system.
+    :type storage_path: str
+    :return: The content type
+    :rtype: str
+    """
+    content_type, encoding = mimetypes.guess_type(storage_path)
+    if encoding == 'gzip':
+        return 'application/gzip'
+    return content_type or 'application/octet-stream'
+
+
+def get_storage_key(storage_path: str) -> str:
+    """
+    Return the key of the given path in the bucket of the S3 default storage, including the storage location prefix
+    (AWS_LOCATION) that the storage adds to the paths it saves.
+
+    :param storage_path: The path of the file in the storage system.
+    :type storage_path: str
+    :return: The key of the file in the bucket
+    :rtype: str
+    """
+    return default_storage._normalize_name(storage_path)  # pylint: disable=protected-access
+
+
+def get_upload_transfer_config() -> TransferConfig:
+    """Return the S3 managed transfer configuration of the uploads"""
+    part_size = settings.FX_UPLOAD_PART_SIZE_MB * 1024 * 1024
+    return TransferConfig(
+        multipart_threshold=part_size,
+        multipart_chunksize=part_size,
+        max_concurrency=settings.FX_UPLOAD_MAX_CONCURRENCY,
+    )
+
+
+def _upload_local_file(storage_path: str, local_file_path: str, is_private: bool, compress: bool) -> None:
+    """
+    Stream a local file to the storage. The file is never fully read into memory; on S3, it is uploaded by a managed
+    multipart transfer, and gzipped on the fly when requested. Other storages may seek the saved file, so it is
+    gzipped into a temporary file first.
+
+    :param storage_path: The path to save the file in the storage system.
+    :type storage_path: str
+    :param local_file_path: The path of the local file.
+    :type local_file_path: str
+    :param is_private: Whether the file should be uploaded as private.
+    :type is_private: bool
+    :param compress: Whether to gzip the file on the fly while uploading it.
+    :type compress: bool
+    """
+    with open(local_file_path, 'rb') as local_file:
+        if isinstance(default_storage, S3Boto3Storage):
+            stream: Any = io.BufferedReader(GzipReader(local_file)) if compress else local_file
+            extra_args = {'ContentType': get_content_type(storage_path)}
+            if is_private:
+                extra_args['ACL'] = 'private'
+            default_storage.bucket.upload_fileobj(
+                stream, get_storage_key(storage_path), ExtraArgs=extra_args, Config=get_upload_transfer_config(),
+            )
+        elif compress:
+            with tempfile.TemporaryFile() as compressed_file:
+                shutil.copyfileobj(GzipReader(local_file), compressed_file, UPLOAD_READ_CHUNK_SIZE)
+                compressed_file.seek(0)
+                default_storage.save(storage_path, File(compressed_file, name=os.path.basename(storage_path)))
+        else:
+            default_storage.save(storage_path, File(local_file, name=os.path.basename(storage_path)))
+
+
+def upload_file(storage_path: str, file: str | File, is_private: bool = False, compress: bool = False) -> str:
     """
     Uploads a file to storage and returns the storage path.
 
     :param storage_path: The path to save the file in the storage system.
     :param file: The file to upload. Can be either a local file path or a file object from a request.
     :param is_private: Whether the file should be uploaded as private (default: False).
+    :param compress: Whether to gzip a local file on the fly while uploading it (default: False).
     :returns uploaded file URL
     """
     if isinstance(file, str):
         # local file to upload
-        with open(file, 'rb') as f:
-            content_file = ContentFile(f.read())
-            default_storage.save(storage_path, content_file)
-    else:
-        # file object to upload
-        directory = os.path.dirname(storage_path)
-        if not default_storage.exists(directory):
-            default_storage.save(directory + '/.empty', ContentFile(''))
-        with default_storage.open(storage_path, 'wb') as f:
-            for chunk in file.chunks():
-                f.write(chunk)
-        default_storage.delete(directory + '/.empty')
+        _upload_local_file(storage_path, file, is_private, compress)
+        return default_storage.url(storage_path)
+
+    # file object to upload
+    directory = os.path.dirname(storage_path)
+    if not default_storage.exists(directory):
+        default_storage.save(directory + '/.empty', ContentFile(''))
+    with default_storage.open(storage_path, 'wb') as f:
+        for chunk in file.chunks():
+            f.write(chunk)
+    default_storage.delete(directory + '/.empty')
 
     if is_private and isinstance(default_storage, S3Boto3Storage):
         default_storage.bucket.Object(storage_path).Acl().put(ACL='private')
@@ -0,0 +1,20 @@
+"""Fake boto3.s3.transfer"""
+
+
+class TransferConfig:  # pylint: disable=too-few-public-methods
+    """
+    A minimal class to simulate the configuration of the S3 managed transfers for mocking purposes.
+    It only keeps the given configuration values as attributes.
+    """
+    def __init__(
+        self,
+        multipart_threshold=8 * 1024 * 1024,
+        max_concurrency=10,
+        multipart_chunksize=8 * 1024 * 1024,
+        **kwargs,
+    ):
+        self.multipart_threshold = multipart_threshold
+        self.max_concurrency = max_concurrency
+        self.multipart_chunksize = multipart_chunksize
+        for key, value in kwargs.items():
+            setattr(self, key, value)
@@ -35,6 +35,20 @@ def get_certificates_for_user_by_course_keys(user, course_keys):  # pylint: disa
     return {}
 
 
+def format_certificate_for_user(username, cert):
+    """format_certificate_for_user Mock"""
+    is_passing = cert.status == 'downloadable'
+    return {
+        'username': username,
+        'course_key': cert.course_id,
+        'status': cert.status,
+        'created': cert.created_date,
+        'modified': cert.modified_date,
+        'is_passing': is_passing,
+        'download_url': f'/certificates/{cert.id}' if is_passing else None,
+    }
+
+
 def get_user_by_username_or_email(username_or_email):
     """get_user_by_username_or_email Mock"""
     raise get_user_model().DoesNotExist('Dummy function always returns DoesNotExist, mock it you need it')
@@ -35,6 +35,7 @@ class CourseOverview(models.Model):
     course_image_url = models.TextField()
     visible_to_staff_only = models.BooleanField(default=False)
     effort = models.TextField(null=True)
+    modified = models.DateTimeField(auto_now=True)
 
     class Meta:
         app_label = 'fake_models'
@@ -88,12 +89,23 @@ class UserSignupSource(models.Model):
         db_table = 'student_usersignupsource'
 
 
+class EligibleCertificateManager(models.Manager):  # pylint: disable=too-few-public-methods
+    """Mock"""
+    def get_queryset(self):
+        """Exclude the certificates of audit enrollments"""
+        return super().get_queryset().exclude(status__in=['audit_passing', 'audit_notpassing'])
+
+
 class GeneratedCertificate(models.Model):
     """Mock"""
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
     course_id = CourseKeyField(max_length=255, blank=True, default=None)
     status = models.CharField(max_length=32, default='unavailable')
     created_date = models.DateTimeField(auto_now_add=True)
+    modified_date = models.DateTimeField(auto_now=True)
+
+    objects = models.Manager()
+    eligible_certificates = EligibleCertificateManager()
 
     class Meta:
         unique_together = (('user', 'course_id'),)
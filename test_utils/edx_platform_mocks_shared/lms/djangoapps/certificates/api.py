@@ -1,2 +1,5 @@
 """edx-platform Mocks"""
-from fake_models.functions import get_certificates_for_user_by_course_keys  # pylint: disable=unused-import
+from fake_models.functions import (  # pylint: disable=unused-import
+    format_certificate_for_user,
+    get_certificates_for_user_by_course_keys,
+)
@@ -61,6 +61,10 @@ class DummyModuleStore:
         """mock modulestore library keys method"""
         return [fake_lib.location.library_key for fake_lib in self.libraries]
 
+    def get_library(self, library_key):
+        """mock modulestore get library method"""
+        return next((fake_lib for fake_lib in self.libraries if fake_lib.location.library_key == library_key), None)
+
     def get_libraries(self):
         """mock modulestore library keys method"""
         return self.libraries
@@ -57,6 +57,7 @@ MIDDLEWARE = (
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'futurex_openedx_extensions.helpers.middlewares.FXRequestMemoMiddleware',
 )
 
 TEMPLATES = [{
@@ -89,12 +90,35 @@ CACHES = {
 # Non-default dashboard settings
 FX_CACHE_TIMEOUT_COURSE_ACCESS_ROLES = 60 * 31  # 31 minutes
 FX_CACHE_TIMEOUT_TENANTS_INFO = 60 * 60 * 3  # 3 hours
+FX_CACHE_STALE_TIMEOUT = 60 * 6  # 6 minutes
+FX_CACHE_LOCAL_TIMEOUT = 0
 FX_CACHE_TIMEOUT_VIEW_ROLES = 60 * 31  # 31 minutes
 FX_CACHE_TIMEOUT_LIVE_STATISTICS_PER_TENANT = 60 * 60 * 3  # three hours
 FX_CACHE_TIMEOUT_CONFIG_ACCESS_CONTROL = 60 * 60 * 48  # 2 days
+FX_CACHE_TIMEOUT_LIBRARY_KEYS = 60 * 31  # 31 minutes
+FX_CACHE_TIMEOUT_LIBRARY_NOT_FOUND = 60 * 2  # 2 minutes
+FX_CACHE_TIMEOUT_EXPORT_DATA_WATERMARK = 30
 FX_CACHE_TIMEOUT_COURSES_RATINGS = 60 * 2  # 2 hours
+FX_CACHE_TIMEOUT_COURSE_GRADING_SUBSECTIONS = 60 * 60 * 25  # 25 hours
+FX_STATISTICS_SNAPSHOT_ENABLED = True
+FX_STATISTICS_SNAPSHOT_LIVE_DELTA = True
+FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS = 60 * 5  # 5 minutes
+FX_STATISTICS_SNAPSHOT_FULL_REFRESH_SECONDS = 60 * 60 * 12  # 12 hours
 
 FX_TASK_MINUTES_LIMIT = 6  # 6 minutes
+FX_TASK_EXPORT_PARALLEL_CHUNKS = 3
+FX_TASK_PROGRESS_UPDATE_SECONDS = 0
+FX_TASK_PROGRESS_UPDATE_STEP = 0.1
+FX_TASK_PROGRESS_CACHE_TIMEOUT = 60
+FX_TASK_EXPORT_GZIP = True
+FX_TASK_EXPORT_REUSE_SECONDS = 60 * 10  # 10 minutes
+FX_UPLOAD_PART_SIZE_MB = 16
+FX_UPLOAD_MAX_CONCURRENCY = 2
+FX_CLICKHOUSE_POOL_SIZE = 0
+FX_CLICKHOUSE_POOL_KEEP_ALIVE_SECONDS = 60
+FX_CLICKHOUSE_POOL_HEALTH_CHECK_SECONDS = 10
+FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION = True
+FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT = 0
 FX_MAX_PERIOD_CHUNKS_MAP = {
     'day': 365 * 2,
     'month': 12 * 2,
@@ -11,6 +11,11 @@ helpers_default_settings = [
     ('FX_CACHE_TIMEOUT_LIVE_STATISTICS_PER_TENANT', 60 * 60 * 2),  # 2 hours
     ('FX_ALLOWED_COURSE_LANGUAGE_CODES', ['en', 'ar', 'fr']),
     ('FX_CACHE_TIMEOUT_COURSES_RATINGS', 60 * 60),  # 1 hour
+    ('FX_CACHE_TIMEOUT_COURSE_GRADING_SUBSECTIONS', 60 * 60 * 24),  # 1 day
+    ('FX_STATISTICS_SNAPSHOT_ENABLED', False),
+    ('FX_STATISTICS_SNAPSHOT_LIVE_DELTA', False),
+    ('FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS', 60 * 15),  # 15 minutes
+    ('FX_STATISTICS_SNAPSHOT_FULL_REFRESH_SECONDS', 60 * 60 * 24),  # 1 day
 ]
 
 
@@ -70,3 +75,45 @@ def test_common_production_plugin_settings_explicit(settings, setting_key, defau
 def test_common_production_plugin_settings():
     """Verify that used settings contain the method plugin_settings"""
     assert hasattr(common_production, 'plugin_settings'), 'settings is missing the method plugin_settings!'
+
+
+@pytest.mark.parametrize('enabled, refresh_seconds, full_refresh_seconds, expected_schedule_names', [
+    (True, 300, 3600, ['fx-refresh-statistics-snapshots', 'fx-full-refresh-statistics-snapshots']),
+    (True, 300, 0, ['fx-refresh-statistics-snapshots']),
+    (True, 0, 3600, ['fx-full-refresh-statistics-snapshots']),
+    (False, 300, 3600, []),
+])
+def test_common_production_plugin_settings_statistics_snapshots_schedule(
+    settings, enabled, refresh_seconds, full_refresh_seconds, expected_schedule_names,
+):
+    """Verify that the refresh of the statistics snapshots is scheduled with celery beat only when enabled"""
+    settings = copy.deepcopy(settings)
+    settings.FX_STATISTICS_SNAPSHOT_ENABLED = enabled
+    settings.FX_STATISTICS_SNAPSHOT_REFRESH_SECONDS = refresh_seconds
+    settings.FX_STATISTICS_SNAPSHOT_FULL_REFRESH_SECONDS = full_refresh_seconds
+    settings.CELERY_BEAT_SCHEDULE = {'other-task': {'task': 'other.task', 'schedule': 60}}
+
+    common_production.plugin_settings(settings)
+    assert list(settings.CELERY_BEAT_SCHEDULE) == expected_schedule_names + ['other-task']
+    if refresh_seconds and enabled:
+        assert settings.CELERY_BEAT_SCHEDULE['fx-refresh-statistics-snapshots'] == {
+            'task': common_production.STATISTICS_SNAPSHOTS_TASK,
+            'schedule': refresh_seconds,
+        }
+    if full_refresh_seconds and enabled:
+        assert settings.CELERY_BEAT_SCHEDULE['fx-full-refresh-statistics-snapshots'] == {
+            'task': common_production.STATISTICS_SNAPSHOTS_TASK,
+            'schedule': full_refresh_seconds,
+            'kwargs': {'full_refresh': True},
+        }
+
+
+def test_common_production_plugin_settings_statistics_snapshots_schedule_override(settings):
+    """Verify that the statistics snapshots entries already defined in CELERY_BEAT_SCHEDULE are kept"""
+    settings = copy.deepcopy(settings)
+    settings.FX_STATISTICS_SNAPSHOT_ENABLED = True
+    overridden_entry = {'task': common_production.STATISTICS_SNAPSHOTS_TASK, 'schedule': 60}
+    settings.CELERY_BEAT_SCHEDULE = {'fx-refresh-statistics-snapshots': overridden_entry}
+
+    common_production.plugin_settings(settings)
+    assert settings.CELERY_BEAT_SCHEDULE['fx-refresh-statistics-snapshots'] == overridden_entry
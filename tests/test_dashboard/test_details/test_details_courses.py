@@ -5,17 +5,22 @@ import pytest
 from common.djangoapps.student.models import CourseEnrollment
 from completion.models import BlockCompletion
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils.timezone import now, timedelta
 from eox_nelp.course_experience.models import FeedbackCourse
 from lms.djangoapps.certificates.models import GeneratedCertificate
+from opaque_keys.edx.locator import CourseLocator
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 from futurex_openedx_extensions.dashboard.details.courses import (
     annotate_courses_rating_queryset,
+    cache_name_course_grading_subsections,
+    get_course_grading_subsections,
     get_courses_orders_queryset,
     get_courses_queryset,
     get_learner_courses_info_queryset,
 )
+from futurex_openedx_extensions.helpers import constants as cs
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
 
 
@@ -293,3 +298,73 @@ def test_get_courses_orders_queryset(  # pylint: disable=too-many-locals
     )
 
     assert result == mock_orders_qs
+
+
+@pytest.mark.django_db
+def test_cache_name_course_grading_subsections(base_data):  # pylint: disable=unused-argument
+    """Verify that the cache name changes when the course overview is modified."""
+    course = CourseOverview.objects.get(id='course-v1:ORG1+2+2')
+    course_id = str(course.id)
+    CourseOverview.objects.filter(id=course_id).update(modified=now() - timedelta(days=1))
+    old_name = cache_name_course_grading_subsections(course_id)
+    assert old_name.startswith(f'{cs.CACHE_NAME_COURSE_GRADING_SUBSECTIONS}_{course_id}_')
+
+    course.save()
+    assert cache_name_course_grading_subsections(course_id) != old_name
+    assert cache_name_course_grading_subsections('course-v1:ORG1+99+99') == \
+        f'{cs.CACHE_NAME_COURSE_GRADING_SUBSECTIONS}_course-v1:ORG1+99+99_0'
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.dashboard.details.courses.get_course_by_id')
+@patch('futurex_openedx_extensions.dashboard.details.courses.grading_context_for_course')
+def test_get_course_grading_subsections(
+    mock_grading_context, mock_get_course, base_data,
+):  # pylint: disable=unused-argument
+    """Verify that get_course_grading_subsections returns the graded subsections grouped by assignment type."""
+    mock_grading_context.return_value = {
+        'all_graded_subsections_by_type': {
+            'Homework': [
+                {'subsection_block': Mock(display_name='First Homework', location='block-v1:ORG1+1+1+type@hw+block@1')},
+                {'subsection_block': Mock(display_name='Second', location='block-v1:ORG1+1+1+type@hw+block@2')},
+            ],
+            'Exam': [
+                {'subsection_block': Mock(display_name='Final', location='block-v1:ORG1+1+1+type@exam+block@1')},
+            ],
+        },
+    }
+
+    assert get_course_grading_subsections('course-v1:ORG1+1+1') == {
+        'Homework': [
+            {'display_name': 'First Homework', 'location': 'block-v1:ORG1+1+1+type@hw+block@1'},
+            {'display_name': 'Second', 'location': 'block-v1:ORG1+1+1+type@hw+block@2'},
+        ],
+        'Exam': [
+            {'display_name': 'Final', 'location': 'block-v1:ORG1+1+1+type@exam+block@1'},
+        ],
+    }
+    mock_get_course.assert_called_once_with(CourseLocator.from_string('course-v1:ORG1+1+1'))
+
+
+@pytest.mark.django_db
+def test_cache_name_course_grading_subsections_with_course_modified(
+    django_assert_num_queries,
+):
+    """Verify that the cache name uses the given modification time of the course without querying it."""
+    modified = now()
+    with django_assert_num_queries(0):
+        assert cache_name_course_grading_subsections('course-v1:ORG1+1+1', modified) == \
+            f'{cs.CACHE_NAME_COURSE_GRADING_SUBSECTIONS}_course-v1:ORG1+1+1_{int(modified.timestamp())}'
+
+
+@patch('futurex_openedx_extensions.dashboard.details.courses.get_course_by_id')
+@patch('futurex_openedx_extensions.dashboard.details.courses.grading_context_for_course')
+def test_get_course_grading_subsections_caches_empty_result(mock_grading_context, _):
+    """Verify that get_course_grading_subsections caches the result of a course without graded subsections."""
+    mock_grading_context.return_value = {'all_graded_subsections_by_type': {}}
+
+    with patch.object(cache, 'set') as mock_set:
+        assert not get_course_grading_subsections('course-v1:ORG1+1+1', now())
+
+    mock_set.assert_called_once()
+    assert mock_set.call_args[0][1]['data'] == {'subsections': {}}
@@ -66,7 +66,9 @@ def serializer_context():
 @pytest.fixture
 def grading_context():
     """Create a grading context for testing."""
-    with patch('futurex_openedx_extensions.dashboard.serializers.grading_context_for_course') as mock_grading_context:
+    with patch(
+        'futurex_openedx_extensions.dashboard.details.courses.grading_context_for_course'
+    ) as mock_grading_context:
         mock_grading_context.return_value = {
             'all_graded_subsections_by_type': {
                 'Homework': [
@@ -162,6 +164,27 @@ def test_data_export_task_serializer_for_download_url(
     assert serializer.data['download_url'] == 'fake_download_url'
 
 
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cache_testing')
+@pytest.mark.parametrize('status, cached_progress, expected_progress', [
+    (DataExportTask.STATUS_PROCESSING, 0.7, 0.7),
+    (DataExportTask.STATUS_PROCESSING, 0.2, 0.5),
+    (DataExportTask.STATUS_PROCESSING, None, 0.5),
+    (DataExportTask.STATUS_IN_QUEUE, 0.7, 0.5),
+])
+def test_data_export_task_serializer_cached_progress(
+    base_data, status, cached_progress, expected_progress,
+):  # pylint: disable=unused-argument
+    """Verify that the DataExportSerializer uses the cached progress of tasks in progress when it is more recent."""
+    user = get_user_model().objects.get(id=10)
+    task = DataExportTask.objects.create(
+        filename='test.csv', view_name='test', user=user, tenant_id=1, progress=0.5, status=status,
+    )
+    if cached_progress is not None:
+        DataExportTask.cache_progress(task.id, cached_progress)
+    assert serializers.DataExportTaskSerializer(instance=task).data['progress'] == expected_progress
+
+
 @pytest.mark.django_db
 def test_learner_basic_details_serializer_no_profile(base_data):  # pylint: disable=unused-argument
     """Verify that the LearnerBasicDetailsSerializer is correctly defined."""
@@ -609,6 +632,48 @@ def test_learner_details_for_course_serializer_certificate_url(
     assert serializer.data[0]['certificate_url'] == mock_get_certificate_url.return_value
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize('optional_field_tags, expected_prefetch', [
+    (['certificate_url', 'certificate_date'], True),
+    (['certificate_date'], True),
+    (['progress'], False),
+])
+@patch('futurex_openedx_extensions.dashboard.serializers.get_certificates_by_users')
+@patch('futurex_openedx_extensions.dashboard.serializers.get_certificate_date')
+@patch('futurex_openedx_extensions.dashboard.serializers.get_certificate_url')
+def test_learner_enrollment_serializer_prefetch_certificates(
+    mock_get_certificate_url, mock_get_certificate_date, mock_get_certificates_by_users,
+    optional_field_tags, expected_prefetch, base_data,
+):  # pylint: disable=unused-argument, too-many-arguments
+    """Verify that the list serializer loads the certificates of all rows at once and feeds both fields from them."""
+    mock_get_certificate_date.return_value = None
+    user_certificates = {'dummy': 'certificates'}
+    mock_get_certificates_by_users.return_value = {4: user_certificates}
+    queryset = CourseEnrollment.objects.filter(user_id__in=[4, 10]).annotate(
+        certificate_available=Value(True),
+        course_score=Value(0.67),
+        active_in_course=Value(True),
+    )
+
+    data = serializers.LearnerEnrollmentSerializer(
+        queryset, context={'requested_optional_field_tags': optional_field_tags}, many=True,
+    ).data
+
+    assert len(data) == queryset.count()
+    if not expected_prefetch:
+        mock_get_certificates_by_users.assert_not_called()
+        return
+
+    mock_get_certificates_by_users.assert_called_once()
+    assert len(mock_get_certificates_by_users.call_args[0][0]) == queryset.count()
+    for call in mock_get_certificate_date.call_args_list:
+        assert call[1]['certificates'] == (user_certificates if call[0][0].id == 4 else {})
+    assert mock_get_certificate_date.call_count == queryset.count()
+    assert mock_get_certificate_url.call_count == (
+        queryset.count() if 'certificate_url' in optional_field_tags else 0
+    )
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize('many', [True, False])
 def test_learner_details_for_course_serializer_exam_scores(
@@ -651,6 +716,60 @@ def test_learner_details_for_course_serializer_exam_scores(
     assert data['earned - Exam: The final exam'] == 'no attempt'
 
 
+@pytest.mark.django_db
+def test_learner_enrollment_serializer_exam_scores_bulk(
+    grading_context, base_data,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that the list serializer loads the exam scores of all rows in one query and gives each row its slice."""
+    queryset = CourseEnrollment.objects.filter(course_id='course-v1:ORG2+3+3').annotate(
+        certificate_available=Value(True),
+        course_score=Value(0.67),
+        active_in_course=Value(True),
+    ).order_by('user_id')
+    assert queryset.count() > 1
+    for enrollment, earned in zip(queryset[:2], [9.0, 5.0]):
+        PersistentSubsectionGrade.objects.create(
+            user_id=enrollment.user_id,
+            course_id='course-v1:ORG2+3+3',
+            usage_key='block-v1:ORG2+1+1+type@homework+block@2',
+            earned_graded=0,
+            possible_graded=0,
+            earned_all=earned,
+            possible_all=10.0,
+            first_attempted=now() - timedelta(days=1),
+        )
+
+    with patch(
+        'futurex_openedx_extensions.dashboard.serializers.PersistentSubsectionGrade.objects.filter',
+        wraps=PersistentSubsectionGrade.objects.filter,
+    ) as mock_filter:
+        data = serializers.LearnerEnrollmentSerializer(queryset, context={
+            'course_id': 'course-v1:ORG2+3+3',
+            'requested_optional_field_tags': ['exam_scores'],
+        }, many=True).data
+
+    mock_filter.assert_called_once()
+    assert [item['earned - Homework 2: Second Homework'] for item in data[:3]] == [9.0, 5.0, 'no attempt']
+    assert all(item['earned - Homework 1: First Homework'] == 'no attempt' for item in data)
+
+
+@pytest.mark.django_db
+def test_learner_enrollment_serializer_exam_scores_bulk_empty_page(
+    grading_context, base_data,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that the list serializer does not query the exam scores of an empty page."""
+    with patch(
+        'futurex_openedx_extensions.dashboard.serializers.PersistentSubsectionGrade.objects.filter',
+    ) as mock_filter:
+        data = serializers.LearnerEnrollmentSerializer(CourseEnrollment.objects.none(), context={
+            'course_id': 'course-v1:ORG2+3+3',
+            'requested_optional_field_tags': ['exam_scores'],
+        }, many=True).data
+
+    assert not data
+    mock_filter.assert_not_called()
+
+
 @pytest.mark.django_db
 def test_learner_details_extended_serializer(base_data):  # pylint: disable=unused-argument
     """Verify that the LearnerDetailsExtendedSerializer returns the correct data."""
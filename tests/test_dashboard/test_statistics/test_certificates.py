@@ -115,3 +115,24 @@ def test_get_learning_hours_count_for_different_course_effort_not_set(
     result = certificates.get_learning_hours_count(fx_permission_info)
     assert result == 10 * 2
     assert 'Invalid course-effort for course course-v1:ORG8+1+1. Assuming default value' not in caplog.text
+
+
+@pytest.mark.django_db
+@override_settings(FX_DEFAULT_COURSE_EFFORT=10)
+@pytest.mark.parametrize('tenant_ids, expected_result, expected_result_with_staff', [
+    ([1], {'org1': 2 * 10, 'org2': 9 * 10}, {'org1': 4 * 10, 'org2': 10 * 10}),
+    ([1, 2], {'org1': 2 * 10, 'org2': 9 * 10, 'org3': 6 * 10, 'org8': 2 * 10}, {
+        'org1': 4 * 10, 'org2': 10 * 10, 'org3': 7 * 10, 'org8': 2 * 10,
+    }),
+    ([3], {}, {}),
+])
+def test_get_learning_hours_count_per_org(
+    base_data, fx_permission_info, tenant_ids, expected_result, expected_result_with_staff,
+):  # pylint: disable=unused-argument
+    """Verify get_learning_hours_count_per_org function."""
+    fx_permission_info['view_allowed_full_access_orgs'] = get_tenants_orgs(tenant_ids)
+    fx_permission_info['view_allowed_any_access_orgs'] = get_tenants_orgs(tenant_ids)
+    result = certificates.get_learning_hours_count_per_org(fx_permission_info)
+    assert result == expected_result
+    result = certificates.get_learning_hours_count_per_org(fx_permission_info, include_staff=True)
+    assert result == expected_result_with_staff
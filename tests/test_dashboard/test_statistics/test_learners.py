@@ -1,6 +1,7 @@
 """Tests for learners statistics."""
 
 import pytest
+from common.djangoapps.student.models import CourseAccessRole
 
 from futurex_openedx_extensions.dashboard.statistics import learners
 from futurex_openedx_extensions.helpers.permissions import get_tenant_limited_fx_permission_info
@@ -24,3 +25,97 @@ def test_get_learners_count(
 
     result = learners.get_learners_count(tenant_fx_permission_info, include_staff=True)
     assert result == expected_result_include_staff
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('include_staff', [False, True])
+def test_get_learners_count_per_tenant(
+    base_data, user1_fx_permission_info, include_staff,
+):  # pylint: disable=unused-argument
+    """Verify that get_learners_count_per_tenant matches get_learners_count of each tenant."""
+    result = learners.get_learners_count_per_tenant(user1_fx_permission_info, include_staff=include_staff)
+    assert result == {
+        tenant_id: learners.get_learners_count(
+            get_tenant_limited_fx_permission_info(user1_fx_permission_info, tenant_id), include_staff=include_staff,
+        ) for tenant_id in [1, 2, 3, 7, 8]
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('include_staff', [False, True])
+def test_get_learners_count_per_tenant_partial_access(base_data, include_staff):  # pylint: disable=unused-argument
+    """Verify that get_learners_count_per_tenant limits partial access courses to the orgs of each tenant."""
+    fx_permission_info = {
+        'user': None,
+        'is_system_staff_user': False,
+        'user_roles': {'instructor': {'course_limited_access': ['course-v1:ORG3+1+1', 'course-v1:ORG8+1+1']}},
+        'view_allowed_roles': ['instructor'],
+        'view_allowed_full_access_orgs': [],
+        'view_allowed_course_access_orgs': ['org3', 'org8'],
+        'view_allowed_any_access_orgs': ['org3', 'org8'],
+        'view_allowed_tenant_ids_any_access': [7, 8],
+        'view_allowed_tenant_ids_full_access': [],
+        'view_allowed_tenant_ids_partial_access': [7, 8],
+    }
+
+    result = learners.get_learners_count_per_tenant(fx_permission_info, include_staff=include_staff)
+    assert result == {
+        tenant_id: learners.get_learners_count(
+            get_tenant_limited_fx_permission_info(fx_permission_info, tenant_id), include_staff=include_staff,
+        ) for tenant_id in [7, 8]
+    }
+    assert result[7] != result[8], 'bad test data'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('include_staff', [False, True])
+def test_get_learners_count_per_tenant_mixed_access(base_data, include_staff):  # pylint: disable=unused-argument
+    """
+    Verify that get_learners_count_per_tenant matches the per-tenant count when a tenant mixes full access and course
+    access orgs, and another tenant has course access only.
+    """
+    fx_permission_info = {
+        'user': None,
+        'is_system_staff_user': False,
+        'user_roles': {
+            'staff': {'course_limited_access': []},
+            'instructor': {'course_limited_access': ['course-v1:ORG2+1+1', 'course-v1:ORG3+1+1']},
+        },
+        'view_allowed_roles': ['staff', 'instructor'],
+        'view_allowed_full_access_orgs': ['org1'],
+        'view_allowed_course_access_orgs': ['org2', 'org3'],
+        'view_allowed_any_access_orgs': ['org1', 'org2', 'org3'],
+        'view_allowed_tenant_ids_any_access': [1, 7],
+        'view_allowed_tenant_ids_full_access': [1],
+        'view_allowed_tenant_ids_partial_access': [1, 7],
+    }
+
+    result = learners.get_learners_count_per_tenant(fx_permission_info, include_staff=include_staff)
+    assert result == {
+        tenant_id: learners.get_learners_count(
+            get_tenant_limited_fx_permission_info(fx_permission_info, tenant_id), include_staff=include_staff,
+        ) for tenant_id in [1, 7]
+    }
+    assert result[1] and result[7], 'bad test data'
+
+
+@pytest.mark.django_db
+def test_get_staff_orgs_per_user(base_data):  # pylint: disable=unused-argument
+    """Verify that _get_staff_orgs_per_user marks the users with a global staff role as staff in all orgs."""
+    CourseAccessRole.objects.all().delete()
+    CourseAccessRole.objects.create(user_id=10, role='support', org='')
+    CourseAccessRole.objects.create(user_id=10, role='staff', org='ORG1')
+    CourseAccessRole.objects.create(user_id=11, role='staff', org='ORG1')
+    CourseAccessRole.objects.create(user_id=11, role='instructor', org='org9')
+
+    assert learners._get_staff_orgs_per_user(['ORG1', 'org2']) == {  # pylint: disable=protected-access
+        10: None,
+        11: {'org1'},
+    }
+
+
+@pytest.mark.django_db
+def test_get_learners_count_per_tenant_no_tenants(user1_fx_permission_info):
+    """Verify that get_learners_count_per_tenant returns an empty result when there are no tenants."""
+    user1_fx_permission_info['view_allowed_tenant_ids_any_access'] = []
+    assert not learners.get_learners_count_per_tenant(user1_fx_permission_info)
@@ -37,3 +37,30 @@ def test_get_live_statistics_invalid_tenant_id(
     assert len(result) == len(keys)
     for key in keys:
         assert result[key] == 0
+
+
+@patch('futurex_openedx_extensions.dashboard.statistics.live.get_snapshot_statistics')
+@patch('futurex_openedx_extensions.dashboard.statistics.live.build_fx_permission_info')
+@pytest.mark.django_db
+@pytest.mark.parametrize('snapshot_enabled, snapshot, expected_learners_count', [
+    (False, {'learners_count': 99}, 16),
+    (True, None, 16),
+    (True, {'learners_count': 99}, 99),
+])
+def test_get_live_statistics_snapshot(
+    mocked_build, mocked_snapshot, base_data, settings, snapshot_enabled, snapshot, expected_learners_count,
+):  # pylint: disable=unused-argument, too-many-arguments
+    """Verify that the live statistics are read from the snapshot when enabled and available."""
+    settings.FX_STATISTICS_SNAPSHOT_ENABLED = snapshot_enabled
+    settings.FX_STATISTICS_SNAPSHOT_LIVE_DELTA = False
+    mocked_build.return_value = build_fx_permission_info(tenant_id=1)
+    mocked_snapshot.return_value = snapshot
+
+    result = live.get_live_statistics(tenant_id=1)
+
+    assert result['learners_count'] == expected_learners_count
+    assert result['courses_count'] == 12
+    if snapshot_enabled:
+        mocked_snapshot.assert_called_once_with(1, live_delta=False)
+    else:
+        mocked_snapshot.assert_not_called()
@@ -0,0 +1,136 @@
+"""Tests for statistics snapshots."""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+from futurex_openedx_extensions.dashboard.statistics import snapshots
+from futurex_openedx_extensions.helpers import constants as cs
+from futurex_openedx_extensions.helpers.models import StatisticsSnapshot, StatisticsSnapshotWatermark
+
+TENANT1_STATISTICS = {
+    'learners_count': 16,
+    'enrollments_count': 26,
+    'certificates_count': 11,
+    'learning_hours_count': 220,
+}
+
+
+def _get_old_certificates_bucket(buckets):
+    """Get the (org, day) of a bucket with certificates created before yesterday"""
+    yesterday = timezone.localdate() - timedelta(days=1)
+    return next(
+        key for key, counters in buckets.items() if counters['certificates_count'] and key[1] < yesterday
+    )
+
+
+@pytest.mark.django_db
+def test_compute_statistics_buckets(base_data):  # pylint: disable=unused-argument
+    """Verify that compute_statistics_buckets groups the statistics by org and day."""
+    result = snapshots.compute_statistics_buckets(1)
+
+    assert {org for org, _ in result} == {'', 'org1', 'org2'}
+    for (org, _), counters in result.items():
+        assert (org == '') == (counters['learners_count'] > 0)
+    for counter in snapshots.SNAPSHOT_COUNTERS:
+        assert sum(counters[counter] for counters in result.values()) == TENANT1_STATISTICS[counter]
+
+    assert not snapshots.compute_statistics_buckets(1, date_from=timezone.localdate() + timedelta(days=1))
+
+
+@pytest.mark.django_db
+def test_compute_statistics_buckets_extra_days(base_data):  # pylint: disable=unused-argument
+    """Verify that compute_statistics_buckets includes the extra days before date_from."""
+    org, old_day = _get_old_certificates_bucket(snapshots.compute_statistics_buckets(1))
+    date_from = timezone.localdate() + timedelta(days=1)
+
+    result = snapshots.compute_statistics_buckets(1, date_from=date_from, extra_days=[old_day])
+    assert (org, old_day) in result
+    assert {day for _, day in result} == {old_day}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('live_delta', [True, False])
+def test_refresh_and_get_snapshot_statistics(base_data, live_delta):  # pylint: disable=unused-argument
+    """Verify that the snapshot statistics match the live statistics after a refresh."""
+    assert snapshots.get_snapshot_statistics(1, live_delta=live_delta) is None
+
+    snapshots.refresh_statistics_snapshot(1)
+
+    assert StatisticsSnapshotWatermark.objects.filter(tenant_id=1).exists()
+    assert StatisticsSnapshot.objects.filter(tenant_id=1).count() == len(snapshots.compute_statistics_buckets(1))
+    assert snapshots.get_snapshot_statistics(1, live_delta=live_delta) == TENANT1_STATISTICS
+
+
+@pytest.mark.django_db
+def test_refresh_statistics_snapshot_incremental(base_data):  # pylint: disable=unused-argument
+    """Verify that the incremental refresh only recomputes the days changed since the last refresh."""
+    GeneratedCertificate.objects.update(modified_date=timezone.now() - timedelta(days=100))
+    snapshots.refresh_statistics_snapshot(1)
+    org, old_day = _get_old_certificates_bucket(snapshots.compute_statistics_buckets(1))
+    old_record = StatisticsSnapshot.objects.get(tenant_id=1, org=org, snapshot_date=old_day)
+    StatisticsSnapshot.objects.filter(id=old_record.id).update(enrollments_count=1000)
+
+    StatisticsSnapshotWatermark.objects.filter(tenant_id=1).update(watermark=timezone.now() - timedelta(days=1))
+    snapshots.refresh_statistics_snapshot(1)
+    assert StatisticsSnapshot.objects.get(id=old_record.id).enrollments_count == 1000, \
+        'old days must not be recomputed when nothing changed in them'
+
+    StatisticsSnapshotWatermark.objects.filter(tenant_id=1).update(watermark=timezone.now() - timedelta(days=1))
+    GeneratedCertificate.objects.filter(
+        created_date__date=old_day,
+        course_id__in=CourseOverview.objects.filter(org__iexact=org).values_list('id', flat=True),
+    ).update(modified_date=timezone.now())
+    snapshots.refresh_statistics_snapshot(1)
+    assert not StatisticsSnapshot.objects.filter(enrollments_count=1000).exists(), \
+        'days of modified certificates must be recomputed'
+
+    StatisticsSnapshot.objects.filter(id__in=StatisticsSnapshot.objects.filter(
+        org=org, snapshot_date=old_day,
+    ).values_list('id', flat=True)).update(enrollments_count=1000)
+    snapshots.refresh_statistics_snapshot(1, full_refresh=True)
+    assert not StatisticsSnapshot.objects.filter(enrollments_count=1000).exists()
+
+
+@pytest.mark.django_db
+def test_refresh_statistics_snapshot_lock(base_data, cache_testing):  # pylint: disable=unused-argument
+    """Verify that a refresh is skipped while another refresh of the same tenant is running."""
+    lock_key = f'{cs.CACHE_NAME_STATISTICS_SNAPSHOT_REFRESH}_1{cs.CACHE_DICT_LOCK_SUFFIX}'
+    cache.set(lock_key, True)
+
+    assert snapshots.refresh_statistics_snapshot(1) is False
+    assert not StatisticsSnapshotWatermark.objects.filter(tenant_id=1).exists()
+    assert snapshots.refresh_statistics_snapshot(2) is True
+
+    cache.delete(lock_key)
+    assert snapshots.refresh_statistics_snapshot(1) is True
+    assert StatisticsSnapshotWatermark.objects.filter(tenant_id=1).exists()
+    assert cache.get(lock_key) is None
+
+
+@pytest.mark.django_db
+def test_refresh_statistics_snapshot_lock_released_on_error(
+    base_data, cache_testing,
+):  # pylint: disable=unused-argument
+    """Verify that the lock is released when the refresh fails."""
+    with patch.object(snapshots, 'compute_statistics_buckets', side_effect=ValueError('something went wrong')):
+        with pytest.raises(ValueError):
+            snapshots.refresh_statistics_snapshot(1)
+
+    assert cache.get(f'{cs.CACHE_NAME_STATISTICS_SNAPSHOT_REFRESH}_1{cs.CACHE_DICT_LOCK_SUFFIX}') is None
+
+
+@pytest.mark.django_db
+def test_get_snapshot_statistics_ignores_removed_orgs(base_data):  # pylint: disable=unused-argument
+    """Verify that get_snapshot_statistics ignores the orgs that are no longer in the tenant."""
+    snapshots.refresh_statistics_snapshot(1)
+    StatisticsSnapshot.objects.filter(tenant_id=1, org='org2').update(org='org99')
+
+    result = snapshots.get_snapshot_statistics(1, live_delta=False)
+    assert result['certificates_count'] == 2
+    assert result['learning_hours_count'] < TENANT1_STATISTICS['learning_hours_count']
+    assert result['learners_count'] == 16
@@ -0,0 +1,45 @@
+"""Tests for Fx Dashboard tasks"""
+from unittest.mock import call, patch
+
+import pytest
+
+from futurex_openedx_extensions.dashboard.tasks import refresh_statistics_snapshots_task
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.dashboard.tasks.refresh_statistics_snapshot')
+@pytest.mark.parametrize('tenant_ids, expected_tenant_ids', [
+    (None, [1, 2, 3, 7, 8]),
+    ([2, 3], [2, 3]),
+])
+def test_refresh_statistics_snapshots_task(
+    mock_refresh, tenant_ids, expected_tenant_ids, base_data,
+):  # pylint: disable=unused-argument
+    """Verify that refresh_statistics_snapshots_task refreshes the snapshots of the given tenants."""
+    refresh_statistics_snapshots_task(tenant_ids=tenant_ids, full_refresh=True)
+
+    assert mock_refresh.call_args_list == [call(tenant_id, full_refresh=True) for tenant_id in expected_tenant_ids]
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.dashboard.tasks.refresh_statistics_snapshot')
+def test_refresh_statistics_snapshots_task_error(mock_refresh, caplog):
+    """Verify that a failure in one tenant is logged and does not stop refreshing the other tenants."""
+    mock_refresh.side_effect = [ValueError('something went wrong'), None]
+
+    refresh_statistics_snapshots_task(tenant_ids=[1, 2])
+
+    assert mock_refresh.call_count == 2
+    assert 'Statistics Snapshot Error for tenant 1: (ValueError) something went wrong' in caplog.text
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.dashboard.tasks.refresh_statistics_snapshot', return_value=False)
+def test_refresh_statistics_snapshots_task_skipped(mock_refresh, caplog):
+    """Verify that a tenant skipped because another refresh is running is logged."""
+    caplog.set_level('INFO')
+
+    refresh_statistics_snapshots_task(tenant_ids=[1])
+
+    mock_refresh.assert_called_once_with(1, full_refresh=False)
+    assert 'Statistics Snapshot refresh of tenant 1 skipped: another refresh is running' in caplog.text
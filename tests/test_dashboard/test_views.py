@@ -14,12 +14,16 @@ from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
 from deepdiff import DeepDiff
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.paginator import EmptyPage
+from django.db import connection
 from django.db.models import Q
-from django.http import JsonResponse
+from django.http import JsonResponse, QueryDict
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import resolve, reverse
 from django.utils.functional import SimpleLazyObject
 from django.utils.timezone import now, timedelta
@@ -48,6 +52,7 @@ from futurex_openedx_extensions.helpers.converters import dict_to_hash
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
 from futurex_openedx_extensions.helpers.filters import DefaultOrderingFilter
 from futurex_openedx_extensions.helpers.models import (
+    ClickhouseQuery,
     ConfigAccessControl,
     DataExportTask,
     DraftConfig,
@@ -191,6 +196,21 @@ class TestTotalCountsView(BaseTestViewMixin):
         }
         self.assertDictEqual(json.loads(response.content), expected_response)
 
+    @pytest.mark.usefixtures('cache_testing')
+    def test_queries_count_independent_of_tenants_count(self):
+        """Verify that the number of queries does not depend on the number of selected tenants"""
+        self.login_user(self.staff_user)
+        queries_count = {}
+        for tenant_ids in ('1', '1,2,3,7,8'):
+            url = self.url + f'?stats=certificates,courses,hidden_courses,learners,enrollments,learning_hours' \
+                             f'&tenant_ids={tenant_ids}'
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+            queries_count[tenant_ids] = len(captured)
+        self.assertEqual(queries_count['1'], queries_count['1,2,3,7,8'])
+
 
 @ddt.ddt
 @pytest.mark.usefixtures('base_data')
@@ -389,12 +409,6 @@ class TestAggregatedCountsView(BaseTestViewMixin):
             len(expected_result['all_tenants']['enrollments_count']) if fill_missing_periods else 0,
         )
 
-    @ddt.data('courses', 'learners', 'learning_hours', 'certificates')
-    def test_unsupported_stats(self, stat):
-        """Test unsupported stats"""
-        with pytest.raises(NotImplementedError):
-            self.view._get_stat_count(stat=stat, tenant_id=1)  # pylint: disable=protected-access
-
     @ddt.data(
         ('day', '2024-08-07'),
         ('month', '2024-08'),
@@ -541,6 +555,24 @@ class TestLearnersView(BaseTestViewMixin):
         self.assertEqual(response.data['count'], 37)
         self.assertGreater(len(response.data['results']), 0)
 
+    def test_success_keyset_pagination(self):
+        """Verify that the view pages the learners by keyset when requested"""
+        self.login_user(self.staff_user)
+        response = self.client.get(self.url + '?pagination=keyset&page_size=30')
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 37)
+        self.assertEqual(len(response.data['results']), 30)
+        self.assertIsNone(response.data['previous'])
+        last_id = response.data['results'][-1]['user_id']
+        self.assertIn(f'after={last_id}', response.data['next'])
+
+        response = self.client.get(response.data['next'] + '&count=0')
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertIsNone(response.data['count'])
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertTrue(all(learner['user_id'] > last_id for learner in response.data['results']))
+        self.assertIsNone(response.data['next'])
+
     @patch('futurex_openedx_extensions.dashboard.views.get_learners_queryset')
     def test_enrollments_filter(self, mock_get_learners_queryset):
         """Verify that the view filters the learners by enrollments"""
@@ -905,10 +937,13 @@ class TestLibrariesView(BaseTestViewMixin):
         self.assertIsNone(response.data['previous'])
         self.assertIn('page=2', response.data['next'], msg="Expected 'page=2' in next URL.")
 
+    @patch('futurex_openedx_extensions.dashboard.serializers.invalidate_library_keys_index')
     @patch('futurex_openedx_extensions.dashboard.serializers.CourseInstructorRole')
     @patch('futurex_openedx_extensions.dashboard.serializers.CourseStaffRole')
     @patch('futurex_openedx_extensions.dashboard.serializers.add_users')
-    def test_library_create_success(self, mock_add_users, mock_staff_role, mock_instructor_role):
+    def test_library_create_success(
+        self, mock_add_users, mock_staff_role, mock_instructor_role, mock_invalidate_index,
+    ):
         """Verify that the view returns the correct response for library creation"""
         staff_user = get_user_model().objects.get(id=self.staff_user)
         staff_user_lazy_obj = SimpleLazyObject(lambda: staff_user)
@@ -923,6 +958,7 @@ class TestLibrariesView(BaseTestViewMixin):
         mock_add_users.assert_called_once_with(staff_user_lazy_obj, mock_staff_role.return_value, staff_user_lazy_obj)
         mock_instructor_role.assert_called_once_with(expected_lib_locator)
         mock_staff_role.assert_called_once_with(expected_lib_locator)
+        mock_invalidate_index.assert_called_once_with(['library-v1:org1+33'])
 
     def test_library_create_for_failure(self):
         """Verify that the view returns the correct response for library creation api failure general errors"""
@@ -1706,7 +1742,7 @@ class TestLearnersEnrollmentView(BaseTestViewMixin):
         self.assertIn(variable_name, str(ctx.exception))
 
 
-class MockClickhouseQuery:
+class MockClickhouseQuery:  # pylint: disable=too-many-instance-attributes
     """Mock ClickhouseQuery"""
     def __init__(
         self, query, slug, version, scope, enabled, params_config, paginated
@@ -1718,6 +1754,12 @@ class MockClickhouseQuery:
         self.enabled = enabled
         self.params_config = params_config
         self.paginated = paginated
+        self.cache_timeout = 60 if 'cached' in slug else 0
+        self.modified_at = None
+
+    get_results_cache_key = ClickhouseQuery.get_results_cache_key
+    get_cached_results = ClickhouseQuery.get_cached_results
+    cache_results = ClickhouseQuery.cache_results
 
     def fix_param_types(self, *args, **kwargs):
         """Mock parse_query"""
@@ -2319,6 +2361,81 @@ class TestClickhouseQueryView(MockPatcherMixin, BaseTestViewMixin):
 
         self.assertEqual(views.ClickhouseQueryView.get_page_url_with_page(url, new_page_no), expected_result)
 
+    @ddt.data(
+        ('', False),
+        ('?no_cache=1', True),
+        ('?no_cache=true&page=2', True),
+        ('?no_cache=0', False),
+    )
+    @ddt.unpack
+    def test_cached_results(self, param_string, bypass_cache):
+        """Verify that the results of queries with cache timeout are cached, and that staff can bypass the cache"""
+        self.url_args = ['course', 'test-query-cached']
+        self.login_user(self.staff_user)
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            first_response = self.client.get(self.url + param_string)
+            self.mocks['execute_query'].return_value = (100, 2, Mock(column_names=['col_name'], result_rows=[[2]]))
+            second_response = self.client.get(self.url + param_string)
+            cache.clear()
+
+        self.assertEqual(first_response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(json.loads(first_response.content)['results'], [{'col_name': 1}])
+        self.assertEqual(json.loads(second_response.content), {
+            **json.loads(first_response.content),
+            'results': [{'col_name': 2 if bypass_cache else 1}],
+        })
+        self.assertEqual(self.mocks['execute_query'].call_count, 2 if bypass_cache else 1)
+        self.assertNotIn('no_cache', self.mocks['execute_query'].call_args.kwargs['parameters'])
+
+    @ddt.data(
+        ('test-query-nop', ch.STREAM_FORMAT_NDJSON),
+        ('test-query-nop', ch.STREAM_FORMAT_ARROW),
+        ('test-query', ch.STREAM_FORMAT_NDJSON),
+    )
+    @ddt.unpack
+    def test_streamed_results(self, slug, stream_format):
+        """Verify that unpaginated queries are streamed when a streaming format is accepted"""
+        self.url_args = ['course', slug]
+        self.login_user(self.staff_user)
+        with patch('futurex_openedx_extensions.dashboard.views.ch.stream_query') as mocked_stream_query:
+            mocked_stream_query.return_value = iter([b'{"col_name": 1}\n', b'{"col_name": 2}\n'])
+            response = self.client.get(self.url, HTTP_ACCEPT=f'{stream_format}, application/json')
+
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        if slug.endswith('-nop'):
+            self.assertEqual(response['Content-Type'], stream_format)
+            self.assertEqual(b''.join(response.streaming_content), b'{"col_name": 1}\n{"col_name": 2}\n')
+            mocked_stream_query.assert_called_once_with('SELECT * FROM table', ANY, stream_format)
+            self.mocks['execute_query'].assert_not_called()
+        else:
+            self.assertEqual(json.loads(response.content)['results'], [{'col_name': 1}])
+            mocked_stream_query.assert_not_called()
+
+    def test_streamed_results_error(self):
+        """Verify that the errors of starting a streamed query are returned as error responses"""
+        self.url_args = ['course', 'test-query-nop']
+        self.login_user(self.staff_user)
+        with patch('futurex_openedx_extensions.dashboard.views.ch.stream_query') as mocked_stream_query:
+            mocked_stream_query.side_effect = ch.ClickhouseQueryParamsError('bad query')
+            response = self.client.get(self.url, HTTP_ACCEPT=ch.STREAM_FORMAT_NDJSON)
+
+        self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'details': {}, 'reason': 'bad query'})
+
+    def test_cached_results_no_bypass_for_non_staff(self):
+        """Verify that the no_cache parameter is ignored for non-staff users"""
+        self.url_args = ['course', 'test-query-cached']
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            request = self._get_request()
+            request.fx_permission_info = {'is_system_staff_user': False, 'view_allowed_any_access_orgs': ['org1']}
+            request.query_params = QueryDict('no_cache=1')
+            view = views.ClickhouseQueryView()
+            view.get(request, 'course', 'test-query-cached')
+            view.get(request, 'course', 'test-query-cached')
+            cache.clear()
+
+        self.mocks['execute_query'].assert_called_once()
+
     @ddt.data(
         ({}, True, (1, DefaultPagination.page_size)),
         ({'page': '4'}, True, (4, DefaultPagination.page_size)),
@@ -11,11 +11,29 @@ from futurex_openedx_extensions.helpers.settings import common_production
 helpers_default_settings = [
     ('FX_CACHE_TIMEOUT_COURSE_ACCESS_ROLES', 60 * 30),  # 30 minutes
     ('FX_CACHE_TIMEOUT_TENANTS_INFO', 60 * 60 * 2),  # 2 hours
+    ('FX_CACHE_STALE_TIMEOUT', 60 * 5),  # 5 minutes
+    ('FX_CACHE_LOCAL_TIMEOUT', 10),
     ('FX_CACHE_TIMEOUT_VIEW_ROLES', 60 * 30),  # 30 minutes
     ('FX_CACHE_TIMEOUT_CONFIG_ACCESS_CONTROL', 60 * 60 * 24),  # 1 day
+    ('FX_CACHE_TIMEOUT_LIBRARY_KEYS', 60 * 30),  # 30 minutes
+    ('FX_CACHE_TIMEOUT_LIBRARY_NOT_FOUND', 60 * 5),  # 5 minutes
+    ('FX_CACHE_TIMEOUT_EXPORT_DATA_WATERMARK', 60),
     ('FX_DASHBOARD_STORAGE_DIR', 'fx_dashboard'),  # fx_dashboard
     ('FX_DEFAULT_COURSE_EFFORT', 12),  # 12 hours
     ('FX_TASK_MINUTES_LIMIT', 5),  # 5 minutes
+    ('FX_TASK_EXPORT_PARALLEL_CHUNKS', 1),
+    ('FX_TASK_PROGRESS_UPDATE_SECONDS', 5),
+    ('FX_TASK_PROGRESS_UPDATE_STEP', 0.05),
+    ('FX_TASK_PROGRESS_CACHE_TIMEOUT', 0),
+    ('FX_TASK_EXPORT_GZIP', False),
+    ('FX_TASK_EXPORT_REUSE_SECONDS', 60 * 5),  # 5 minutes
+    ('FX_UPLOAD_PART_SIZE_MB', 8),
+    ('FX_UPLOAD_MAX_CONCURRENCY', 4),
+    ('FX_CLICKHOUSE_POOL_SIZE', 4),
+    ('FX_CLICKHOUSE_POOL_KEEP_ALIVE_SECONDS', 60 * 5),  # 5 minutes
+    ('FX_CLICKHOUSE_POOL_HEALTH_CHECK_SECONDS', 30),
+    ('FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION', False),
+    ('FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT', 60),
     ('FX_MAX_PERIOD_CHUNKS_MAP', {
         'day': 365,
         'month': 12,
@@ -74,3 +92,22 @@ def test_ready_imports_signals():
     with patch('futurex_openedx_extensions.helpers.signals') as mock_signals:
         config.ready()
     assert mock_signals is not None, 'signals module was not imported in ready method!'
+
+
+@pytest.mark.parametrize('middleware', [
+    ['django.contrib.sessions.middleware.SessionMiddleware'],
+    [
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'futurex_openedx_extensions.helpers.middlewares.FXRequestMemoMiddleware',
+    ],
+])
+def test_common_production_plugin_settings_middleware(settings, middleware):
+    """Verify that the plugin's settings add the request memo middleware once"""
+    settings = copy.deepcopy(settings)
+    settings.MIDDLEWARE = tuple(middleware)
+
+    common_production.plugin_settings(settings)
+    assert settings.MIDDLEWARE[0] == 'django.contrib.sessions.middleware.SessionMiddleware'
+    assert list(settings.MIDDLEWARE).count(
+        'futurex_openedx_extensions.helpers.middlewares.FXRequestMemoMiddleware'
+    ) == 1
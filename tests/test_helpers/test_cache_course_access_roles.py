@@ -0,0 +1,38 @@
+"""Tests for cache_course_access_roles management command."""
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from futurex_openedx_extensions.helpers import constants as cs
+
+
+@pytest.mark.parametrize('command_args, expected_user_ids, expected_batch_size', [
+    ([], None, cs.COURSE_ACCESS_ROLES_CACHE_BATCH_SIZE),
+    (['--user-ids', '3', '7'], [3, 7], cs.COURSE_ACCESS_ROLES_CACHE_BATCH_SIZE),
+    (['--batch-size', '10'], None, 10),
+])
+@patch('futurex_openedx_extensions.helpers.management.commands.cache_course_access_roles.'
+       'cache_course_access_roles_of_users', return_value=2)
+def test_command_recomputes_cache(
+    mock_cache_roles, command_args, expected_user_ids, expected_batch_size, capsys,
+):
+    """Verify that the command recomputes the course access roles cache of the given users."""
+    call_command('cache_course_access_roles', *command_args)
+
+    mock_cache_roles.assert_called_once_with(expected_user_ids, batch_size=expected_batch_size)
+    assert 'Successfully recomputed the course access roles cache of 2 users' in capsys.readouterr().out
+
+
+@patch('futurex_openedx_extensions.helpers.management.commands.cache_course_access_roles.'
+       'cache_course_access_roles_of_users')
+@patch('futurex_openedx_extensions.helpers.management.commands.cache_course_access_roles.'
+       'cache_course_access_roles_task')
+def test_command_async(mock_task, mock_cache_roles, capsys):
+    """Verify that the command schedules the recompute in a celery task when --async is used."""
+    mock_task.delay.return_value.id = 'task-id'
+    call_command('cache_course_access_roles', '--user-ids', '3', '--async')
+
+    mock_task.delay.assert_called_once_with([3])
+    mock_cache_roles.assert_not_called()
+    assert 'Course access roles cache recompute is scheduled in task (task-id)' in capsys.readouterr().out
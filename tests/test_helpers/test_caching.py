@@ -1,18 +1,29 @@
 """Tests for caching helper functions."""
-from datetime import timedelta
-from unittest.mock import patch
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest.mock import Mock, patch
 
 import pytest
 from django.core.cache import cache
 from django.utils import timezone
 
+from futurex_openedx_extensions.helpers import caching
 from futurex_openedx_extensions.helpers import constants as cs
 from futurex_openedx_extensions.helpers.caching import (
     cache_dict,
+    cache_dict_set_many,
     invalidate_cache,
+    invalidate_local_caches,
+    invalidate_request_memo,
     invalidate_tenant_readable_lms_configs,
+    request_memo,
+    request_memo_context,
 )
 
+TEST_KEY_VERSION = f'{cs.CACHE_NAME_LOCAL_CACHE_VERSION}_test_key'
+
 
 @pytest.fixture
 def mock_cache():
@@ -197,24 +208,75 @@ def test_read_from_settings_non_existing(mock_cache, caplog):  # pylint: disable
 def test_invalidate_single_cache_valid(mock_cache):  # pylint: disable=redefined-outer-name
     """Test invalidating a single valid cache."""
     _, _, mock_delete, _ = mock_cache
-    valid_cache_name = cs.CACHE_NAME_ALL_TENANTS_INFO
+    valid_cache_name = cs.CACHE_NAME_TENANTS_REGISTRY
     invalidate_cache(valid_cache_name)
     mock_delete.assert_called_once_with(valid_cache_name)
 
 
+def test_invalidate_single_cache_scoped(
+    mock_cache, local_cache,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that invalidating one cache drops only its local value, without the generation or the request memo."""
+    mock_get, _, _, _ = mock_cache
+    mock_get.side_effect = lambda key, default=None: 0 if key == cs.CACHE_NAME_LOCAL_CACHE_GENERATION else None
+
+    func = Mock(side_effect=lambda key: {'key': key})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name=lambda key: key, local_timeout=30)(func)
+    dummy_func('key1')
+    dummy_func('key2')
+
+    with request_memo_context() as store:
+        store['key'] = 'value'
+        with patch.object(cache, 'incr') as mock_incr:
+            invalidate_cache('key1')
+        mock_incr.assert_not_called()
+        assert store == {'key': 'value'}
+
+    dummy_func('key1')
+    dummy_func('key2')
+    assert [call[0][0] for call in func.call_args_list] == ['key1', 'key2', 'key1']
+
+
 def test_invalidate_all_caches(mock_cache):  # pylint: disable=redefined-outer-name
     """Test invalidating all predefined caches."""
     _, _, mock_delete, _ = mock_cache
     all_cache_names = [
-        cs.CACHE_NAME_ALL_COURSE_ORG_FILTER_LIST,
-        cs.CACHE_NAME_ALL_TENANTS_INFO,
+        cs.CACHE_NAME_TENANTS_REGISTRY,
         cs.CACHE_NAME_ALL_VIEW_ROLES,
-        cs.CACHE_NAME_ORG_TO_TENANT_MAP,
+        cs.CACHE_NAME_LIBRARY_KEYS_INDEX,
     ]
-    invalidate_cache()
+    with patch.object(cache, 'add'), patch.object(cache, 'incr') as mock_incr:
+        invalidate_cache()
     for name in all_cache_names:
         mock_delete.assert_any_call(name)
     assert mock_delete.call_count == len(all_cache_names)
+    mock_incr.assert_called_once_with(cs.CACHE_NAME_LOCAL_CACHE_GENERATION)
+
+
+@patch.object(cache, 'set_many')
+def test_cache_dict_set_many(mock_set_many, mock_cache):  # pylint: disable=redefined-outer-name
+    """Verify that cache_dict_set_many writes all the results at once in the format of cache_dict."""
+    mock_get, _, _, frozen_now = mock_cache
+    cache_dict_set_many({'key1': {'a': 1}, 'key2': {'b': 2}}, timeout=77, stale_timeout=3)
+
+    cache_content = {
+        'created_datetime': frozen_now,
+        'expiry_datetime': frozen_now + timedelta(seconds=77),
+    }
+    mock_set_many.assert_called_once_with({
+        'key1': {**cache_content, 'data': {'a': 1}},
+        'key2': {**cache_content, 'data': {'b': 2}},
+    }, 80.0)
+
+    mock_get.return_value = mock_set_many.call_args[0][0]['key1']
+    assert dummy_cached_func() == {'a': 1}
+
+
+@patch.object(cache, 'set_many')
+def test_cache_dict_set_many_no_results(mock_set_many):
+    """Verify that cache_dict_set_many does nothing when there are no results."""
+    cache_dict_set_many({}, timeout=77)
+    mock_set_many.assert_not_called()
 
 
 def test_skip_cache_option(mock_cache):  # pylint: disable=redefined-outer-name
@@ -235,3 +297,465 @@ def test_invalidate_specific_tenant_cache(mock_delete):
     tenant_id = 42
     invalidate_tenant_readable_lms_configs([tenant_id])
     mock_delete.assert_called_once_with(f'{cs.CACHE_NAME_TENANT_READABLE_LMS_CONFIG}_{tenant_id}')
+
+
+@pytest.fixture
+def mock_cache_add(mock_cache):  # pylint: disable=redefined-outer-name
+    """Fixture to mock the cache add method, and freeze the time on a real datetime value."""
+    real_now = datetime.now(tz=dt_timezone.utc)
+    with patch.object(cache, 'add') as mock_add:
+        with patch.object(timezone, 'now', return_value=real_now):
+            mock_add.return_value = True
+            yield mock_add, mock_cache[:3] + (real_now,)
+
+
+@pytest.mark.parametrize('expiry_delta, lock_acquired, expected_result, expected_call', [
+    (10, True, 'value-cached', False),
+    (-10, True, 'value', True),
+    (-10, False, 'value-cached', False),
+])
+def test_cache_stale_while_revalidate(
+    mock_cache_add, expiry_delta, lock_acquired, expected_result, expected_call,
+):  # pylint: disable=redefined-outer-name
+    """Verify that the stale value is returned while only the lock holder refreshes it."""
+    mock_cache_add, (mock_get, mock_set, mock_delete, frozen_now) = mock_cache_add
+    mock_get.return_value = {
+        'expiry_datetime': frozen_now + timedelta(seconds=expiry_delta),
+        'data': {'key': 'value-cached'},
+    }
+    mock_cache_add.return_value = lock_acquired
+    calls = []
+
+    @cache_dict(timeout=77, key_generator_or_name='test_key', stale_timeout=33)
+    def dummy_func():
+        calls.append(1)
+        return {'key': 'value'}
+
+    assert dummy_func() == {'key': expected_result}
+    assert bool(calls) == expected_call
+    if expiry_delta > 0:
+        mock_cache_add.assert_not_called()
+    else:
+        mock_cache_add.assert_called_once_with(f'test_key{cs.CACHE_DICT_LOCK_SUFFIX}', True, 33)
+    if expected_call:
+        mock_delete.assert_called_once_with(f'test_key{cs.CACHE_DICT_LOCK_SUFFIX}')
+        mock_set.assert_called_once_with('test_key', {
+            'created_datetime': frozen_now,
+            'expiry_datetime': frozen_now + timedelta(seconds=77),
+            'data': {'key': 'value'},
+        }, 77 + 33)
+    else:
+        mock_delete.assert_not_called()
+        mock_set.assert_not_called()
+
+
+def test_cache_stale_while_revalidate_releases_lock_on_error(mock_cache_add):  # pylint: disable=redefined-outer-name
+    """Verify that the refresh lock is released when the function raises an error."""
+    mock_cache_add, (mock_get, mock_set, mock_delete, frozen_now) = mock_cache_add
+    mock_get.return_value = {
+        'expiry_datetime': frozen_now - timedelta(seconds=1),
+        'data': {'key': 'value-cached'},
+    }
+
+    @cache_dict(timeout=77, key_generator_or_name='test_key', stale_timeout=33)
+    def dummy_func():
+        raise ValueError('Error computing')
+
+    with pytest.raises(ValueError):
+        dummy_func()
+    mock_cache_add.assert_called_once()
+    mock_delete.assert_called_once_with(f'test_key{cs.CACHE_DICT_LOCK_SUFFIX}')
+    mock_set.assert_not_called()
+
+
+def test_cache_stale_timeout_from_settings_zero(mock_cache_add, settings):  # pylint: disable=redefined-outer-name
+    """Verify that a zero stale timeout disables the stale-while-revalidate mode."""
+    settings.TEST_STALE_TIMEOUT = 0
+    mock_cache_add, (mock_get, mock_set, _, frozen_now) = mock_cache_add
+    mock_get.return_value = {
+        'expiry_datetime': frozen_now - timedelta(seconds=1),
+        'data': {'key': 'value-cached'},
+    }
+
+    func = Mock(return_value={'key': 'value'})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', stale_timeout='TEST_STALE_TIMEOUT')(func)
+
+    assert dummy_func() == {'key': 'value-cached'}
+    func.assert_not_called()
+    mock_cache_add.assert_not_called()
+    mock_set.assert_not_called()
+
+
+def test_cache_bad_stale_timeout(mock_cache, caplog):  # pylint: disable=redefined-outer-name
+    """Verify that an error is logged when the stale timeout is not a non-negative integer."""
+    mock_get, mock_set, _, _ = mock_cache
+
+    @cache_dict(timeout=77, key_generator_or_name='test_key', stale_timeout=-1)
+    def dummy_func():
+        return {'key': 'value'}
+
+    assert dummy_func() == {'key': 'value'}
+    mock_get.assert_not_called()
+    mock_set.assert_not_called()
+    assert 'cache_dict: error generating cache key: unexpected timeout value' in caplog.text
+
+
+@pytest.mark.parametrize('random_value, compute_seconds, expected_result', [
+    (0.0, 100.0, 'value-cached'),
+    (0.99999, 100.0, 'value'),
+    (0.99999, 0.0, 'value-cached'),
+    (0.99999, None, 'value-cached'),
+])
+def test_cache_early_expiration(
+    mock_cache_add, random_value, compute_seconds, expected_result,
+):  # pylint: disable=redefined-outer-name
+    """Verify that the value is refreshed probabilistically before it expires."""
+    _, (mock_get, mock_set, _, frozen_now) = mock_cache_add
+    mock_get.return_value = {
+        'expiry_datetime': frozen_now + timedelta(seconds=60),
+        'data': {'key': 'value-cached'},
+    }
+    if compute_seconds is not None:
+        mock_get.return_value['compute_seconds'] = compute_seconds
+
+    @cache_dict(timeout=77, key_generator_or_name='test_key', early_expiration_beta=1.0)
+    def dummy_func():
+        return {'key': 'value'}
+
+    with patch('futurex_openedx_extensions.helpers.caching.random.random', return_value=random_value):
+        assert dummy_func() == {'key': expected_result}
+
+    if expected_result == 'value':
+        mock_set.assert_called_once()
+        assert mock_set.call_args[0][1]['compute_seconds'] >= 0
+        assert mock_set.call_args[0][2] == 77
+    else:
+        mock_set.assert_not_called()
+
+
+def test_cache_early_expiration_without_expiry(mock_cache_add):  # pylint: disable=redefined-outer-name
+    """Verify that a cached value without an expiry time is considered fresh."""
+    _, (mock_get, mock_set, _, _) = mock_cache_add
+    mock_get.return_value = {'data': {'key': 'value-cached'}}
+
+    func = Mock(return_value={'key': 'value'})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', early_expiration_beta=1.0)(func)
+
+    assert dummy_func() == {'key': 'value-cached'}
+    func.assert_not_called()
+    mock_set.assert_not_called()
+
+
+@pytest.fixture
+def local_cache():
+    """Fixture to start and end every test with an empty local cache, without touching the shared cache."""
+    with patch.object(cache, 'add'), patch.object(cache, 'incr'):
+        invalidate_local_caches()
+    yield
+    with patch.object(cache, 'add'), patch.object(cache, 'incr'):
+        invalidate_local_caches()
+
+
+def test_cache_local_hit(mock_cache, local_cache):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that the local cache is used before the shared cache."""
+    mock_get, mock_set, _, _ = mock_cache
+    mock_get.side_effect = lambda key, default=None: {
+        cs.CACHE_NAME_LOCAL_CACHE_GENERATION: 0,
+        TEST_KEY_VERSION: 0,
+        'test_key': None,
+    }[key]
+
+    func = Mock(return_value={'key': 'value'})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', local_timeout=30)(func)
+
+    assert dummy_func() == {'key': 'value'}
+    assert dummy_func() == {'key': 'value'}
+    func.assert_called_once()
+    mock_set.assert_called_once()
+    assert [call[0][0] for call in mock_get.call_args_list] == [
+        cs.CACHE_NAME_LOCAL_CACHE_GENERATION, 'test_key', TEST_KEY_VERSION,
+    ]
+
+
+def test_cache_local_filled_from_shared_cache(
+    mock_cache, local_cache,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that a value read from the shared cache is kept in the local cache."""
+    mock_get, _, _, _ = mock_cache
+    mock_get.side_effect = lambda key, default=None: {
+        cs.CACHE_NAME_LOCAL_CACHE_GENERATION: 0,
+        TEST_KEY_VERSION: 0,
+        'test_key': {'data': {'key': 'value-cached'}},
+    }[key]
+
+    func = Mock(return_value={'key': 'value'})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', local_timeout=30)(func)
+
+    assert dummy_func() == {'key': 'value-cached'}
+    assert dummy_func() == {'key': 'value-cached'}
+    func.assert_not_called()
+    assert [call[0][0] for call in mock_get.call_args_list].count('test_key') == 1
+
+
+@pytest.mark.parametrize('lock_acquired, expected_result', [(True, 'value'), (False, 'value-cached')])
+def test_cache_local_not_filled_with_stale_value(
+    local_cache, mock_cache, lock_acquired, expected_result,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that a stale value read from the shared cache is not kept in the local cache."""
+    mock_get, _, _, _ = mock_cache
+    real_now = datetime.now(tz=dt_timezone.utc)
+    mock_get.side_effect = lambda key, default=None: {
+        cs.CACHE_NAME_LOCAL_CACHE_GENERATION: 0,
+        TEST_KEY_VERSION: 0,
+        'test_key': {
+            'expiry_datetime': real_now - timedelta(seconds=10),
+            'data': {'key': 'value-cached'},
+        },
+    }[key]
+
+    func = Mock(return_value={'key': 'value'})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', stale_timeout=33, local_timeout=30)(func)
+
+    with patch.object(cache, 'add', return_value=lock_acquired), patch.object(timezone, 'now', return_value=real_now):
+        assert dummy_func() == {'key': expected_result}
+        assert dummy_func() == {'key': expected_result}
+    assert [call[0][0] for call in mock_get.call_args_list].count('test_key') == 2 - lock_acquired
+
+
+@pytest.mark.parametrize('monotonic_delta, generation, expected_calls', [
+    (0, 0, 1),
+    (31, 0, 2),
+    (2, 1, 2),
+])
+def test_cache_local_expiry_and_generation(
+    mock_cache, local_cache, monotonic_delta, generation, expected_calls,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that a local value is dropped when it expires or when the generation changes."""
+    mock_get, _, _, _ = mock_cache
+    current_generation = [0]
+    mock_get.side_effect = lambda key, default=None: {
+        cs.CACHE_NAME_LOCAL_CACHE_GENERATION: current_generation[0],
+        TEST_KEY_VERSION: 0,
+        'test_key': None,
+    }[key]
+
+    func = Mock(return_value={'key': 'value'})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', local_timeout=30)(func)
+
+    now = time.monotonic()
+    with patch('futurex_openedx_extensions.helpers.caching.time.monotonic', return_value=now):
+        dummy_func()
+    current_generation[0] = generation
+    with patch('futurex_openedx_extensions.helpers.caching.time.monotonic', return_value=now + monotonic_delta):
+        dummy_func()
+
+    assert func.call_count == expected_calls
+
+
+def test_cache_local_lru_eviction(mock_cache, local_cache):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that the least recently used local value is evicted when the local cache is full."""
+    mock_get, _, _, _ = mock_cache
+    mock_get.side_effect = lambda key, default=None: 0 if key == cs.CACHE_NAME_LOCAL_CACHE_GENERATION else None
+
+    func = Mock(side_effect=lambda key: {'key': key})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name=lambda key: key, local_timeout=30)(func)
+
+    with patch.object(cs, 'CACHE_LOCAL_MAX_ENTRIES', 2):
+        dummy_func('key1')
+        dummy_func('key2')
+        dummy_func('key1')
+        dummy_func('key3')
+        assert func.call_count == 3
+
+        dummy_func('key1')
+        assert func.call_count == 3
+        dummy_func('key2')
+        assert func.call_count == 4
+
+
+def test_cache_local_returns_copies(mock_cache, local_cache):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that modifying a value returned from the local cache does not affect the next callers."""
+    mock_get, _, _, _ = mock_cache
+    mock_get.side_effect = lambda key, default=None: 0 if key != 'test_key' else None
+
+    func = Mock(return_value={'key': {'nested': ['value']}})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', local_timeout=30)(func)
+
+    dummy_func()['key']['nested'].append('modified by the first caller')
+    dummy_func()['key']['nested'].append('modified by the second caller')
+    assert dummy_func() == {'key': {'nested': ['value']}}
+    func.assert_called_once()
+
+
+def test_invalidate_cache_local_other_process(
+    cache_testing, local_cache,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that invalidating a cache name in one process drops its local value in the other processes."""
+    func = Mock(side_effect=[{'key': 'value1'}, {'key': 'value2'}])
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_other_process', local_timeout=30)(func)
+
+    now = time.monotonic()
+    with patch('futurex_openedx_extensions.helpers.caching.time.monotonic', return_value=now):
+        assert dummy_func() == {'key': 'value1'}
+
+        with patch.object(caching, '_local_cache', OrderedDict()):
+            invalidate_cache('test_other_process')
+        assert dummy_func() == {'key': 'value1'}, 'the version is only checked once per check period'
+
+    with patch(
+        'futurex_openedx_extensions.helpers.caching.time.monotonic',
+        return_value=now + cs.CACHE_LOCAL_GENERATION_CHECK_SECONDS,
+    ):
+        assert dummy_func() == {'key': 'value2'}
+        assert dummy_func() == {'key': 'value2'}
+    assert func.call_count == 2
+
+
+def test_cache_local_entry_dropped_during_version_check(
+    mock_cache, local_cache,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that a local value dropped while its version is checked is not put back in the local cache."""
+    mock_get, _, _, _ = mock_cache
+    mock_get.side_effect = lambda key, default=None: 0 if key != 'test_key' else None
+
+    func = Mock(return_value={'key': 'value'})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', local_timeout=30)(func)
+
+    now = time.monotonic()
+    with patch('futurex_openedx_extensions.helpers.caching.time.monotonic', return_value=now):
+        dummy_func()
+
+    def drop_local_entry(cache_key):
+        caching._local_cache.pop(cache_key)  # pylint: disable=protected-access
+        return 0
+
+    with patch('futurex_openedx_extensions.helpers.caching.time.monotonic', return_value=now + 2):
+        with patch.object(caching, '_get_local_cache_version', side_effect=drop_local_entry):
+            assert dummy_func() == {'key': 'value'}
+        assert 'test_key' not in caching._local_cache  # pylint: disable=protected-access
+    func.assert_called_once()
+
+
+@pytest.mark.parametrize('version, expected_calls', [(0, 1), (1, 2)])
+def test_cache_local_version_changed(
+    mock_cache, local_cache, version, expected_calls,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that a local value is dropped when the version of its cache name changes."""
+    mock_get, _, _, _ = mock_cache
+    current_version = [0]
+    mock_get.side_effect = lambda key, default=None: {
+        cs.CACHE_NAME_LOCAL_CACHE_GENERATION: 0,
+        TEST_KEY_VERSION: current_version[0],
+        'test_key': None,
+    }[key]
+
+    func = Mock(return_value={'key': 'value'})
+    dummy_func = cache_dict(timeout=77, key_generator_or_name='test_key', local_timeout=30)(func)
+
+    now = time.monotonic()
+    with patch('futurex_openedx_extensions.helpers.caching.time.monotonic', return_value=now):
+        dummy_func()
+    current_version[0] = version
+    with patch('futurex_openedx_extensions.helpers.caching.time.monotonic', return_value=now + 2):
+        dummy_func()
+        dummy_func()
+
+    assert func.call_count == expected_calls
+
+
+def test_cache_bad_local_timeout(mock_cache, caplog):  # pylint: disable=redefined-outer-name
+    """Verify that a bad local timeout is logged, and the function result is returned without caching."""
+    mock_get, mock_set, _, _ = mock_cache
+
+    @cache_dict(timeout=77, key_generator_or_name='test_key', local_timeout=-1)
+    def dummy_func():
+        return {'key': 'value'}
+
+    assert dummy_func() == {'key': 'value'}
+    mock_get.assert_not_called()
+    mock_set.assert_not_called()
+    assert 'cache_dict: error generating cache key' in caplog.text
+
+
+def test_invalidate_local_caches(local_cache):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that invalidating the local caches increases the shared generation."""
+    with patch.object(cache, 'add') as mock_add, patch.object(cache, 'incr') as mock_incr:
+        invalidate_local_caches()
+    mock_add.assert_called_once_with(cs.CACHE_NAME_LOCAL_CACHE_GENERATION, 0, None)
+    mock_incr.assert_called_once_with(cs.CACHE_NAME_LOCAL_CACHE_GENERATION)
+
+
+def test_invalidate_local_caches_incr_failure(caplog):
+    """Verify that a failure to increase the generation is logged."""
+    with patch.object(cache, 'add'), patch.object(cache, 'incr', side_effect=ValueError):
+        invalidate_local_caches()
+    assert 'cache_dict: failed to increase the local cache generation' in caplog.text
+
+
+def test_request_memo_outside_context():
+    """Verify that the function is called every time outside a request memo context."""
+    func = Mock(return_value=['value'])
+    memoized_func = request_memo(key_generator=lambda arg: arg)(func)
+
+    assert memoized_func(1) == ['value']
+    assert memoized_func(1) == ['value']
+    assert func.call_count == 2
+
+
+def test_request_memo_within_context():
+    """Verify that each distinct call runs once within a request memo context."""
+    func = Mock(side_effect=lambda arg: [arg])
+    func.__qualname__ = 'dummy_func'
+    memoized_func = request_memo(key_generator=lambda arg: arg)(func)
+
+    with request_memo_context() as store:
+        assert memoized_func(1) == [1]
+        assert memoized_func(1) == [1]
+        assert memoized_func(2) == [2]
+        assert func.call_count == 2
+        assert len(store) == 2
+
+    assert memoized_func(1) == [1]
+    assert func.call_count == 3
+
+
+def test_request_memo_returns_copies():
+    """Verify that modifying a memoized result does not affect the next callers."""
+    func = Mock(return_value={'orgs': ['org1']})
+    func.__qualname__ = 'dummy_func'
+    memoized_func = request_memo(key_generator=lambda: None)(func)
+
+    with request_memo_context():
+        memoized_func()['orgs'].append('org2')
+        assert memoized_func() == {'orgs': ['org1']}
+        assert func.call_count == 1
+
+
+def test_request_memo_does_not_memoize_errors():
+    """Verify that the function is called again when it raised an error."""
+    func = Mock(side_effect=[ValueError('error'), ['value']])
+    func.__qualname__ = 'dummy_func'
+    memoized_func = request_memo(key_generator=lambda: None)(func)
+
+    with request_memo_context():
+        with pytest.raises(ValueError):
+            memoized_func()
+        assert memoized_func() == ['value']
+
+
+def test_invalidate_request_memo():
+    """Verify that invalidating the request memo drops the memoized results of the current context only."""
+    invalidate_request_memo()
+
+    with request_memo_context() as store:
+        store['key'] = 'value'
+        invalidate_request_memo()
+        assert not store
+
+
+def test_invalidate_cache_drops_request_memo(mock_cache):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that invalidating the cache drops the memoized results of the current request."""
+    with request_memo_context() as store:
+        store['key'] = 'value'
+        invalidate_cache()
+        assert not store
@@ -2,9 +2,17 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from django.contrib.auth import get_user_model
+from lms.djangoapps.certificates.api import format_certificate_for_user
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from opaque_keys.edx.locator import CourseLocator
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
-from futurex_openedx_extensions.helpers.certificates import get_certificate_date, get_certificate_url
+from futurex_openedx_extensions.helpers.certificates import (
+    get_certificate_date,
+    get_certificate_url,
+    get_certificates_by_users,
+)
 
 
 @pytest.mark.django_db
@@ -57,3 +65,49 @@ def test_learner_courses_details_serializer_get_certificate_url(
     } if certificates_url != 'empty' else {}
 
     assert get_certificate_url(request, 44, course.id) == expected_url
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.certificates.get_certificates_for_user_by_course_keys')
+def test_get_certificate_date_and_url_prefetched(mock_get_certificates, base_data):  # pylint: disable=unused-argument
+    """Verify that get_certificate_date and get_certificate_url use the prefetched certificates when given."""
+    course = CourseOverview.objects.get(id='course-v1:ORG1+2+2')
+    certificates = {course.id: {'download_url': 'https://s1.sample.com/certificate/', 'created': 'not None value'}}
+
+    assert get_certificate_date(44, course.id, certificates=certificates) == 'not None value'
+    assert get_certificate_url(Mock(), 44, course.id, certificates=certificates) == 'https://s1.sample.com/certificate/'
+    assert get_certificate_date(44, course.id, certificates={}) is None
+    mock_get_certificates.assert_not_called()
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.certificates.get_certificates_for_user_by_course_keys')
+def test_get_certificates_by_users(
+    mock_get_certificates, base_data, django_assert_num_queries,
+):  # pylint: disable=unused-argument
+    """Verify that get_certificates_by_users formats the requested certificates of all users from one query."""
+    users = {user.id: user for user in get_user_model().objects.filter(id__in=[4, 5, 10])}
+    course1 = CourseLocator.from_string('course-v1:ORG1+5+5')
+    course2 = CourseLocator.from_string('course-v1:ORG2+4+4')
+    GeneratedCertificate.objects.filter(user_id=5, course_id=course2).update(status='audit_passing')
+
+    with django_assert_num_queries(1):
+        result = get_certificates_by_users([
+            (users[4], course1),
+            (users[5], course2),
+            (users[10], course1),
+            (None, course1),
+            (users[4], None),
+        ])
+
+    certificate = GeneratedCertificate.objects.get(user_id=4, course_id=course1)
+    assert result == {4: {course1: format_certificate_for_user(users[4].username, certificate)}}
+    assert result[4][course1]['download_url'] == f'/certificates/{certificate.id}'
+    mock_get_certificates.assert_not_called()
+
+
+@patch('futurex_openedx_extensions.helpers.certificates.GeneratedCertificate')
+def test_get_certificates_by_users_empty(mock_generated_certificate):
+    """Verify that get_certificates_by_users returns an empty dict without querying when there are no valid pairs."""
+    assert not get_certificates_by_users([(None, None)])
+    mock_generated_certificate.eligible_certificates.filter.assert_not_called()
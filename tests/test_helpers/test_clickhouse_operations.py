@@ -1,8 +1,12 @@
 """Tests for clickhouse helper functions."""
-from unittest.mock import Mock, patch
+import io
+import json
+from datetime import date
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from django.core.paginator import EmptyPage
+from django.test import override_settings
 
 import futurex_openedx_extensions.helpers.clickhouse_operations as ch
 
@@ -51,6 +55,146 @@ def test_get_client_failed_to_connect(get_client_mock):  # pylint: disable=redef
     get_client_mock.assert_called_once()
 
 
+@pytest.fixture
+def clients_pool(get_client_mock):  # pylint: disable=redefined-outer-name
+    """Use a fresh clients pool, with a new mocked client for every connection."""
+    get_client_mock.side_effect = lambda **_: Mock(ping=Mock(return_value=True))
+    pool = ch.ClickhouseClientPool()
+    with patch('futurex_openedx_extensions.helpers.clickhouse_operations._clients_pool', pool):
+        with override_settings(FX_CLICKHOUSE_POOL_SIZE=2, FX_CLICKHOUSE_POOL_HEALTH_CHECK_SECONDS=30):
+            yield pool
+    pool.clear()
+
+
+@pytest.mark.usefixtures('clients_pool')
+def test_get_pooled_client_reuse(get_client_mock):  # pylint: disable=redefined-outer-name
+    """Verify that get_pooled_client reuses the idle clients, and creates new ones only when none is idle."""
+    with ch.get_pooled_client() as client1:
+        with ch.get_pooled_client() as client2:
+            assert client1 is not client2
+    with ch.get_pooled_client() as client3:
+        pass
+
+    assert client3 is client1, 'the most recently released client is reused'
+    assert get_client_mock.call_count == 2
+    client1.close.assert_not_called()
+    client1.ping.assert_not_called()
+
+
+@pytest.mark.usefixtures('clients_pool')
+def test_get_pooled_client_pool_full(get_client_mock):  # pylint: disable=redefined-outer-name
+    """Verify that the clients that do not fit in the pool are closed."""
+    with ch.get_pooled_client() as client1:
+        with ch.get_pooled_client() as client2:
+            with ch.get_pooled_client() as client3:
+                pass
+
+    client1.close.assert_called_once()
+    client2.close.assert_not_called()
+    client3.close.assert_not_called()
+    with override_settings(FX_CLICKHOUSE_POOL_SIZE=0):
+        with ch.get_pooled_client() as client4:
+            pass
+    assert client4 is client2
+    client4.close.assert_called_once()
+    assert get_client_mock.call_count == 3
+
+
+@pytest.mark.parametrize('ping_result, test_case', [
+    (True, 'healthy client is reused'),
+    (False, 'unhealthy client is replaced'),
+    (Exception('connection reset'), 'client failing to ping is replaced'),
+])
+@pytest.mark.usefixtures('clients_pool')
+def test_get_pooled_client_health_check(
+    get_client_mock, ping_result, test_case,
+):  # pylint: disable=redefined-outer-name
+    """Verify that the clients idle for more than the health check period are pinged before reuse."""
+    with ch.get_pooled_client() as client1:
+        client1.ping.side_effect = [ping_result]
+
+    with override_settings(FX_CLICKHOUSE_POOL_HEALTH_CHECK_SECONDS=0):
+        with ch.get_pooled_client() as client2:
+            pass
+
+    client1.ping.assert_called_once()
+    if ping_result is True:
+        assert client2 is client1, test_case
+        client1.close.assert_not_called()
+    else:
+        assert client2 is not client1, test_case
+        client1.close.assert_called_once()
+        assert get_client_mock.call_count == 2
+
+
+@pytest.mark.usefixtures('clients_pool')
+def test_get_pooled_client_keep_alive(get_client_mock):  # pylint: disable=redefined-outer-name
+    """Verify that the clients older than the keep-alive period are closed and replaced without a health check."""
+    with ch.get_pooled_client() as client1:
+        pass
+
+    with override_settings(FX_CLICKHOUSE_POOL_KEEP_ALIVE_SECONDS=0):
+        with ch.get_pooled_client() as client2:
+            pass
+
+    assert client2 is not client1
+    client1.close.assert_called_once()
+    client1.ping.assert_not_called()
+    assert get_client_mock.call_count == 2
+
+
+@pytest.mark.usefixtures('clients_pool')
+def test_get_pooled_client_failure():
+    """Verify that a client that failed a query is returned to the pool, and checked before its next use."""
+    with pytest.raises(ch.ClickhouseQueryParamsError):
+        with ch.get_pooled_client() as client1:
+            raise ch.ClickhouseQueryParamsError('bad query')
+
+    with ch.get_pooled_client() as client2:
+        pass
+
+    assert client2 is client1
+    client1.ping.assert_called_once()
+
+
+@pytest.mark.usefixtures('clients_pool')
+def test_get_pooled_client_connection_error(get_client_mock):  # pylint: disable=redefined-outer-name
+    """Verify that get_pooled_client raises the connection errors of get_client."""
+    get_client_mock.side_effect = Exception('Failed to connect')
+
+    with pytest.raises(ch.ClickhouseClientConnectionError):
+        ch.get_pooled_client().__enter__()
+
+
+@pytest.mark.usefixtures('clients_pool')
+def test_get_pooled_client_after_fork(get_client_mock):  # pylint: disable=redefined-outer-name
+    """Verify that the clients pooled by the parent process are dropped without closing them in a forked process."""
+    with ch.get_pooled_client() as client1:
+        pass
+
+    with patch('futurex_openedx_extensions.helpers.clickhouse_operations.os.getpid', return_value=-1):
+        with ch.get_pooled_client() as client2:
+            pass
+
+    assert client2 is not client1
+    client1.close.assert_not_called()
+    assert get_client_mock.call_count == 2
+
+
+def test_clients_pool_clear(clients_pool, caplog):  # pylint: disable=redefined-outer-name
+    """Verify that clear closes all the idle clients, and logs the errors of closing them."""
+    with ch.get_pooled_client() as client1:
+        with ch.get_pooled_client() as client2:
+            client2.close.side_effect = Exception('already closed')
+
+    clients_pool.clear()
+
+    client1.close.assert_called_once()
+    client2.close.assert_called_once()
+    assert 'Clickhouse: failed to close a pooled client: already closed' in caplog.text
+    assert clients_pool.acquire().client not in (client1, client2)
+
+
 def test_get_default_queries():
     """Verify that get_default_queries works as expected."""
     queries = ch.get_default_queries()
@@ -110,6 +254,7 @@ def test_execute_query(get_client_mock):  # pylint: disable=redefined-outer-name
     assert result == (None, None, get_client_mock.query.return_value)
 
 
+@override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=False)
 def test_execute_query_empty_result_when_paginated(get_client_mock):  # pylint: disable=redefined-outer-name
     """Verify that execute_query works as expected when result is empty."""
     with patch('futurex_openedx_extensions.helpers.clickhouse_operations.count_result') as count_result_mock:
@@ -128,6 +273,7 @@ def test_execute_query_invalid_query(get_client_mock):  # pylint: disable=redefi
     assert exc_info.value.args[0] == 'Error executing Clickhouse query: Invalid query'
 
 
+@override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=False)
 def test_execute_query_paginated(get_client_mock):  # pylint: disable=redefined-outer-name
     """Verify that execute_query works as expected when paginated."""
     get_client_mock.query.return_value = Mock(result_rows=[['result1', 'result2']])
@@ -139,6 +285,7 @@ def test_execute_query_paginated(get_client_mock):  # pylint: disable=redefined-
         assert result == (100, 3, get_client_mock.query.return_value)
 
 
+@override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=False)
 @pytest.mark.parametrize('page, expected_error_msg', [
     (0, 'Page should be greater than or equal to 1'),
     (50, 'Page does not exist!'),
@@ -156,6 +303,7 @@ def test_execute_query_invalid_page(
         get_client_mock.query.assert_not_called()
 
 
+@override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=False)
 @pytest.mark.parametrize('page_size, expected_error_msg', [
     (None, 'Page size should be an integer between 1 and 1000'),
     (0, 'Page size should be an integer between 1 and 1000'),
@@ -176,6 +324,196 @@ def test_execute_query_invalid_page_size(
         get_client_mock.query.assert_not_called()
 
 
+@override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=True)
+@pytest.mark.parametrize('page, rows, expected_next_page', [
+    (1, [['a', 1, 25], ['b', 2, 25]], 2),
+    (3, [['e', 5, 25]], None),
+])
+def test_execute_query_paginated_single_query(
+    get_client_mock, page, rows, expected_next_page,
+):  # pylint: disable=redefined-outer-name
+    """Verify that execute_query gets the records count with the page in one round-trip."""
+    get_client_mock.query.return_value = Mock(column_names=('name', 'value', '__fx_records_count__'), result_rows=rows)
+
+    with patch('futurex_openedx_extensions.helpers.clickhouse_operations.count_result') as count_result_mock:
+        max_count, next_page, result = ch.execute_query(get_client_mock, SIMPLE_QUERY, page=page, page_size=10)
+
+    count_result_mock.assert_not_called()
+    get_client_mock.query.assert_called_once_with(
+        f'SELECT *, count() OVER () AS __fx_records_count__ FROM ({SIMPLE_QUERY}) LIMIT 10 OFFSET {(page - 1) * 10}',
+        parameters=None,
+    )
+    assert max_count == 25
+    assert next_page == expected_next_page
+    assert ch.result_to_json(result) == [{'name': row[0], 'value': row[1]} for row in rows]
+
+
+@override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=True)
+@pytest.mark.parametrize('page, records_count, expected_count_calls, test_case', [
+    (1, 0, 0, 'empty first page means no records, without a count query'),
+    (2, 0, 1, 'empty result of a later page needs a count query'),
+])
+def test_execute_query_paginated_single_query_no_records(
+    get_client_mock, page, records_count, expected_count_calls, test_case,
+):  # pylint: disable=redefined-outer-name
+    """Verify that execute_query returns an empty result when the query has no records."""
+    get_client_mock.query.return_value = Mock(column_names=('name', '__fx_records_count__'), result_rows=[])
+
+    with patch('futurex_openedx_extensions.helpers.clickhouse_operations.count_result') as count_result_mock:
+        count_result_mock.return_value = records_count
+        assert ch.execute_query(get_client_mock, SIMPLE_QUERY, page=page, page_size=10) == (0, None, None), test_case
+
+    assert count_result_mock.call_count == expected_count_calls, test_case
+
+
+@override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=True)
+def test_execute_query_paginated_single_query_page_not_found(get_client_mock):  # pylint: disable=redefined-outer-name
+    """Verify that execute_query raises EmptyPage when the page is beyond the records."""
+    get_client_mock.query.return_value = Mock(column_names=('name', '__fx_records_count__'), result_rows=[])
+
+    with patch('futurex_openedx_extensions.helpers.clickhouse_operations.count_result') as count_result_mock:
+        count_result_mock.return_value = 15
+        with pytest.raises(EmptyPage) as exc_info:
+            ch.execute_query(get_client_mock, SIMPLE_QUERY, page=3, page_size=10)
+
+    assert exc_info.value.args[0] == 'Page does not exist!'
+
+
+@pytest.mark.parametrize('single_query', [True, False])
+def test_execute_query_paginated_cached_count(
+    get_client_mock, cache_testing, single_query,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that the records count is cached, so the next pages of the same query need only the page query."""
+    parameters = {'orgs': ['org1']}
+    with override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=single_query, FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT=60):
+        with patch('futurex_openedx_extensions.helpers.clickhouse_operations.count_result') as count_result_mock:
+            count_result_mock.return_value = 25
+            get_client_mock.query.return_value = Mock(
+                column_names=('name', '__fx_records_count__'), result_rows=[['a', 25]],
+            )
+            assert ch.execute_query(get_client_mock, SIMPLE_QUERY, parameters, page=1, page_size=10)[:2] == (25, 2)
+
+            get_client_mock.query.reset_mock()
+            get_client_mock.query.return_value = Mock(column_names=('name',), result_rows=[['k']])
+            max_count, next_page, result = ch.execute_query(
+                get_client_mock, SIMPLE_QUERY, parameters, page=3, page_size=10,
+            )
+            assert (max_count, next_page) == (25, None)
+            assert result == get_client_mock.query.return_value
+            get_client_mock.query.assert_called_once_with(f'{SIMPLE_QUERY} LIMIT 10 OFFSET 20', parameters=parameters)
+
+            get_client_mock.query.return_value = Mock(
+                column_names=('name', '__fx_records_count__'), result_rows=[['a', 25]],
+            )
+            ch.execute_query(get_client_mock, SIMPLE_QUERY, {'orgs': ['org2']}, page=1, page_size=10)
+
+    assert count_result_mock.call_count == (0 if single_query else 2), 'other parameters have their own count'
+
+
+@pytest.mark.parametrize('single_query', [True, False])
+def test_execute_query_paginated_stale_cached_count(
+    get_client_mock, cache_testing, single_query,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that a page beyond the cached count is checked with a fresh count before it is reported missing."""
+    with override_settings(FX_CLICKHOUSE_SINGLE_QUERY_PAGINATION=single_query, FX_CLICKHOUSE_COUNT_CACHE_TIMEOUT=60):
+        with patch('futurex_openedx_extensions.helpers.clickhouse_operations.count_result') as count_result_mock:
+            count_result_mock.return_value = 25
+            get_client_mock.query.return_value = Mock(
+                column_names=('name', '__fx_records_count__'), result_rows=[['a', 25]],
+            )
+            assert ch.execute_query(get_client_mock, SIMPLE_QUERY, page=1, page_size=10)[:2] == (25, 2)
+
+            count_result_mock.return_value = 35
+            get_client_mock.query.return_value = Mock(
+                column_names=('name', '__fx_records_count__'), result_rows=[['k', 35]],
+            )
+            max_count, next_page, result = ch.execute_query(get_client_mock, SIMPLE_QUERY, page=4, page_size=10)
+            assert (max_count, next_page) == (35, None)
+            assert ch.result_to_json(result)[0]['name'] == 'k'
+
+            get_client_mock.query.return_value = Mock(column_names=('name', '__fx_records_count__'), result_rows=[])
+            with pytest.raises(EmptyPage):
+                ch.execute_query(get_client_mock, SIMPLE_QUERY, page=5, page_size=10)
+            assert ch.execute_query(get_client_mock, SIMPLE_QUERY, page=1, page_size=10)[0] == 35, \
+                'the fresh count is cached'
+
+
+@pytest.fixture
+def streaming_client(get_client_mock, clients_pool):  # pylint: disable=redefined-outer-name, unused-argument
+    """Use one mocked client that supports the streaming queries."""
+    client = MagicMock()
+    get_client_mock.side_effect = None
+    get_client_mock.return_value = client
+    return client
+
+
+def test_stream_query_ndjson(streaming_client, clients_pool):  # pylint: disable=redefined-outer-name
+    """Verify that stream_query streams the rows as JSON lines, one block at a time, and then releases the client."""
+    stream = MagicMock()
+    stream.source.column_names = ('name', 'day')
+    stream.__iter__.return_value = iter([[('one', date(2024, 1, 1)), ('two', None)], [('three', date(2024, 1, 3))]])
+    streaming_client.query_row_block_stream.return_value.__enter__.return_value = stream
+
+    generator = ch.stream_query(SIMPLE_QUERY, {'x': 1}, ch.STREAM_FORMAT_NDJSON)
+    streaming_client.query_row_block_stream.assert_called_once_with(SIMPLE_QUERY, parameters={'x': 1})
+    assert not clients_pool._idle_clients, 'the client is held while streaming'  # pylint: disable=protected-access
+
+    chunks = list(generator)
+    assert len(chunks) == 2
+    assert [json.loads(line) for line in b''.join(chunks).decode('utf-8').splitlines()] == [
+        {'name': 'one', 'day': '2024-01-01'}, {'name': 'two', 'day': None}, {'name': 'three', 'day': '2024-01-03'},
+    ]
+    assert clients_pool.acquire().client is streaming_client
+
+
+def test_stream_query_arrow(streaming_client, clients_pool):  # pylint: disable=redefined-outer-name
+    """Verify that stream_query passes the Arrow stream of Clickhouse through in chunks, and closes it when done."""
+    content = bytes(range(256)) * 500
+    raw_stream = io.BytesIO(content)
+    streaming_client.raw_stream.return_value = raw_stream
+
+    chunks = list(ch.stream_query(SIMPLE_QUERY, None, ch.STREAM_FORMAT_ARROW))
+
+    streaming_client.raw_stream.assert_called_once_with(SIMPLE_QUERY, parameters=None, fmt='ArrowStream')
+    assert b''.join(chunks) == content
+    assert len(chunks) == 2
+    assert raw_stream.closed
+    assert clients_pool.acquire().client is streaming_client
+
+
+def test_stream_query_closed_early(streaming_client):  # pylint: disable=redefined-outer-name
+    """Verify that closing the stream before it is fully consumed closes the Clickhouse stream."""
+    raw_stream = io.BytesIO(b'x' * 200000)
+    streaming_client.raw_stream.return_value = raw_stream
+
+    generator = ch.stream_query(SIMPLE_QUERY, None, ch.STREAM_FORMAT_ARROW)
+    next(generator)
+    generator.close()
+
+    assert raw_stream.closed
+
+
+def test_stream_query_error(streaming_client, clients_pool):  # pylint: disable=redefined-outer-name
+    """Verify that stream_query raises the errors of starting the query, and releases the client for a check."""
+    streaming_client.query_row_block_stream.side_effect = Exception('Invalid query')
+
+    with pytest.raises(ch.ClickhouseQueryParamsError) as exc_info:
+        ch.stream_query(SIMPLE_QUERY, None, ch.STREAM_FORMAT_NDJSON)
+
+    assert exc_info.value.args[0] == 'Error executing Clickhouse query: Invalid query'
+    assert clients_pool.acquire().client is streaming_client
+    streaming_client.ping.assert_called_once()
+
+
+def test_stream_query_unsupported_format(get_client_mock):  # pylint: disable=redefined-outer-name
+    """Verify that stream_query rejects unsupported stream formats."""
+    with pytest.raises(ch.ClickhouseQueryParamsError) as exc_info:
+        ch.stream_query(SIMPLE_QUERY, None, 'text/csv')
+
+    assert exc_info.value.args[0] == 'Unsupported stream format: text/csv'
+    get_client_mock.assert_not_called()
+
+
 def test_result_to_json():
     """Verify that result_to_json works as expected."""
     assert ch.result_to_json(None) == []
@@ -1,39 +1,92 @@
 """Test export csv"""
+# pylint: disable=too-many-lines
+import copy
 import csv
+import gzip
+import json
 import logging
 import os
 import tempfile
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
+from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.test import override_settings
+from rest_framework import serializers
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.generics import ListAPIView
+from rest_framework.views import APIView
 from storages.backends.s3boto3 import S3Boto3Storage
 
-from futurex_openedx_extensions.helpers.constants import CSV_EXPORT_UPLOAD_DIR
+from futurex_openedx_extensions.helpers.constants import (
+    CSV_EXPORT_S3_MAX_PARTS,
+    CSV_EXPORT_S3_MIN_PART_SIZE,
+    CSV_EXPORT_UPLOAD_DIR,
+)
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException
 from futurex_openedx_extensions.helpers.export_csv import (
     _combine_partial_files,
+    _combine_partial_files_s3,
+    _ExportProgressTracker,
     _generate_csv_with_tracked_progress,
+    _get_export_view,
     _get_mocked_request,
     _get_response_data,
     _get_user,
     _get_view_class_instance,
     _paginated_response_generator,
+    _PartialFilesReader,
+    _prepare_export,
+    _streamed_response_generator,
     _upload_file_to_storage,
+    delete_export_chunks,
     export_data_to_csv,
     generate_file_url,
+    get_export_chunks,
     get_exported_file_url,
+    is_exported_file_available,
     log_export_task,
+    merge_export_chunks,
 )
+from futurex_openedx_extensions.helpers.export_mixins import ExportCSVMixin
 from futurex_openedx_extensions.helpers.models import DataExportTask
+from futurex_openedx_extensions.helpers.pagination import DefaultPagination
+from futurex_openedx_extensions.helpers.upload import get_storage_dir
 
 _FILENAME = 'test.csv'
 
 
+class UsernameSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = get_user_model()
+        fields = ['id', 'username']
+
+
+class StreamedTestView(ExportCSVMixin, ListAPIView):
+    """View exported by streaming its queryset"""
+    fx_view_name = 'test_streamed_export'
+    authentication_classes = [SessionAuthentication]
+    permission_classes = []
+    pagination_class = DefaultPagination
+    serializer_class = UsernameSerializer
+
+    def get_queryset(self):
+        return get_user_model().objects.filter(id__lte=self.kwargs.get('max_id', 5))
+
+
+class NotStreamedTestView(StreamedTestView):
+    fx_export_streaming = False
+
+
+class PlainTestView(ExportCSVMixin, APIView):
+    fx_view_name = 'test_plain_export'
+
+
 @pytest.fixture
 def fx_task():
     """Fixture for DataExportTask."""
@@ -222,28 +275,173 @@ def test_paginated_response_generator_for_empty_response_data(
     view_instance.assert_called_once()
 
 
-@pytest.mark.parametrize('partial', [True, False])
-def test_upload_file_to_storage(partial):
-    """Test uploading a file to the default storage."""
+@pytest.fixture
+def streamed_view_data(view_data, site):  # pylint: disable=redefined-outer-name
+    """Fixture for the view data of a streamed export."""
+    view_data['site'] = site
+    view_data['kwargs'] = {'max_id': 5}
+    view_data['export_view'] = _get_export_view(
+        StreamedTestView.as_view(),
+        'http://example.com/api/data?page_size=2',
+        {'role': 'admin', 'user': get_user_model().objects.get(id=30)},
+        view_data,
+    )
+    return view_data
+
+
+@pytest.mark.django_db
+@override_settings(ALLOWED_HOSTS=['example.com'])
+def test_get_export_view(base_data, view_data, site):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _get_export_view initializes the view once with the mocked request."""
+    user = get_user_model().objects.get(id=30)
+    view_data['site'] = site
+    view_data['kwargs'] = {'max_id': 3}
+    with patch.object(StreamedTestView, 'check_permissions') as mock_check_permissions:
+        view = _get_export_view(
+            StreamedTestView.as_view(), 'http://example.com/api/data?page_size=2', {'user': user}, view_data,
+        )
+    assert isinstance(view, StreamedTestView)
+    assert view.request.user == user
+    assert view.kwargs == {'max_id': 3}
+    mock_check_permissions.assert_called_once_with(view.request)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('view_instance, case_description', [
+    (MagicMock(), 'view_class is not a class'),
+    (PlainTestView.as_view(), 'view is not a generic view'),
+    (NotStreamedTestView.as_view(), 'view disabled streaming'),
+])
+def test_get_export_view_not_supported(
+    view_instance, case_description, base_data, view_data, site,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _get_export_view returns None for views that do not support streaming the export."""
+    view_data['site'] = site
+    assert _get_export_view(
+        view_instance, 'http://example.com/api/data', {'user': None}, view_data,
+    ) is None, case_description
+
+
+@pytest.mark.django_db
+@override_settings(ALLOWED_HOSTS=['example.com'])
+def test_get_export_view_not_permitted(
+    base_data, view_data, site,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _get_export_view raises an error when the view refuses the request."""
+    view_data['site'] = site
+    with patch.object(StreamedTestView, 'check_permissions', side_effect=PermissionDenied()):
+        with pytest.raises(FXCodedException) as exc_info:
+            _get_export_view(
+                StreamedTestView.as_view(),
+                'http://example.com/api/data',
+                {'user': get_user_model().objects.get(id=30)},
+                view_data,
+            )
+    assert str(exc_info.value) == 'CSV Export: View initialization failed with status code: 403'
+
+
+@pytest.mark.django_db
+@override_settings(ALLOWED_HOSTS=['example.com'])
+@pytest.mark.parametrize('max_id, expected_results', [
+    (5, [
+        ([{'id': 1, 'username': 'user1'}, {'id': 2, 'username': 'user2'}], 0.4, 2),
+        ([{'id': 3, 'username': 'user3'}, {'id': 4, 'username': 'user4'}], 0.8, 4),
+        ([{'id': 5, 'username': 'user5'}], 1.0, 5),
+    ]),
+    (4, [
+        ([{'id': 1, 'username': 'user1'}, {'id': 2, 'username': 'user2'}], 0.5, 2),
+        ([{'id': 3, 'username': 'user3'}, {'id': 4, 'username': 'user4'}], 1.0, 4),
+    ]),
+    (0, [([], 0, 0)]),
+])
+def test_streamed_response_generator(
+    base_data, streamed_view_data, max_id, expected_results,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _streamed_response_generator yields the records of the queryset in batches of page size."""
+    streamed_view_data['export_view'].kwargs['max_id'] = max_id
+    assert list(_streamed_response_generator(streamed_view_data)) == expected_results
+    assert streamed_view_data['end_page'] is None
+
+
+@pytest.mark.django_db
+@override_settings(ALLOWED_HOSTS=['example.com'])
+@pytest.mark.parametrize('ordering, expected_after', [
+    (None, 2),
+    ('username', None),
+])
+def test_streamed_response_generator_long_running(
+    base_data, streamed_view_data, ordering, expected_after,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """
+    Verify that _streamed_response_generator stops after the time limit, and continues from the next page. The
+    continuation starts after the last exported key only when the queryset is ordered by primary key.
+    """
+    queryset = get_user_model().objects.filter(id__lte=5)
+    if ordering:
+        queryset = queryset.order_by(ordering)
+
+    with patch.object(StreamedTestView, 'get_queryset', return_value=queryset):
+        with patch('futurex_openedx_extensions.helpers.export_csv._is_long_running_process', return_value=True):
+            assert list(_streamed_response_generator(streamed_view_data)) == [
+                ([{'id': 1, 'username': 'user1'}, {'id': 2, 'username': 'user2'}], 0.4, 2),
+            ]
+        assert streamed_view_data['end_page'] == 1
+        assert streamed_view_data['after'] == expected_after
+
+        streamed_view_data['start_page'] = 2
+        streamed_view_data['end_page'] = None
+        assert list(_streamed_response_generator(streamed_view_data)) == [
+            ([{'id': 3, 'username': 'user3'}, {'id': 4, 'username': 'user4'}], 0.8, 4),
+            ([{'id': 5, 'username': 'user5'}], 1.0, 5),
+        ]
+
+
+@pytest.mark.django_db
+@override_settings(ALLOWED_HOSTS=['example.com'])
+def test_streamed_response_generator_chunk(
+    base_data, streamed_view_data,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _streamed_response_generator yields the records of the chunk, with the progress of the export."""
+    streamed_view_data['export_view'].kwargs['max_id'] = 9
+    streamed_view_data.update({'chunk': 2, 'after': 3, 'until': 6, 'total_records': 9})
+    assert list(_streamed_response_generator(streamed_view_data)) == [
+        ([{'id': 4, 'username': 'user4'}, {'id': 5, 'username': 'user5'}], 0.22, 2),
+        ([{'id': 6, 'username': 'user6'}], 0.33, 3),
+    ]
+
+
+@pytest.mark.parametrize('filename, partial, chunk, partial_name', [
+    (_FILENAME, True, 0, f'{_FILENAME}_000001'),
+    (_FILENAME, True, 2, f'{_FILENAME}_002_000001'),
+    (_FILENAME, False, 0, None),
+    (f'{_FILENAME}.gz', True, 0, f'{_FILENAME}.gz_000001'),
+    (f'{_FILENAME}.gz', False, 0, None),
+])
+def test_upload_file_to_storage(filename, partial, chunk, partial_name):
+    """Test uploading a file to the default storage. Files named .gz are compressed while uploading."""
     dummy_content = b'Test content'
     # create dummy temp file
     with tempfile.NamedTemporaryFile(delete=False) as temp_file:
         temp_file.write(dummy_content)
         temp_file_path = temp_file.name
     fake_tenant = 'fake'
-    storage_path = f'{settings.FX_DASHBOARD_STORAGE_DIR}/{fake_tenant}/exported_files/{_FILENAME}'
+    storage_path = f'{settings.FX_DASHBOARD_STORAGE_DIR}/{fake_tenant}/exported_files/{filename}'
     if partial:
-        storage_path = f'{storage_path}_parts/{_FILENAME}_000001'
-    result = _upload_file_to_storage(temp_file_path, _FILENAME, fake_tenant, partial_tag=1 if partial else 0)
+        storage_path = f'{storage_path}_parts/{partial_name}'
+    result = _upload_file_to_storage(
+        temp_file_path, filename, fake_tenant, partial_tag=1 if partial else 0, chunk=chunk,
+    )
     assert result == storage_path
     # verify file created on default storage with right content
     with default_storage.open(storage_path, 'rb') as storage_file:
         uploaded_content = storage_file.read()
+        if filename.endswith('.gz'):
+            uploaded_content = gzip.decompress(uploaded_content)
         assert uploaded_content == dummy_content
     os.remove(temp_file_path)
     default_storage.delete(storage_path)
     if partial:
-        os.rmdir(f'{settings.FX_DASHBOARD_STORAGE_DIR}/{fake_tenant}/exported_files/{_FILENAME}_parts')
+        os.rmdir(f'{settings.FX_DASHBOARD_STORAGE_DIR}/{fake_tenant}/exported_files/{filename}_parts')
     os.rmdir(f'{settings.FX_DASHBOARD_STORAGE_DIR}/{fake_tenant}/exported_files')
     os.rmdir(f'{settings.FX_DASHBOARD_STORAGE_DIR}/{fake_tenant}')
     os.rmdir(settings.FX_DASHBOARD_STORAGE_DIR)
@@ -259,52 +457,118 @@ def test_upload_file_to_storage_set_private(mock_get_storage_dir, mock_storage):
         temp_file_path = temp_file.name
 
     storage_path = f'{mock_get_storage_dir.return_value}/{_FILENAME}'
-    mock_put = MagicMock()
-    mock_object = MagicMock(Acl=MagicMock(return_value=MagicMock(put=mock_put)))
-    mock_storage.bucket.Object.return_value = mock_object
 
     _upload_file_to_storage(temp_file_path, _FILENAME, 99)
-    mock_storage.bucket.Object.assert_not_called()
-    mock_put.assert_not_called()
+    mock_storage.bucket.upload_fileobj.assert_not_called()
 
     mock_storage.__class__ = S3Boto3Storage
+    mock_storage._normalize_name.side_effect = lambda name: name  # pylint: disable=protected-access
     _upload_file_to_storage(temp_file_path, _FILENAME, 99)
-    mock_storage.bucket.Object.assert_called_once_with(storage_path)
-    mock_put.assert_called_once_with(ACL='private')
+    mock_storage.bucket.upload_fileobj.assert_called_once()
+    assert mock_storage.bucket.upload_fileobj.call_args.args[1] == storage_path
+    assert mock_storage.bucket.upload_fileobj.call_args.kwargs['ExtraArgs'] == {
+        'ContentType': 'text/csv', 'ACL': 'private',
+    }
+    mock_storage.bucket.Object.assert_not_called()
+    os.remove(temp_file_path)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cache_testing')
+@override_settings(FX_TASK_PROGRESS_UPDATE_SECONDS=60, FX_TASK_PROGRESS_UPDATE_STEP=0.1)
+def test_export_progress_tracker(fx_task, base_data):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _ExportProgressTracker saves the progress only when it advances enough, or on flush."""
+    fx_task.status = DataExportTask.STATUS_PROCESSING
+    fx_task.save()
+    tracker = _ExportProgressTracker(fx_task.id)
+
+    with patch(
+        'futurex_openedx_extensions.helpers.models.DataExportTask.set_progress', wraps=DataExportTask.set_progress,
+    ) as mock_set_progress:
+        for progress in [0.02, 0.05, 0.11, 0.15, 0.19]:
+            tracker.update(progress)
+        mock_set_progress.assert_called_once_with(fx_task.id, 0.11)
+        assert DataExportTask.get_cached_progress(fx_task.id) == 0.19, 'every update is mirrored to the cache'
+
+        tracker.flush()
+        tracker.flush()
+        assert mock_set_progress.call_count == 2
+    fx_task.refresh_from_db()
+    assert fx_task.progress == 0.19
+
+
+@pytest.mark.django_db
+@override_settings(FX_TASK_PROGRESS_UPDATE_SECONDS=60, FX_TASK_PROGRESS_UPDATE_STEP=0.1)
+def test_export_progress_tracker_by_time(fx_task, base_data):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _ExportProgressTracker saves the progress when enough time passes since the last save."""
+    fx_task.status = DataExportTask.STATUS_PROCESSING
+    fx_task.save()
+    with patch('futurex_openedx_extensions.helpers.export_csv.time.monotonic', return_value=1000.0):
+        tracker = _ExportProgressTracker(fx_task.id)
+        tracker.update(0.01)
+    fx_task.refresh_from_db()
+    assert fx_task.progress == 0.0
+
+    with patch('futurex_openedx_extensions.helpers.export_csv.time.monotonic', return_value=1060.0):
+        tracker.update(0.02)
+    fx_task.refresh_from_db()
+    assert fx_task.progress == 0.02
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cache_testing')
+@override_settings(FX_TASK_PROGRESS_UPDATE_SECONDS=60, FX_TASK_PROGRESS_UPDATE_STEP=0.1)
+def test_export_progress_tracker_additive(fx_task, base_data):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _ExportProgressTracker adds the coalesced deltas of a chunk to the task progress."""
+    fx_task.status = DataExportTask.STATUS_PROCESSING
+    fx_task.progress = 0.5
+    fx_task.save()
+    tracker = _ExportProgressTracker(fx_task.id, additive=True)
+
+    with patch(
+        'futurex_openedx_extensions.helpers.models.DataExportTask.add_progress', wraps=DataExportTask.add_progress,
+    ) as mock_add_progress:
+        for _ in range(5):
+            tracker.update(0.04)
+        assert mock_add_progress.call_count == 1
+        tracker.flush()
+        assert mock_add_progress.call_count == 2
+    fx_task.refresh_from_db()
+    assert round(fx_task.progress, 6) == 0.7
+    assert DataExportTask.get_cached_progress(fx_task.id) is None, 'chunk deltas are not mirrored to the cache'
 
 
 @pytest.mark.django_db
 @patch('futurex_openedx_extensions.helpers.export_csv._paginated_response_generator')
-@patch('futurex_openedx_extensions.helpers.models.DataExportTask.get_task')
 @pytest.mark.parametrize('last_percentage, case_description', [
     (0.99, 'last percentage could be less than %100 if some records were dropped from the view during the export'),
     (1.0, 'mostly, last percentage will be %100'),
     (1.01, 'we allow the possibility of %1 records added to the view during the export'),
 ])
 def test_generate_csv_with_tracked_progress(
-    mock_get_task, mock_generator, last_percentage, case_description, base_data, view_data,
-):  # pylint: disable=unused-argument, too-many-arguments
+    mock_generator, last_percentage, case_description, fx_task, base_data, view_data,
+):  # pylint: disable=redefined-outer-name, unused-argument, too-many-arguments
     """Test _generate_csv_with_tracked_progress."""
-    tenant = MagicMock(id=1)
-    task = MagicMock()
-    task.tenant = tenant
-    task.status = DataExportTask.STATUS_PROCESSING
-    mock_get_task.return_value = task
+    fx_task.status = DataExportTask.STATUS_PROCESSING
+    fx_task.save()
 
-    storage_dir = f'{settings.FX_DASHBOARD_STORAGE_DIR}/{str(tenant.id)}/exported_files'
+    storage_dir = f'{settings.FX_DASHBOARD_STORAGE_DIR}/{str(fx_task.tenant_id)}/exported_files'
     fake_storage_path = f'{storage_dir}/{_FILENAME}'
     fx_permission_info = {'user': get_user_model().objects.get(id=30), 'role': 'admin'}
     mock_generator.return_value = iter([
         ([{'id': 1}, {'id': 2}], 0.67, 2),
         ([{'id': 3}], last_percentage, 3)
     ])
-    assert _generate_csv_with_tracked_progress(
-        task, fx_permission_info, view_data, _FILENAME, MagicMock()
-    )
-    task.save.assert_called()
-    assert task.save.call_count == 2
-    assert task.progress == 1.0, 'Test case failed! progress must be %100 when the task is finished, regardless of' \
-        ' the value of last_percentage. Failed case: ' + case_description
+    with patch(
+        'futurex_openedx_extensions.helpers.models.DataExportTask.set_progress', wraps=DataExportTask.set_progress,
+    ) as mock_set_progress:
+        assert _generate_csv_with_tracked_progress(
+            fx_task.id, fx_permission_info, view_data, _FILENAME, MagicMock()
+        )
+    assert mock_set_progress.call_count == 2
+    fx_task.refresh_from_db()
+    assert fx_task.progress == 1.0, 'Test case failed! progress must be %100 when the task is finished, regardless' \
+        ' of the value of last_percentage. Failed case: ' + case_description
     with open(fake_storage_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         rows = list(reader)
@@ -315,7 +579,38 @@ def test_generate_csv_with_tracked_progress(
 
     default_storage.delete(fake_storage_path)
     os.rmdir(storage_dir)
-    os.rmdir(f'{settings.FX_DASHBOARD_STORAGE_DIR}/{str(tenant.id)}')
+    os.rmdir(f'{settings.FX_DASHBOARD_STORAGE_DIR}/{str(fx_task.tenant_id)}')
+    os.rmdir(settings.FX_DASHBOARD_STORAGE_DIR)
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.export_csv._paginated_response_generator')
+def test_generate_csv_with_tracked_progress_jsonl_gz(
+    mock_generator, fx_task, base_data, view_data,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _generate_csv_with_tracked_progress writes the export format of the filename."""
+    fx_task.status = DataExportTask.STATUS_PROCESSING
+    fx_task.save()
+    filename = 'test.jsonl.gz'
+
+    storage_dir = f'{settings.FX_DASHBOARD_STORAGE_DIR}/{str(fx_task.tenant_id)}/exported_files'
+    fake_storage_path = f'{storage_dir}/{filename}'
+    fx_permission_info = {'user': get_user_model().objects.get(id=30), 'role': 'admin'}
+    mock_generator.return_value = iter([
+        ([{'id': 1, 'name': 'one'}, {'id': 2, 'name': None}], 0.67, 2),
+        ([{'id': 3, 'name': 'three'}], 1.0, 3)
+    ])
+    assert _generate_csv_with_tracked_progress(fx_task.id, fx_permission_info, view_data, filename, MagicMock())
+
+    with default_storage.open(fake_storage_path, 'rb') as file:
+        lines = gzip.decompress(file.read()).decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'id': 1, 'name': 'one'}, {'id': 2, 'name': None}, {'id': 3, 'name': 'three'},
+    ]
+
+    default_storage.delete(fake_storage_path)
+    os.rmdir(storage_dir)
+    os.rmdir(f'{settings.FX_DASHBOARD_STORAGE_DIR}/{str(fx_task.tenant_id)}')
     os.rmdir(settings.FX_DASHBOARD_STORAGE_DIR)
 
 
@@ -447,6 +742,63 @@ def test_generate_csv_with_tracked_progress_for_last_partial_export(
     combine_mock.assert_called_once()
 
 
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.export_csv._streamed_response_generator')
+@patch('futurex_openedx_extensions.helpers.export_csv._paginated_response_generator')
+@patch('futurex_openedx_extensions.helpers.export_csv._upload_file_to_storage')
+def test_generate_csv_with_tracked_progress_for_streamed_export(
+    _, mock_paginated_generator, mock_streamed_generator, fx_task, base_data, view_data,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _generate_csv_with_tracked_progress streams the export when the view supports it."""
+    view_data['export_view'] = MagicMock()
+    mock_streamed_generator.return_value = iter([([{'id': 1}], 1.0, 1)])
+    fx_task.status = DataExportTask.STATUS_PROCESSING
+    fx_task.save()
+    assert _generate_csv_with_tracked_progress(
+        fx_task.id, {'dummy': 'dummy'}, view_data, _FILENAME, MagicMock(),
+    )
+    mock_streamed_generator.assert_called_once_with(view_data)
+    mock_paginated_generator.assert_not_called()
+    assert DataExportTask.objects.get(id=fx_task.id).progress == 1.0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('chunk, expected_content', [
+    (1, '"id"\n1\n2\n'),
+    (2, '1\n2\n'),
+])
+@patch('futurex_openedx_extensions.helpers.export_csv._combine_partial_files')
+@patch('futurex_openedx_extensions.helpers.export_csv._streamed_response_generator')
+@patch('futurex_openedx_extensions.helpers.export_csv._upload_file_to_storage')
+def test_generate_csv_with_tracked_progress_for_chunk(
+    mock_upload, mock_generator, mock_combine, chunk, expected_content, fx_task, base_data, view_data,
+):  # pylint: disable=redefined-outer-name, unused-argument, too-many-arguments
+    """
+    Verify that _generate_csv_with_tracked_progress uploads every chunk as a partial file without combining it, writes
+    the header only in the first chunk, and adds the share of the chunk to the task progress.
+    """
+    uploaded_content = []
+
+    def upload_side_effect(local_file_path, *args, **kwargs):
+        with open(local_file_path, encoding='utf-8') as file:
+            uploaded_content.append(file.read())
+
+    mock_upload.side_effect = upload_side_effect
+    mock_generator.return_value = iter([([{'id': 1}], 0.25, 1), ([{'id': 2}], 0.5, 2)])
+    view_data.update({'export_view': MagicMock(), 'chunk': chunk, 'total_records': 4, 'page_size': 1})
+    fx_task.status = DataExportTask.STATUS_PROCESSING
+    fx_task.save()
+
+    assert _generate_csv_with_tracked_progress(
+        fx_task.id, {'dummy': 'dummy'}, view_data, _FILENAME, MagicMock(),
+    )
+    assert uploaded_content == [expected_content]
+    assert mock_upload.call_args.kwargs == {'partial_tag': 1, 'chunk': chunk}
+    mock_combine.assert_not_called()
+    fx_task.refresh_from_db()
+    assert fx_task.progress == 0.5
+
+
 @pytest.mark.django_db
 @patch('futurex_openedx_extensions.helpers.export_csv._get_view_class_instance')
 @patch('futurex_openedx_extensions.helpers.export_csv._generate_csv_with_tracked_progress')
@@ -470,6 +822,7 @@ def test_export_data_to_csv(
     assert view_data['url'] == expected_url
     assert view_data['page_size'] == 50
     assert view_data['view_instance'] == mock_view_instance
+    assert view_data['export_view'] is None
     mock_generate_csv.assert_called_once_with(
         fx_task.id, fx_permission_info, view_data, _FILENAME, mock_view_instance
     )
@@ -639,13 +992,6 @@ def mock_default_storage():
         yield mock_storage
 
 
-@pytest.fixture
-def mock_upload_file_to_storage():
-    """Fixture for upload file to storage."""
-    with patch('futurex_openedx_extensions.helpers.export_csv._upload_file_to_storage') as mock_upload:
-        yield mock_upload
-
-
 @pytest.fixture
 def mock_get_storage_dir():
     """Fixture for get storage dir."""
@@ -654,68 +1000,224 @@ def mock_get_storage_dir():
 
 
 @pytest.fixture
-def mock_data_export_task():
-    """Fixture for data export task."""
-    with patch('futurex_openedx_extensions.helpers.export_csv.DataExportTask.get_task') as mock_get_task:
-        mock_task = MagicMock()
-        mock_task.tenant.id = 123
-        mock_get_task.return_value = mock_task
-        yield mock_get_task
+def partial_files():
+    """Fixture for partial files of an export in the default storage."""
+    parts_dir = os.path.join(get_storage_dir(1, CSV_EXPORT_UPLOAD_DIR), f'{_FILENAME}_parts')
+    contents = {
+        f'{_FILENAME}_000002': b'b' * 100000,
+        f'{_FILENAME}_000001': b'"id"\n' + b'a' * 70000,
+        f'{_FILENAME}_000003': b'',
+        f'{_FILENAME}_000004': b'c\n',
+    }
+    for name, content in contents.items():
+        default_storage.save(os.path.join(parts_dir, name), ContentFile(content))
+
+    yield parts_dir, b''.join(content for _, content in sorted(contents.items()))
+
+    storage_path = os.path.join(get_storage_dir(1, CSV_EXPORT_UPLOAD_DIR), _FILENAME)
+    if default_storage.exists(storage_path):
+        default_storage.delete(storage_path)
+    for name in contents:
+        if default_storage.exists(os.path.join(parts_dir, name)):
+            default_storage.delete(os.path.join(parts_dir, name))
+    if os.path.isdir(default_storage.path(parts_dir)):
+        os.rmdir(default_storage.path(parts_dir))
+    os.rmdir(default_storage.path(get_storage_dir(1, CSV_EXPORT_UPLOAD_DIR)))
+    os.rmdir(default_storage.path(os.path.dirname(get_storage_dir(1, CSV_EXPORT_UPLOAD_DIR))))
+    os.rmdir(default_storage.path(settings.FX_DASHBOARD_STORAGE_DIR))
+
+
+def test_partial_files_reader(partial_files):  # pylint: disable=redefined-outer-name
+    """Verify that _PartialFilesReader reads the partial files one after the other as one stream."""
+    parts_dir, expected_content = partial_files
+    part_paths = [os.path.join(parts_dir, name) for name in sorted(default_storage.listdir(parts_dir)[1])]
+
+    with _PartialFilesReader(part_paths) as reader:
+        content = b''
+        buffer = bytearray(30000)
+        while size := reader.readinto(buffer):
+            content += bytes(buffer[:size])
+    assert content == expected_content
+
+    reader = _PartialFilesReader(part_paths)
+    assert reader.readable()
+    assert reader.read(10) == expected_content[:10]
+    reader.close()
+    assert reader.closed
+
+
+def test_combine_partial_files_streamed(partial_files, caplog):  # pylint: disable=redefined-outer-name
+    """Verify that _combine_partial_files streams the partial files in order into the combined file."""
+    caplog.set_level(logging.INFO)
+    parts_dir, expected_content = partial_files
 
+    _combine_partial_files(task_id=1, filename=_FILENAME, tenant_id=1)
+
+    with default_storage.open(os.path.join(get_storage_dir(1, CSV_EXPORT_UPLOAD_DIR), _FILENAME), 'rb') as file:
+        assert file.read() == expected_content
+    assert not os.path.exists(default_storage.path(parts_dir))
+    assert 'CSV Export: partial files combined by streaming for task 1' in caplog.text
 
-@patch('futurex_openedx_extensions.helpers.export_csv.os.remove')
-@pytest.mark.parametrize('os_rm_failure', [True, False])
-def test_combine_partial_files_success(
-    mock_os_remove,
-    os_rm_failure,
-    mock_default_storage,
-    mock_get_storage_dir,
-    mock_upload_file_to_storage,
-    mock_data_export_task,
-    caplog,
-):  # pylint: disable=too-many-arguments, redefined-outer-name, unused-argument
-    """Verify the outcome of _combine_partial_files."""
-    caplog.set_level(logging.INFO)
 
+@pytest.mark.parametrize('combined_by_s3', [True, False])
+@patch('futurex_openedx_extensions.helpers.export_csv._combine_partial_files_s3')
+def test_combine_partial_files_s3_storage(
+    mock_combine_s3, combined_by_s3, mock_default_storage, mock_get_storage_dir,
+):  # pylint: disable=redefined-outer-name
+    """Verify that _combine_partial_files uses the multipart copy when possible, and keeps the combined file private."""
+    mock_combine_s3.return_value = combined_by_s3
+    mock_default_storage.__class__ = S3Boto3Storage
     mock_get_storage_dir.return_value = '/mock/storage/dir'
-    mock_default_storage.listdir.return_value = ([], ['part1.csv', 'part2.csv'])
-    mock_open_file = mock_open(read_data='file1_content')
-    mock_open_file.return_value.read.side_effect = [b'file1_content', b'file2_content']
-    mock_default_storage.open.side_effect = mock_open_file
-
-    if os_rm_failure:
-        mock_os_remove.side_effect = Exception('Some exception')
-
-    with tempfile.NamedTemporaryFile(mode='w', newline='', encoding='utf-8', delete=False) as temp_file:
-        with patch(
-            'futurex_openedx_extensions.helpers.export_csv.tempfile.NamedTemporaryFile',
-            return_value=temp_file,
-        ) as mock_tmp_file:
-            _combine_partial_files(task_id=1, filename='export.csv', tenant_id=123)
-
-            mock_get_storage_dir.assert_called_once_with(123, CSV_EXPORT_UPLOAD_DIR)
-            mock_default_storage.listdir.assert_called_once_with(
-                os.path.join('/mock/storage/dir', 'export.csv_parts')
-            )
-            mock_default_storage.open.assert_any_call(
-                os.path.join('/mock/storage/dir', 'export.csv_parts', 'part1.csv')
-            )
-            mock_default_storage.open.assert_any_call(
-                os.path.join('/mock/storage/dir', 'export.csv_parts', 'part2.csv')
-            )
-            mock_upload_file_to_storage.assert_called_once_with(
-                mock_tmp_file.return_value.name, 'export.csv', 123,
-            )
-            for part_file in ['part1.csv', 'part2.csv']:
-                mock_default_storage.delete.assert_any_call(
-                    os.path.join('/mock/storage/dir', 'export.csv_parts', part_file)
-                )
-            mock_default_storage.delete.assert_any_call(
-                os.path.join('/mock/storage/dir', 'export.csv_parts')
-            )
-            mock_os_remove.assert_called_once_with(temp_file.name)
+    mock_default_storage.listdir.return_value = ([], ['export.csv_000002', 'export.csv_000001'])
+    parts_dir = os.path.join('/mock/storage/dir', 'export.csv_parts')
+    part_paths = [os.path.join(parts_dir, 'export.csv_000001'), os.path.join(parts_dir, 'export.csv_000002')]
+
+    _combine_partial_files(task_id=1, filename='export.csv', tenant_id=123)
+
+    mock_get_storage_dir.assert_called_once_with(123, CSV_EXPORT_UPLOAD_DIR)
+    mock_default_storage.listdir.assert_called_once_with(parts_dir)
+    mock_combine_s3.assert_called_once_with('/mock/storage/dir/export.csv', part_paths)
+    if combined_by_s3:
+        mock_default_storage.save.assert_not_called()
+        mock_default_storage.bucket.Object.assert_not_called()
+    else:
+        mock_default_storage.save.assert_called_once()
+        assert mock_default_storage.save.call_args.args[0] == '/mock/storage/dir/export.csv'
+        mock_default_storage.bucket.Object.assert_called_once_with('/mock/storage/dir/export.csv')
+        mock_default_storage.bucket.Object.return_value.Acl.return_value.put.assert_called_once_with(ACL='private')
+    for part_path in part_paths:
+        mock_default_storage.delete.assert_any_call(part_path)
+    mock_default_storage.delete.assert_any_call(parts_dir)
+
+
+@patch('futurex_openedx_extensions.helpers.export_csv.upload_file')
+@patch('futurex_openedx_extensions.helpers.export_csv.combine_parquet_files')
+@patch('futurex_openedx_extensions.helpers.export_csv._combine_partial_files_s3')
+def test_combine_partial_files_parquet(
+    mock_combine_s3, mock_combine_parquet, mock_upload, mock_default_storage, mock_get_storage_dir,
+):  # pylint: disable=redefined-outer-name
+    """Verify that _combine_partial_files rewrites Parquet parts into one file, then uploads it."""
+    mock_get_storage_dir.return_value = '/mock/storage/dir'
+    mock_default_storage.listdir.return_value = ([], ['export.parquet_000002', 'export.parquet_000001'])
+    parts_dir = '/mock/storage/dir/export.parquet_parts'
+    part_paths = [f'{parts_dir}/export.parquet_000001', f'{parts_dir}/export.parquet_000002']
+    mock_combine_parquet.side_effect = lambda paths, file: file.write(b'combined')
+
+    def _upload_file(storage_path, local_file_path, is_private):
+        with open(local_file_path, 'rb') as local_file:
+            assert local_file.read() == b'combined'
+        assert storage_path == '/mock/storage/dir/export.parquet'
+        assert is_private is True
+
+    mock_upload.side_effect = _upload_file
+    _combine_partial_files(task_id=1, filename='export.parquet', tenant_id=1)
+
+    mock_combine_s3.assert_not_called()
+    mock_combine_parquet.assert_called_once()
+    assert mock_combine_parquet.call_args.args[0] == part_paths
+    mock_upload.assert_called_once()
+    assert not os.path.exists(mock_upload.call_args.args[1])
+    mock_default_storage.save.assert_not_called()
+    mock_default_storage.delete.assert_any_call(parts_dir)
+
+
+@patch(
+    'futurex_openedx_extensions.helpers.export_csv.get_storage_key', side_effect=lambda name: f'location/{name}',
+)
+def test_combine_partial_files_s3(_, mock_default_storage):  # pylint: disable=redefined-outer-name
+    """Verify that _combine_partial_files_s3 combines the parts by copying them inside the bucket."""
+    mock_default_storage.__class__ = S3Boto3Storage
+    mock_default_storage.size.return_value = CSV_EXPORT_S3_MIN_PART_SIZE
+    mock_default_storage.bucket.name = 'fake-bucket'
+    client = mock_default_storage.bucket.meta.client
+    client.create_multipart_upload.return_value = {'UploadId': 'upload-1'}
+    client.upload_part_copy.side_effect = [
+        {'CopyPartResult': {'ETag': 'etag-1'}},
+        {'CopyPartResult': {'ETag': 'etag-2'}},
+    ]
+
+    assert _combine_partial_files_s3('dir/export.csv', ['dir/part1', 'dir/part2']) is True
+
+    client.create_multipart_upload.assert_called_once_with(
+        Bucket='fake-bucket', Key='location/dir/export.csv', ACL='private', ContentType='text/csv',
+    )
+    assert client.upload_part_copy.call_args_list[1].kwargs == {
+        'Bucket': 'fake-bucket',
+        'Key': 'location/dir/export.csv',
+        'UploadId': 'upload-1',
+        'PartNumber': 2,
+        'CopySource': {'Bucket': 'fake-bucket', 'Key': 'location/dir/part2'},
+    }
+    client.complete_multipart_upload.assert_called_once_with(
+        Bucket='fake-bucket',
+        Key='location/dir/export.csv',
+        UploadId='upload-1',
+        MultipartUpload={'Parts': [{'ETag': 'etag-1', 'PartNumber': 1}, {'ETag': 'etag-2', 'PartNumber': 2}]},
+    )
+    client.abort_multipart_upload.assert_not_called()
+
+
+@patch(
+    'futurex_openedx_extensions.helpers.export_csv.get_storage_key', side_effect=lambda name: f'location/{name}',
+)
+def test_combine_partial_files_s3_failure(_, mock_default_storage):  # pylint: disable=redefined-outer-name
+    """Verify that _combine_partial_files_s3 aborts the multipart upload when copying a part fails."""
+    mock_default_storage.__class__ = S3Boto3Storage
+    mock_default_storage.size.return_value = CSV_EXPORT_S3_MIN_PART_SIZE
+    mock_default_storage.bucket.name = 'fake-bucket'
+    client = mock_default_storage.bucket.meta.client
+    client.create_multipart_upload.return_value = {'UploadId': 'upload-1'}
+    client.upload_part_copy.side_effect = Exception('copy failed')
+
+    with pytest.raises(Exception) as exc_info:
+        _combine_partial_files_s3('dir/export.csv', ['dir/part1'])
+    assert str(exc_info.value) == 'copy failed'
+    client.abort_multipart_upload.assert_called_once_with(
+        Bucket='fake-bucket', Key='location/dir/export.csv', UploadId='upload-1',
+    )
+    client.complete_multipart_upload.assert_not_called()
+
+
+@pytest.mark.parametrize('is_s3, part_sizes, case_description', [
+    (False, [CSV_EXPORT_S3_MIN_PART_SIZE] * 2, 'storage is not S3'),
+    (True, [], 'no parts'),
+    (True, [CSV_EXPORT_S3_MIN_PART_SIZE] * (CSV_EXPORT_S3_MAX_PARTS + 1), 'too many parts'),
+    (True, [CSV_EXPORT_S3_MIN_PART_SIZE - 1, CSV_EXPORT_S3_MIN_PART_SIZE], 'a part is too small'),
+])
+def test_combine_partial_files_s3_not_possible(
+    is_s3, part_sizes, case_description, mock_default_storage,
+):  # pylint: disable=redefined-outer-name
+    """Verify that _combine_partial_files_s3 does not combine the parts when the multipart copy is not possible."""
+    if is_s3:
+        mock_default_storage.__class__ = S3Boto3Storage
+    sizes = dict(zip((f'part{index}' for index in range(len(part_sizes))), part_sizes))
+    mock_default_storage.size.side_effect = sizes.get
+
+    assert _combine_partial_files_s3('export.csv', list(sizes)) is False, case_description
+    mock_default_storage.bucket.meta.client.create_multipart_upload.assert_not_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('status, file_exists, expected_result', [
+    (DataExportTask.STATUS_COMPLETED, True, True),
+    (DataExportTask.STATUS_COMPLETED, False, False),
+    (DataExportTask.STATUS_PROCESSING, True, False),
+])
+@patch('futurex_openedx_extensions.helpers.export_csv.default_storage')
+def test_is_exported_file_available(
+    mock_default_storage, status, file_exists, expected_result, base_data,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that is_exported_file_available is True only for completed tasks with their file in the storage."""
+    task = DataExportTask.objects.create(
+        filename='test.csv', view_name='test_export', user_id=30, tenant_id=1, status=status,
+    )
+    mock_default_storage.exists.return_value = file_exists
 
-    assert not os_rm_failure or 'CSV Export: failed to remove temporary combined file for task' in caplog.text
+    assert is_exported_file_available(task) is expected_result
+    if status == DataExportTask.STATUS_COMPLETED:
+        mock_default_storage.exists.assert_called_once_with(
+            os.path.join(get_storage_dir(1, CSV_EXPORT_UPLOAD_DIR), 'test.csv')
+        )
 
 
 @pytest.mark.parametrize(
@@ -748,3 +1250,128 @@ def test_log_export_task_logs_correctly(status, continue_job, expected_log_metho
         args, _ = mock_log.error.call_args
         assert 'boom' in args[4], test_case
     assert expected_msg_part in args[1], test_case
+
+
+@pytest.fixture
+def prepared_chunks_export(view_data, site):  # pylint: disable=redefined-outer-name
+    """Fixture to prepare the streamed export of the first nine users, with two records per page."""
+    def prepare_export_side_effect(_, sent_view_data, __):
+        sent_view_data.update({'site': site, 'kwargs': {'max_id': 9}, 'page_size': 2})
+        sent_view_data['export_view'] = _get_export_view(
+            StreamedTestView.as_view(),
+            'http://example.com/api/data',
+            {'user': get_user_model().objects.get(id=30)},
+            sent_view_data,
+        )
+
+    view_data['site_domain'] = site.domain
+    with patch(
+        'futurex_openedx_extensions.helpers.export_csv._prepare_export', side_effect=prepare_export_side_effect,
+    ) as mock_prepare:
+        yield mock_prepare
+
+
+@pytest.mark.django_db
+def test_get_export_chunks(
+    base_data, view_data, prepared_chunks_export,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that get_export_chunks splits the export into ranges of primary keys with the same size."""
+    original_view_data = copy.deepcopy(view_data)
+    assert get_export_chunks('http://example.com/api/data', view_data, {'user_id': 30}) == [
+        {**original_view_data, 'chunk': 1, 'after': None, 'until': 3, 'total_records': 9},
+        {**original_view_data, 'chunk': 2, 'after': 3, 'until': 6, 'total_records': 9},
+        {**original_view_data, 'chunk': 3, 'after': 6, 'until': None, 'total_records': 9},
+    ]
+    prepared_chunks_export.assert_called_once()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('parallel_chunks, url, case_description', [
+    (1, 'http://example.com/api/data', 'parallel export is disabled'),
+    (3, 'http://example.com/api/data?page=1', 'bad URL is left for export_data_to_csv to report'),
+])
+def test_get_export_chunks_disabled(
+    base_data, view_data, prepared_chunks_export, parallel_chunks, url, case_description,
+):  # pylint: disable=redefined-outer-name, unused-argument, too-many-arguments
+    """Verify that get_export_chunks does not split the export when the parallel export is not possible."""
+    with override_settings(FX_TASK_EXPORT_PARALLEL_CHUNKS=parallel_chunks):
+        assert get_export_chunks(url, view_data, {'user_id': 30}) == [], case_description
+    prepared_chunks_export.assert_not_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('export_view, max_id, ordering, case_description', [
+    (False, 9, None, 'view does not support streaming'),
+    (True, 9, 'username', 'queryset is not ordered by primary key'),
+    (True, 3, None, 'not enough records for two chunks of one page each'),
+])
+def test_get_export_chunks_not_possible(
+    base_data, view_data, prepared_chunks_export, export_view, max_id, ordering, case_description,
+):  # pylint: disable=redefined-outer-name, unused-argument, too-many-arguments
+    """Verify that get_export_chunks does not split the export when the export cannot be split."""
+    def prepare_export_side_effect(*args):
+        original_side_effect(*args)
+        if not export_view:
+            args[1]['export_view'] = None
+
+    original_side_effect = prepared_chunks_export.side_effect
+    prepared_chunks_export.side_effect = prepare_export_side_effect
+    queryset = get_user_model().objects.filter(id__lte=max_id)
+    if ordering:
+        queryset = queryset.order_by(ordering)
+
+    with patch.object(StreamedTestView, 'get_queryset', return_value=queryset):
+        assert get_export_chunks('http://example.com/api/data', view_data, {'user_id': 30}) == [], case_description
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.export_csv._get_export_view', return_value=None)
+@patch('futurex_openedx_extensions.helpers.export_csv._get_view_class_instance')
+def test_prepare_export(
+    mock_get_view, mock_get_export_view, base_data, view_data, site,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that _prepare_export restores the user, and fills the view data required for the export."""
+    mock_get_view.return_value.view_class.pagination_class.max_page_size = 50
+    view_data['site_domain'] = site.domain
+    fx_permission_info = {'user_id': 30}
+
+    assert _prepare_export('http://example.com/api/data', view_data, fx_permission_info) == mock_get_view.return_value
+    assert fx_permission_info['user'] == get_user_model().objects.get(id=30)
+    assert view_data['url'] == 'http://example.com/api/data?page=1&page_size=50'
+    assert view_data['site'] == site
+    assert view_data['export_view'] is None
+    mock_get_export_view.assert_called_once_with(
+        mock_get_view.return_value, view_data['url'], fx_permission_info, view_data,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('filename', ['test', 'test.csv'])
+@patch('futurex_openedx_extensions.helpers.export_csv._combine_partial_files')
+def test_merge_export_chunks(
+    mock_combine, filename, fx_task, base_data,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that merge_export_chunks combines the partial files of the export."""
+    merge_export_chunks(fx_task.id, filename)
+    mock_combine.assert_called_once_with(fx_task.id, 'test.csv', fx_task.tenant.id)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('filename', ['test', 'test.csv'])
+def test_delete_export_chunks(
+    partial_files, filename, fx_task, base_data,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that delete_export_chunks deletes the partial files of the export and their directory."""
+    parts_dir, _ = partial_files
+
+    delete_export_chunks(fx_task.id, filename)
+
+    assert not os.path.exists(default_storage.path(parts_dir))
+
+
+@pytest.mark.django_db
+def test_delete_export_chunks_no_partial_files(
+    fx_task, base_data,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that delete_export_chunks does nothing when the export has no partial files."""
+    delete_export_chunks(fx_task.id, _FILENAME)
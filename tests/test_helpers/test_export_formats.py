@@ -0,0 +1,241 @@
+"""Tests for the export formats helpers"""
+import csv
+import io
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from futurex_openedx_extensions.helpers.export_formats import (
+    CSVExportWriter,
+    ExportWriter,
+    JSONLinesExportWriter,
+    ParquetExportWriter,
+    combine_parquet_files,
+    get_export_format,
+    get_export_writer,
+    is_export_format_available,
+)
+
+
+@pytest.mark.parametrize('export_format, pyarrow_installed, expected_result', [
+    ('csv', True, True),
+    ('csv.gz', False, True),
+    ('jsonl.gz', False, True),
+    ('parquet', True, True),
+    ('parquet', False, False),
+    ('xlsx', True, False),
+    ('', True, False),
+])
+def test_is_export_format_available(export_format, pyarrow_installed, expected_result):
+    """Verify that is_export_format_available accepts only the supported formats, with their requirements."""
+    with patch(
+        'futurex_openedx_extensions.helpers.export_formats.pyarrow', object() if pyarrow_installed else None,
+    ):
+        assert is_export_format_available(export_format) is expected_result
+
+
+@pytest.mark.parametrize('filename, expected_format', [
+    ('export.csv', 'csv'),
+    ('export.csv.gz', 'csv.gz'),
+    ('export.jsonl.gz', 'jsonl.gz'),
+    ('export.parquet', 'parquet'),
+    ('export.gz', None),
+    ('export', None),
+])
+def test_get_export_format(filename, expected_format):
+    """Verify that get_export_format returns the export format of the filename extension."""
+    assert get_export_format(filename) == expected_format
+
+
+@pytest.mark.parametrize('filename, expected_writer_class', [
+    ('export.csv', CSVExportWriter),
+    ('export.csv.gz', CSVExportWriter),
+    ('export.jsonl.gz', JSONLinesExportWriter),
+    ('export.parquet', ParquetExportWriter),
+    ('export', CSVExportWriter),
+])
+def test_get_export_writer(filename, expected_writer_class):
+    """Verify that get_export_writer returns the writer of the export format."""
+    file = io.BytesIO()
+    writer = get_export_writer(filename, file)
+    assert isinstance(writer, expected_writer_class)
+    assert writer.file is file
+
+
+def test_export_writer_write_batch():
+    """Verify that the base ExportWriter does not implement write_batch."""
+    with pytest.raises(NotImplementedError):
+        ExportWriter(io.BytesIO()).write_batch([{'id': 1}], header=True)
+
+
+def test_csv_export_writer():
+    """Verify that CSVExportWriter writes the header only when requested, and leaves the file open."""
+    file = io.BytesIO()
+    writer = CSVExportWriter(file)
+    writer.write_batch([{'id': 1, 'name': 'one'}, {'id': 2, 'name': 'two'}], header=True)
+    writer.write_batch([{'id': 3, 'name': 'three'}], header=False)
+    writer.close()
+
+    assert not file.closed
+    assert list(csv.reader(io.StringIO(file.getvalue().decode('utf-8')))) == [
+        ['id', 'name'], ['1', 'one'], ['2', 'two'], ['3', 'three'],
+    ]
+
+
+def test_json_lines_export_writer():
+    """Verify that JSONLinesExportWriter writes one JSON object per line."""
+    file = io.BytesIO()
+    writer = JSONLinesExportWriter(file)
+    writer.write_batch([{'id': 1, 'name': 'اسم'}, {'id': 2, 'name': None}], header=True)
+    writer.write_batch([{'id': 3, 'tags': ['a']}], header=False)
+    writer.close()
+
+    lines = file.getvalue().decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'id': 1, 'name': 'اسم'}, {'id': 2, 'name': None}, {'id': 3, 'tags': ['a']},
+    ]
+
+
+def test_parquet_export_writer():
+    """Verify that ParquetExportWriter writes one row group per batch, with the types inferred from the batches."""
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    file = io.BytesIO()
+    writer = ParquetExportWriter(file)
+    writer.write_batch([
+        {'id': 1, 'score': 1, 'active': True, 'name': 'one', 'extra': None, 'tags': ['a']},
+        {'id': 2, 'score': 2.5, 'active': False, 'name': None, 'extra': None, 'tags': []},
+    ], header=True)
+    writer.write_batch([
+        {'id': 3, 'score': 3, 'active': None, 'name': 'three', 'extra': 7, 'tags': None},
+    ], header=False)
+    writer.close()
+
+    parquet_file = pyarrow_parquet.ParquetFile(io.BytesIO(file.getvalue()))
+    assert parquet_file.num_row_groups == 2
+    assert [(field.name, str(field.type)) for field in parquet_file.schema_arrow] == [
+        ('id', 'int64'), ('score', 'double'), ('active', 'bool'), ('name', 'string'), ('extra', 'int64'),
+        ('tags', 'string'),
+    ]
+    assert parquet_file.read().to_pylist() == [
+        {'id': 1, 'score': 1.0, 'active': True, 'name': 'one', 'extra': None, 'tags': '["a"]'},
+        {'id': 2, 'score': 2.5, 'active': False, 'name': None, 'extra': None, 'tags': '[]'},
+        {'id': 3, 'score': 3.0, 'active': None, 'name': 'three', 'extra': 7, 'tags': None},
+    ]
+
+
+def test_parquet_export_writer_schema_drift(caplog):
+    """
+    Verify that ParquetExportWriter keeps all the values when the types drift in the later batches: the written row
+    groups are rewritten with the columns promoted to floats or strings.
+    """
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    caplog.set_level('INFO')
+    file = io.BytesIO()
+    writer = ParquetExportWriter(file)
+    writer.write_batch([{'id': 1, 'score': 1, 'active': True, 'name': None}], header=True)
+    writer.write_batch([{'id': 2, 'score': 2.5, 'active': 'yes', 'name': 5}], header=False)
+    writer.write_batch([{'id': 3, 'score': 'high', 'active': False, 'name': 'three'}], header=False)
+    writer.write_batch([{'id': 2 ** 40, 'score': None, 'active': None, 'name': None}], header=False)
+    writer.close()
+
+    parquet_file = pyarrow_parquet.ParquetFile(io.BytesIO(file.getvalue()))
+    assert parquet_file.num_row_groups == 4
+    assert [(field.name, str(field.type)) for field in parquet_file.schema_arrow] == [
+        ('id', 'int64'), ('score', 'string'), ('active', 'string'), ('name', 'string'),
+    ]
+    assert parquet_file.read().to_pylist() == [
+        {'id': 1, 'score': '1.0', 'active': 'True', 'name': None},
+        {'id': 2, 'score': '2.5', 'active': 'yes', 'name': '5'},
+        {'id': 3, 'score': 'high', 'active': 'False', 'name': 'three'},
+        {'id': 2 ** 40, 'score': None, 'active': None, 'name': None},
+    ]
+    assert caplog.text.count('Parquet Export: column types changed, rewriting the written row groups') == 2
+
+
+def test_parquet_export_writer_no_records():
+    """Verify that ParquetExportWriter writes nothing when no batch is written."""
+    file = io.BytesIO()
+    writer = ParquetExportWriter(file)
+    writer.close()
+    assert file.getvalue() == b''
+
+
+def _save_parquet_parts(parts_records):
+    """Save a partial Parquet file of every list of records, and return their paths"""
+    part_paths = []
+    for index, records in enumerate(parts_records):
+        file = io.BytesIO()
+        writer = ParquetExportWriter(file)
+        if records:
+            writer.write_batch(records, header=False)
+        writer.close()
+        part_paths.append(default_storage.save(f'parquet_parts/part_{index}', ContentFile(file.getvalue())))
+    return part_paths
+
+
+def _delete_parquet_parts(part_paths):
+    """Delete the saved partial Parquet files"""
+    for part_path in part_paths:
+        default_storage.delete(part_path)
+    os.rmdir(default_storage.path('parquet_parts'))
+
+
+def test_combine_parquet_files():
+    """Verify that combine_parquet_files combines the partial files in order, and skips the empty ones."""
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    part_paths = _save_parquet_parts([
+        [{'id': 1, 'name': 'one'}, {'id': 2, 'name': 'two'}],
+        [],
+        [{'id': 3, 'name': None}],
+    ])
+
+    combined_file = io.BytesIO()
+    combine_parquet_files(part_paths, combined_file)
+
+    parquet_file = pyarrow_parquet.ParquetFile(io.BytesIO(combined_file.getvalue()))
+    assert parquet_file.read().to_pylist() == [
+        {'id': 1, 'name': 'one'}, {'id': 2, 'name': 'two'}, {'id': 3, 'name': None},
+    ]
+
+    _delete_parquet_parts(part_paths)
+
+
+def test_combine_parquet_files_schema_drift():
+    """
+    Verify that combine_parquet_files combines partial files of different inferred schemas, with the columns of
+    different types promoted to a type that fits both.
+    """
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    part_paths = _save_parquet_parts([
+        [{'id': 1, 'score': None, 'active': True}],
+        [{'id': 2, 'score': 2.5, 'active': 'no'}],
+    ])
+
+    combined_file = io.BytesIO()
+    combine_parquet_files(part_paths, combined_file)
+
+    parquet_file = pyarrow_parquet.ParquetFile(io.BytesIO(combined_file.getvalue()))
+    assert [(field.name, str(field.type)) for field in parquet_file.schema_arrow] == [
+        ('id', 'int64'), ('score', 'double'), ('active', 'string'),
+    ]
+    assert parquet_file.read().to_pylist() == [
+        {'id': 1, 'score': None, 'active': 'True'},
+        {'id': 2, 'score': 2.5, 'active': 'no'},
+    ]
+
+    _delete_parquet_parts(part_paths)
+
+
+def test_combine_parquet_files_all_empty():
+    """Verify that combine_parquet_files writes nothing when all the partial files are empty."""
+    part_paths = _save_parquet_parts([[], []])
+
+    combined_file = io.BytesIO()
+    combine_parquet_files(part_paths, combined_file)
+    assert combined_file.getvalue() == b''
+
+    _delete_parquet_parts(part_paths)
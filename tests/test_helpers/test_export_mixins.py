@@ -1,14 +1,26 @@
 """Test export csv"""
+import json
+from datetime import timedelta
 from unittest.mock import PropertyMock, patch
 
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
+from django.db.models import Value
+from django.http import QueryDict
+from django.test import override_settings
+from django.utils import timezone
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from rest_framework import serializers
 from rest_framework import status as http_status
+from rest_framework.generics import ListAPIView
 from rest_framework.test import APIRequestFactory
 
-from futurex_openedx_extensions.helpers.export_mixins import ExportCSVMixin
+from futurex_openedx_extensions.helpers import constants as cs
+from futurex_openedx_extensions.helpers.export_mixins import ExportCSVMixin, get_model_data_watermark
 from futurex_openedx_extensions.helpers.models import DataExportTask
+from futurex_openedx_extensions.helpers.pagination import DefaultPagination
+from futurex_openedx_extensions.helpers.querysets import update_removable_annotations
 
 
 class TestView(ExportCSVMixin):
@@ -17,6 +29,28 @@ class TestView(ExportCSVMixin):
     request = None
 
 
+class UsernameSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = get_user_model()
+        fields = ['id', 'username']
+
+
+class GenericTestView(ExportCSVMixin, ListAPIView):
+    """Generic view exported by streaming its queryset"""
+    fx_view_name = 'test_generic_export'
+    pagination_class = DefaultPagination
+    serializer_class = UsernameSerializer
+
+    def get_queryset(self):
+        return get_user_model().objects.filter(id__in=[3, 1, 2])
+
+
+@pytest.fixture
+def generic_view():
+    """Create an instance of a generic view using the ExportCSVMixin for testing."""
+    return GenericTestView(request=APIRequestFactory().get('/'), format_kwarg=None)
+
+
 @pytest.fixture
 def export_csv_mixin():
     """Create an instance of the ExportCSVMixin for testing."""
@@ -34,13 +68,24 @@ def export_csv_mixin():
 
 
 @pytest.mark.django_db
-def test_export_filename(base_data, export_csv_mixin):  # pylint: disable=redefined-outer-name, unused-argument
-    """Test the export_filename property."""
+@pytest.mark.parametrize('download, gzip_export, expected_extension', [
+    ('csv', False, 'csv'),
+    ('CSV', True, 'csv.gz'),
+    ('csv.gz', False, 'csv.gz'),
+    ('jsonl.gz', True, 'jsonl.gz'),
+    ('parquet', True, 'parquet'),
+])
+def test_export_filename(
+    base_data, export_csv_mixin, download, gzip_export, expected_extension,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Test the export_filename property. The extension is the requested export format."""
+    export_csv_mixin.request.query_params = {'download': download}
     fake_time = '20241002_120000_123456'
     with patch('futurex_openedx_extensions.helpers.export_mixins.datetime') as mock_datetime_class:
         mock_datetime_class.now.return_value.strftime.return_value = fake_time
-        filename = export_csv_mixin.export_filename
-        expected_filename = f'test_export_{fake_time}.csv'
+        with override_settings(FX_TASK_EXPORT_GZIP=gzip_export):
+            filename = export_csv_mixin.export_filename
+        expected_filename = f'test_export_{fake_time}.{expected_extension}'
         assert filename == expected_filename
 
 
@@ -112,6 +157,7 @@ def test_generate_csv_url_response(
         mocked_get_query_params_func.return_value = fake_query_params
         response = export_csv_mixin.generate_csv_url_response()
         fx_task = DataExportTask.objects.get(filename=filename)
+        assert fx_task.export_format == DataExportTask.FORMAT_CSV_GZ, 'FX_TASK_EXPORT_GZIP is set in test settings'
         mocked_export_data_to_csv_task.assert_called_once_with(
             fx_task.id, fake_url, view_params, serialized_fx_permission_info, filename
         )
@@ -258,3 +304,219 @@ def test_list_with_csv_download_for_tasks_limit(
     )
     response = export_csv_mixin.list(export_csv_mixin.request)
     assert response.status_code == http_status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.export_mixins.ExportCSVMixin.generate_csv_url_response')
+@patch('futurex_openedx_extensions.helpers.export_mixins.is_export_format_available', return_value=False)
+def test_list_with_unavailable_export_format(
+    _, mocked_generate_response, base_data, export_csv_mixin,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that the list method rejects export formats that are not available on the server."""
+    export_csv_mixin.request.query_params = {'download': 'parquet'}
+    response = export_csv_mixin.list(export_csv_mixin.request)
+    assert response.status_code == http_status.HTTP_400_BAD_REQUEST
+    assert response.data == {'detail': 'Export format (parquet) is not available on this server!'}
+    mocked_generate_response.assert_not_called()
+
+
+@pytest.mark.parametrize('view_class, streaming, expected_result', [
+    (TestView, True, False),
+    (GenericTestView, True, True),
+    (GenericTestView, False, False),
+])
+def test_is_export_streaming_supported(view_class, streaming, expected_result):
+    """Verify that is_export_streaming_supported is True only for generic views that did not disable streaming."""
+    view_instance = view_class()
+    view_instance.fx_export_streaming = streaming
+    assert view_instance.is_export_streaming_supported() is expected_result
+
+
+@pytest.mark.django_db
+def test_get_export_queryset_unordered(
+    base_data, generic_view,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that get_export_queryset orders unordered querysets by primary key."""
+    queryset = generic_view.get_export_queryset()
+    assert queryset.ordered
+    assert list(queryset.values_list('id', flat=True)) == [1, 2, 3]
+
+
+@pytest.mark.django_db
+def test_get_export_queryset_keeps_removable_annotations(
+    base_data, generic_view,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that get_export_queryset keeps the removable annotations when ordering the queryset."""
+    queryset = get_user_model().objects.filter(id__in=[1, 2, 3]).annotate(fake_annotation=Value(1))
+    update_removable_annotations(queryset, removable=['fake_annotation'])
+    with patch.object(GenericTestView, 'get_queryset', return_value=queryset):
+        assert generic_view.get_export_queryset().removable_annotations == {'fake_annotation'}
+
+
+@pytest.mark.django_db
+def test_get_export_queryset_ordered(
+    base_data, generic_view,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that get_export_queryset keeps the ordering of ordered querysets."""
+    queryset = get_user_model().objects.filter(id__in=[1, 2, 3]).order_by('-id')
+    with patch.object(GenericTestView, 'get_queryset', return_value=queryset):
+        assert list(generic_view.get_export_queryset().values_list('id', flat=True)) == [3, 2, 1]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('pagination_class', [DefaultPagination, None])
+def test_get_export_count(
+    base_data, generic_view, pagination_class,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that get_export_count counts the records with or without a pagination class."""
+    generic_view.pagination_class = pagination_class
+    assert generic_view.get_export_count(generic_view.get_export_queryset()) == 3
+
+
+@pytest.mark.django_db
+def test_serialize_export_items(
+    base_data, generic_view,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that serialize_export_items serializes the given records with the serializer of the view."""
+    items = list(generic_view.get_export_queryset()[:2])
+    assert generic_view.serialize_export_items(items) == [
+        {'id': 1, 'username': 'user1'},
+        {'id': 2, 'username': 'user2'},
+    ]
+
+
+@pytest.mark.django_db
+def test_get_export_fingerprint(base_data, export_csv_mixin):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that the export fingerprint is the same for identical requests, regardless of the order of values."""
+    export_csv_mixin.request.query_params = {'download': 'csv'}
+    export_csv_mixin.request.fx_permission_info['view_allowed_full_access_orgs'] = ['org1', 'org2']
+    export_csv_mixin.request.GET = QueryDict('download=csv&search_text=x&course_ids=c1&course_ids=c2&page=2')
+    fingerprint = export_csv_mixin.get_export_fingerprint()
+    assert len(fingerprint) == 64
+
+    export_csv_mixin.request.fx_permission_info['view_allowed_full_access_orgs'] = ['org2', 'org1']
+    export_csv_mixin.request.GET = QueryDict('course_ids=c2&course_ids=c1&search_text=x&download=csv&page_size=5')
+    assert export_csv_mixin.get_export_fingerprint() == fingerprint, 'order of values and pagination are ignored'
+
+    export_csv_mixin.request.query_params = {'download': 'jsonl.gz'}
+    assert export_csv_mixin.get_export_fingerprint() != fingerprint, 'export format is included'
+    export_csv_mixin.request.query_params = {'download': 'csv'}
+
+    export_csv_mixin.request.GET = QueryDict('course_ids=c2&search_text=x')
+    assert export_csv_mixin.get_export_fingerprint() != fingerprint, 'filters are included'
+    export_csv_mixin.request.GET = QueryDict('course_ids=c2&course_ids=c1&search_text=x')
+
+    export_csv_mixin.request.fx_permission_info['view_allowed_full_access_orgs'] = ['org1']
+    assert export_csv_mixin.get_export_fingerprint() != fingerprint, 'permission scope is included'
+    export_csv_mixin.request.fx_permission_info['view_allowed_full_access_orgs'] = ['org1', 'org2']
+
+    with patch(
+        'futurex_openedx_extensions.helpers.export_mixins.ExportCSVMixin.get_export_data_watermark',
+        return_value='2026-10-16T10:00:00',
+    ):
+        assert export_csv_mixin.get_export_fingerprint() != fingerprint, 'data watermark is included'
+
+
+def test_get_export_data_watermark_not_streamed():
+    """Verify that get_export_data_watermark is empty for views that are not exported by streaming their queryset."""
+    assert TestView().get_export_data_watermark() == ''
+
+
+@pytest.mark.django_db
+def test_get_export_data_watermark(base_data, generic_view):  # pylint: disable=redefined-outer-name, unused-argument
+    """
+    Verify that get_export_data_watermark of a streamed view holds the last primary key of the exported model,
+    without counting or filtering the exported records.
+    """
+    last_user_id = get_user_model().objects.order_by('-id').values_list('id', flat=True).first()
+    queryset = get_user_model().objects.filter(id__in=[1, 2, 3]).annotate(fake_annotation=Value(1))
+    with patch.object(GenericTestView, 'get_queryset', return_value=queryset):
+        assert json.loads(generic_view.get_export_data_watermark()) == {'fx_last_pk': last_user_id}
+
+    get_user_model().objects.create(username='new_user', email='new_user@example.com')
+    with patch.object(GenericTestView, 'get_queryset', return_value=get_user_model().objects.filter(id__in=[1, 2])):
+        assert json.loads(generic_view.get_export_data_watermark()) == {'fx_last_pk': last_user_id + 1}
+
+
+def test_get_model_data_watermark_cached():
+    """Verify that get_model_data_watermark is cached per model with the export data watermark timeout."""
+    with patch('futurex_openedx_extensions.helpers.caching.cache') as mock_cache:
+        mock_cache.get.return_value = {'data': {'fx_last_pk': 7}}
+        assert get_model_data_watermark(get_user_model()) == {'fx_last_pk': 7}
+
+    mock_cache.get.assert_called_once_with(f'{cs.CACHE_NAME_EXPORT_DATA_WATERMARK}_auth.user')
+
+
+@pytest.mark.django_db
+def test_get_export_data_watermark_modified(
+    base_data, generic_view,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that get_export_data_watermark changes when a record is modified, if the model has a modified field."""
+    course = CourseOverview.objects.order_by('-modified').first()
+    with patch.object(GenericTestView, 'get_queryset', return_value=CourseOverview.objects.all()):
+        watermark = generic_view.get_export_data_watermark()
+        assert json.loads(watermark)['fx_last_modified'] == str(course.modified)
+
+        course.save()
+        assert generic_view.get_export_data_watermark() != watermark
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('status, age_seconds, same_user, file_available, expected_reused, case_description', [
+    (DataExportTask.STATUS_IN_QUEUE, 10, True, False, True, 'task in queue is reused'),
+    (DataExportTask.STATUS_PROCESSING, 10, True, False, True, 'task in progress is reused'),
+    (DataExportTask.STATUS_COMPLETED, 10, True, True, True, 'completed task with its file is reused'),
+    (DataExportTask.STATUS_COMPLETED, 10, True, False, False, 'completed task without its file is not reused'),
+    (DataExportTask.STATUS_FAILED, 10, True, False, False, 'failed task is not reused'),
+    (DataExportTask.STATUS_PROCESSING, 60 * 11, True, False, False, 'old task is not reused'),
+    (DataExportTask.STATUS_PROCESSING, 10, False, False, False, 'task of another user is not reused'),
+])
+@patch('futurex_openedx_extensions.helpers.export_mixins.is_exported_file_available')
+def test_get_reusable_export_task(
+    mock_file_available, status, age_seconds, same_user, file_available, expected_reused, case_description,
+    base_data, export_csv_mixin,
+):  # pylint: disable=redefined-outer-name, unused-argument, too-many-arguments
+    """Verify that get_reusable_export_task returns only recent, usable tasks of the user with the same fingerprint."""
+    mock_file_available.return_value = file_available
+    fx_task = DataExportTask.objects.create(
+        filename='test.csv', view_name='test_export', user_id=30 if same_user else 31, tenant_id=1,
+        status=status, fingerprint='a' * 64,
+    )
+    DataExportTask.objects.filter(id=fx_task.id).update(created_at=timezone.now() - timedelta(seconds=age_seconds))
+    DataExportTask.objects.create(
+        filename='test.csv', view_name='test_export', user_id=30, tenant_id=1, fingerprint='b' * 64,
+    )
+
+    result = export_csv_mixin.get_reusable_export_task('a' * 64)
+    assert (result == fx_task if expected_reused else result is None), case_description
+    with override_settings(FX_TASK_EXPORT_REUSE_SECONDS=0):
+        assert export_csv_mixin.get_reusable_export_task('a' * 64) is None
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.export_mixins.export_data_to_csv_task.delay')
+@patch(
+    'futurex_openedx_extensions.helpers.export_mixins.ExportCSVMixin.get_view_request_url',
+    return_value='http://example.com/view',
+)
+def test_list_reuses_identical_export(
+    _, mocked_export_task, base_data, export_csv_mixin,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that an identical export request returns the existing task without starting a new export."""
+    export_csv_mixin.request.query_params = {'download': 'csv'}
+    export_csv_mixin.request.GET = QueryDict('download=csv&search_text=x')
+    tasks_count = DataExportTask.objects.count()
+
+    first_response = export_csv_mixin.list(export_csv_mixin.request)
+    fx_task = DataExportTask.objects.get(id=first_response.data['export_task_id'])
+    assert fx_task.fingerprint == export_csv_mixin.get_export_fingerprint()
+    mocked_export_task.assert_called_once()
+
+    second_response = export_csv_mixin.list(export_csv_mixin.request)
+    assert second_response.status_code == http_status.HTTP_200_OK
+    assert second_response.data == {
+        'success': f'Task already exists with id: {fx_task.id}',
+        'export_task_id': fx_task.id,
+    }
+    mocked_export_task.assert_called_once()
+    assert DataExportTask.objects.count() == tasks_count + 1
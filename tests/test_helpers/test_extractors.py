@@ -6,7 +6,9 @@ import pytest
 from common.djangoapps.student.models import UserProfile
 from custom_reg_form.models import ExtraInfo
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import override_settings
+from opaque_keys.edx.locator import LibraryLocator
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 from futurex_openedx_extensions.dashboard.serializers import SerializerOptionalMethodField
@@ -15,6 +17,7 @@ from futurex_openedx_extensions.helpers.exceptions import FXCodedException
 from futurex_openedx_extensions.helpers.extractors import (
     DictHashcode,
     DictHashcodeSet,
+    cache_name_library_not_found,
     dot_separated_path_extract_all,
     dot_separated_path_force_set_value,
     dot_separated_path_get_value,
@@ -26,14 +29,17 @@ from futurex_openedx_extensions.helpers.extractors import (
     get_available_optional_field_tags_docs_table,
     get_course_id_from_uri,
     get_first_not_empty_item,
+    get_library_keys_index,
     get_max_valid_date_to,
     get_min_valid_date_from,
     get_optional_field_class,
     get_orgs_of_courses,
+    get_orgs_of_libraries,
     get_partial_access_course_ids,
     get_valid_date_duration,
     get_valid_duration,
     import_from_path,
+    invalidate_library_keys_index,
     verify_course_ids,
 )
 from tests.fixture_helpers import d_t
@@ -156,6 +162,94 @@ def test_get_orgs_of_courses_for_library_ids(course_ids, expected_orgs, base_dat
     assert result == {'courses': expected_orgs}
 
 
+def test_get_library_keys_index():
+    """Verify that get_library_keys_index indexes the organizations of all the library keys by library ID."""
+    assert get_library_keys_index() == {
+        'by_id': {
+            'library-v1:org1+11': 'org1',
+            'library-v1:org1+22': 'org1',
+            'library-v1:org5+11': 'org5',
+        },
+    }
+
+
+def test_get_library_keys_index_cached(cache_testing):  # pylint: disable=unused-argument
+    """Verify that get_library_keys_index reads the library keys from the modulestore only once."""
+    with patch('futurex_openedx_extensions.helpers.extractors.modulestore') as mock_modulestore:
+        mock_modulestore.return_value.get_library_keys.return_value = []
+        assert get_library_keys_index() == {'by_id': {}}
+        assert get_library_keys_index() == {'by_id': {}}
+    mock_modulestore.return_value.get_library_keys.assert_called_once_with()
+
+
+def test_get_orgs_of_libraries():
+    """Verify that get_orgs_of_libraries returns the organizations of the existing libraries only."""
+    with patch('futurex_openedx_extensions.helpers.extractors.invalidate_cache') as mock_invalidate_cache:
+        assert get_orgs_of_libraries([
+            'library-v1:org1+11', 'library-v1:org5+11', 'library-v1:org1+99', 'course-v1:ORG1+5+5', 'invalid',
+        ]) == {
+            'library-v1:org1+11': 'org1',
+            'library-v1:org5+11': 'org5',
+        }
+    mock_invalidate_cache.assert_not_called()
+
+
+@pytest.mark.usefixtures('cache_testing')
+def test_get_orgs_of_libraries_refreshes_index():
+    """
+    Verify that get_orgs_of_libraries looks up the libraries missing from the cached index in the modulestore, and
+    refreshes the index when they are found.
+    """
+    new_library_key = LibraryLocator.from_string('library-v1:org2+33')
+    with patch('futurex_openedx_extensions.helpers.extractors.modulestore') as mock_modulestore:
+        mock_modulestore.return_value.get_library_keys.return_value = []
+        mock_modulestore.return_value.get_library.return_value = None
+        assert not get_orgs_of_libraries(['library-v1:org2+33'])
+
+        mock_modulestore.return_value.get_library_keys.return_value = [new_library_key]
+        mock_modulestore.return_value.get_library.return_value = Mock()
+        cache.delete(cache_name_library_not_found('library-v1:org2+33'))
+        assert get_orgs_of_libraries(['library-v1:org2+33']) == {'library-v1:org2+33': 'org2'}
+        assert get_orgs_of_libraries(['library-v1:org2+33']) == {'library-v1:org2+33': 'org2'}
+
+    assert mock_modulestore.return_value.get_library_keys.call_count == 2
+    assert mock_modulestore.return_value.get_library.call_count == 2
+    mock_modulestore.return_value.get_library.assert_called_with(new_library_key)
+
+
+@pytest.mark.usefixtures('cache_testing')
+def test_get_orgs_of_libraries_remembers_not_found():
+    """
+    Verify that get_orgs_of_libraries remembers the library IDs that were not found in the modulestore, and does not
+    invalidate the library keys index for them.
+    """
+    with patch('futurex_openedx_extensions.helpers.extractors.modulestore') as mock_modulestore:
+        mock_modulestore.return_value.get_library_keys.return_value = []
+        mock_modulestore.return_value.get_library.return_value = None
+        with patch('futurex_openedx_extensions.helpers.extractors.invalidate_cache') as mock_invalidate_cache:
+            assert not get_orgs_of_libraries(['library-v1:org2+33', 'library-v1:org2+44'])
+            assert not get_orgs_of_libraries(['library-v1:org2+33'])
+            assert not get_orgs_of_libraries(['library-v1:org2+44', 'library-v1:org2+55'])
+
+    assert mock_modulestore.return_value.get_library.call_count == 3
+    mock_invalidate_cache.assert_not_called()
+    assert cache.get(cache_name_library_not_found('library-v1:org2+55')) is True
+
+
+@pytest.mark.usefixtures('cache_testing')
+def test_invalidate_library_keys_index():
+    """Verify that invalidate_library_keys_index deletes the index and the not found markers of the given IDs only."""
+    cache.set(cs.CACHE_NAME_LIBRARY_KEYS_INDEX, {'data': {'by_id': {}}})
+    cache.set(cache_name_library_not_found('library-v1:org2+33'), True)
+    cache.set(cache_name_library_not_found('library-v1:org2+44'), True)
+
+    invalidate_library_keys_index(['library-v1:org2+33'])
+
+    assert cache.get(cs.CACHE_NAME_LIBRARY_KEYS_INDEX) is None
+    assert cache.get(cache_name_library_not_found('library-v1:org2+33')) is None
+    assert cache.get(cache_name_library_not_found('library-v1:org2+44')) is True
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize('course_ids, expected_error_message', [
     (
@@ -0,0 +1,23 @@
+"""Tests for middlewares."""
+from unittest.mock import Mock
+
+from futurex_openedx_extensions.helpers.caching import _request_memo_store
+from futurex_openedx_extensions.helpers.middlewares import FXRequestMemoMiddleware
+
+
+def test_request_memo_middleware():
+    """Verify that the middleware opens a memo store for the request only"""
+    stores = []
+
+    def get_response(request):
+        stores.append(_request_memo_store.get())
+        return request.response
+
+    request = Mock(response='the response')
+    middleware = FXRequestMemoMiddleware(get_response)
+
+    assert middleware(request) == 'the response'
+    assert middleware(request) == 'the response'
+    assert stores[0] == {}
+    assert stores[0] is not stores[1]
+    assert _request_memo_store.get() is None
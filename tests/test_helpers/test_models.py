@@ -9,8 +9,10 @@ import pytest
 from common.djangoapps.student.models import CourseAccessRole
 from deepdiff import DeepDiff
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
+from django.test import override_settings
 from django.utils import timezone
 
 from futurex_openedx_extensions.helpers.clickhouse_operations import ClickhouseBaseError
@@ -297,7 +299,7 @@ def test_clickhouse_query_load_missing_queries(mocked_default, mocked_missing):
         'default_queries': {
             'course': {
                 'v1': {
-                    'slug1': {'query': 'SELECT * FROM table'},
+                    'slug1': {'query': 'SELECT * FROM table', 'cache_timeout': 900},
                 }
             },
             'user': {
@@ -315,8 +317,42 @@ def test_clickhouse_query_load_missing_queries(mocked_default, mocked_missing):
     with patch('futurex_openedx_extensions.helpers.models.ClickhouseQuery.validate_clickhouse_query'):
         ClickhouseQuery.load_missing_queries()
         assert ClickhouseQuery.objects.count() == 2
-        assert ClickhouseQuery.objects.filter(scope='course', version='v1', slug='slug1').exists()
-        assert ClickhouseQuery.objects.filter(scope='user', version='v1', slug='slug2').exists()
+        assert ClickhouseQuery.objects.get(scope='course', version='v1', slug='slug1').cache_timeout == 900
+        assert ClickhouseQuery.objects.get(scope='user', version='v1', slug='slug2').cache_timeout == 0
+
+
+def test_clickhouse_query_get_results_cache_key(sample_clickhouse_query):  # pylint: disable=redefined-outer-name
+    """Verify that ClickhouseQuery.get_results_cache_key ignores the order of list params only."""
+    sample_clickhouse_query.modified_at = timezone.now()
+    key = sample_clickhouse_query.get_results_cache_key({'__orgs_of_tenants__': ['org1', 'org2'], 'x': 1}, 1, 20)
+    assert key.startswith('fx_clickhouse_query_results_course_v1_test-query_')
+
+    assert key == sample_clickhouse_query.get_results_cache_key(
+        {'x': 1, '__orgs_of_tenants__': ['org2', 'org1']}, 1, 20,
+    )
+    assert key != sample_clickhouse_query.get_results_cache_key({'__orgs_of_tenants__': ['org1'], 'x': 1}, 1, 20)
+    assert key != sample_clickhouse_query.get_results_cache_key(
+        {'__orgs_of_tenants__': ['org1', 'org2'], 'x': 1}, 2, 20,
+    )
+    sample_clickhouse_query.modified_at = timezone.now() + timezone.timedelta(seconds=1)
+    assert key != sample_clickhouse_query.get_results_cache_key(
+        {'__orgs_of_tenants__': ['org1', 'org2'], 'x': 1}, 1, 20,
+    ), 'modifying the query invalidates its cached results'
+
+
+@pytest.mark.parametrize('cache_timeout, expected_cached', [(0, False), (60, True)])
+def test_clickhouse_query_cache_results(
+    sample_clickhouse_query, cache_testing, cache_timeout, expected_cached,
+):  # pylint: disable=redefined-outer-name, unused-argument
+    """Verify that ClickhouseQuery caches the results only when its cache_timeout is set."""
+    sample_clickhouse_query.cache_timeout = cache_timeout
+    results = {'count': 1, 'next_page': None, 'results': [{'col': 1}]}
+    params = {'__orgs_of_tenants__': ['org1']}
+
+    sample_clickhouse_query.cache_results(params, 1, 20, results)
+
+    assert sample_clickhouse_query.get_cached_results(params, 1, 20) == (results if expected_cached else None)
+    assert sample_clickhouse_query.get_cached_results(params, 2, 20) is None
 
 
 @patch('futurex_openedx_extensions.helpers.models.ClickhouseQuery.get_missing_query_ids')
@@ -544,6 +580,126 @@ def test_data_export_task_set_progress(base_data):  # pylint: disable=unused-arg
             assert task.progress == valid_progress
 
 
+@pytest.mark.django_db
+def test_data_export_task_set_progress_single_update(base_data):  # pylint: disable=unused-argument
+    """Verify that DataExportTask.set_progress updates the progress column without loading and saving the task."""
+    task = DataExportTask.objects.create(
+        filename='test.csv',
+        view_name='test_view',
+        user_id=1,
+        tenant_id=1,
+        status=DataExportTask.STATUS_PROCESSING,
+    )
+    with patch('futurex_openedx_extensions.helpers.models.DataExportTask.save') as mock_save:
+        with patch('futurex_openedx_extensions.helpers.models.DataExportTask.get_task') as mock_get_task:
+            DataExportTask.set_progress(task.id, 0.3)
+    mock_save.assert_not_called()
+    mock_get_task.assert_not_called()
+    task.refresh_from_db()
+    assert task.progress == 0.3
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cache_testing')
+@pytest.mark.parametrize('new_status, expected_update_fields', [
+    (DataExportTask.STATUS_COMPLETED, ['status', 'completed_at', 'progress']),
+    (DataExportTask.STATUS_FAILED, ['status', 'error_message']),
+])
+def test_data_export_task_set_status_update_fields(
+    base_data, new_status, expected_update_fields,
+):  # pylint: disable=unused-argument
+    """Verify that DataExportTask.set_status saves only the changed fields, and clears the cached progress."""
+    task = DataExportTask.objects.create(
+        filename='test.csv',
+        view_name='test_view',
+        user_id=1,
+        tenant_id=1,
+        status=DataExportTask.STATUS_PROCESSING,
+    )
+    DataExportTask.cache_progress(task.id, 0.5)
+    with patch('futurex_openedx_extensions.helpers.models.DataExportTask.save') as mock_save:
+        DataExportTask.set_status(task.id, new_status, error_message='an error message')
+    mock_save.assert_called_once_with(update_fields=expected_update_fields)
+    assert DataExportTask.get_cached_progress(task.id) is None
+
+
+@pytest.mark.usefixtures('cache_testing')
+def test_data_export_task_cached_progress():
+    """Verify that DataExportTask mirrors the progress to the cache only when the cache timeout is set."""
+    DataExportTask.cache_progress(99, 0.25)
+    assert DataExportTask.get_cached_progress(99) == 0.25
+    assert cache.get('fx_export_task_progress_99') == 0.25
+
+    with override_settings(FX_TASK_PROGRESS_CACHE_TIMEOUT=0):
+        assert DataExportTask.get_cached_progress(99) is None
+        DataExportTask.cache_progress(98, 0.25)
+    assert DataExportTask.get_cached_progress(98) is None
+
+
+@pytest.mark.django_db
+def test_data_export_task_add_progress(base_data):  # pylint: disable=unused-argument
+    """Verify that DataExportTask.add_progress adds to the progress, without exceeding 1.0."""
+    task = DataExportTask.objects.create(
+        filename='test.csv',
+        view_name='test_view',
+        user_id=1,
+        tenant_id=1,
+    )
+
+    for status_choice in DataExportTask.STATUS_CHOICES:
+        task.status = status_choice[0]
+        task.progress = 0.5
+        task.save()
+
+        if status_choice[0] != DataExportTask.STATUS_PROCESSING:
+            with pytest.raises(FXCodedException) as exc_info:
+                DataExportTask.add_progress(task.id, 0.25)
+            assert exc_info.value.code == FXExceptionCodes.EXPORT_CSV_TASK_CANNOT_CHANGE_PROGRESS.value
+            assert str(exc_info.value) == f'Cannot add progress for a task with status ({status_choice[0]}).'
+        else:
+            DataExportTask.add_progress(task.id, 0.25)
+            task.refresh_from_db()
+            assert task.progress == 0.75
+            DataExportTask.add_progress(task.id, 0.5)
+            task.refresh_from_db()
+            assert task.progress == 1.0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('invalid_progress', [
+    None, 'not an int', 1.0001, -0.00001,
+])
+def test_data_export_task_add_progress_invalid_value(base_data, invalid_progress):  # pylint: disable=unused-argument
+    """Verify that DataExportTask.add_progress raises FXCodedException for invalid progress value."""
+    with pytest.raises(FXCodedException) as exc_info:
+        DataExportTask.add_progress(1, invalid_progress)
+    assert exc_info.value.code == FXExceptionCodes.EXPORT_CSV_TASK_INVALID_PROGRESS_VALUE.value
+    assert str(exc_info.value) == f'Invalid progress value! ({invalid_progress}).'
+
+
+@pytest.mark.django_db
+def test_data_export_task_complete_chunk(base_data):  # pylint: disable=unused-argument
+    """Verify that DataExportTask.complete_chunk returns True only for the last completed chunk."""
+    task = DataExportTask.objects.create(
+        filename='test.csv',
+        view_name='test_view',
+        user_id=1,
+        tenant_id=1,
+        status=DataExportTask.STATUS_PROCESSING,
+        completed_chunks=5,
+    )
+    DataExportTask.set_chunks_count(task.id, 3)
+    task.refresh_from_db()
+    assert (task.chunks_count, task.completed_chunks) == (3, 0)
+
+    assert [DataExportTask.complete_chunk(task.id) for _ in range(3)] == [False, False, True]
+
+    DataExportTask.set_status(task_id=task.id, status=DataExportTask.STATUS_FAILED)
+    assert DataExportTask.complete_chunk(task.id) is False
+    task.refresh_from_db()
+    assert task.completed_chunks == 3
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize('invalid_progress', [
     None, 'not an int', 1.0001, -0.00001,
@@ -1,8 +1,13 @@
 """Tests for pagination helpers"""
-from unittest.mock import MagicMock, PropertyMock, patch
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
+import pytest
+from django.contrib.auth import get_user_model
 from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
 from futurex_openedx_extensions.helpers.pagination import DefaultPagination, DefaultPaginator
 
@@ -65,3 +70,109 @@ def test_count_with_not_query_set(mock_verify, mock_super_count):
 
     assert paginator.count == mock_super_count.return_value
     mock_verify.assert_not_called()
+
+
+def _get_request(query_string):
+    """Get a DRF request with the given query string."""
+    return Request(APIRequestFactory().get(f'/learners/?{query_string}'))
+
+
+@pytest.mark.parametrize('query_string, keyset_allowed, expected_result', [
+    ('pagination=keyset', True, True),
+    ('pagination=keyset', False, False),
+    ('pagination=page', True, False),
+    ('', True, False),
+])
+def test_is_keyset_pagination(query_string, keyset_allowed, expected_result):
+    """Verify that the keyset pagination is used only when requested, and allowed for the view."""
+    view = Mock(fx_keyset_pagination=keyset_allowed)
+    assert DefaultPagination().is_keyset_pagination(_get_request(query_string), view) is expected_result
+
+
+def test_is_keyset_pagination_view_without_attribute():
+    """Verify that the keyset pagination is not used for views that did not allow it."""
+    assert DefaultPagination().is_keyset_pagination(_get_request('pagination=keyset'), object()) is False
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_first_page(base_data):  # pylint: disable=unused-argument
+    """Verify that the keyset pagination returns the first page ordered by ID, with the link to the next page."""
+    pagination = DefaultPagination()
+    queryset = get_user_model().objects.filter(id__in=[5, 3, 1, 2, 4]).order_by('-username')
+    page = pagination.paginate_queryset(
+        queryset, _get_request('pagination=keyset&page_size=2&page=3'), Mock(fx_keyset_pagination=True),
+    )
+
+    assert [user.id for user in page] == [1, 2]
+    response = pagination.get_paginated_response(['dummy'])
+    assert response.data == {
+        'count': 5,
+        'next': 'http://testserver/learners/?after=2&page_size=2&pagination=keyset',
+        'previous': None,
+        'results': ['dummy'],
+    }
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_last_page(base_data):  # pylint: disable=unused-argument
+    """Verify that the keyset pagination returns the records after the given ID, without a link to the next page."""
+    pagination = DefaultPagination()
+    queryset = get_user_model().objects.filter(id__in=[5, 3, 1, 2, 4])
+    page = pagination.paginate_queryset(
+        queryset, _get_request('pagination=keyset&page_size=2&after=3&count=0'), Mock(fx_keyset_pagination=True),
+    )
+
+    assert [user.id for user in page] == [4, 5]
+    assert pagination.get_paginated_response([]).data == {
+        'count': None,
+        'next': None,
+        'previous': None,
+        'results': [],
+    }
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_count_removable_annotations(base_data):  # pylint: disable=unused-argument
+    """Verify that the keyset pagination counts the records with the paginator of the pagination class."""
+    pagination = DefaultPagination()
+    with patch.object(DefaultPaginator, 'count', new_callable=PropertyMock, return_value=99):
+        pagination.paginate_queryset(
+            get_user_model().objects.all(), _get_request('pagination=keyset'), Mock(fx_keyset_pagination=True),
+        )
+    assert pagination.get_paginated_response([]).data['count'] == 99
+
+
+def test_keyset_pagination_invalid_after():
+    """Verify that the keyset pagination raises NotFound for an invalid after value."""
+    with pytest.raises(NotFound) as exc_info:
+        DefaultPagination().paginate_queryset(
+            MagicMock(), _get_request('pagination=keyset&after=abc'), Mock(fx_keyset_pagination=True),
+        )
+    assert str(exc_info.value.detail) == 'Invalid after value: abc'
+
+
+def test_keyset_pagination_disabled():
+    """Verify that the keyset pagination returns None when the pagination is disabled."""
+    pagination = DefaultPagination()
+    pagination.page_size = None
+    assert pagination.paginate_queryset(
+        MagicMock(), _get_request('pagination=keyset'), Mock(fx_keyset_pagination=True),
+    ) is None
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_not_affected(base_data):  # pylint: disable=unused-argument
+    """Verify that the page number pagination is used when the keyset pagination is not requested."""
+    pagination = DefaultPagination()
+    queryset = get_user_model().objects.filter(id__in=[1, 2, 3, 4, 5]).order_by('id')
+    page = pagination.paginate_queryset(
+        queryset, _get_request('page_size=2&page=2&after=4'), Mock(fx_keyset_pagination=True),
+    )
+
+    assert [user.id for user in page] == [3, 4]
+    assert pagination.get_paginated_response([]).data == {
+        'count': 5,
+        'next': 'http://testserver/learners/?after=4&page=3&page_size=2',
+        'previous': 'http://testserver/learners/?after=4&page_size=2',
+        'results': [],
+    }
@@ -272,6 +272,56 @@ def test_fx_base_authenticated_permission_selected_tenants(
     })
 
 
+@pytest.mark.django_db
+def test_fx_base_authenticated_permission_uses_permission_index(
+    base_data, dummy_view, permission,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that FXBaseAuthenticatedPermission fills the view allowed info from the permission index of the user"""
+    request = APIRequestFactory().generic('GET', '/dummy/?tenant_ids=1,2')
+    set_user(request, 9)
+    with patch('futurex_openedx_extensions.helpers.permissions.get_user_permission_index') as mock_index:
+        mock_index.return_value = {
+            1: {'full_access_orgs': ['org1'], 'course_access_orgs': ['org2'], 'full_access_tenant_ids': [1, 4]},
+            2: {'full_access_orgs': [], 'course_access_orgs': ['org3'], 'full_access_tenant_ids': []},
+            3: {'full_access_orgs': ['org4'], 'course_access_orgs': [], 'full_access_tenant_ids': [3]},
+        }
+        permission.has_permission(request, dummy_view)
+
+    mock_index.assert_called_once_with(9, ['staff', 'admin'])
+    assert not DeepDiff(request.fx_permission_info, {
+        'user': request.user,
+        'user_roles': request.fx_permission_info['user_roles'],
+        'is_system_staff_user': False,
+        'view_allowed_roles': ['staff', 'admin'],
+        'view_allowed_full_access_orgs': ['org1'],
+        'view_allowed_course_access_orgs': ['org2', 'org3'],
+        'view_allowed_any_access_orgs': ['org1', 'org2', 'org3'],
+        'view_allowed_tenant_ids_any_access': [1, 2],
+        'view_allowed_tenant_ids_full_access': [1, 4],
+        'view_allowed_tenant_ids_partial_access': [2],
+        'download_allowed': request.fx_permission_info['download_allowed'],
+    }, ignore_order=True)
+
+
+@pytest.mark.django_db
+def test_fx_base_authenticated_permission_tenant_not_in_permission_index(
+    base_data, dummy_view, permission,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that FXBaseAuthenticatedPermission gives no access to the orgs of a tenant missing from the index"""
+    request = APIRequestFactory().generic('GET', '/dummy/?tenant_ids=1,2')
+    set_user(request, 9)
+    with patch('futurex_openedx_extensions.helpers.permissions.get_user_permission_index') as mock_index:
+        mock_index.return_value = {
+            1: {'full_access_orgs': ['org1'], 'course_access_orgs': [], 'full_access_tenant_ids': [1]},
+        }
+        permission.has_permission(request, dummy_view)
+
+    assert request.fx_permission_info['view_allowed_full_access_orgs'] == ['org1']
+    assert request.fx_permission_info['view_allowed_course_access_orgs'] == []
+    assert request.fx_permission_info['view_allowed_tenant_ids_full_access'] == [1]
+    assert request.fx_permission_info['view_allowed_tenant_ids_partial_access'] == [2]
+
+
 @pytest.mark.django_db
 def test_fx_base_authenticated_permission_tenant_id_in_url(
     base_data, dummy_view, permission,
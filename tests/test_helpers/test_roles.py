@@ -18,6 +18,7 @@ from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
 
 from futurex_openedx_extensions.helpers import constants as cs
+from futurex_openedx_extensions.helpers.caching import get_cache_generation
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
 from futurex_openedx_extensions.helpers.extractors import DictHashcode
 from futurex_openedx_extensions.helpers.models import ViewAllowedRoles
@@ -27,6 +28,7 @@ from futurex_openedx_extensions.helpers.roles import (
     RoleType,
     _clean_course_access_roles,
     _clean_course_access_roles_partial,
+    _get_course_access_roles_values,
     _verify_can_add_course_access_roles,
     _verify_can_add_org_course_creator,
     _verify_can_delete_course_access_roles,
@@ -34,7 +36,9 @@ from futurex_openedx_extensions.helpers.roles import (
     add_missing_signup_source_record,
     add_org_course_creator,
     are_all_library_ids,
+    cache_course_access_roles_of_users,
     cache_name_user_course_access_roles,
+    cache_name_user_permission_index,
     cache_refresh_course_access_roles,
     check_tenant_access,
     delete_course_access_roles,
@@ -43,6 +47,7 @@ from futurex_openedx_extensions.helpers.roles import (
     get_fx_view_with_roles,
     get_tenant_user_roles,
     get_user_course_access_roles,
+    get_user_permission_index,
     get_usernames_with_access_roles,
     is_view_exist,
     is_view_support_write,
@@ -372,6 +377,71 @@ def test_get_user_course_access_roles(base_data):  # pylint: disable=unused-argu
     assert_expected_result(8, expected_result)
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize('view_allowed_roles, expected_index', [
+    (['staff', 'instructor'], {
+        1: {'full_access_orgs': ['org1', 'org2'], 'course_access_orgs': ['org1'], 'full_access_tenant_ids': [1]},
+        2: {'full_access_orgs': ['org3'], 'course_access_orgs': ['org3'], 'full_access_tenant_ids': [2, 7]},
+        7: {'full_access_orgs': ['org3'], 'course_access_orgs': ['org3'], 'full_access_tenant_ids': [2, 7]},
+    }),
+    (['staff'], {
+        1: {'full_access_orgs': [], 'course_access_orgs': ['org1'], 'full_access_tenant_ids': []},
+        2: {'full_access_orgs': [], 'course_access_orgs': ['org3'], 'full_access_tenant_ids': []},
+        7: {'full_access_orgs': [], 'course_access_orgs': ['org3'], 'full_access_tenant_ids': []},
+    }),
+    (['data_researcher'], {}),
+])
+def test_get_user_permission_index(
+    base_data, view_allowed_roles, expected_index,
+):  # pylint: disable=unused-argument
+    """Verify that get_user_permission_index returns the accessible orgs of every tenant for the given roles."""
+    _remove_course_access_roles_causing_error_logs()
+    assert get_user_permission_index(4, view_allowed_roles) == expected_index
+
+
+@pytest.mark.django_db
+def test_get_user_permission_index_cached(base_data, cache_testing):  # pylint: disable=unused-argument
+    """Verify that get_user_permission_index caches the index of every role set, and rebuilds it on a new generation"""
+    user_id = 4
+    _remove_course_access_roles_causing_error_logs()
+    with patch('futurex_openedx_extensions.helpers.roles._build_user_permission_index') as mock_build:
+        mock_build.side_effect = lambda *args: {'built_for': args[1]}
+        assert get_user_permission_index(user_id, ['staff', 'instructor']) == {'built_for': ['staff', 'instructor']}
+        assert get_user_permission_index(user_id, ['instructor', 'staff']) == {'built_for': ['staff', 'instructor']}
+        assert get_user_permission_index(user_id, ['staff']) == {'built_for': ['staff']}
+        assert mock_build.call_count == 2
+        version = cache.get(cache_name_user_permission_index(user_id))
+        assert version is not None
+
+        with patch('futurex_openedx_extensions.helpers.roles.get_cache_generation', return_value=99):
+            assert get_user_permission_index(user_id, ['staff']) == {'built_for': ['staff']}
+        assert mock_build.call_count == 3
+
+        cache.delete(cache_name_user_permission_index(user_id))
+        assert get_user_permission_index(user_id, ['staff']) == {'built_for': ['staff']}
+        assert mock_build.call_count == 4
+        assert cache.get(cache_name_user_permission_index(user_id)) not in (None, version)
+
+
+@pytest.mark.django_db
+def test_get_user_permission_index_concurrent_writes(base_data, cache_testing):  # pylint: disable=unused-argument
+    """Verify that get_user_permission_index keeps the version and the index written first by a concurrent request"""
+    user_id = 4
+    version_cache_name = cache_name_user_permission_index(user_id)
+    original_add = cache.add
+
+    def add_after_concurrent_request(key, value, timeout):
+        """Write the value of a concurrent request just before this one."""
+        original_add(key, 'other_version' if key == version_cache_name else {'built_by': 'other'}, timeout)
+        return original_add(key, value, timeout)
+
+    with patch('futurex_openedx_extensions.helpers.roles._build_user_permission_index', return_value={'built': 1}):
+        with patch.object(cache, 'add', side_effect=add_after_concurrent_request):
+            assert get_user_permission_index(user_id, ['staff']) == {'built': 1}
+    assert cache.get(version_cache_name) == 'other_version'
+    assert cache.get(f'{version_cache_name}_other_version_staff_{get_cache_generation()}') == {'built_by': 'other'}
+
+
 @pytest.mark.django_db
 def test_get_user_course_access_roles_for_invalid_library_id(base_data):  # pylint: disable=unused-argument
     """Verify get_user_course_access_roles result when invalid library role exist in db."""
@@ -1380,10 +1450,45 @@ def test_cache_refresh_course_access_roles(mock_get_roles, cache_testing):  # py
     cache_name = cache_name_user_course_access_roles(user_id)
 
     cache.set(cache_name, {'some': 'data'}, timeout=None)
+    cache.set(cache_name_user_permission_index(user_id), {'some': 'index'}, timeout=None)
     assert cache.get(cache_name) == {'some': 'data'}
     mock_get_roles.side_effect = mocked_get_user_course_access_roles
     cache_refresh_course_access_roles(user_id)
     assert cache.get(cache_name) == {'some': 'new data'}
+    assert cache.get(cache_name_user_permission_index(user_id)) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('user_ids, batch_size', [
+    (None, 500),
+    (None, 2),
+    ([4, 9, 4, 999], 2),
+])
+def test_cache_course_access_roles_of_users(
+    base_data, cache_testing, user_ids, batch_size,
+):  # pylint: disable=unused-argument
+    """Verify that cache_course_access_roles_of_users writes the same roles of get_user_course_access_roles."""
+    all_user_ids = sorted(set(CourseAccessRole.objects.values_list('user_id', flat=True)))
+    expected_user_ids = all_user_ids if user_ids is None else [4, 9, 999]
+    for user_id in expected_user_ids:
+        cache.set(cache_name_user_permission_index(user_id), {'some': 'index'})
+
+    with patch(
+        'futurex_openedx_extensions.helpers.roles._get_course_access_roles_values',
+        wraps=_get_course_access_roles_values,
+    ) as mock_get_values:
+        assert cache_course_access_roles_of_users(user_ids, batch_size=batch_size) == len(expected_user_ids)
+    assert mock_get_values.call_count == (len(expected_user_ids) + batch_size - 1) // batch_size
+
+    for user_id in expected_user_ids:
+        assert cache.get(cache_name_user_course_access_roles(user_id))['data'] == get_user_course_access_roles(
+            user_id, __skip_cache=True,
+        )
+        assert cache.get(cache_name_user_permission_index(user_id)) is None
+    if user_ids:
+        assert cache.get(cache_name_user_course_access_roles(999))['data'] == {
+            'roles': {}, 'useless_entries_exist': False,
+        }
 
 
 @pytest.mark.django_db
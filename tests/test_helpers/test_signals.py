@@ -7,7 +7,10 @@ from django.core.cache import cache
 
 from futurex_openedx_extensions.helpers import constants as cs
 from futurex_openedx_extensions.helpers.models import ConfigAccessControl, TenantAsset, ViewAllowedRoles
-from futurex_openedx_extensions.helpers.roles import cache_name_user_course_access_roles
+from futurex_openedx_extensions.helpers.roles import (
+    cache_name_user_course_access_roles,
+    cache_name_user_permission_index,
+)
 
 tenant_info_test_cases = [
     (1, 2, False, 'Non-template tenant will not trigger cache invalidation'),
@@ -25,8 +28,10 @@ def test_refresh_course_access_role_cache_on_save(
     user_id = 1
     cache_name = cache_name_user_course_access_roles(user_id)
     cache.set(cache_name, 'test')
+    cache.set(cache_name_user_permission_index(user_id), 'test')
     dummy = CourseAccessRole.objects.create(user_id=user_id, role='test')
     assert cache.get(cache_name) is None
+    assert cache.get(cache_name_user_permission_index(user_id)) is None
     mock_signup.assert_not_called()
 
     cache.set(cache_name, 'test')
@@ -42,12 +47,15 @@ def test_refresh_view_allowed_roles_cache_on_delete(base_data, cache_testing):
     user_id = 3
     cache_name = cache_name_user_course_access_roles(user_id)
     cache.set(cache_name, 'test')
+    cache.set(cache_name_user_permission_index(user_id), 'test')
 
     CourseAccessRole.objects.filter(user_id=user_id + 1).delete()
     assert cache.get(cache_name) == 'test'
+    assert cache.get(cache_name_user_permission_index(user_id)) == 'test'
 
     CourseAccessRole.objects.filter(user_id=user_id).delete()
     assert cache.get(cache_name) is None
+    assert cache.get(cache_name_user_permission_index(user_id)) is None
 
 
 @patch('futurex_openedx_extensions.helpers.roles.is_view_exist', return_value=True)
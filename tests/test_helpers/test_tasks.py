@@ -7,18 +7,36 @@ from django.contrib.auth import get_user_model
 
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
 from futurex_openedx_extensions.helpers.models import DataExportTask
-from futurex_openedx_extensions.helpers.tasks import export_data_to_csv_task
+from futurex_openedx_extensions.helpers.tasks import (
+    cache_course_access_roles_task,
+    export_data_to_csv_chunk_task,
+    export_data_to_csv_task,
+    merge_export_chunks_task,
+)
+
+
+@pytest.fixture
+def fx_task():
+    """Fixture for DataExportTask."""
+    return DataExportTask.objects.create(
+        filename='test_file.csv',
+        view_name='fake',
+        user_id=30,
+        tenant_id=1,
+    )
 
 
 @pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.get_export_chunks', return_value=[])
 @patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv')
-@pytest.mark.parametrize('export_completed', [True, False])
+@pytest.mark.parametrize('export_completed, after', [(True, None), (False, None), (False, 20)])
 def test_export_data_to_csv_task(
-    mocked_export_data_to_csv, export_completed, base_data, view_data, caplog,
-):  # pylint: disable=unused-argument
+    mocked_export_data_to_csv, mocked_get_export_chunks, export_completed, after, base_data, view_data, caplog,
+):  # pylint: disable=unused-argument, too-many-arguments, redefined-outer-name
     """test export_data_to_csv_task functionality"""
     def export_data_to_csv_side_effect(*args, **kwargs):
         DataExportTask.objects.filter(id=fx_task.id).update(status=DataExportTask.STATUS_PROCESSING)
+        view_data['after'] = after
         return export_completed
 
     filename = 'test_file.csv'
@@ -45,10 +63,13 @@ def test_export_data_to_csv_task(
         mock_delay.assert_not_called()
         assert fx_task.status == DataExportTask.STATUS_COMPLETED
     else:
-        mock_delay.assert_called_once_with(fx_task.id, url, {
+        expected_next_view_data = {
             'query_params': {}, 'kwargs': {}, 'path': '/', 'start_page': 1, 'end_page': None,
             'site_domain': 'example.com',
-        }, fx_permission_info, filename)
+        }
+        if after is not None:
+            expected_next_view_data['after'] = after
+        mock_delay.assert_called_once_with(fx_task.id, url, expected_next_view_data, fx_permission_info, filename)
         assert 'CSV Export: initiating a continue job starting from page' in caplog.text
         assert fx_task.status == DataExportTask.STATUS_PROCESSING
 
@@ -104,3 +125,225 @@ def test_export_data_to_csv_task_error_unhandled(mock_get_task, mock_set_status,
     mock_set_status.assert_called_once_with(
         task_id=task_id, status=DataExportTask.STATUS_FAILED, error_message=str(mock_get_task.side_effect)
     )
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv_chunk_task.delay')
+@patch('futurex_openedx_extensions.helpers.tasks.get_export_chunks')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv')
+def test_export_data_to_csv_task_parallel(
+    mocked_export_data_to_csv, mocked_get_export_chunks, mocked_chunk_delay, base_data, view_data, fx_task, caplog,
+):  # pylint: disable=unused-argument, too-many-arguments, redefined-outer-name
+    """Verify that export_data_to_csv_task runs every chunk of the export in its own task"""
+    caplog.set_level(logging.INFO)
+    url = 'http://example.com/view'
+    fx_permission_info = {'user_id': 30, 'role': 'admin'}
+    chunks = [{'chunk': 1, 'until': 10}, {'chunk': 2, 'after': 10}]
+    mocked_get_export_chunks.return_value = chunks
+    mocked_chunk_delay.return_value.status = 'PENDING'
+
+    export_data_to_csv_task(fx_task.id, url, view_data, fx_permission_info, 'test_file.csv')
+
+    mocked_export_data_to_csv.assert_not_called()
+    mocked_get_export_chunks.assert_called_once_with(url, view_data, fx_permission_info)
+    assert [call.args for call in mocked_chunk_delay.call_args_list] == [
+        (fx_task.id, url, chunk, fx_permission_info, 'test_file.csv') for chunk in chunks
+    ]
+    fx_task.refresh_from_db()
+    assert fx_task.status == DataExportTask.STATUS_PROCESSING
+    assert (fx_task.chunks_count, fx_task.completed_chunks) == (2, 0)
+    assert f'CSV Export: splitting task {fx_task.id} into 2 parallel chunks.' in caplog.text
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.get_export_chunks')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv', return_value=True)
+def test_export_data_to_csv_task_no_parallel_for_continuation(
+    mocked_export_data_to_csv, mocked_get_export_chunks, base_data, view_data, fx_task,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that export_data_to_csv_task does not split a continued export"""
+    DataExportTask.set_status(task_id=fx_task.id, status=DataExportTask.STATUS_PROCESSING)
+    view_data['start_page'] = 3
+    export_data_to_csv_task(fx_task.id, 'http://example.com/view', view_data, {'user_id': 30}, 'test_file.csv')
+    mocked_get_export_chunks.assert_not_called()
+    mocked_export_data_to_csv.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.merge_export_chunks_task.delay')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv_chunk_task.delay')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv')
+def test_export_data_to_csv_chunk_task_continuation(
+    mocked_export_data_to_csv, mocked_chunk_delay, mocked_merge_delay, base_data, view_data, fx_task, caplog,
+):  # pylint: disable=unused-argument, too-many-arguments, redefined-outer-name
+    """Verify that export_data_to_csv_chunk_task continues a long chunk in a new task"""
+    def export_data_to_csv_side_effect(_, __, sent_view_data, ___, ____):
+        sent_view_data.update({'start_page': 2, 'after': 20, 'view_instance': object()})
+        return False
+
+    caplog.set_level(logging.INFO)
+    mocked_export_data_to_csv.side_effect = export_data_to_csv_side_effect
+    view_data.update({'chunk': 2, 'after': 10, 'until': 30, 'total_records': 200, 'site_domain': 'example.com'})
+    fx_permission_info = {'user_id': 30}
+
+    export_data_to_csv_chunk_task(fx_task.id, 'http://example.com/view', view_data, fx_permission_info, 'test.csv')
+
+    mocked_chunk_delay.assert_called_once_with(fx_task.id, 'http://example.com/view', {
+        'query_params': {}, 'kwargs': {}, 'path': '/', 'start_page': 2, 'end_page': None,
+        'site_domain': 'example.com', 'chunk': 2, 'after': 20, 'until': 30, 'total_records': 200,
+    }, fx_permission_info, 'test.csv')
+    mocked_merge_delay.assert_not_called()
+    assert f'CSV Export: continuing chunk 2 of task {fx_task.id} from page 2.' in caplog.text
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('completed_chunks, expected_merge', [(0, False), (1, True)])
+@patch('futurex_openedx_extensions.helpers.tasks.merge_export_chunks_task.delay')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv_chunk_task.delay')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv', return_value=True)
+def test_export_data_to_csv_chunk_task_completed(
+    mocked_export_data_to_csv, mocked_chunk_delay, mocked_merge_delay, completed_chunks, expected_merge,
+    base_data, view_data, fx_task,
+):  # pylint: disable=unused-argument, too-many-arguments, redefined-outer-name
+    """Verify that export_data_to_csv_chunk_task starts the merge only when the last chunk is completed"""
+    DataExportTask.objects.filter(id=fx_task.id).update(
+        status=DataExportTask.STATUS_PROCESSING, chunks_count=2, completed_chunks=completed_chunks,
+    )
+    view_data['chunk'] = 1
+
+    export_data_to_csv_chunk_task(fx_task.id, 'http://example.com/view', view_data, {}, 'test_file.csv')
+
+    mocked_chunk_delay.assert_not_called()
+    if expected_merge:
+        mocked_merge_delay.assert_called_once_with(fx_task.id, 'test_file.csv')
+    else:
+        mocked_merge_delay.assert_not_called()
+    fx_task.refresh_from_db()
+    assert fx_task.completed_chunks == completed_chunks + 1
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.delete_export_chunks')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv')
+def test_export_data_to_csv_chunk_task_error(
+    mocked_export_data_to_csv, mocked_delete_export_chunks, base_data, view_data, fx_task,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that export_data_to_csv_chunk_task marks the export task as failed when the chunk fails"""
+    mocked_export_data_to_csv.side_effect = Exception('Testing chunk error')
+    view_data['chunk'] = 1
+
+    with pytest.raises(Exception):
+        export_data_to_csv_chunk_task(fx_task.id, 'http://example.com/view', view_data, {}, 'test_file.csv')
+    fx_task.refresh_from_db()
+    assert fx_task.status == DataExportTask.STATUS_FAILED
+    assert fx_task.error_message == 'Testing chunk error'
+    mocked_delete_export_chunks.assert_called_once_with(fx_task.id, 'test_file.csv')
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.delete_export_chunks')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv')
+def test_export_data_to_csv_chunk_task_parent_failed(
+    mocked_export_data_to_csv, mocked_delete_export_chunks, base_data, view_data, fx_task, caplog,
+):  # pylint: disable=unused-argument, too-many-arguments, redefined-outer-name
+    """Verify that export_data_to_csv_chunk_task skips the chunk, and deletes the partial files when the task failed"""
+    caplog.set_level(logging.INFO)
+    DataExportTask.objects.filter(id=fx_task.id).update(status=DataExportTask.STATUS_FAILED, error_message='failed')
+    view_data['chunk'] = 2
+
+    export_data_to_csv_chunk_task(fx_task.id, 'http://example.com/view', view_data, {}, 'test_file.csv')
+
+    mocked_export_data_to_csv.assert_not_called()
+    mocked_delete_export_chunks.assert_called_once_with(fx_task.id, 'test_file.csv')
+    fx_task.refresh_from_db()
+    assert (fx_task.status, fx_task.error_message) == (DataExportTask.STATUS_FAILED, 'failed')
+    assert f'CSV Export: task {fx_task.id} has failed, deleting the partial files of its chunks.' in caplog.text
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.merge_export_chunks_task.delay')
+@patch('futurex_openedx_extensions.helpers.tasks.delete_export_chunks')
+@patch('futurex_openedx_extensions.helpers.tasks.export_data_to_csv')
+def test_export_data_to_csv_chunk_task_parent_failed_while_exporting(
+    mocked_export_data_to_csv, mocked_delete_export_chunks, mocked_merge_delay, base_data, view_data, fx_task,
+):  # pylint: disable=unused-argument, too-many-arguments, redefined-outer-name
+    """Verify that a chunk completed after the task failed deletes the partial files, including its own"""
+    DataExportTask.objects.filter(id=fx_task.id).update(
+        status=DataExportTask.STATUS_PROCESSING, chunks_count=2, completed_chunks=1,
+    )
+
+    def _export_while_other_chunk_fails(*args, **kwargs):  # pylint: disable=unused-argument
+        DataExportTask.objects.filter(id=fx_task.id).update(status=DataExportTask.STATUS_FAILED)
+        return True
+
+    mocked_export_data_to_csv.side_effect = _export_while_other_chunk_fails
+    view_data['chunk'] = 2
+
+    export_data_to_csv_chunk_task(fx_task.id, 'http://example.com/view', view_data, {}, 'test_file.csv')
+
+    mocked_merge_delay.assert_not_called()
+    mocked_delete_export_chunks.assert_called_once_with(fx_task.id, 'test_file.csv')
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.delete_export_chunks')
+@patch('futurex_openedx_extensions.helpers.tasks.merge_export_chunks')
+def test_merge_export_chunks_task_error_task_already_failed(
+    mocked_merge_export_chunks, mocked_delete_export_chunks, base_data, fx_task, caplog,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that the original error is raised when the task cannot be marked as failed, such as when it already is"""
+    DataExportTask.objects.filter(id=fx_task.id).update(status=DataExportTask.STATUS_FAILED)
+    mocked_merge_export_chunks.side_effect = ValueError('Testing merge error')
+    mocked_delete_export_chunks.side_effect = OSError('Testing delete error')
+
+    with pytest.raises(ValueError, match='Testing merge error'):
+        merge_export_chunks_task(fx_task.id, 'test_file.csv')
+
+    status_error_code = FXExceptionCodes.EXPORT_CSV_TASK_CHANGE_STATUS_NOT_POSSIBLE.value
+    assert f'CSV Export: cannot mark task {fx_task.id} as failed: ({status_error_code})' in caplog.text
+    assert (
+        f'CSV Export: failed to delete the partial files of task {fx_task.id}: (OSError) Testing delete error'
+    ) in caplog.text
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.merge_export_chunks')
+def test_merge_export_chunks_task(
+    mocked_merge_export_chunks, base_data, fx_task,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that merge_export_chunks_task merges the chunks, and completes the export task"""
+    DataExportTask.set_status(task_id=fx_task.id, status=DataExportTask.STATUS_PROCESSING)
+
+    merge_export_chunks_task(fx_task.id, 'test_file.csv')
+
+    mocked_merge_export_chunks.assert_called_once_with(fx_task.id, 'test_file.csv')
+    fx_task.refresh_from_db()
+    assert fx_task.status == DataExportTask.STATUS_COMPLETED
+    assert fx_task.progress == 1.0
+
+
+@pytest.mark.django_db
+@patch('futurex_openedx_extensions.helpers.tasks.merge_export_chunks')
+def test_merge_export_chunks_task_error(
+    mocked_merge_export_chunks, base_data, fx_task,
+):  # pylint: disable=unused-argument, redefined-outer-name
+    """Verify that merge_export_chunks_task marks the export task as failed when the merge fails"""
+    DataExportTask.set_status(task_id=fx_task.id, status=DataExportTask.STATUS_PROCESSING)
+    mocked_merge_export_chunks.side_effect = FXCodedException(
+        code=FXExceptionCodes.UNKNOWN_ERROR, message='Testing merge error',
+    )
+
+    with pytest.raises(FXCodedException):
+        merge_export_chunks_task(fx_task.id, 'test_file.csv')
+    fx_task.refresh_from_db()
+    assert fx_task.status == DataExportTask.STATUS_FAILED
+
+
+@patch('futurex_openedx_extensions.helpers.tasks.cache_course_access_roles_of_users', return_value=3)
+@pytest.mark.parametrize('user_ids', [None, [1, 2, 3]])
+def test_cache_course_access_roles_task(mocked_cache_roles, user_ids, caplog):
+    """Verify that cache_course_access_roles_task recomputes the course access roles cache of the given users"""
+    caplog.set_level(logging.INFO)
+    assert cache_course_access_roles_task(user_ids) == 3
+    mocked_cache_roles.assert_called_once_with(user_ids)
+    assert 'Course access roles cache: recomputed for 3 users.' in caplog.text
@@ -14,6 +14,7 @@ from eox_tenant.models import Route, TenantConfig
 
 from futurex_openedx_extensions.helpers import constants as cs
 from futurex_openedx_extensions.helpers import tenants
+from futurex_openedx_extensions.helpers.caching import invalidate_local_caches
 from futurex_openedx_extensions.helpers.exceptions import FXCodedException, FXExceptionCodes
 from futurex_openedx_extensions.helpers.models import ConfigAccessControl, DraftConfig, TenantAsset
 
@@ -129,10 +130,50 @@ def test_get_all_course_org_filter_list(base_data):  # pylint: disable=unused-ar
 @pytest.mark.django_db
 def test_get_all_course_org_filter_list_is_being_cached(cache_testing):  # pylint: disable=unused-argument
     """Verify that get_all_course_org_filter_list is being cached."""
-    assert cache.get(cs.CACHE_NAME_ALL_COURSE_ORG_FILTER_LIST) is None
+    assert cache.get(cs.CACHE_NAME_TENANTS_REGISTRY) is None
     result = tenants.get_all_course_org_filter_list()
-    assert cache.get(cs.CACHE_NAME_ALL_COURSE_ORG_FILTER_LIST)['data'] == result
-    cache.set(cs.CACHE_NAME_ALL_COURSE_ORG_FILTER_LIST, None)
+    assert cache.get(cs.CACHE_NAME_TENANTS_REGISTRY)['data']['course_org_filter_list'] == result
+    cache.set(cs.CACHE_NAME_TENANTS_REGISTRY, None)
+
+
+@pytest.mark.django_db
+def test_get_tenants_registry_is_being_cached(base_data, cache_testing):  # pylint: disable=unused-argument
+    """Verify that get_tenants_registry is cached under one versioned key, and read by the tenant helpers."""
+    assert cache.get(cs.CACHE_NAME_TENANTS_REGISTRY) is None
+    registry = tenants.get_tenants_registry()
+    assert registry['version'] == cs.TENANTS_REGISTRY_VERSION
+    assert cs.CACHE_NAME_TENANTS_REGISTRY.endswith(f'_v{cs.TENANTS_REGISTRY_VERSION}')
+    assert cache.get(cs.CACHE_NAME_TENANTS_REGISTRY)['data'] == registry
+
+    with patch('futurex_openedx_extensions.helpers.tenants._get_tenants_with_routes_queryset') as mock_queryset:
+        assert tenants.get_all_tenants_info() == registry['tenants_info']
+        assert tenants.get_all_course_org_filter_list() == registry['course_org_filter_list']
+        assert tenants.get_org_to_tenant_map() == registry['org_to_tenant_map']
+        assert tenants.get_tenants_sharing_orgs() == registry['tenants_sharing_orgs']
+    mock_queryset.assert_not_called()
+
+    assert registry['org_to_tenant_map'] == {
+        'org1': [1],
+        'org2': [1],
+        'org3': [2, 7],
+        'org4': [3],
+        'org5': [3],
+        'org8': [2, 8],
+    }
+
+
+@pytest.mark.django_db
+def test_get_tenants_registry_one_tenants_query(base_data):  # pylint: disable=unused-argument
+    """Verify that get_tenants_registry reads the tenants and their exclusion reasons with one TenantConfig query."""
+    with patch(
+        'futurex_openedx_extensions.helpers.tenants._get_tenants_with_routes_queryset',
+        wraps=tenants._get_tenants_with_routes_queryset,  # pylint: disable=protected-access
+    ) as mock_queryset, patch('futurex_openedx_extensions.helpers.tenants.get_excluded_tenant_ids') as mock_excluded:
+        registry = tenants.get_tenants_registry()
+
+    mock_queryset.assert_called_once_with()
+    mock_excluded.assert_not_called()
+    assert registry['tenants_info']['tenant_ids'] == [1, 2, 3, 7, 8]
 
 
 @pytest.mark.django_db
@@ -155,6 +196,16 @@ def test_get_all_course_org_filter_list_is_being_cached(cache_testing):  # pylin
         'duplicates': {},
         'invalid': [4],
     }),
+    ([3, 1, 8], {
+        'course_org_filter_list': ['org4', 'org5', 'org1', 'org2', 'org8'],
+        'duplicates': {},
+        'invalid': [],
+    }),
+    ([2, 2], {
+        'course_org_filter_list': ['org3', 'org8'],
+        'duplicates': {2: [2]},
+        'invalid': [],
+    }),
     ([2, 3, 7, 8], {
         'course_org_filter_list': ['org3', 'org8', 'org4', 'org5'],
         'duplicates': {
@@ -185,6 +236,29 @@ def test_get_course_org_filter_list(base_data, tenant_ids, expected):  # pylint:
         assert str(exc_info.value) == f'Invalid tenant IDs: {expected["invalid"]}'
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize('tenant_ids', [
+    [1, 2, 3, 7], [2, 3], [2, 3, 4], [3, 1, 8], [8, 3, 2, 7], [4, 5], [],
+])
+def test_get_course_org_filter_list_without_shared_orgs(base_data, tenant_ids):  # pylint: disable=unused-argument
+    """Verify that get_course_org_filter_list returns the same result when the tenants are not checked for duplicates"""
+    expected = tenants.get_course_org_filter_list(tenant_ids, ignore_invalid_tenant_ids=True)
+    with patch('futurex_openedx_extensions.helpers.tenants._are_tenants_without_shared_orgs', return_value=False):
+        assert tenants.get_course_org_filter_list(tenant_ids, ignore_invalid_tenant_ids=True) == expected
+
+
+@pytest.mark.django_db
+def test_get_tenants_sharing_orgs(base_data):  # pylint: disable=unused-argument
+    """Verify get_tenants_sharing_orgs function."""
+    assert tenants.get_tenants_sharing_orgs() == {
+        1: [],
+        2: [7, 8],
+        3: [],
+        7: [2],
+        8: [2],
+    }
+
+
 @pytest.mark.django_db
 def test_get_all_tenants_info(base_data):  # pylint: disable=unused-argument
     """Verify get_all_tenants_info function."""
@@ -199,6 +273,23 @@ def test_get_all_tenants_info(base_data):  # pylint: disable=unused-argument
     }
 
 
+@pytest.mark.django_db
+@override_settings(FX_CACHE_LOCAL_TIMEOUT=30)
+def test_get_tenants_registry_local_copies(base_data, cache_testing):  # pylint: disable=unused-argument
+    """Verify that modifying the registry data returned from the local cache does not affect the next callers."""
+    invalidate_local_caches()
+    try:
+        tenants.get_all_tenants_info()['tenant_ids'].append(99)
+        tenants.get_org_to_tenant_map()['org1'].append(99)
+        tenants.get_tenants_by_org('org1').append(99)
+
+        assert tenants.get_all_tenants_info()['tenant_ids'] == [1, 2, 3, 7, 8]
+        assert 99 not in tenants.get_org_to_tenant_map()['org1']
+        assert 99 not in tenants.get_tenants_by_org('org1')
+    finally:
+        invalidate_local_caches()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize('config_key, info_key, test_value, expected_result', [
     # ('LMS_BASE', 'lms_root_url', 'lms.example.com', 'https://lms.example.com'),
@@ -207,7 +298,10 @@ def test_get_all_tenants_info(base_data):  # pylint: disable=unused-argument
     ('platform_name', 'platform_name', 'Test Platform', 'Test Platform'),
     ('logo_image_url', 'logo_image_url', 'https://img.example.com/dummy.jpg', 'https://img.example.com/dummy.jpg'),
 ])
-@patch('futurex_openedx_extensions.helpers.tenants.get_excluded_tenant_ids', return_value=[4])
+@patch(
+    'futurex_openedx_extensions.helpers.tenants._get_tenant_exclusion_reasons',
+    side_effect=lambda tenant: [1] if tenant.id == 4 else [],
+)
 def test_get_all_tenants_info_configs(
     base_data, config_key, info_key, test_value, expected_result
 ):  # pylint: disable=unused-argument
@@ -226,8 +320,8 @@ def test_get_all_tenants_info_configs(
     (['PLATFORM_NAME', 'platform_name'], '', 1),
 ])
 @patch(
-    'futurex_openedx_extensions.helpers.tenants.get_excluded_tenant_ids',
-    return_value=[1, 2, 3, 4, 5, 6, 7, 8]
+    'futurex_openedx_extensions.helpers.tenants._get_tenant_exclusion_reasons',
+    side_effect=lambda tenant: [1] if tenant.id in [1, 2, 3, 4, 5, 6, 7, 8] else [],
 )
 @patch('futurex_openedx_extensions.helpers.tenants.get_first_not_empty_item')
 @patch('futurex_openedx_extensions.helpers.tenants.fix_lms_base')
@@ -292,13 +386,27 @@ def test_get_all_tenants_info_template_tenant(base_data, template_tenant):  # py
     assert template_tenant.external_key == settings.FX_TEMPLATE_TENANT_SITE
 
 
+@pytest.mark.django_db
+@override_settings(FX_TEMPLATE_TENANT_SITE='')
+def test_get_all_tenants_info_no_template_site(base_data, caplog):  # pylint: disable=unused-argument
+    """Verify that get_all_tenants_info reads only the not excluded tenants when no template site is configured."""
+    result = tenants.get_all_tenants_info()
+    assert 'CONFIGURATION ERROR: Template tenant not found! ()' in caplog.text
+    assert result['tenant_ids'] == [1, 2, 3, 7, 8]
+    assert result['template_tenant'] == {
+        'tenant_id': None,
+        'tenant_site': None,
+        'assets': None,
+    }
+
+
 @pytest.mark.django_db
 def test_get_all_tenants_info_is_being_cached(cache_testing):  # pylint: disable=unused-argument
     """Verify that get_all_tenants_info is being cached."""
-    assert cache.get(cs.CACHE_NAME_ALL_TENANTS_INFO) is None
+    assert cache.get(cs.CACHE_NAME_TENANTS_REGISTRY) is None
     result = tenants.get_all_tenants_info()
-    assert cache.get(cs.CACHE_NAME_ALL_TENANTS_INFO)['data'] == result
-    cache.set(cs.CACHE_NAME_ALL_TENANTS_INFO, None)
+    assert cache.get(cs.CACHE_NAME_TENANTS_REGISTRY)['data']['tenants_info'] == result
+    cache.set(cs.CACHE_NAME_TENANTS_REGISTRY, None)
 
 
 @pytest.mark.django_db
@@ -1,8 +1,32 @@
 """Upload tests"""
+import gzip
+import io
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from futurex_openedx_extensions.helpers.upload import (
+    GzipReader,
+    get_content_type,
+    get_storage_key,
+    get_upload_transfer_config,
+    upload_file,
+)
 
-from futurex_openedx_extensions.helpers.upload import upload_file
+
+@pytest.fixture
+def local_file():
+    """Fixture for a local file to upload."""
+    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+        temp_file.write(b'"id","name"\n' + b'1,"name"\n' * 50000)
+    yield temp_file.name
+    os.remove(temp_file.name)
 
 
 def test_upload_file_with_dir_creation():
@@ -27,3 +51,129 @@ def test_upload_file_with_dir_creation():
     default_storage.delete('storage/file1.txt')
     default_storage.delete('storage/file2.txt')
     default_storage.delete('storage')
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_upload_file_local_file(local_file, compress):  # pylint: disable=redefined-outer-name
+    """Verify that upload_file streams a local file to the storage, and compresses it on the fly when requested."""
+    with open(local_file, 'rb') as file:
+        expected_content = file.read()
+
+    uploaded_url = upload_file('storage/local.csv', local_file, compress=compress)
+    assert uploaded_url == default_storage.url('storage/local.csv')
+    with default_storage.open('storage/local.csv', 'rb') as file:
+        content = file.read()
+    if compress:
+        assert len(content) < len(expected_content)
+        content = gzip.decompress(content)
+    assert content == expected_content
+
+    default_storage.delete('storage/local.csv')
+    default_storage.delete('storage')
+
+
+@pytest.mark.parametrize('compress', [False, True])
+@patch('futurex_openedx_extensions.helpers.upload.default_storage')
+def test_upload_file_local_file_seekable(mock_storage, local_file, compress):  # pylint: disable=redefined-outer-name
+    """Verify that upload_file saves a seekable file in storages other than S3, even when compressing it."""
+    saved = {}
+
+    def _save(name, content):
+        assert content.seekable()
+        content.seek(0)
+        saved.update({'name': name, 'content': content.read()})
+
+    mock_storage.save.side_effect = _save
+    upload_file('storage/local.csv', local_file, compress=compress)
+
+    with open(local_file, 'rb') as file:
+        expected_content = file.read()
+    assert saved['name'] == 'storage/local.csv'
+    assert (gzip.decompress(saved['content']) if compress else saved['content']) == expected_content
+
+
+@pytest.mark.parametrize('is_private, compress, expected_extra_args', [
+    (False, False, {'ContentType': 'text/csv'}),
+    (True, False, {'ContentType': 'text/csv', 'ACL': 'private'}),
+    (True, True, {'ContentType': 'text/csv', 'ACL': 'private'}),
+])
+@patch('futurex_openedx_extensions.helpers.upload.default_storage')
+def test_upload_file_local_file_s3(
+    mock_storage, local_file, is_private, compress, expected_extra_args,
+):  # pylint: disable=redefined-outer-name
+    """Verify that upload_file uploads a local file to S3 with a managed transfer."""
+    mock_storage.__class__ = S3Boto3Storage
+    mock_storage._normalize_name.side_effect = lambda name: f'location/{name}'  # pylint: disable=protected-access
+    uploaded = {}
+
+    def _upload_fileobj(fileobj, key, ExtraArgs, Config):  # pylint: disable=invalid-name
+        uploaded.update({'content': fileobj.read(), 'key': key, 'extra_args': ExtraArgs, 'config': Config})
+
+    mock_storage.bucket.upload_fileobj.side_effect = _upload_fileobj
+    upload_file('storage/local.csv', local_file, is_private=is_private, compress=compress)
+
+    with open(local_file, 'rb') as file:
+        expected_content = file.read()
+    assert uploaded['key'] == 'location/storage/local.csv'
+    assert uploaded['extra_args'] == expected_extra_args
+    assert uploaded['config'].multipart_chunksize == 16 * 1024 * 1024
+    assert (gzip.decompress(uploaded['content']) if compress else uploaded['content']) == expected_content
+    mock_storage.save.assert_not_called()
+    mock_storage.bucket.Object.assert_not_called()
+
+
+@pytest.mark.parametrize('is_private', [False, True])
+@patch('futurex_openedx_extensions.helpers.upload.default_storage')
+def test_upload_file_object_s3(mock_storage, is_private):
+    """Verify that upload_file sets the private ACL of an uploaded file object on S3 only when requested."""
+    mock_storage.__class__ = S3Boto3Storage
+    file_obj = SimpleUploadedFile('test.txt', b'file content', content_type='text/plain')
+
+    upload_file('storage/file.txt', file_obj, is_private=is_private)
+
+    mock_storage.open.return_value.__enter__.return_value.write.assert_called_once_with(b'file content')
+    mock_storage.bucket.upload_fileobj.assert_not_called()
+    if is_private:
+        mock_storage.bucket.Object.assert_called_once_with('storage/file.txt')
+        mock_storage.bucket.Object.return_value.Acl.return_value.put.assert_called_once_with(ACL='private')
+    else:
+        mock_storage.bucket.Object.assert_not_called()
+
+
+def test_gzip_reader():
+    """Verify that GzipReader compresses the source on the fly, whatever the size of the reads."""
+    content = b'some content to compress ' * 10000
+    reader = GzipReader(io.BytesIO(content), chunk_size=1000)
+    assert reader.readable()
+
+    compressed = b''
+    while data := reader.read(7):
+        compressed += data
+    assert gzip.decompress(compressed) == content
+    assert gzip.decompress(GzipReader(io.BytesIO(b'')).read()) == b''
+
+
+@pytest.mark.parametrize('storage_path, expected_content_type', [
+    ('dir/export.csv', 'text/csv'),
+    ('dir/export.csv.gz', 'application/gzip'),
+    ('dir/export.csv_parts/export.csv_000001', 'application/octet-stream'),
+])
+def test_get_content_type(storage_path, expected_content_type):
+    """Verify that get_content_type returns the content type of the stored file."""
+    assert get_content_type(storage_path) == expected_content_type
+
+
+@override_settings(FX_UPLOAD_PART_SIZE_MB=10, FX_UPLOAD_MAX_CONCURRENCY=3)
+def test_get_upload_transfer_config():
+    """Verify that get_upload_transfer_config uses the part size and concurrency settings."""
+    config = get_upload_transfer_config()
+    assert config.multipart_threshold == 10 * 1024 * 1024
+    assert config.multipart_chunksize == 10 * 1024 * 1024
+    assert config.max_concurrency == 3
+
+
+@patch('futurex_openedx_extensions.helpers.upload.default_storage')
+def test_get_storage_key(mock_storage):
+    """Verify that get_storage_key adds the location of the storage to the path."""
+    mock_storage._normalize_name.side_effect = lambda name: f'location/{name}'  # pylint: disable=protected-access
+    assert get_storage_key('storage/file.csv') == 'location/storage/file.csv'